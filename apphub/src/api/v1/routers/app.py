@@ -6,7 +6,7 @@ import time
 from typing import Any, Dict
 from fastapi import APIRouter, Query,Path, Body, Request
 from fastapi.responses import StreamingResponse
-from src.core import logger
+from src.core.logger import logger
 from src.core.exception import CustomException
 from src.schemas.appAvailable import AppAvailableResponse
 from src.schemas.appCatalog import AppCatalogResponse
@@ -15,6 +15,7 @@ from src.schemas.appInstallAcceptedResponse import AppInstallAcceptedResponse
 from src.schemas.appInstall import appInstall
 from src.schemas.appPhpInfo import AppPhpInfoResponse
 from src.schemas.appPhpMigration import AppPhpMigrationRequest
+from src.schemas.appResourceMetrics import AppResourceMetricsResponse
 from src.schemas.appResponse import AppResponse
 from src.schemas.appAccess import AppAccessCertificateRequest, AppAccessCustomCertificateRequest, AppAccessDomainBindingRequest, AppAccessOverviewResponse, AppAccessProfile, AppAccessProfileUpdateRequest, AppAccessRootUrlRequest
 from src.schemas.appCustomFields import AppCustomFieldResponse, AppCustomFieldsRequest
@@ -22,6 +23,7 @@ from src.schemas.errorResponse import ErrorResponse
 from src.services.app_access_manager import AppAccessManager
 from src.services.app_status import get_app_custom_fields, save_app_custom_fields
 from src.services.app_manager import AppManger
+from src.services.app_resource_metrics import app_resource_metrics, collect_app_resource_metrics_safely
 from src.services.apps_stream_cache import apps_stream_cache
 from src.services.compose_install import install_compose_application, prepare_compose_install_tracking, validate_compose_installation
 from src.services.common_check import install_validate
@@ -29,6 +31,8 @@ from threading import Thread
 
 router = APIRouter()
 
+APPS_STREAM_CHANGE_POLL_SECONDS = 0.25
+
 @router.get(
         "/apps/catalog/{locale}",
     summary="List Catalogs",
@@ -79,7 +83,15 @@ def get_apps(
 @router.get(
         "/apps/stream",
         summary="Stream Installed Apps",
-        description="Server-sent events stream for installed app inventory snapshots.",
+        description=(
+            "Server-sent events stream for installed app inventory snapshots. Every event carries the inventory digest "
+            "as its SSE id. With mode=delta, after the first full snapshot the server only emits `delta` events holding "
+            "the added or changed app records (`upserts`) and the keys (`<app_id>:<tracking_id>`) of removed ones. "
+            "Clients resume from a digest they already hold via the Last-Event-ID header or the digest parameter; when "
+            "that digest is no longer known, a full snapshot is sent instead. For the local endpoint every cycle also "
+            "emits a `metrics` event with per-app CPU, memory, network and block I/O usage (see GET /apps/metrics); "
+            "metrics are not part of the inventory digest."
+        ),
         responses={
         200: {"description": "Apps stream established"},
         400: {"model": ErrorResponse},
@@ -89,10 +101,16 @@ def get_apps(
 async def stream_apps(
     request: Request,
     endpointId: int = Query(None, description="Endpoint ID to get apps from. If not set, get apps from the local endpoint"),
-    locale: str = Query("en", description="Language used to resolve installed app media", regex="^(zh|en)(-[A-Za-z]{2})?$")
+    locale: str = Query("en", description="Language used to resolve installed app media", regex="^(zh|en)(-[A-Za-z]{2})?$"),
+    mode: str = Query("snapshot", description="snapshot: resend the full inventory on change; delta: send only changed app records", regex="^(snapshot|delta)$"),
+    digest: str = Query(None, description="Inventory digest the client already holds; overridden by the Last-Event-ID header"),
 ):
+    resume_digest = (request.headers.get("last-event-id") or digest or "").strip() or None
+
     async def event_generator():
-        last_digest: str | None = None
+        last_digest: str | None = resume_digest
+        inventory_generation: int | None = None
+        first_event = True
 
         while True:
             if await request.is_disconnected():
@@ -101,21 +119,42 @@ async def stream_apps(
             sleep_seconds = 5.0
 
             try:
-                snapshot = apps_stream_cache.get_snapshot(endpointId, locale, force_refresh=last_digest is None)
+                snapshot = apps_stream_cache.get_snapshot(endpointId, locale, force_refresh=first_event and last_digest is None)
                 sleep_seconds = min(max(snapshot.refresh_interval_seconds, 1.0), 5.0)
+                inventory_generation = snapshot.inventory_generation
 
-                if snapshot.digest != last_digest:
-                    last_digest = snapshot.digest
-                    yield f"retry: {int(snapshot.refresh_interval_seconds * 1000)}\n"
-                    yield f"event: snapshot\ndata: {snapshot.event_json}\n\n"
-                else:
+                if snapshot.digest == last_digest:
+                    if first_event:
+                        yield f"retry: {int(sleep_seconds * 1000)}\n"
                     yield ": keep-alive\n\n"
+                else:
+                    delta = None
+                    if mode == "delta" and last_digest is not None:
+                        delta = apps_stream_cache.get_delta(endpointId, locale, last_digest)
+                    yield f"retry: {int(sleep_seconds * 1000)}\n"
+                    if delta is not None:
+                        yield f"id: {delta.digest}\nevent: delta\ndata: {delta.event_json}\n\n"
+                        last_digest = delta.digest
+                    else:
+                        yield f"id: {snapshot.digest}\nevent: snapshot\ndata: {snapshot.event_json}\n\n"
+                        last_digest = snapshot.digest
+                first_event = False
             except Exception as exc:
                 logger.warning(f"Apps stream failed: {exc}")
                 payload = json.dumps({"message": "Apps stream refresh failed"}, separators=(",", ":"))
                 yield f"event: error\ndata: {payload}\n\n"
 
-            await asyncio.sleep(sleep_seconds)
+            if endpointId is None:
+                metrics = await asyncio.to_thread(collect_app_resource_metrics_safely)
+                if metrics is not None:
+                    yield f"event: metrics\ndata: {json.dumps(metrics, separators=(',', ':'))}\n\n"
+
+            # Wake up early when the Docker events stream reports an inventory change.
+            deadline = time.monotonic() + sleep_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(min(APPS_STREAM_CHANGE_POLL_SECONDS, max(deadline - time.monotonic(), 0.0)))
+                if inventory_generation is not None and apps_stream_cache.has_pending_changes(inventory_generation):
+                    break
 
     return StreamingResponse(
         event_generator(),
@@ -127,6 +166,27 @@ async def stream_apps(
         },
     )
 
+@router.get(
+        "/apps/metrics",
+        summary="App Resource Metrics",
+        description=(
+            "Per-app CPU, memory, network and block I/O usage of the local endpoint, summed over each app's running "
+            "containers and read in one pass from the host cgroup accounting files. Rates are computed against the "
+            "previous collection, so the first call after startup only carries totals and memory."
+        ),
+        responses={
+        200: {"model": AppResourceMetricsResponse},
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        }
+    )
+def get_app_resource_metrics(
+    sort: str = Query("cpu", description="Metric to order apps by", regex="^(cpu|memory|network|block)$"),
+    top: int = Query(None, description="Only return this many apps with the highest usage", ge=1, le=500),
+):
+    return app_resource_metrics.top(sort, top)
+
+
 @router.get(
         "/apps/{app_id}",
         summary="Inspect App",
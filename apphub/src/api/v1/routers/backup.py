@@ -1,7 +1,11 @@
 from fastapi import APIRouter, Query, Path, Body
+from fastapi.responses import StreamingResponse
 from typing import Dict, List
+from src.core.event_stream import iter_sse_events
 from src.schemas.errorResponse import ErrorResponse
 from src.services.back_manager import BackupManager
+from src.services.backup_jobs import backup_jobs
+from src.schemas.backupJob import BackupJob
 from src.schemas.backupsnapshot import BackupSnapshot
 
 router = APIRouter()
@@ -22,6 +26,64 @@ def create_backup(
     BackupManager().create_backup(app_id)
     return {"message": f"Backup created successfully for app: {app_id}"}
 
+@router.post(
+    "/backup/{app_id}/jobs",
+    summary="Start Backup Job",
+    description="Start a backup for the specified app in the background and return its job; follow it with GET /backup/jobs/{job_id}/stream",
+    status_code=202,
+    responses={
+        202: {"model": BackupJob},
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+def start_backup_job(
+    app_id: str = Path(..., description="App ID to create backup for")
+):
+    return backup_jobs.start(app_id)
+
+@router.get(
+    "/backup/jobs/{job_id}",
+    summary="Inspect Backup Job",
+    description="Return the status, latest progress and result of a backup job",
+    responses={
+        200: {"model": BackupJob},
+        404: {"model": ErrorResponse},
+    },
+)
+def get_backup_job(
+    job_id: str = Path(..., description="Backup job ID")
+):
+    job, _version = backup_jobs.get(job_id)
+    return job
+
+@router.get(
+    "/backup/jobs/{job_id}/stream",
+    summary="Stream Backup Job Progress",
+    description=(
+        "Server-sent events for a backup job: a `progress` event with percent done, throughput and ETA "
+        "whenever Restic reports progress, then one `done` event carrying the final job state. "
+        "An `error` event ends the stream if the job is pruned while it is being followed."
+    ),
+    responses={
+        200: {"description": "Backup job stream established"},
+        404: {"model": ErrorResponse},
+    },
+)
+def stream_backup_job(
+    job_id: str = Path(..., description="Backup job ID"),
+):
+    events = backup_jobs.stream(job_id)
+    return StreamingResponse(
+        iter_sse_events(events),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
 @router.get(
     "/backup/snapshots",
     summary="List Snapshots",
@@ -1,9 +1,14 @@
 import base64
-from typing import Optional
+from typing import Any, Optional
 
-from fastapi import APIRouter, Body, Cookie, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Body, Cookie, Header, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
+from src.core.directory_listing import MAX_DIRECTORY_PAGE_SIZE, DirectoryPageRequest
+from src.core.content_search import SEARCH_DEFAULT_MAX_MATCHES, SEARCH_MAX_CONTEXT_LINES, SEARCH_MAX_MATCHES, ContentSearchOptions
+from src.core.disk_usage import DISK_USAGE_DEFAULT_TOP, DISK_USAGE_MAX_TOP
+from src.core.event_stream import iter_sse_events
 from src.core.exception import CustomException
 from src.schemas.errorResponse import ErrorResponse
 from src.schemas.fileManager import (
@@ -13,16 +18,20 @@ from src.schemas.fileManager import (
     FileManagerCreateFolderRequest,
     FileManagerDeleteRequest,
     FileManagerDirectoryResponse,
+    FileManagerDiskUsageResponse,
     FileManagerMetadataResponse,
     FileManagerMutationResponse,
     FileManagerRenameRequest,
     FileManagerTextFileResponse,
     FileManagerUpdateAttributesRequest,
+    FileManagerUploadAbortResponse,
     FileManagerUploadRequest,
+    FileManagerUploadSessionRequest,
+    FileManagerUploadSessionResponse,
     FileManagerVolumesResponse,
     FileManagerWriteTextRequest,
 )
-from src.services.file_manager import FileManagerService
+from src.services.file_manager import FILE_UPLOAD_CHUNK_MAX_BYTES, FileManagerService
 from src.services.product_auth import PRODUCT_AUTH_COOKIE_NAME
 
 router = APIRouter()
@@ -54,9 +63,21 @@ def list_file_manager_volumes(
 def list_file_manager_tree(
     volume_id: str = Query(..., description="Docker volume name"),
     path: str = Query("/", description="Relative path inside the selected volume"),
+    sort: str = Query("name", description="Sort field: name, size or modified; directories are always listed first"),
+    order: str = Query("asc", description="Sort order: asc or desc"),
+    name: Optional[str] = Query(None, description="Only list entries whose name contains this text (case-insensitive)"),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_DIRECTORY_PAGE_SIZE, description="Page size; omit to list every entry"),
+    include_details: bool = Query(True, description="Resolve owner/group names and text editability"),
     session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
 ):
-    return _get_file_manager_service().list_directory(session_token=session_token, volume_id=volume_id, relative_path=path)
+    page_request = DirectoryPageRequest.from_params(sort, order, name, cursor, limit, include_details)
+    return _get_file_manager_service().list_directory(
+        session_token=session_token,
+        volume_id=volume_id,
+        relative_path=path,
+        page_request=page_request,
+    )
 
 
 @router.get(
@@ -80,9 +101,16 @@ def read_file_manager_metadata(
     responses={200: {"model": FileManagerDirectoryResponse}, 401: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
 )
 def list_file_manager_root_tree(
+    sort: str = Query("name", description="Sort field: name, size or modified; directories are always listed first"),
+    order: str = Query("asc", description="Sort order: asc or desc"),
+    name: Optional[str] = Query(None, description="Only list entries whose name contains this text (case-insensitive)"),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_DIRECTORY_PAGE_SIZE, description="Page size; omit to list every entry"),
+    include_details: bool = Query(True, description="Resolve owner/group names and text editability"),
     session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
 ):
-    return _get_file_manager_service().get_root_directory(session_token=session_token)
+    page_request = DirectoryPageRequest.from_params(sort, order, name, cursor, limit, include_details)
+    return _get_file_manager_service().get_root_directory(session_token=session_token, page_request=page_request)
 
 
 @router.get(
@@ -276,24 +304,199 @@ def upload_file_manager_item(
     )
 
 
+@router.post(
+    "/files/uploads",
+    summary="Start chunked upload",
+    description="Start a resumable upload into a selected Docker volume directory; chunks are then sent with PUT /files/uploads/{upload_id}",
+    responses={200: {"model": FileManagerUploadSessionResponse}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+def start_file_manager_upload(
+    payload: FileManagerUploadSessionRequest,
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    return _get_file_manager_service().start_upload(
+        session_token=session_token,
+        volume_id=payload.volume_id,
+        parent_path=payload.parent_path,
+        file_name=payload.file_name,
+        size=payload.size,
+    )
+
+
+@router.get(
+    "/files/uploads/{upload_id}",
+    summary="Get chunked upload status",
+    description="Get the offset a resumed upload has to continue from",
+    responses={200: {"model": FileManagerUploadSessionResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+def get_file_manager_upload(
+    upload_id: str,
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    return _get_file_manager_service().get_upload(session_token=session_token, upload_id=upload_id)
+
+
+@router.put(
+    "/files/uploads/{upload_id}",
+    summary="Upload chunk",
+    description="Append a raw binary chunk at the given offset; the upload completes when the declared size is reached",
+    responses={200: {"model": FileManagerUploadSessionResponse}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}, 413: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+async def upload_file_manager_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk"),
+    content_sha256: Optional[str] = Header(default=None, alias="X-Content-SHA256", description="Hex SHA-256 of the chunk"),
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    service = _get_file_manager_service()
+    # Reject anonymous requests before buffering up to a whole chunk of their body.
+    await run_in_threadpool(service.auth_service._require_authenticated_operator, session_token)
+    content = bytearray()
+    async for chunk in request.stream():
+        content.extend(chunk)
+        if len(content) > FILE_UPLOAD_CHUNK_MAX_BYTES:
+            raise CustomException(status_code=413, message="Payload Too Large", details=f"Upload chunks are limited to {FILE_UPLOAD_CHUNK_MAX_BYTES} bytes")
+    return await run_in_threadpool(
+        service.upload_chunk,
+        session_token=session_token,
+        upload_id=upload_id,
+        offset=offset,
+        content=bytes(content),
+        checksum=content_sha256,
+    )
+
+
+@router.delete(
+    "/files/uploads/{upload_id}",
+    summary="Abort chunked upload",
+    description="Abort an upload and discard the data received so far",
+    responses={200: {"model": FileManagerUploadAbortResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+def abort_file_manager_upload(
+    upload_id: str,
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    return _get_file_manager_service().abort_upload(session_token=session_token, upload_id=upload_id)
+
+
 @router.get(
     "/files/download",
     summary="Download file",
-    description="Download a file from a selected Docker volume",
-    responses={200: {"description": "Binary file response"}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    description="Download a file from a selected Docker volume; a single byte range may be requested with the Range header",
+    responses={200: {"description": "Binary file response"}, 206: {"description": "Partial binary file response"}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 416: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
 )
 def download_file_manager_item(
     volume_id: str = Query(..., description="Docker volume name"),
     path: str = Query(..., description="Relative file path inside the selected volume"),
+    range_header: Optional[str] = Header(default=None, alias="Range"),
     session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
 ):
-    file_name, payload = _get_file_manager_service().download_file(
+    download = _get_file_manager_service().open_download(
         session_token=session_token,
         volume_id=volume_id,
         relative_path=path,
+        range_header=range_header,
     )
-    return Response(
-        content=payload,
+    return StreamingResponse(
+        download.chunks,
+        status_code=download.status_code,
         media_type="application/octet-stream",
-        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+        headers={**download.headers, "Content-Disposition": f'attachment; filename="{download.file_name}"'},
+    )
+
+
+@router.get(
+    "/files/disk-usage",
+    summary="Analyze volume disk usage",
+    description="Recursively calculate disk usage below a path in a selected Docker volume and return the largest directories and files; unchanged directories are served from an mtime-keyed cache",
+    responses={200: {"model": FileManagerDiskUsageResponse}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+def get_file_manager_disk_usage(
+    volume_id: str = Query(..., description="Docker volume name"),
+    path: str = Query("/", description="Relative directory path inside the selected volume"),
+    top: int = Query(DISK_USAGE_DEFAULT_TOP, ge=1, le=DISK_USAGE_MAX_TOP, description="Number of largest directories and files to return"),
+    refresh: bool = Query(False, description="Ignore cached directory totals and rescan everything"),
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    return _get_file_manager_service().get_disk_usage(
+        session_token=session_token,
+        volume_id=volume_id,
+        relative_path=path,
+        top=top,
+        refresh=refresh,
+    )
+
+
+@router.get(
+    "/files/disk-usage/stream",
+    summary="Stream volume disk usage",
+    description="Server-Sent Events variant of /files/disk-usage: a progress event per finished top-level directory, then a result (or error) event",
+    responses={200: {"description": "text/event-stream with progress, result and error events"}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+def stream_file_manager_disk_usage(
+    volume_id: str = Query(..., description="Docker volume name"),
+    path: str = Query("/", description="Relative directory path inside the selected volume"),
+    top: int = Query(DISK_USAGE_DEFAULT_TOP, ge=1, le=DISK_USAGE_MAX_TOP, description="Number of largest directories and files to return"),
+    refresh: bool = Query(False, description="Ignore cached directory totals and rescan everything"),
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    events = _get_file_manager_service().stream_disk_usage(
+        session_token=session_token,
+        volume_id=volume_id,
+        relative_path=path,
+        top=top,
+        refresh=refresh,
+    )
+    return StreamingResponse(
+        iter_sse_events(events, _disk_usage_event_data),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def _disk_usage_event_data(event: dict[str, Any]) -> Any:
+    if event.get("type") == "progress":
+        return event.get("entry")
+    if event.get("type") == "result":
+        return event.get("usage")
+    return {key: value for key, value in event.items() if key != "type"}
+
+
+@router.get(
+    "/files/search",
+    summary="Search file contents",
+    description="Server-Sent Events search of text file contents below a path in a selected Docker volume. Emits match events (with context lines) as they are found, progress events while scanning and a final done event; binary and oversized files are skipped. Closing the connection cancels the search.",
+    responses={200: {"description": "text/event-stream with match, progress, done and error events"}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+def search_file_manager_contents(
+    volume_id: str = Query(..., description="Docker volume name"),
+    query: str = Query(..., min_length=1, max_length=1024, description="Text to search for"),
+    path: str = Query("/", description="Relative directory path inside the selected volume"),
+    regex: bool = Query(False, description="Treat query as a regular expression"),
+    case_sensitive: bool = Query(False, description="Match case exactly"),
+    context: int = Query(0, ge=0, le=SEARCH_MAX_CONTEXT_LINES, description="Lines of context before and after each match"),
+    include: Optional[str] = Query(None, max_length=255, description="Only search files whose name matches this glob, e.g. *.conf"),
+    max_matches: int = Query(SEARCH_DEFAULT_MAX_MATCHES, ge=1, le=SEARCH_MAX_MATCHES, description="Stop after this many matches"),
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    options = ContentSearchOptions.from_params(query, regex, case_sensitive, context, include, max_matches)
+    events = _get_file_manager_service().search_files(
+        session_token=session_token,
+        volume_id=volume_id,
+        relative_path=path,
+        options=options,
+    )
+    return StreamingResponse(
+        iter_sse_events(events),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
     )
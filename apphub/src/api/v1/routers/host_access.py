@@ -1,5 +1,6 @@
 import asyncio
 import base64
+import codecs
 import json
 from io import BytesIO
 from typing import Optional
@@ -9,6 +10,7 @@ from fastapi.responses import StreamingResponse
 from uvicorn.protocols.utils import ClientDisconnected
 from websockets.exceptions import InvalidState
 
+from src.core.directory_listing import MAX_DIRECTORY_PAGE_SIZE, DirectoryPageRequest
 from src.core.exception import CustomException
 from src.schemas.errorResponse import ErrorResponse
 from src.schemas.hostAccess import (
@@ -155,9 +157,21 @@ def update_host_access_preferences(
 def list_host_access_tree(
     path: str = Query("/", description="Absolute host path"),
     profile_id: Optional[str] = Query(None, description="Saved host profile identifier"),
+    sort: str = Query("name", description="Sort field: name, size or modified; directories are always listed first"),
+    order: str = Query("asc", description="Sort order: asc or desc"),
+    name: Optional[str] = Query(None, description="Only list entries whose name contains this text (case-insensitive)"),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_DIRECTORY_PAGE_SIZE, description="Page size; omit to list every entry"),
+    include_details: bool = Query(True, description="Resolve owner/group names"),
     session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
 ):
-    return _get_host_access_service().list_directory(session_token=session_token, path=path, profile_id=profile_id)
+    page_request = DirectoryPageRequest.from_params(sort, order, name, cursor, limit, include_details)
+    return _get_host_access_service().list_directory(
+        session_token=session_token,
+        path=path,
+        profile_id=profile_id,
+        page_request=page_request,
+    )
 
 
 @router.get(
@@ -348,7 +362,6 @@ async def host_access_terminal_ws(websocket: WebSocket):
         rows = int(websocket.query_params.get("rows", "32"))
         attached = service.attach_terminal_session(session_token=session_token, session_id=session_id, cols=cols, rows=rows)
         profile = attached["profile"]
-        snapshot = str(attached.get("buffer") or "")
         output_cursor = int(attached.get("cursor") or 0)
     except CustomException as exc:
         await websocket.send_json({"type": "error", "message": exc.message, "details": exc.details})
@@ -359,32 +372,44 @@ async def host_access_terminal_ws(websocket: WebSocket):
         await websocket.close(code=1011)
         return
 
+    loop = asyncio.get_running_loop()
+    output_ready = asyncio.Event()
+
+    def notify_output():
+        try:
+            loop.call_soon_threadsafe(output_ready.set)
+        except RuntimeError:
+            pass
+
     async def pump_output():
+        # Output is pushed: the session's reader thread wakes this task instead of it polling.
+        # Replay of a reattached session starts at the oldest retained byte, like new output.
         cursor = output_cursor
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
         try:
             while True:
-                updates, next_cursor, closed = service.read_terminal_updates(session_id=session_id, after_cursor=cursor)
-                if updates:
-                    for payload in updates:
+                output_ready.clear()
+                payload, cursor, closed = service.read_terminal_updates(session_id=session_id, after_cursor=cursor)
+                if payload:
+                    text = decoder.decode(payload)
+                    if text:
                         try:
-                            await websocket.send_text(json.dumps({"type": "output", "session_id": session_id, "data": payload}))
+                            await websocket.send_text(json.dumps({"type": "output", "session_id": session_id, "data": text}))
                         except (RuntimeError, WebSocketDisconnect, ClientDisconnected, InvalidState, asyncio.CancelledError):
                             return
-                    cursor = next_cursor
                     continue
                 if closed:
                     break
-                await asyncio.sleep(0.02)
+                await output_ready.wait()
         finally:
             try:
                 await websocket.send_text(json.dumps({"type": "closed", "session_id": session_id}))
             except (RuntimeError, WebSocketDisconnect, ClientDisconnected, InvalidState, asyncio.CancelledError):
                 pass
 
-    output_task = asyncio.create_task(pump_output())
     await websocket.send_text(json.dumps({"type": "ready", "session_id": session_id, "cwd": profile["working_directory"], "username": profile["username"]}))
-    if snapshot:
-        await websocket.send_text(json.dumps({"type": "output", "session_id": session_id, "data": snapshot}))
+    unsubscribe_output = service.subscribe_terminal_output(session_id=session_id, listener=notify_output)
+    output_task = asyncio.create_task(pump_output())
     try:
         while True:
             payload = await websocket.receive_text()
@@ -409,5 +434,6 @@ async def host_access_terminal_ws(websocket: WebSocket):
     except WebSocketDisconnect:
         pass
     finally:
+        unsubscribe_output()
         output_task.cancel()
         service.detach_terminal_session(session_id=session_id)
@@ -1,6 +1,7 @@
 import asyncio
 import hashlib
 import json
+from datetime import datetime
 from typing import Any, Optional
 
 from fastapi import APIRouter, Cookie, Query, Request
@@ -9,7 +10,7 @@ from fastapi.responses import StreamingResponse
 
 from src.core.logger import logger
 from src.schemas.errorResponse import ErrorResponse
-from src.schemas.runtimeLogs import RuntimeLogsQuery, RuntimeLogsResponse, RuntimeLogsSourcesResponse
+from src.schemas.runtimeLogs import RuntimeLogsQuery, RuntimeLogsResponse, RuntimeLogsSearchQuery, RuntimeLogsSearchResponse, RuntimeLogsSourcesResponse
 from src.services.product_auth import PRODUCT_AUTH_COOKIE_NAME
 from src.services.runtime_logs import RuntimeLogsService
 
@@ -62,6 +63,27 @@ def get_runtime_logs(
     return _build_runtime_logs_response(session_token=session_token, query=query)
 
 
+@router.get(
+    "/logs/runtime/search",
+    summary="Search runtime console log history",
+    description="Query the on-disk runtime log index by time range, level, component and text, newest first. Pass next_cursor as before to page through older entries.",
+    responses={200: {"model": RuntimeLogsSearchResponse}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+def search_runtime_logs(
+    level: Optional[str] = Query(default=None, description="Severity filter: error, warning, info"),
+    keyword: Optional[str] = Query(default=None, description="Case-insensitive text filter"),
+    component: Optional[str] = Query(default=None, description="Component filter, e.g. platform-entrypoint"),
+    time_range: Optional[str] = Query(default=None, description="Time range filter: 15m, 1h, 6h, 24h, 7d"),
+    since: Optional[datetime] = Query(default=None, description="Only entries at or after this ISO 8601 time"),
+    until: Optional[datetime] = Query(default=None, description="Only entries before this ISO 8601 time"),
+    before: Optional[int] = Query(default=None, ge=1, description="Cursor from a previous page"),
+    limit: int = Query(default=200, ge=1, le=1000, description="Maximum number of entries per page"),
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    query = RuntimeLogsSearchQuery(level=level, keyword=keyword, component=component, time_range=time_range, since=since, until=until, before=before, limit=limit)
+    return _get_runtime_logs_service().search_runtime_logs(session_token=session_token, query=query)
+
+
 @router.get(
     "/logs/runtime/stream",
     summary="Stream runtime console logs",
@@ -82,41 +104,22 @@ async def stream_runtime_logs(
         refresh_seconds = 5.0
         stream_cursor = None
 
-        while True:
-            if await request.is_disconnected():
-                break
+        try:
+            while True:
+                if await request.is_disconnected():
+                    break
 
-            try:
-                if stream_cursor is None:
-                    entries, stream_cursor = _get_runtime_logs_service().open_runtime_logs_stream(session_token=session_token, query=query)
-                    response = RuntimeLogsResponse(
-                        source="runtime-console",
-                        level=query.level,
-                        keyword=query.keyword,
-                        time_range=query.time_range,
-                        limit=query.limit,
-                        entries=entries,
-                        cursor=entries[-1].id if entries else None,
-                    )
-                    payload = {
-                        "logs": jsonable_encoder(response),
-                        "refresh_hint_ms": int(refresh_seconds * 1000),
-                    }
-                    _digest, event_json = _serialize_stream_snapshot(payload)
-                    yield f"retry: {int(refresh_seconds * 1000)}\n"
-                    yield f"event: snapshot\ndata: {event_json}\n\n"
-                else:
-                    delta = _get_runtime_logs_service().poll_runtime_logs_stream(session_token=session_token, cursor=stream_cursor)
-                    if delta.snapshot is not None:
-                        refresh_seconds = 5.0
+                try:
+                    if stream_cursor is None:
+                        entries, stream_cursor = _get_runtime_logs_service().open_runtime_logs_stream(session_token=session_token, query=query)
                         response = RuntimeLogsResponse(
                             source="runtime-console",
                             level=query.level,
                             keyword=query.keyword,
                             time_range=query.time_range,
                             limit=query.limit,
-                            entries=delta.snapshot,
-                            cursor=delta.snapshot[-1].id if delta.snapshot else None,
+                            entries=entries,
+                            cursor=entries[-1].id if entries else None,
                         )
                         payload = {
                             "logs": jsonable_encoder(response),
@@ -125,29 +128,55 @@ async def stream_runtime_logs(
                         _digest, event_json = _serialize_stream_snapshot(payload)
                         yield f"retry: {int(refresh_seconds * 1000)}\n"
                         yield f"event: snapshot\ndata: {event_json}\n\n"
-                    elif delta.entries:
-                        refresh_seconds = 5.0
-                        payload = {
-                            "append": {
-                                "source": "runtime-console",
-                                "limit": query.limit,
-                                "entries": jsonable_encoder(delta.entries),
-                            },
-                            "refresh_hint_ms": int(refresh_seconds * 1000),
-                        }
-                        _digest, event_json = _serialize_stream_snapshot(payload)
-                        yield f"retry: {int(refresh_seconds * 1000)}\n"
-                        yield f"event: append\ndata: {event_json}\n\n"
                     else:
-                        refresh_seconds = min(refresh_seconds + 2.5, 15.0)
-                        yield ": keep-alive\n\n"
-            except Exception as exc:
-                logger.warning(f"Runtime logs stream failed: {exc}")
-                payload = json.dumps({"message": "Runtime logs stream refresh failed"}, separators=(",", ":"))
-                yield f"event: error\ndata: {payload}\n\n"
-                refresh_seconds = min(refresh_seconds + 2.5, 15.0)
-
-            await asyncio.sleep(refresh_seconds)
+                        delta = _get_runtime_logs_service().poll_runtime_logs_stream(session_token=session_token, cursor=stream_cursor)
+                        if delta.snapshot is not None:
+                            refresh_seconds = 5.0
+                            response = RuntimeLogsResponse(
+                                source="runtime-console",
+                                level=query.level,
+                                keyword=query.keyword,
+                                time_range=query.time_range,
+                                limit=query.limit,
+                                entries=delta.snapshot,
+                                cursor=delta.snapshot[-1].id if delta.snapshot else None,
+                            )
+                            payload = {
+                                "logs": jsonable_encoder(response),
+                                "refresh_hint_ms": int(refresh_seconds * 1000),
+                            }
+                            _digest, event_json = _serialize_stream_snapshot(payload)
+                            yield f"retry: {int(refresh_seconds * 1000)}\n"
+                            yield f"event: snapshot\ndata: {event_json}\n\n"
+                        elif delta.entries:
+                            refresh_seconds = 5.0
+                            payload = {
+                                "append": {
+                                    "source": "runtime-console",
+                                    "limit": query.limit,
+                                    "entries": jsonable_encoder(delta.entries),
+                                },
+                                "refresh_hint_ms": int(refresh_seconds * 1000),
+                            }
+                            _digest, event_json = _serialize_stream_snapshot(payload)
+                            yield f"retry: {int(refresh_seconds * 1000)}\n"
+                            yield f"event: append\ndata: {event_json}\n\n"
+                        else:
+                            refresh_seconds = min(refresh_seconds + 2.5, 15.0)
+                            yield ": keep-alive\n\n"
+                except Exception as exc:
+                    logger.warning(f"Runtime logs stream failed: {exc}")
+                    payload = json.dumps({"message": "Runtime logs stream refresh failed"}, separators=(",", ":"))
+                    yield f"event: error\ndata: {payload}\n\n"
+                    refresh_seconds = min(refresh_seconds + 2.5, 15.0)
+
+                if stream_cursor is None:
+                    await asyncio.sleep(refresh_seconds)
+                else:
+                    # Returns early as soon as the shared log tailer pushes new lines.
+                    await stream_cursor.subscription.wait(refresh_seconds)
+        finally:
+            _get_runtime_logs_service().close_runtime_logs_stream(stream_cursor)
 
     return StreamingResponse(
         event_generator(),
@@ -1,11 +1,14 @@
 from typing import Optional
 
 from fastapi import APIRouter, Cookie, Path, Query
+from fastapi.responses import StreamingResponse
 
-from src.core.exception import CustomException
+from src.core.content_search import SEARCH_DEFAULT_MAX_MATCHES, SEARCH_MAX_CONTEXT_LINES, SEARCH_MAX_MATCHES, ContentSearchOptions
+from src.core.directory_listing import MAX_DIRECTORY_PAGE_SIZE, DirectoryPageRequest
+from src.core.event_stream import iter_sse_events
 from src.schemas.appVolumeBrowse import AppVolumeBrowseContentResponse, AppVolumeBrowseTreeResponse
 from src.schemas.errorResponse import ErrorResponse
-from src.services.app_volume_browse import AppVolumeBrowseService
+from src.services.app_volume_browse import DIRECTORY_ITEM_LIMIT, AppVolumeBrowseService
 from src.services.product_auth import PRODUCT_AUTH_COOKIE_NAME
 
 
@@ -28,9 +31,15 @@ def browse_application_volume_tree(
     app_id: str = Path(..., min_length=1, max_length=256),
     volume_id: str = Path(..., min_length=1, max_length=256),
     path: str = Query("/", max_length=4096),
+    sort: str = Query("name", description="Sort field: name, size or modified; directories are always listed first"),
+    order: str = Query("asc", description="Sort order: asc or desc"),
+    name: Optional[str] = Query(None, max_length=256, description="Only list entries whose name contains this text (case-insensitive)"),
+    cursor: Optional[str] = Query(None, max_length=4096, description="next_cursor returned by the previous page"),
+    limit: int = Query(DIRECTORY_ITEM_LIMIT, ge=1, le=MAX_DIRECTORY_PAGE_SIZE, description="Page size"),
     session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
 ):
-    return _get_service().list_directory(session_token, app_id, volume_id, path)
+    page_request = DirectoryPageRequest.from_params(sort, order, name, cursor, limit)
+    return _get_service().list_directory(session_token, app_id, volume_id, path, page_request=page_request)
 
 
 @router.get(
@@ -46,4 +55,35 @@ def browse_application_volume_content(
     path: str = Query(..., min_length=1, max_length=4096),
     session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
 ):
-    return _get_service().read_text_file(session_token, app_id, volume_id, path)
\ No newline at end of file
+    return _get_service().read_text_file(session_token, app_id, volume_id, path)
+
+
+@router.get(
+    "/myapps/{app_id}/volumes/{volume_id}/browse/search",
+    summary="Search application volume file contents",
+    description="Server-Sent Events search of text file contents below a path in a volume mounted by the current application's running containers. Emits match events (with context lines), progress events and a final done event; binary and oversized files are skipped. Closing the connection cancels the search.",
+    responses={200: {"description": "text/event-stream with match, progress, done and error events"}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 403: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}, 422: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+def search_application_volume(
+    app_id: str = Path(..., min_length=1, max_length=256),
+    volume_id: str = Path(..., min_length=1, max_length=256),
+    query: str = Query(..., min_length=1, max_length=1024, description="Text to search for"),
+    path: str = Query("/", max_length=4096),
+    regex: bool = Query(False, description="Treat query as a regular expression, limited to the syntax Python and grep -E share"),
+    case_sensitive: bool = Query(False, description="Match case exactly"),
+    context: int = Query(0, ge=0, le=SEARCH_MAX_CONTEXT_LINES, description="Lines of context before and after each match"),
+    include: Optional[str] = Query(None, max_length=255, description="Only search files whose name matches this glob, e.g. *.conf"),
+    max_matches: int = Query(SEARCH_DEFAULT_MAX_MATCHES, ge=1, le=SEARCH_MAX_MATCHES, description="Stop after this many matches"),
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    options = ContentSearchOptions.from_params(query, regex, case_sensitive, context, include, max_matches)
+    events = _get_service().search_files(session_token, app_id, volume_id, path, options)
+    return StreamingResponse(
+        iter_sse_events(events),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -2,12 +2,12 @@ import asyncio
 import json
 from typing import Optional
 
-from fastapi import APIRouter, Cookie, Request
+from fastapi import APIRouter, Cookie, Query, Request
 from fastapi.responses import StreamingResponse
 
 from src.core.logger import logger
 from src.schemas.errorResponse import ErrorResponse
-from src.schemas.overview import OverviewResponse
+from src.schemas.overview import OverviewMetricsSeriesResponse, OverviewResponse
 from src.services.overview_service import OverviewService
 from src.services.overview_stream_cache import overview_stream_cache
 from src.services.product_auth import PRODUCT_AUTH_COOKIE_NAME
@@ -33,6 +33,20 @@ def get_overview(
     return overview_stream_cache.get_overview(session_token=session_token, force_refresh=True)
 
 
+@router.get(
+    "/overview/metrics",
+    summary="Get runtime metric history",
+    description="Return downsampled CPU, memory, network and disk I/O series recorded by the background metrics sampler, for dashboard sparklines.",
+    responses={200: {"model": OverviewMetricsSeriesResponse}, 400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+)
+def get_overview_metrics(
+    window: str = Query(default="1h", description="Series window: 1h or 24h"),
+    points: int = Query(default=60, ge=1, le=360, description="Number of points to downsample the window into"),
+    session_token: Optional[str] = Cookie(default=None, alias=PRODUCT_AUTH_COOKIE_NAME),
+):
+    return _get_overview_service().get_metrics_series(session_token=session_token, window=window, points=points)
+
+
 @router.get(
     "/overview/stream",
     summary="Stream homepage overview summary",
@@ -83,58 +83,65 @@ async def stream_service_logs(
         refresh_seconds = 5.0
         stream_cursor = None
 
-        while True:
-            if await request.is_disconnected():
-                break
-
-            try:
-                if stream_cursor is None:
-                    response, stream_cursor = _get_core_services_service().open_service_logs_stream(
-                        session_token=session_token,
-                        service_key=service_key,
-                        query=query,
-                    )
-                    payload = {
-                        "logs": jsonable_encoder(response),
-                        "refresh_hint_ms": int(refresh_seconds * 1000),
-                    }
-                    _digest, event_json = _serialize_stream_snapshot(payload)
-                    yield f"retry: {int(refresh_seconds * 1000)}\n"
-                    yield f"event: snapshot\ndata: {event_json}\n\n"
-                else:
-                    delta = _get_core_services_service().poll_service_logs_stream(session_token=session_token, cursor=stream_cursor)
-                    if delta.snapshot is not None:
-                        refresh_seconds = 5.0
+        try:
+            while True:
+                if await request.is_disconnected():
+                    break
+
+                try:
+                    if stream_cursor is None:
+                        response, stream_cursor = _get_core_services_service().open_service_logs_stream(
+                            session_token=session_token,
+                            service_key=service_key,
+                            query=query,
+                        )
                         payload = {
-                            "logs": jsonable_encoder(delta.snapshot),
+                            "logs": jsonable_encoder(response),
                             "refresh_hint_ms": int(refresh_seconds * 1000),
                         }
                         _digest, event_json = _serialize_stream_snapshot(payload)
                         yield f"retry: {int(refresh_seconds * 1000)}\n"
                         yield f"event: snapshot\ndata: {event_json}\n\n"
-                    elif delta.entries:
-                        refresh_seconds = 5.0
-                        payload = {
-                            "append": {
-                                "service": service_key,
-                                "limit": query.limit,
-                                "entries": jsonable_encoder(delta.entries),
-                            },
-                            "refresh_hint_ms": int(refresh_seconds * 1000),
-                        }
-                        _digest, event_json = _serialize_stream_snapshot(payload)
-                        yield f"retry: {int(refresh_seconds * 1000)}\n"
-                        yield f"event: append\ndata: {event_json}\n\n"
                     else:
-                        refresh_seconds = min(refresh_seconds + 2.5, 15.0)
-                        yield ": keep-alive\n\n"
-            except Exception as exc:
-                logger.warning(f"Service logs stream failed for {service_key}: {exc}")
-                payload = json.dumps({"message": "Service logs stream refresh failed"}, separators=(",", ":"))
-                yield f"event: error\ndata: {payload}\n\n"
-                refresh_seconds = min(refresh_seconds + 2.5, 15.0)
-
-            await asyncio.sleep(refresh_seconds)
+                        delta = _get_core_services_service().poll_service_logs_stream(session_token=session_token, cursor=stream_cursor)
+                        if delta.snapshot is not None:
+                            refresh_seconds = 5.0
+                            payload = {
+                                "logs": jsonable_encoder(delta.snapshot),
+                                "refresh_hint_ms": int(refresh_seconds * 1000),
+                            }
+                            _digest, event_json = _serialize_stream_snapshot(payload)
+                            yield f"retry: {int(refresh_seconds * 1000)}\n"
+                            yield f"event: snapshot\ndata: {event_json}\n\n"
+                        elif delta.entries:
+                            refresh_seconds = 5.0
+                            payload = {
+                                "append": {
+                                    "service": service_key,
+                                    "limit": query.limit,
+                                    "entries": jsonable_encoder(delta.entries),
+                                },
+                                "refresh_hint_ms": int(refresh_seconds * 1000),
+                            }
+                            _digest, event_json = _serialize_stream_snapshot(payload)
+                            yield f"retry: {int(refresh_seconds * 1000)}\n"
+                            yield f"event: append\ndata: {event_json}\n\n"
+                        else:
+                            refresh_seconds = min(refresh_seconds + 2.5, 15.0)
+                            yield ": keep-alive\n\n"
+                except Exception as exc:
+                    logger.warning(f"Service logs stream failed for {service_key}: {exc}")
+                    payload = json.dumps({"message": "Service logs stream refresh failed"}, separators=(",", ":"))
+                    yield f"event: error\ndata: {payload}\n\n"
+                    refresh_seconds = min(refresh_seconds + 2.5, 15.0)
+
+                if stream_cursor is None:
+                    await asyncio.sleep(refresh_seconds)
+                else:
+                    # Returns early as soon as the shared log tailer pushes new lines.
+                    await stream_cursor.subscription.wait(refresh_seconds)
+        finally:
+            _get_core_services_service().close_service_logs_stream(stream_cursor)
 
     return StreamingResponse(
         event_generator(),
@@ -1,12 +1,109 @@
+import threading
+from urllib.parse import urlparse
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.core.env_settings import env_float, env_int
+
+
+API_POOL_SIZE = env_int("WEBSOFT9_API_POOL_SIZE", 16, minimum=1)
+API_CONNECT_TIMEOUT = env_float("WEBSOFT9_API_CONNECT_TIMEOUT", 10.0, minimum=0.0)
+API_READ_TIMEOUT = env_float("WEBSOFT9_API_READ_TIMEOUT", 300.0, minimum=0.0)
+API_MAX_RETRIES = env_int("WEBSOFT9_API_MAX_RETRIES", 3, minimum=1)
+API_RETRY_BACKOFF = env_float("WEBSOFT9_API_RETRY_BACKOFF", 0.3, minimum=0.0)
+
+
+class APISessionPool:
+    """
+    Registry of shared requests sessions, one per API origin (scheme://host:port).
+
+    Every APIHelper pointing at the same origin reuses the same keep-alive connection pool,
+    so Portainer, Nginx Proxy Manager and Gitea calls no longer open a TCP connection per request.
+    Headers are never stored on the pooled session; they are passed per request by APIHelper.
+    """
+
+    _sessions = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls, base_url, pool_size=None, max_retries=None, backoff_factor=None):
+        """
+        Get the shared session for the origin of base_url, creating it on first use.
+
+        Args:
+            base_url (str): Base URL for API
+            pool_size (int): Maximum keep-alive connections kept for the origin
+            max_retries (int): Retries for connection errors and 502/503/504 on idempotent methods
+            backoff_factor (float): Exponential backoff factor between retries
+
+        Returns:
+            requests.Session: Shared session
+        """
+        key = cls._origin(base_url)
+        session = cls._sessions.get(key)
+        if session is not None:
+            return session
+
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                session = cls._create_session(
+                    pool_size or API_POOL_SIZE,
+                    API_MAX_RETRIES if max_retries is None else max_retries,
+                    API_RETRY_BACKOFF if backoff_factor is None else backoff_factor,
+                )
+                cls._sessions[key] = session
+            return session
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every pooled session and drop it from the registry.
+        """
+        with cls._lock:
+            sessions = list(cls._sessions.values())
+            cls._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    @staticmethod
+    def _origin(base_url):
+        parsed = urlparse(base_url or "")
+        if not parsed.scheme or not parsed.netloc:
+            return base_url or ""
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+    @staticmethod
+    def _create_session(pool_size, max_retries, backoff_factor):
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
 
 class APIHelper:
     """
     Helper class for making API calls
 
+    Requests go through a pooled keep-alive session shared by all helpers with the same origin.
+
     Attributes:
         base_url (str): Base URL for API
         headers (dict): Headers
+        timeout (tuple): Default (connect, read) timeout in seconds
 
     Methods:
         get(path: str, params: dict = None, headers: dict = None) -> Response: Get a resource
@@ -14,19 +111,24 @@ class APIHelper:
         put(path: str, params: dict = None, json: dict = None, headers: dict = None) -> Response: Update a resource
         delete(path: str, headers: dict = None) -> Response: Delete a resource
     """
-    def __init__(self, base_url, headers=None, verify=True):
+    def __init__(self, base_url, headers=None, verify=True, timeout=None, pool_size=None):
         """
         Initialize the APIHelper instance.
 
         Args:
             base_url (str): Base URL for API
             headers (dict): Headers
+            verify (bool): Verify TLS certificates
+            timeout (float | tuple): Default timeout, overridable per request
+            pool_size (int): Keep-alive pool size used when the origin session is first created
         """
         self.base_url = base_url
         self.headers = headers
         self.verify = verify
+        self.timeout = timeout if timeout is not None else (API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
+        self.session = APISessionPool.get_session(base_url, pool_size=pool_size)
 
-    def get(self, path, params=None, headers=None):
+    def get(self, path, params=None, headers=None, timeout=None):
         """
         Get a resource
 
@@ -34,14 +136,14 @@ class APIHelper:
             path (str): Path to resource
             params (dict): Query parameters
             headers (dict): Headers
+            timeout (float | tuple): Timeout for this request
 
         Returns:
             Response: Response from API
         """
-        url = f"{self.base_url}/{path}"
-        return requests.get(url, params=params, headers=self._merge_headers(headers), verify=self.verify)
+        return self._request("GET", path, params=params, headers=headers, timeout=timeout)
 
-    def post(self, path, params=None, json=None, headers=None):
+    def post(self, path, params=None, json=None, headers=None, timeout=None):
         """
         Create a resource
 
@@ -50,14 +152,14 @@ class APIHelper:
             params (dict): Query parameters
             json (dict): JSON payload
             headers (dict): Headers
+            timeout (float | tuple): Timeout for this request
 
         Returns:
             Response: Response from API
         """
-        url = f"{self.base_url}/{path}"
-        return requests.post(url, params=params, json=json, headers=self._merge_headers(headers), verify=self.verify)
+        return self._request("POST", path, params=params, json=json, headers=headers, timeout=timeout)
 
-    def put(self, path, params=None, json=None, headers=None):
+    def put(self, path, params=None, json=None, headers=None, timeout=None):
         """
         Update a resource
 
@@ -66,26 +168,38 @@ class APIHelper:
             params (dict): Query parameters
             json (dict): JSON payload
             headers (dict): Headers
-        
+            timeout (float | tuple): Timeout for this request
+
         Returns:
             Response: Response from API
         """
-        url = f"{self.base_url}/{path}"
-        return requests.put(url, params=params, json=json, headers=self._merge_headers(headers), verify=self.verify)
+        return self._request("PUT", path, params=params, json=json, headers=headers, timeout=timeout)
 
-    def delete(self, path,params=None, headers=None):
+    def delete(self, path, params=None, headers=None, timeout=None):
         """
         Delete a resource
 
         Args:
             path (str): Path to resource
             headers (dict): Headers
-        
+            timeout (float | tuple): Timeout for this request
+
         Returns:
             Response: Response from API
         """
+        return self._request("DELETE", path, params=params, headers=headers, timeout=timeout)
+
+    def _request(self, method, path, params=None, json=None, headers=None, timeout=None):
         url = f"{self.base_url}/{path}"
-        return requests.delete(url, params=params, headers=self._merge_headers(headers), verify=self.verify)
+        return self.session.request(
+            method,
+            url,
+            params=params,
+            json=json,
+            headers=self._merge_headers(headers),
+            verify=self.verify,
+            timeout=self.timeout if timeout is None else timeout,
+        )
 
     def _merge_headers(self, headers):
         """
@@ -99,4 +213,4 @@ class APIHelper:
         """
         if self.headers and headers:
             return {**self.headers, **headers}
-        return self.headers or headers
\ No newline at end of file
+        return self.headers or headers
@@ -0,0 +1,261 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    name: str
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    loads: int
+    load_errors: int
+    evictions: int
+    expirations: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "tags")
+
+    def __init__(self, value: Any, expires_at: float, tags: frozenset):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tags
+
+
+class _InFlightLoad:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-key TTLs.
+
+    Attributes:
+        name (str): Cache name, reported in stats
+        max_entries (int): Maximum number of entries before least-recently-used ones are evicted
+        default_ttl (float): TTL in seconds used when set/get_or_load are called without one
+
+    Methods:
+        get(key, default): Get a live value
+        set(key, value, ttl, tags, generation): Store a value, unless an invalidation happened since generation
+        generation(): Counter bumped by every invalidation, for callers that load outside get_or_load
+        get_or_load(key, loader, ttl, tags): Get a value, loading it once for all concurrent callers on a miss
+        invalidate(key): Drop one key
+        invalidate_tag(tag): Drop every key stored with the tag
+        clear(): Drop everything
+        stats(): Hit/miss/eviction counters
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, default_ttl: float = 300.0):
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.default_ttl = float(default_ttl)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Any, _Entry]" = OrderedDict()
+        self._tag_index: dict[str, set] = {}
+        self._in_flight: dict[Any, _InFlightLoad] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._load_errors = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._get_live_locked(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: Any,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Store value under key and return whether it was stored.
+
+        Callers that load a value themselves pass the generation() read before the load; if any
+        invalidation happened in between, the value may already be stale and is not stored.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._set_locked(key, value, ttl, tags)
+            return True
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get_or_load(self, key: Any, loader: Callable[[], Any], ttl: Optional[float] = None, tags: Iterable[str] = ()) -> Any:
+        """
+        Return the cached value for key, or call loader to produce it.
+
+        Concurrent misses on the same key wait for a single loader call instead of all loading.
+        Loader exceptions are re-raised to every waiter and nothing is cached.
+        """
+        with self._lock:
+            entry = self._get_live_locked(key)
+            if entry is not None:
+                self._hits += 1
+                return entry.value
+            self._misses += 1
+            in_flight = self._in_flight.get(key)
+            owner = in_flight is None
+            if owner:
+                in_flight = _InFlightLoad()
+                self._in_flight[key] = in_flight
+
+        if not owner:
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.value
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            with self._lock:
+                self._load_errors += 1
+                self._in_flight.pop(key, None)
+            in_flight.error = exc
+            in_flight.done.set()
+            raise
+
+        with self._lock:
+            self._loads += 1
+            # An invalidation during the load removes the in-flight marker; don't cache a value
+            # that may already be stale in that case.
+            if self._in_flight.get(key) is in_flight:
+                self._set_locked(key, value, ttl, tags)
+                self._in_flight.pop(key, None)
+        in_flight.value = value
+        in_flight.done.set()
+        return value
+
+    def invalidate(self, key: Any) -> bool:
+        with self._lock:
+            self._generation += 1
+            self._in_flight.pop(key, None)
+            return self._remove_locked(key)
+
+    def invalidate_tag(self, tag: str) -> int:
+        with self._lock:
+            self._generation += 1
+            keys = list(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._in_flight.pop(key, None)
+                self._remove_locked(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tag_index.clear()
+            self._in_flight.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                name=self.name,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                loads=self._loads,
+                load_errors=self._load_errors,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            return self._get_live_locked(key) is not None
+
+    def _get_live_locked(self, key: Any) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove_locked(key)
+            self._expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set_locked(self, key: Any, value: Any, ttl: Optional[float], tags: Iterable[str]) -> None:
+        self._remove_locked(key)
+        entry_ttl = self.default_ttl if ttl is None else float(ttl)
+        entry = _Entry(value, time.monotonic() + entry_ttl, frozenset(tags or ()))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove_locked(oldest_key)
+            self._evictions += 1
+
+    def _remove_locked(self, key: Any) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    self._tag_index.pop(tag, None)
+        return True
+
+
+_registry: dict[str, TTLCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name: str, max_entries: int = 256, default_ttl: float = 300.0) -> TTLCache:
+    """
+    Get the process-wide cache registered under name, creating it on first use.
+
+    Modules that must share a cache without importing each other (a writer that invalidates and
+    a reader that loads) look it up by name; size and TTL come from whichever caller creates it.
+    """
+    with _registry_lock:
+        cache = _registry.get(name)
+        if cache is None:
+            cache = TTLCache(name, max_entries=max_entries, default_ttl=default_ttl)
+            _registry[name] = cache
+        return cache
+
+
+def get_all_cache_stats() -> list[CacheStats]:
+    with _registry_lock:
+        caches = list(_registry.values())
+    return [cache.stats() for cache in caches]
@@ -0,0 +1,238 @@
+import fnmatch
+import os
+import re
+import stat
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from src.core.exception import CustomException
+
+
+SEARCH_MAX_CONTEXT_LINES = 5
+SEARCH_DEFAULT_MAX_MATCHES = 500
+SEARCH_MAX_MATCHES = 5000
+SEARCH_DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+SEARCH_MAX_FILE_BYTES = 32 * 1024 * 1024
+SEARCH_TIME_LIMIT_SECONDS = 120.0
+# Longer lines are cut in results; matching still sees the whole line.
+SEARCH_MAX_LINE_CHARS = 1000
+SEARCH_BINARY_SNIFF_BYTES = 8192
+SEARCH_PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class ContentSearchOptions:
+    """
+    What to look for and how far to look.
+
+    Attributes:
+        query (str): Literal text, or a Python regular expression when regex is set
+        regex (bool): Treat query as a regular expression
+        case_sensitive (bool): Match case exactly
+        context (int): Lines of context returned before and after each match
+        include (str): Optional file name glob, e.g. ``*.conf``
+        max_matches (int): Stop after this many matches
+        max_file_bytes (int): Larger files are skipped
+    """
+
+    query: str
+    regex: bool = False
+    case_sensitive: bool = False
+    context: int = 0
+    include: str = ""
+    max_matches: int = SEARCH_DEFAULT_MAX_MATCHES
+    max_file_bytes: int = SEARCH_DEFAULT_MAX_FILE_BYTES
+
+    @classmethod
+    def from_params(
+        cls,
+        query: Optional[str],
+        regex: bool = False,
+        case_sensitive: bool = False,
+        context: int = 0,
+        include: Optional[str] = None,
+        max_matches: Optional[int] = None,
+        max_file_bytes: Optional[int] = None,
+    ) -> "ContentSearchOptions":
+        normalized_query = str(query or "")
+        if not normalized_query.strip():
+            raise CustomException(400, "Invalid Request", "A search query is required")
+        if "\n" in normalized_query or "\x00" in normalized_query:
+            raise CustomException(400, "Invalid Request", "The search query must be a single line")
+        normalized_include = str(include or "").strip()
+        if "/" in normalized_include:
+            raise CustomException(400, "Invalid Request", "include must be a file name pattern")
+        options = cls(
+            query=normalized_query,
+            regex=bool(regex),
+            case_sensitive=bool(case_sensitive),
+            context=max(0, min(int(context or 0), SEARCH_MAX_CONTEXT_LINES)),
+            include=normalized_include,
+            max_matches=max(1, min(int(max_matches or SEARCH_DEFAULT_MAX_MATCHES), SEARCH_MAX_MATCHES)),
+            max_file_bytes=max(1, min(int(max_file_bytes or SEARCH_DEFAULT_MAX_FILE_BYTES), SEARCH_MAX_FILE_BYTES)),
+        )
+        options.compile()
+        return options
+
+    def compile(self) -> "re.Pattern[str]":
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        try:
+            return re.compile(self.query if self.regex else re.escape(self.query), flags)
+        except re.error as exc:
+            raise CustomException(400, "Invalid Request", f"Invalid regular expression: {exc}")
+
+    def require_posix_compatible(self) -> None:
+        """
+        Reject regex syntax that Python's re and ``grep -E`` read differently.
+
+        Searches that run grep inside application containers accept only the syntax both
+        dialects share: no backslash classes or anchors (\\d, \\w, \\b, ...), no ``(?...)``
+        groups, no lazy or possessive quantifiers and no backslashes or POSIX classes inside
+        brackets. Literal queries are always compatible.
+        """
+        if not self.regex:
+            return
+        query = self.query
+        index = 0
+        in_bracket = False
+        while index < len(query):
+            char = query[index]
+            following = query[index + 1:index + 2]
+            if in_bracket:
+                if char == "\\" or (char == "[" and following in {":", ".", "="}):
+                    raise self._incompatible_pattern("escapes and POSIX classes inside [...] are not supported")
+                if char == "]":
+                    in_bracket = False
+                index += 1
+                continue
+            if char == "\\":
+                if following.isalnum():
+                    raise self._incompatible_pattern(f"\\{following} is not supported; use a bracket expression such as [0-9]")
+                index += 2
+                continue
+            if char == "[":
+                in_bracket = True
+                index += 1
+                # A leading ^ negates, and a ] right after the opening bracket is literal.
+                if query[index:index + 1] == "^":
+                    index += 1
+                if query[index:index + 1] == "]":
+                    index += 1
+                continue
+            if char == "(" and following == "?":
+                raise self._incompatible_pattern("(?...) groups are not supported")
+            if char in "*+?}" and following in {"?", "+"}:
+                raise self._incompatible_pattern("lazy and possessive quantifiers are not supported")
+            index += 1
+
+    @staticmethod
+    def _incompatible_pattern(reason: str) -> CustomException:
+        return CustomException(400, "Invalid Request", f"Unsupported regular expression for application volume search: {reason}")
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "query": self.query,
+            "regex": self.regex,
+            "case_sensitive": self.case_sensitive,
+            "context": self.context,
+            "include": self.include,
+            "max_matches": self.max_matches,
+            "max_file_bytes": self.max_file_bytes,
+        }
+
+
+def search_tree(
+    start_path: str,
+    options: ContentSearchOptions,
+    *,
+    display_path: Callable[[str], str],
+    time_limit_seconds: float = SEARCH_TIME_LIMIT_SECONDS,
+) -> Iterator[dict[str, Any]]:
+    """
+    Search text files below start_path and yield events as they are found.
+
+    Events are ``match`` (path, line_number, line, before, after), periodic ``progress`` and a
+    final ``done`` with the counters. Symlinks are not followed; files that are too large or
+    contain NUL bytes are skipped. The generator does no work ahead of its consumer, so closing
+    it cancels the search.
+
+    The files helper script carries a stdlib-only copy of this search for helper-backed volumes.
+    """
+    pattern = options.compile()
+    started = time.monotonic()
+    last_progress = started
+    counters = {"files_scanned": 0, "files_skipped": 0, "matches": 0}
+    truncated = False
+    timed_out = False
+
+    for directory, directory_names, file_names in os.walk(start_path):
+        directory_names.sort()
+        for file_name in sorted(file_names):
+            if options.include and not fnmatch.fnmatch(file_name, options.include):
+                continue
+            file_path = os.path.join(directory, file_name)
+            try:
+                file_stat = os.lstat(file_path)
+            except OSError:
+                counters["files_skipped"] += 1
+                continue
+            if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size > options.max_file_bytes:
+                counters["files_skipped"] += 1
+                continue
+            try:
+                for match in _search_file(file_path, pattern, options.context):
+                    counters["matches"] += 1
+                    yield {"type": "match", "path": display_path(file_path), **match}
+                    if counters["matches"] >= options.max_matches:
+                        truncated = True
+                        break
+            except _BinaryFile:
+                counters["files_skipped"] += 1
+                continue
+            except OSError:
+                counters["files_skipped"] += 1
+                continue
+            counters["files_scanned"] += 1
+            now = time.monotonic()
+            if truncated:
+                break
+            if now - started > time_limit_seconds:
+                timed_out = True
+                break
+            if now - last_progress >= SEARCH_PROGRESS_INTERVAL_SECONDS:
+                last_progress = now
+                yield {"type": "progress", **counters}
+        if truncated or timed_out:
+            break
+
+    yield {"type": "done", **counters, "truncated": truncated, "timed_out": timed_out}
+
+
+class _BinaryFile(Exception):
+    pass
+
+
+def _search_file(file_path: str, pattern: "re.Pattern[str]", context: int) -> Iterator[dict[str, Any]]:
+    with open(file_path, "rb") as handle:
+        if b"\x00" in handle.read(SEARCH_BINARY_SNIFF_BYTES):
+            raise _BinaryFile(file_path)
+        handle.seek(0)
+        before: deque = deque(maxlen=context)
+        pending: list[dict[str, Any]] = []
+        for line_number, raw_line in enumerate(handle, start=1):
+            line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+            shown = line[:SEARCH_MAX_LINE_CHARS]
+            for match in pending:
+                match["after"].append(shown)
+            while pending and len(pending[0]["after"]) >= context:
+                yield pending.pop(0)
+            if pattern.search(line):
+                match = {"line_number": line_number, "line": shown, "before": list(before), "after": []}
+                if context:
+                    pending.append(match)
+                else:
+                    yield match
+            before.append(shown)
+        yield from pending
@@ -0,0 +1,158 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from src.core.exception import CustomException
+
+
+DIRECTORY_SORT_FIELDS = ("name", "size", "modified")
+DIRECTORY_SORT_ORDERS = ("asc", "desc")
+MAX_DIRECTORY_PAGE_SIZE = 1000
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class DirectoryPageRequest:
+    """
+    Sort, filter and paging options for a directory listing.
+
+    Attributes:
+        sort (str): One of DIRECTORY_SORT_FIELDS; directories always come first
+        order (str): asc or desc
+        name_filter (str): Case-insensitive substring the entry name must contain
+        cursor (str): Opaque next_cursor of the previous page
+        limit (int): Page size; None returns every remaining entry
+        include_details (bool): Whether owner/group labels and editability are resolved
+    """
+
+    sort: str = "name"
+    order: str = "asc"
+    name_filter: str = ""
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
+    include_details: bool = True
+
+    @classmethod
+    def from_params(
+        cls,
+        sort: Optional[str] = None,
+        order: Optional[str] = None,
+        name_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        include_details: Optional[bool] = None,
+    ) -> "DirectoryPageRequest":
+        normalized_sort = str(sort or "name").strip().lower()
+        normalized_order = str(order or "asc").strip().lower()
+        if normalized_sort not in DIRECTORY_SORT_FIELDS:
+            raise CustomException(400, "Invalid Request", f"sort must be one of: {', '.join(DIRECTORY_SORT_FIELDS)}")
+        if normalized_order not in DIRECTORY_SORT_ORDERS:
+            raise CustomException(400, "Invalid Request", "order must be asc or desc")
+        if limit is not None and not 1 <= int(limit) <= MAX_DIRECTORY_PAGE_SIZE:
+            raise CustomException(400, "Invalid Request", f"limit must be between 1 and {MAX_DIRECTORY_PAGE_SIZE}")
+        return cls(
+            sort=normalized_sort,
+            order=normalized_order,
+            name_filter=str(name_filter or "").strip(),
+            cursor=str(cursor or "").strip() or None,
+            limit=int(limit) if limit is not None else None,
+            include_details=True if include_details is None else bool(include_details),
+        )
+
+    @property
+    def needs_stat(self) -> bool:
+        """Whether ordering needs size/mtime of every entry, not only of the returned page."""
+        return self.sort != "name"
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "sort": self.sort,
+            "order": self.order,
+            "name_filter": self.name_filter,
+            "cursor": self.cursor,
+            "limit": self.limit,
+            "include_details": self.include_details,
+        }
+
+
+@dataclass(frozen=True)
+class DirectoryPage:
+    entries: list
+    next_cursor: Optional[str]
+    total_items: int
+
+
+def paginate_directory_entries(
+    entries: Sequence[T],
+    page_request: DirectoryPageRequest,
+    *,
+    name: Callable[[T], str],
+    is_directory: Callable[[T], bool],
+    size: Optional[Callable[[T], int]] = None,
+    modified: Optional[Callable[[T], float]] = None,
+) -> DirectoryPage:
+    """
+    Filter, sort and cut one page out of entries.
+
+    The cursor is the sort key of the last returned entry, so pages stay consistent when entries
+    are added or removed between requests. size/modified accessors are only called when the
+    requested sort needs them.
+    """
+    needle = page_request.name_filter.lower()
+    keyed = [
+        (_sort_key(entry, page_request.sort, name, is_directory, size, modified), entry)
+        for entry in entries
+        if not needle or needle in name(entry).lower()
+    ]
+    descending = page_request.order == "desc"
+    directories = sorted((item for item in keyed if item[0][0] == 0), key=lambda item: item[0], reverse=descending)
+    files = sorted((item for item in keyed if item[0][0] == 1), key=lambda item: item[0], reverse=descending)
+    ordered = directories + files
+
+    start = 0
+    if page_request.cursor:
+        cursor_key = _decode_cursor(page_request.cursor, page_request)
+        start = next((index for index, (key, _) in enumerate(ordered) if _is_after(key, cursor_key, descending)), len(ordered))
+
+    end = len(ordered) if page_request.limit is None else min(start + page_request.limit, len(ordered))
+    page = ordered[start:end]
+    next_cursor = _encode_cursor(page[-1][0], page_request) if page and end < len(ordered) else None
+    return DirectoryPage(entries=[entry for _, entry in page], next_cursor=next_cursor, total_items=len(ordered))
+
+
+def _sort_key(entry, sort, name, is_directory, size, modified) -> tuple:
+    entry_name = name(entry)
+    rank = 0 if is_directory(entry) else 1
+    if sort == "size":
+        return (rank, int(size(entry) or 0) if size else 0, entry_name.lower(), entry_name)
+    if sort == "modified":
+        return (rank, float(modified(entry) or 0) if modified else 0.0, entry_name.lower(), entry_name)
+    return (rank, entry_name.lower(), entry_name)
+
+
+def _is_after(key: tuple, cursor_key: tuple, descending: bool) -> bool:
+    # Directories stay ahead of files in both orders; only the rest of the key flips.
+    if key[0] != cursor_key[0]:
+        return key[0] > cursor_key[0]
+    return key[1:] < cursor_key[1:] if descending else key[1:] > cursor_key[1:]
+
+
+def _encode_cursor(key: tuple, page_request: DirectoryPageRequest) -> str:
+    payload = {"k": list(key), "s": page_request.sort, "o": page_request.order, "f": page_request.name_filter}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, page_request: DirectoryPageRequest) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        key = tuple(payload["k"])
+        matches = (payload["s"], payload["o"], payload["f"]) == (page_request.sort, page_request.order, page_request.name_filter)
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise CustomException(400, "Invalid Request", "cursor is not valid")
+    if not matches or len(key) != (3 if page_request.sort == "name" else 4):
+        raise CustomException(400, "Invalid Request", "cursor does not match the requested sort or filter")
+    return key
@@ -0,0 +1,277 @@
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from src.core.env_settings import env_float, env_int
+
+
+DISK_USAGE_DEFAULT_TOP = 20
+DISK_USAGE_MAX_TOP = 100
+DISK_USAGE_WORKERS = env_int("WEBSOFT9_FILES_DISK_USAGE_WORKERS", 4, minimum=1)
+# Directories whose mtime is unchanged reuse their cached file sizes for this long; files that
+# grow in place do not touch the directory mtime, so this bounds how stale a subtotal can get.
+DISK_USAGE_CACHE_MAX_AGE_SECONDS = env_float("WEBSOFT9_FILES_DISK_USAGE_CACHE_SECONDS", 600.0, minimum=1.0)
+DISK_USAGE_CACHE_MAX_NODES = 200000
+
+
+def allocated_bytes(entry_stat: os.stat_result) -> int:
+    """Bytes actually allocated on disk (what ``du`` reports), falling back to the apparent size."""
+    blocks = getattr(entry_stat, "st_blocks", None)
+    return blocks * 512 if blocks is not None else entry_stat.st_size
+
+
+@dataclass
+class _UsageNode:
+    mtime_ns: int
+    scanned_at: float
+    bytes: int
+    files: int
+    children: list[str]
+    top_files: list[tuple[int, str]]
+
+
+@dataclass
+class _UsageFrame:
+    path: str
+    total: int
+    files: int
+    directories: int
+    pending: list[str]
+
+
+class DiskUsageCancelled(Exception):
+    """Raised by DiskUsageScanner.scan() once its cancel event is set."""
+
+
+@dataclass
+class _UsageCollector:
+    top: int
+    errors: int = 0
+    scanned: int = 0
+    reused: int = 0
+    top_files: list[tuple[int, str]] = field(default_factory=list)
+    top_directories: list[tuple[int, str]] = field(default_factory=list)
+
+    def push(self, heap: list[tuple[int, str]], item: tuple[int, str]) -> None:
+        if len(heap) < self.top:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def merge(self, other: "_UsageCollector") -> None:
+        self.errors += other.errors
+        self.scanned += other.scanned
+        self.reused += other.reused
+        for item in other.top_files:
+            self.push(self.top_files, item)
+        for item in other.top_directories:
+            self.push(self.top_directories, item)
+
+
+class DiskUsageScanner:
+    """
+    Recursive disk usage of a directory tree, like ``du -x``.
+
+    Every directory's direct files are summed once and cached with the directory's mtime; later
+    scans only re-read directories whose mtime changed (or whose entry is older than
+    max_age_seconds) and reuse the cached subtotals for the rest. The first level below the
+    scanned path is walked by a bounded thread pool, and on_progress receives each finished
+    subtree so callers can stream partial results. Setting the cancel event stops every walker
+    at its next directory and makes scan() raise DiskUsageCancelled.
+
+    The files helper script carries a stdlib-only copy of this walker for Docker volumes that
+    are only reachable through a helper container.
+    """
+
+    def __init__(
+        self,
+        max_age_seconds: float = DISK_USAGE_CACHE_MAX_AGE_SECONDS,
+        workers: int = DISK_USAGE_WORKERS,
+        max_nodes: int = DISK_USAGE_CACHE_MAX_NODES,
+    ):
+        self.max_age_seconds = max_age_seconds
+        self.workers = workers
+        self.max_nodes = max_nodes
+        self._lock = threading.Lock()
+        self._cache: dict[str, _UsageNode] = {}
+
+    def scan(
+        self,
+        path: str,
+        *,
+        display_path: Callable[[str], str],
+        top: int = DISK_USAGE_DEFAULT_TOP,
+        refresh: bool = False,
+        on_progress: Optional[Callable[[dict[str, Any]], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> dict[str, Any]:
+        """
+        Scan path and return totals, per-child subtotals and the top largest directories and files.
+
+        display_path maps absolute paths to the paths reported to the caller.
+        """
+        top = max(1, min(int(top), DISK_USAGE_MAX_TOP))
+        root_stat = os.stat(path, follow_symlinks=False)
+        collector = _UsageCollector(top=top)
+        root_node = self._load_node(path, root_stat, refresh, collector)
+        totals = [allocated_bytes(root_stat) + root_node.bytes, root_node.files, 0]
+        for size, name in root_node.top_files:
+            collector.push(collector.top_files, (size, os.path.join(path, name)))
+
+        children = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="disk-usage") as executor:
+            futures = {
+                executor.submit(self._scan_subtree, os.path.join(path, name), root_stat.st_dev, refresh, top, cancel): name
+                for name in root_node.children
+            }
+            for future in as_completed(futures):
+                child_path = os.path.join(path, futures[future])
+                child_bytes, child_files, child_directories, child_collector = future.result()
+                collector.merge(child_collector)
+                if child_collector.scanned + child_collector.reused == 0:
+                    continue
+                totals[0] += child_bytes
+                totals[1] += child_files
+                totals[2] += 1 + child_directories
+                child = {
+                    "name": futures[future],
+                    "path": display_path(child_path),
+                    "bytes": child_bytes,
+                    "files": child_files,
+                    "directories": child_directories,
+                }
+                children.append(child)
+                if on_progress is not None:
+                    on_progress(child)
+
+        return {
+            "path": display_path(path),
+            "bytes": totals[0],
+            "files": totals[1],
+            "directories": totals[2],
+            "children": sorted(children, key=lambda item: (-item["bytes"], item["name"])),
+            "top_directories": [{"path": display_path(item), "bytes": size} for size, item in sorted(collector.top_directories, reverse=True)],
+            "top_files": [{"path": display_path(item), "bytes": size} for size, item in sorted(collector.top_files, reverse=True)],
+            "scanned_directories": collector.scanned,
+            "cached_directories": collector.reused,
+            "errors": collector.errors,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _scan_subtree(
+        self,
+        path: str,
+        device: int,
+        refresh: bool,
+        top: int,
+        cancel: Optional[threading.Event],
+    ) -> tuple[int, int, int, _UsageCollector]:
+        collector = _UsageCollector(top=top)
+        total, files, directories = self._scan_directory(path, device, refresh, collector, cancel)
+        return total, files, directories, collector
+
+    def _scan_directory(
+        self,
+        path: str,
+        device: int,
+        refresh: bool,
+        collector: _UsageCollector,
+        cancel: Optional[threading.Event] = None,
+    ) -> tuple[int, int, int]:
+        # Post-order walk with an explicit stack, so deeply nested trees cannot exhaust the
+        # interpreter's recursion limit. A frame is finished once its pending children are walked.
+        root = self._enter_directory(path, device, refresh, collector)
+        if root is None:
+            return 0, 0, 0
+        stack = [root]
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise DiskUsageCancelled(path)
+            frame = stack[-1]
+            if frame.pending:
+                child = self._enter_directory(os.path.join(frame.path, frame.pending.pop()), device, refresh, collector)
+                if child is not None:
+                    stack.append(child)
+                else:
+                    frame.directories += 1
+                continue
+            stack.pop()
+            collector.push(collector.top_directories, (frame.total, frame.path))
+            if not stack:
+                return frame.total, frame.files, frame.directories
+            parent = stack[-1]
+            parent.total += frame.total
+            parent.files += frame.files
+            parent.directories += 1 + frame.directories
+
+    def _enter_directory(self, path: str, device: int, refresh: bool, collector: _UsageCollector) -> Optional[_UsageFrame]:
+        try:
+            dir_stat = os.stat(path, follow_symlinks=False)
+        except OSError:
+            collector.errors += 1
+            return None
+        if dir_stat.st_dev != device:
+            # Stay on one file system, like du -x.
+            return None
+        node = self._load_node(path, dir_stat, refresh, collector)
+        for size, name in node.top_files:
+            collector.push(collector.top_files, (size, os.path.join(path, name)))
+        # Reversed so that popping from the end walks the children in directory order.
+        return _UsageFrame(path, allocated_bytes(dir_stat) + node.bytes, node.files, 0, list(reversed(node.children)))
+
+    def _load_node(self, path: str, dir_stat: os.stat_result, refresh: bool, collector: _UsageCollector) -> _UsageNode:
+        now = time.monotonic()
+        with self._lock:
+            node = self._cache.get(path)
+        if (
+            node is not None
+            and not refresh
+            and node.mtime_ns == dir_stat.st_mtime_ns
+            and now - node.scanned_at <= self.max_age_seconds
+        ):
+            collector.reused += 1
+            return node
+
+        own_bytes = 0
+        files = 0
+        children: list[str] = []
+        sizes: list[tuple[int, str]] = []
+        try:
+            with os.scandir(path) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            children.append(entry.name)
+                            continue
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        collector.errors += 1
+                        continue
+                    size = allocated_bytes(entry_stat)
+                    own_bytes += size
+                    files += 1
+                    sizes.append((size, entry.name))
+        except OSError:
+            collector.errors += 1
+
+        node = _UsageNode(
+            mtime_ns=dir_stat.st_mtime_ns,
+            scanned_at=now,
+            bytes=own_bytes,
+            files=files,
+            children=children,
+            top_files=heapq.nlargest(DISK_USAGE_MAX_TOP, sizes),
+        )
+        with self._lock:
+            if len(self._cache) >= self.max_nodes:
+                self._cache.clear()
+            self._cache[path] = node
+        collector.scanned += 1
+        return node
@@ -0,0 +1,17 @@
+import os
+
+
+def env_int(name: str, default: int, *, minimum: int) -> int:
+    """Integer setting from the environment, at least minimum; unparsable values fall back to default."""
+    try:
+        return max(minimum, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float, *, minimum: float) -> float:
+    """Float setting from the environment, at least minimum; unparsable values fall back to default."""
+    try:
+        return max(minimum, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
@@ -0,0 +1,33 @@
+import json
+from typing import Any, Callable, Iterator, Optional
+
+from src.core.exception import CustomException
+
+
+def iter_sse_events(
+    events: Iterator[dict[str, Any]],
+    event_data: Optional[Callable[[dict[str, Any]], Any]] = None,
+) -> Iterator[str]:
+    """
+    Frame service events (``{"type": ..., **fields}``) as Server-Sent Events.
+
+    ``heartbeat`` events become keep-alive comments. event_data picks what an event sends as its
+    data; by default every field except ``type``. A CustomException raised by the producer ends
+    the stream with an ``error`` event, and the producer is closed when the client goes away so
+    the work behind it stops.
+    """
+    try:
+        for event in events:
+            event_type = event.get("type")
+            if event_type == "heartbeat":
+                yield ": keep-alive\n\n"
+                continue
+            data = event_data(event) if event_data is not None else {key: value for key, value in event.items() if key != "type"}
+            yield f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+    except CustomException as exc:
+        payload = json.dumps({"status_code": exc.status_code, "message": exc.message, "details": exc.details}, separators=(",", ":"))
+        yield f"event: error\ndata: {payload}\n\n"
+    finally:
+        close = getattr(events, "close", None)
+        if close is not None:
+            close()
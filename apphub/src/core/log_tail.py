@@ -0,0 +1,154 @@
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, Union
+
+
+LOG_TAIL_BLOCK_BYTES = 64 * 1024
+LOG_TAIL_USE_MMAP = os.getenv("WEBSOFT9_LOG_TAIL_USE_MMAP", "").strip().lower() in {"1", "true", "yes", "on"}
+# Since-time lookups resolve to one of these grid points, so at most this much older output is
+# read (and then dropped by the caller's own time filter).
+LOG_INDEX_GRID_BYTES = 1024 * 1024
+LOG_INDEX_PROBE_LINES = 16
+LOG_INDEX_MAX_FILES = 64
+
+PathLike = Union[str, os.PathLike]
+
+
+def iter_lines_reversed(
+    path: PathLike,
+    *,
+    stop_offset: int = 0,
+    block_size: int = LOG_TAIL_BLOCK_BYTES,
+    use_mmap: bool = LOG_TAIL_USE_MMAP,
+) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield (offset, line) pairs from the end of a file back to stop_offset, newest first.
+
+    Lines are raw bytes without the trailing newline; a final line that is still being written
+    is included. Only the blocks holding the returned lines are read, so taking the last N
+    lines costs O(N) regardless of the file size. With use_mmap the file is mapped and scanned
+    with rfind instead of read block by block.
+    """
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        stop_offset = max(0, min(int(stop_offset), size))
+        if size <= stop_offset:
+            return
+        if use_mmap:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                end = size
+                while True:
+                    newline = mapped.rfind(b"\n", stop_offset, end)
+                    start = newline + 1 if newline >= 0 else stop_offset
+                    yield start, mapped[start:end]
+                    if newline < 0:
+                        return
+                    end = newline
+
+        position = size
+        pending = b""
+        while position > stop_offset:
+            read_size = min(block_size, position - stop_offset)
+            position -= read_size
+            handle.seek(position)
+            chunk = handle.read(read_size) + pending
+            lines = chunk.split(b"\n")
+            pending = lines[0]
+            line_end = position + len(chunk)
+            for line in reversed(lines[1:]):
+                line_end -= len(line)
+                yield line_end, line
+                line_end -= 1
+        yield stop_offset, pending
+
+
+class LogTimeIndex:
+    """
+    Per-file index from timestamps to byte offsets for append-only logs.
+
+    The first timestamped line after every LOG_INDEX_GRID_BYTES boundary is probed lazily and
+    remembered per (device, inode), so repeated since-time queries binary-search a handful of
+    cached points instead of parsing the file. Entries are dropped when a file shrinks (it was
+    truncated) and least recently used files are evicted beyond max_files. Timestamps are
+    assumed to be roughly ascending, as they are in log files.
+    """
+
+    def __init__(self, grid_bytes: int = LOG_INDEX_GRID_BYTES, max_files: int = LOG_INDEX_MAX_FILES):
+        self.grid_bytes = grid_bytes
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._files: "OrderedDict[tuple[int, int], tuple[int, dict[int, tuple[int, Optional[float]]]]]" = OrderedDict()
+
+    def find_offset(self, path: PathLike, since: float, timestamp_of: Callable[[bytes], Optional[float]]) -> int:
+        """
+        Return a line offset before which every line is older than since (epoch seconds).
+
+        Falls back to 0 whenever it cannot prove that, e.g. for files without timestamps.
+        """
+        try:
+            with open(path, "rb") as handle:
+                file_stat = os.fstat(handle.fileno())
+                probes = self._probes_for(file_stat)
+                low, high = 0, file_stat.st_size // self.grid_bytes
+                offset = 0
+                while low < high:
+                    middle = (low + high + 1) // 2
+                    line_offset, timestamp = self._probe(handle, probes, middle, timestamp_of)
+                    if timestamp is not None and timestamp < since:
+                        low, offset = middle, line_offset
+                    else:
+                        high = middle - 1
+                return offset
+        except OSError:
+            return 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+
+    def _probes_for(self, file_stat: os.stat_result) -> dict[int, tuple[int, Optional[float]]]:
+        key = (file_stat.st_dev, file_stat.st_ino)
+        with self._lock:
+            cached = self._files.get(key)
+            if cached is None or cached[0] > file_stat.st_size:
+                cached = (file_stat.st_size, {})
+            else:
+                cached = (file_stat.st_size, cached[1])
+            self._files[key] = cached
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+            return cached[1]
+
+    def _probe(
+        self,
+        handle,
+        probes: dict[int, tuple[int, Optional[float]]],
+        grid_point: int,
+        timestamp_of: Callable[[bytes], Optional[float]],
+    ) -> tuple[int, Optional[float]]:
+        cached = probes.get(grid_point)
+        if cached is not None:
+            return cached
+        handle.seek(grid_point * self.grid_bytes - 1)
+        # Reading from the byte before the grid point lands on the next line start, even when
+        # the grid point itself is one.
+        handle.readline()
+        result: tuple[int, Optional[float]] = (handle.tell(), None)
+        for _ in range(LOG_INDEX_PROBE_LINES):
+            line_offset = handle.tell()
+            line = handle.readline()
+            if not line.endswith(b"\n"):
+                # The tail of the file is still being written; do not cache it.
+                return result
+            timestamp = timestamp_of(line.rstrip(b"\r\n"))
+            if timestamp is not None:
+                result = (line_offset, timestamp)
+                break
+        probes[grid_point] = result
+        return result
+
+
+log_time_index = LogTimeIndex()
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.core.logger import logger
+
+
+# Without inotify every tailer re-stats its files this often; with inotify this is only a safety net.
+LOG_TAIL_POLL_SECONDS = 1.0
+LOG_TAIL_INOTIFY_SAFETY_SECONDS = 10.0
+# Bursts of writes are read together instead of waking subscribers for every line.
+LOG_TAIL_COALESCE_SECONDS = 0.1
+# A subscriber that falls this far behind is told to resynchronize from a snapshot instead.
+LOG_TAIL_SUBSCRIBER_MAX_PENDING = 5000
+# Streams re-validate the operator session at most this often instead of on every update.
+LOG_STREAM_AUTH_RECHECK_SECONDS = 30.0
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+
+
+@dataclass(frozen=True)
+class LogTailSource:
+    """
+    A set of append-only log files followed by one shared tailer.
+
+    Attributes:
+        key (str): Identity of the source; subscribers with the same key share a tailer
+        list_files (Callable): Current files of the source, oldest first
+        parse_line (Callable): (path, byte offset, raw line) -> parsed entry or None
+    """
+
+    key: str
+    list_files: Callable[[], list[Path]]
+    parse_line: Callable[[Path, int, bytes], Optional[Any]]
+
+
+class LogTailSubscription:
+    """
+    One consumer of a shared tailer.
+
+    poll() catches the tailer up and returns what arrived since the previous call together with
+    a reset flag (files rotated or truncated, or this subscriber fell behind by more than
+    max_pending entries); after a reset the consumer should rebuild its view from a snapshot.
+    wait() lets async consumers sleep until the tailer pushes something.
+    """
+
+    def __init__(self, tailer: "_LogTailer", max_pending: int):
+        self._tailer = tailer
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending: list[Any] = []
+        self._reset = False
+        self._closed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+
+    def poll(self) -> tuple[list[Any], bool]:
+        self._tailer.refresh()
+        with self._lock:
+            entries, reset = self._pending, self._reset
+            self._pending, self._reset = [], False
+        if self._event is not None:
+            self._event.clear()
+        return ([] if reset else entries), reset
+
+    async def wait(self, timeout: float) -> None:
+        """Return when the tailer has pushed entries or a reset, or after timeout seconds."""
+        if self._event is None:
+            self._loop = asyncio.get_running_loop()
+            self._event = asyncio.Event()
+        with self._lock:
+            if self._pending or self._reset:
+                return
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._tailer.unsubscribe(self)
+
+    def _deliver(self, entries: list[Any]) -> None:
+        with self._lock:
+            if self._reset:
+                return
+            if len(self._pending) + len(entries) > self._max_pending:
+                self._pending, self._reset = [], True
+            else:
+                self._pending.extend(entries)
+        self._wake()
+
+    def _request_reset(self) -> None:
+        with self._lock:
+            self._pending, self._reset = [], True
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._loop is None or self._event is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # The consumer's event loop is gone.
+            pass
+
+
+class _ChangeWatcher:
+    """Sleep until a watched directory changes (inotify), a wake() call, or a timeout."""
+
+    _MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+    def __init__(self):
+        # wake() can race with close() from another thread; the lock keeps it off closed (and
+        # possibly reused) descriptors.
+        self._lock = threading.Lock()
+        self._closed = False
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+        self._libc = None
+        self._fd: Optional[int] = None
+        self._watched: set[str] = set()
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd >= 0:
+            self._libc, self._fd = libc, fd
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._fd is not None
+
+    def watch(self, directories: set[str]) -> None:
+        if self._fd is None:
+            return
+        for directory in directories - self._watched:
+            if self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK) >= 0:
+                self._watched.add(directory)
+
+    def wait(self, timeout: float) -> None:
+        descriptors = [self._wake_read] + ([self._fd] if self._fd is not None else [])
+        readable, _, _ = select.select(descriptors, [], [], timeout)
+        if self._fd in readable:
+            time.sleep(LOG_TAIL_COALESCE_SECONDS)
+        for descriptor in readable:
+            try:
+                while os.read(descriptor, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def wake(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                os.write(self._wake_write, b"\0")
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for descriptor in (self._fd, self._wake_read, self._wake_write):
+                if descriptor is not None:
+                    os.close(descriptor)
+
+
+class _LogTailer:
+    def __init__(self, source: LogTailSource):
+        self.source = source
+        self._lock = threading.RLock()
+        self._subscribers: "weakref.WeakSet[LogTailSubscription]" = weakref.WeakSet()
+        self._positions: dict[Path, tuple[int, int, int]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._watcher: Optional[_ChangeWatcher] = None
+
+    def subscribe(self, max_pending: int) -> LogTailSubscription:
+        subscription = LogTailSubscription(self, max_pending)
+        with self._lock:
+            if not self._subscribers:
+                # Nobody followed the files meanwhile: start from their current end.
+                self._positions = self._capture_positions(self._list_files())
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"log-tail-{self.source.key}", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: LogTailSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            watcher = self._watcher if not self._subscribers else None
+        if watcher is not None:
+            watcher.wake()
+
+    def refresh(self) -> None:
+        """Read and parse whatever was appended since the last refresh, once for all subscribers."""
+        with self._lock:
+            files = self._list_files()
+            if set(files) != set(self._positions):
+                self._reset(files)
+                return
+            entries: list[Any] = []
+            for path in files:
+                device, inode, position = self._positions[path]
+                try:
+                    with open(path, "rb") as handle:
+                        file_stat = os.fstat(handle.fileno())
+                        if (file_stat.st_dev, file_stat.st_ino) != (device, inode) or file_stat.st_size < position:
+                            self._reset(files)
+                            return
+                        if file_stat.st_size == position:
+                            continue
+                        handle.seek(position)
+                        data = handle.read(file_stat.st_size - position)
+                except OSError:
+                    self._reset(files)
+                    return
+                # A line that is still being written is left for the next refresh.
+                complete = data[:data.rfind(b"\n") + 1]
+                offset = position
+                for raw_line in complete.splitlines(keepends=True):
+                    entry = self.source.parse_line(path, offset, raw_line.rstrip(b"\r\n"))
+                    if entry is not None:
+                        entries.append(entry)
+                    offset += len(raw_line)
+                self._positions[path] = (device, inode, position + len(complete))
+            subscribers = list(self._subscribers)
+        if entries:
+            for subscriber in subscribers:
+                subscriber._deliver(entries)
+
+    def _reset(self, files: list[Path]) -> None:
+        self._positions = self._capture_positions(files)
+        for subscriber in list(self._subscribers):
+            subscriber._request_reset()
+
+    def _list_files(self) -> list[Path]:
+        try:
+            return list(self.source.list_files())
+        except OSError:
+            return []
+
+    @staticmethod
+    def _capture_positions(files: list[Path]) -> dict[Path, tuple[int, int, int]]:
+        positions = {}
+        for path in files:
+            try:
+                file_stat = path.stat()
+            except OSError:
+                continue
+            positions[path] = (file_stat.st_dev, file_stat.st_ino, file_stat.st_size)
+        return positions
+
+    def _run(self) -> None:
+        watcher = _ChangeWatcher()
+        with self._lock:
+            self._watcher = watcher
+        try:
+            while True:
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        self._watcher = None
+                        return
+                    directories = {str(path.parent) for path in self._positions}
+                watcher.watch(directories)
+                watcher.wait(LOG_TAIL_INOTIFY_SAFETY_SECONDS if watcher.uses_inotify else LOG_TAIL_POLL_SECONDS)
+                try:
+                    self.refresh()
+                except Exception as exc:
+                    logger.warning(f"Log tailer {self.source.key} failed to refresh: {exc}")
+        finally:
+            watcher.close()
+
+
+class LogTailMultiplexer:
+    """
+    One tailer per log source, shared by every stream that follows it.
+
+    A tailer thread waits for changes with inotify (or re-stats its files every
+    LOG_TAIL_POLL_SECONDS where inotify is unavailable), reads and parses new lines once and fans
+    the parsed entries out to its subscribers, which apply their own filters. The thread stops
+    when the last subscriber closes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tailers: dict[str, _LogTailer] = {}
+
+    def subscribe(self, source: LogTailSource, *, max_pending: int = LOG_TAIL_SUBSCRIBER_MAX_PENDING) -> LogTailSubscription:
+        with self._lock:
+            tailer = self._tailers.get(source.key)
+            if tailer is None:
+                tailer = _LogTailer(source)
+                self._tailers[source.key] = tailer
+        return tailer.subscribe(max_pending)
+
+
+log_tail_multiplexer = LogTailMultiplexer()
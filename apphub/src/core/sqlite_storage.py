@@ -0,0 +1,123 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Union
+
+from src.core.env_settings import env_int
+
+
+SQLITE_BUSY_TIMEOUT_MS = env_int("WEBSOFT9_SQLITE_BUSY_TIMEOUT_MS", 30000, minimum=0)
+SQLITE_SYNCHRONOUS = (os.getenv("WEBSOFT9_SQLITE_SYNCHRONOUS", "NORMAL") or "NORMAL").strip().upper()
+SQLITE_STATEMENT_CACHE_SIZE = env_int("WEBSOFT9_SQLITE_STATEMENT_CACHE_SIZE", 256, minimum=0)
+
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+class SQLiteStorage:
+    """
+    Shared access to one local SQLite database file.
+
+    Each thread gets one long-lived connection (WAL journal, tuned synchronous and busy_timeout,
+    statement cache), so callers no longer pay a connect plus pragma round trip per operation.
+    ``with storage.connect() as connection:`` keeps the sqlite3 semantics callers already rely on:
+    the block commits on success and rolls back on error, but the connection stays open.
+
+    Attributes:
+        database_file (Path): Database file path
+
+    Methods:
+        connect(): Get this thread's connection
+        ensure_schema(name, initializer): Run a schema initializer once per process
+        close(): Close every pooled connection
+    """
+
+    def __init__(self, database_file: Union[str, Path]):
+        self.database_file = Path(database_file)
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._connections: dict[threading.Thread, sqlite3.Connection] = {}
+        self._initialized_schemas: set[str] = set()
+
+    def connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+
+        self.database_file.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.database_file,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+        )
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS if SQLITE_SYNCHRONOUS in _SYNCHRONOUS_MODES else 'NORMAL'}")
+        connection.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        connection.execute("PRAGMA foreign_keys=ON")
+        self._local.connection = connection
+        with self._lock:
+            self._connections[threading.current_thread()] = connection
+            self._close_dead_thread_connections_locked()
+        return connection
+
+    def ensure_schema(self, name: str, initializer: Callable[[sqlite3.Connection], None]) -> None:
+        """
+        Run initializer (CREATE TABLE / migrations) the first time name is requested for this file.
+
+        Initializers that raise are retried on the next call.
+        """
+        if name in self._initialized_schemas:
+            return
+        with self._lock:
+            if name in self._initialized_schemas:
+                return
+            with self.connect() as connection:
+                initializer(connection)
+            self._initialized_schemas.add(name)
+
+    def close(self) -> None:
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+            self._initialized_schemas.clear()
+        self._local = threading.local()
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+
+    def _close_dead_thread_connections_locked(self) -> None:
+        # Short-lived worker threads would otherwise leave their connection open until process exit.
+        for thread in [thread for thread in self._connections if not thread.is_alive()]:
+            try:
+                self._connections.pop(thread).close()
+            except sqlite3.Error:
+                pass
+
+
+_storages: dict[str, SQLiteStorage] = {}
+_storages_lock = threading.Lock()
+
+
+def get_sqlite_storage(database_file: Union[str, Path]) -> SQLiteStorage:
+    """
+    Get the process-wide storage for database_file, creating it on first use.
+    """
+    key = os.path.abspath(database_file)
+    with _storages_lock:
+        storage = _storages.get(key)
+        if storage is None:
+            storage = SQLiteStorage(database_file)
+            _storages[key] = storage
+        return storage
+
+
+def close_all_sqlite_storages() -> None:
+    with _storages_lock:
+        storages = list(_storages.values())
+        _storages.clear()
+    for storage in storages:
+        storage.close()
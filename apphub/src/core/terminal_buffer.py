@@ -0,0 +1,92 @@
+import threading
+from typing import Callable, Optional
+
+
+class TerminalOutputBuffer:
+    """
+    Fixed-capacity ring buffer of raw terminal output.
+
+    Output is kept as bytes, so a multi-byte character split across two SSH reads is only decoded
+    once a reader has both halves. Positions are absolute byte offsets since the session started:
+    read(after) returns the retained bytes written after that offset plus the offset to pass next
+    time, and a reader that fell behind by more than the capacity continues from the oldest
+    retained byte. Appends and reads cost O(bytes moved), independent of how much output the
+    session has produced.
+
+    Listeners are called (without the buffer lock held) after every append and on notify(), so
+    consumers can wait for output instead of polling.
+
+    Attributes:
+        capacity (int): Retained bytes
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._ring = bytearray(self.capacity)
+        self._end = 0
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def start(self) -> int:
+        """Offset of the oldest retained byte."""
+        with self._lock:
+            return max(0, self._end - self.capacity)
+
+    @property
+    def end(self) -> int:
+        """Offset after the newest byte."""
+        with self._lock:
+            return self._end
+
+    def append(self, data: bytes) -> int:
+        if not data:
+            return self.end
+        view = memoryview(data)
+        with self._lock:
+            if len(view) > self.capacity:
+                # Only the tail can be retained; the skipped bytes still count as written.
+                self._end += len(view) - self.capacity
+                view = view[-self.capacity:]
+            position = self._end % self.capacity
+            head = min(len(view), self.capacity - position)
+            self._ring[position:position + head] = view[:head]
+            self._ring[:len(view) - head] = view[head:]
+            self._end += len(view)
+            end = self._end
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+        return end
+
+    def read(self, after: int, limit: Optional[int] = None) -> tuple[bytes, int]:
+        """Return (bytes written after offset after, offset to continue from), at most limit bytes."""
+        with self._lock:
+            begin = min(max(int(after), self._end - self.capacity, 0), self._end)
+            stop = self._end if limit is None else min(self._end, begin + max(1, int(limit)))
+            length = stop - begin
+            if not length:
+                return b"", stop
+            position = begin % self.capacity
+            if position + length <= self.capacity:
+                return bytes(self._ring[position:position + length]), stop
+            ring = memoryview(self._ring)
+            return b"".join((ring[position:], ring[:length - (self.capacity - position)])), stop
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register listener and return a function that removes it again."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def remove() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return remove
+
+    def notify(self) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
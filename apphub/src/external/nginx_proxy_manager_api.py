@@ -253,7 +253,7 @@ class NginxProxyManagerAPI:
         merged_headers.pop("Content-Type", None)  # Let requests set the multipart boundary
 
         try:
-            upload_resp = requests.post(
+            upload_resp = self.api.session.post(
                 url,
                 files={
                     "certificate": ("certificate.pem", certificate_pem, "application/x-pem-file"),
@@ -261,6 +261,7 @@ class NginxProxyManagerAPI:
                 },
                 headers=merged_headers,
                 verify=self.api.verify,
+                timeout=self.api.timeout,
             )
         except requests.RequestException as exc:
             logger.error(f"Certificate file upload failed: {exc}")
@@ -4,22 +4,42 @@ import hashlib
 import json
 import os
 import pwd
+import queue
+import secrets
 import shutil
+import socket
 import stat
 import tempfile
 import threading
 import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from functools import lru_cache
 from pathlib import PurePosixPath
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 import docker
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, Query, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
+from src.core.content_search import (
+    SEARCH_MAX_LINE_CHARS,
+    SEARCH_PROGRESS_INTERVAL_SECONDS,
+    SEARCH_TIME_LIMIT_SECONDS,
+    ContentSearchOptions,
+    search_tree,
+)
+from src.core.disk_usage import (
+    DISK_USAGE_CACHE_MAX_AGE_SECONDS,
+    DISK_USAGE_DEFAULT_TOP,
+    DISK_USAGE_MAX_TOP,
+    DISK_USAGE_WORKERS,
+    DiskUsageCancelled,
+    DiskUsageScanner,
+)
+from src.core.directory_listing import DirectoryPageRequest, MAX_DIRECTORY_PAGE_SIZE, paginate_directory_entries
 from src.core.exception import CustomException
 from src.schemas.errorResponse import ErrorResponse
 
@@ -28,25 +48,64 @@ TEXT_FILE_LIMIT_BYTES = 1024 * 1024
 DOCKER_HELPER_MOUNT_PATH = "/workspace"
 DOCKER_HELPER_IMAGE_FALLBACK = "python:3.11-slim"
 DOCKER_HELPER_IDLE_TTL_SECONDS = max(int(os.getenv("WEBSOFT9_FILES_AGENT_HELPER_IDLE_TTL", "300") or "300"), 30)
+STREAM_CHUNK_BYTES = 1024 * 1024
+UPLOAD_CHUNK_MAX_BYTES = max(int(os.getenv("WEBSOFT9_FILES_UPLOAD_CHUNK_MAX_BYTES", str(8 * 1024 * 1024)) or "0"), STREAM_CHUNK_BYTES)
+UPLOAD_SESSION_TTL_SECONDS = 24 * 3600
+UPLOAD_PART_PREFIX = ".websoft9-upload-"
+# Part files of unfinished uploads, so a restarted agent can remove them without walking the volumes.
+UPLOAD_REGISTRY_PATH = os.getenv("WEBSOFT9_FILES_AGENT_UPLOAD_REGISTRY") or (
+    f"{os.getenv('WEBSOFT9_DATA_ROOT', '/opt/websoft9/data')}/config/files-agent/upload-parts.json"
+)
+DISK_USAGE_HEARTBEAT_SECONDS = 15.0
+DOCKER_HELPER_PERSISTENT_WORKER = (os.getenv("WEBSOFT9_FILES_AGENT_PERSISTENT_WORKER", "true") or "").strip().lower() not in {"0", "false", "no", "off"}
+# Actions without side effects; safe to re-run through exec when the worker dies mid-request.
+DOCKER_HELPER_RETRYABLE_ACTIONS = {"list-entries", "describe-entries", "metadata", "read-text", "disk-usage"}
+# Actions whose cache lives in the serve worker; they wait for it instead of using a one-off exec.
+DOCKER_HELPER_WORKER_ACTIONS = {"disk-usage"}
 DOCKER_HELPER_SCRIPT = r'''
 import base64
+import fnmatch
 import grp
+import heapq
 import json
 import os
 import pwd
+import re
 import shutil
 import stat
 import sys
 import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import PurePosixPath
 
 ROOT = os.environ.get("WEBSOFT9_FILE_HELPER_ROOT", "/workspace")
 TEXT_FILE_LIMIT_BYTES = 1024 * 1024
+STREAM_CHUNK_BYTES = 1024 * 1024
+DISK_USAGE_MAX_TOP = 100
+DISK_USAGE_CACHE_MAX_NODES = 200000
+# Directory path -> cached direct-file usage; lives as long as the serve worker.
+DISK_USAGE_CACHE = {}
+DISK_USAGE_CACHE_LOCK = threading.Lock()
+# Set by serve() while a request runs; one-shot execs have nowhere to send progress.
+progress_sink = None
+
+class HelperFailure(Exception):
+    def __init__(self, status_code, message, details=""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.details = details
 
 def fail(status_code, message, details=""):
-    print(json.dumps({"ok": False, "status_code": status_code, "message": message, "details": details}))
-    sys.exit(1)
+    raise HelperFailure(status_code, message, details)
+
+def failure_response(status_code, message, details=""):
+    return {"ok": False, "status_code": status_code, "message": message, "details": details}
 
 def normalize_relative_path(path_value, allow_root=True):
     raw = str(path_value or "/").strip() or "/"
@@ -88,6 +147,8 @@ def normalize_item_path(root_path, entry_path):
 def format_timestamp(ts):
     return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace("+00:00", "Z")
 
+# Cached for the lifetime of the helper process, i.e. across all requests a serve worker handles.
+@lru_cache(maxsize=1024)
 def lookup_owner(uid, include_id=False):
     try:
         value = pwd.getpwuid(uid).pw_name
@@ -95,6 +156,7 @@ def lookup_owner(uid, include_id=False):
         value = str(uid)
     return f"{value} ({uid})" if include_id else value
 
+@lru_cache(maxsize=1024)
 def lookup_group(gid, include_id=False):
     try:
         value = grp.getgrgid(gid).gr_name
@@ -159,46 +221,66 @@ def build_permission_mode(payload):
         return value
     return (bits(permission_groups[0]) << 6) | (bits(permission_groups[1]) << 3) | bits(permission_groups[2])
 
-def emit(value):
-    print(json.dumps({"ok": True, "data": value}))
-
-def action_directory(payload):
+def action_list_entries(payload):
     target_path = resolve_target_path(payload.get("path", "/"))
     if not os.path.isdir(target_path):
         fail(400, "Invalid Request", "The requested path is not a directory")
-    directory_stat = os.stat(target_path, follow_symlinks=False)
-    metadata = build_metadata(target_path, payload.get("display_name", ""), directory_stat, False)
+    with_stat = bool(payload.get("with_stat"))
+    entries = []
     try:
-        entries = sorted(os.scandir(target_path), key=lambda entry: entry.name.lower())
+        with os.scandir(target_path) as iterator:
+            for entry in iterator:
+                try:
+                    # d_type answers is_dir without a stat call; size/mtime only when sorting needs them.
+                    is_directory = entry.is_dir(follow_symlinks=False)
+                    entry_stat = entry.stat(follow_symlinks=False) if with_stat else None
+                except FileNotFoundError:
+                    continue
+                entries.append([
+                    entry.name,
+                    is_directory,
+                    entry_stat.st_size if entry_stat and not is_directory else 0,
+                    entry_stat.st_mtime if entry_stat else 0,
+                ])
     except FileNotFoundError:
         fail(404, "File Not Found", "The requested path disappeared while being read")
+    return {"entries": entries}
+
+def action_describe_entries(payload):
+    target_path = resolve_target_path(payload.get("path", "/"))
+    if not os.path.isdir(target_path):
+        fail(400, "Invalid Request", "The requested path is not a directory")
+    include_details = payload.get("include_details", True)
+    directory_stat = os.stat(target_path, follow_symlinks=False)
+    metadata = build_metadata(target_path, payload.get("display_name", ""), directory_stat, False)
     items = []
-    for entry in entries:
+    for name in payload.get("names") or []:
+        entry_path = os.path.join(target_path, normalize_name(name))
         try:
-            entry_stat = entry.stat(follow_symlinks=False)
+            entry_stat = os.stat(entry_path, follow_symlinks=False)
         except FileNotFoundError:
             continue
-        item_type = "directory" if entry.is_dir(follow_symlinks=False) else "file"
+        item_type = "directory" if stat.S_ISDIR(entry_stat.st_mode) else "file"
         size = 0 if item_type == "directory" else entry_stat.st_size
         items.append({
-            "name": entry.name,
-            "path": normalize_item_path(ROOT, entry.path),
+            "name": name,
+            "path": normalize_item_path(ROOT, entry_path),
             "item_type": item_type,
             "size": size,
             "mode": stat.filemode(entry_stat.st_mode),
-            "owner": lookup_owner(entry_stat.st_uid),
-            "group": lookup_group(entry_stat.st_gid),
+            "owner": lookup_owner(entry_stat.st_uid) if include_details else None,
+            "group": lookup_group(entry_stat.st_gid) if include_details else None,
             "accessed_at": format_timestamp(entry_stat.st_atime),
             "modified_at": format_timestamp(entry_stat.st_mtime),
             "created_at": format_timestamp(entry_stat.st_ctime),
-            "text_editable": infer_text_editable(entry.name, item_type, size, entry_stat.st_mode),
+            "text_editable": infer_text_editable(name, item_type, size, entry_stat.st_mode) if include_details else None,
         })
-    emit({"metadata": metadata, "items": items})
+    return {"metadata": metadata, "items": items}
 
 def action_metadata(payload):
     target_path = resolve_target_path(payload.get("path", "/"))
     target_stat = os.stat(target_path, follow_symlinks=False)
-    emit(build_metadata(target_path, payload.get("display_name", ""), target_stat, True))
+    return build_metadata(target_path, payload.get("display_name", ""), target_stat, True)
 
 def action_read_text(payload):
     target_path = resolve_target_path(payload.get("path", "/"), allow_root=False)
@@ -212,7 +294,7 @@ def action_read_text(payload):
     if b"\x00" in raw:
         fail(400, "Unsupported File", "Binary files cannot be opened in the inline editor")
     try:
-        emit({"content": raw.decode("utf-8")})
+        return {"content": raw.decode("utf-8")}
     except UnicodeDecodeError:
         fail(400, "Unsupported File", "Only UTF-8 text files are supported for inline editing")
 
@@ -247,7 +329,7 @@ def action_write_text(payload):
     finally:
         if temp_path and os.path.exists(temp_path):
             os.remove(temp_path)
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
 def action_create_directory(payload):
     target_path = resolve_target_path(payload.get("path", "/"), allow_root=False, require_exists=False)
@@ -259,7 +341,7 @@ def action_create_directory(payload):
         os.chown(target_path, parent_stat.st_uid, parent_stat.st_gid)
     except OSError:
         pass
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
 def action_create_file(payload):
     target_path = resolve_target_path(payload.get("path", "/"), allow_root=False, require_exists=False)
@@ -272,7 +354,7 @@ def action_create_file(payload):
         os.chown(target_path, parent_stat.st_uid, parent_stat.st_gid)
     except OSError:
         pass
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
 def action_rename(payload):
     source_path = resolve_target_path(payload.get("source_path", "/"), allow_root=False)
@@ -283,7 +365,7 @@ def action_rename(payload):
     if not os.path.isdir(parent_path):
         fail(400, "Invalid Request", "The target parent directory does not exist")
     os.rename(source_path, target_path)
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
 def action_copy(payload):
     source_path = resolve_target_path(payload.get("source_path", "/"), allow_root=False)
@@ -303,7 +385,7 @@ def action_copy(payload):
         shutil.copytree(source_path, target_path)
     else:
         shutil.copy2(source_path, target_path)
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
 def action_move(payload):
     source_path = resolve_target_path(payload.get("source_path", "/"), allow_root=False)
@@ -320,7 +402,7 @@ def action_move(payload):
     if os.path.isdir(source_path) and os.path.realpath(target_path).startswith(os.path.realpath(source_path) + os.sep):
         fail(400, "Invalid Request", "A directory cannot be moved into itself")
     shutil.move(source_path, target_path)
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
 def action_attributes(payload):
     source_path = resolve_target_path(payload.get("source_path", "/"), allow_root=False)
@@ -343,7 +425,7 @@ def action_attributes(payload):
     if permission_mode is not None:
         os.chmod(target_path, permission_mode, follow_symlinks=False)
     target_stat = os.stat(target_path, follow_symlinks=False)
-    emit(build_metadata(target_path, payload.get("display_name", ""), target_stat, True))
+    return build_metadata(target_path, payload.get("display_name", ""), target_stat, True)
 
 def action_delete(payload):
     target_path = resolve_target_path(payload.get("path", "/"), allow_root=False)
@@ -353,7 +435,7 @@ def action_delete(payload):
         shutil.rmtree(target_path)
     else:
         os.remove(target_path)
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
 def action_upload(payload):
     parent_path = resolve_target_path(payload.get("parent_path", "/"))
@@ -369,19 +451,324 @@ def action_upload(payload):
     target_path = resolve_target_path(target_relative_path, allow_root=False, require_exists=False)
     with open(target_path, "wb") as handle:
         handle.write(content)
-    emit({"status": "ok"})
+    return {"status": "ok"}
 
-def action_download(payload):
+def action_commit_upload(payload):
+    source_path = resolve_target_path(payload.get("source_path", "/"), allow_root=False)
+    target_path = resolve_target_path(payload.get("target_path", "/"), allow_root=False, require_exists=False)
+    if os.path.isdir(target_path):
+        fail(400, "Invalid Request", "A directory with the same name already exists")
+    if os.path.exists(target_path):
+        # Replacing an existing file keeps its owner and mode, like an in-place write would.
+        original_stat = os.stat(target_path)
+        try:
+            os.chown(source_path, original_stat.st_uid, original_stat.st_gid)
+            os.chmod(source_path, stat.S_IMODE(original_stat.st_mode))
+        except OSError:
+            pass
+    os.replace(source_path, target_path)
+    return {"status": "ok"}
+
+def action_read_stream(payload):
     target_path = resolve_target_path(payload.get("path", "/"), allow_root=False)
     if not os.path.isfile(target_path):
         fail(400, "Invalid Request", "Only file downloads are supported")
+    remaining = payload.get("length")
     with open(target_path, "rb") as handle:
-        emit({"content_base64": base64.b64encode(handle.read()).decode("utf-8")})
+        handle.seek(int(payload.get("offset") or 0))
+        while remaining is None or remaining > 0:
+            chunk = handle.read(STREAM_CHUNK_BYTES if remaining is None else min(STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            sys.stdout.buffer.write(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    sys.stdout.buffer.flush()
+    return None
+
+def action_write_chunk(payload):
+    target_path = resolve_target_path(payload.get("path", "/"), allow_root=False)
+    offset = int(payload.get("offset") or 0)
+    current_size = os.path.getsize(target_path)
+    if current_size != offset:
+        fail(409, "Upload Offset Mismatch", f"The upload is at offset {current_size}")
+    with open(target_path, "ab") as handle:
+        while True:
+            chunk = sys.stdin.buffer.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                break
+            handle.write(chunk)
+    return {"size": os.path.getsize(target_path)}
+
+def emit_progress(data):
+    if progress_sink is not None:
+        progress_sink(data)
+
+def allocated_bytes(entry_stat):
+    blocks = getattr(entry_stat, "st_blocks", None)
+    return blocks * 512 if blocks is not None else entry_stat.st_size
+
+def new_usage_collector(top):
+    return {"top": top, "errors": 0, "scanned": 0, "reused": 0, "top_files": [], "top_directories": []}
+
+def push_top(collector, key, item):
+    heap = collector[key]
+    if len(heap) < collector["top"]:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+def merge_usage_collector(collector, other):
+    for key in ("errors", "scanned", "reused"):
+        collector[key] += other[key]
+    for key in ("top_files", "top_directories"):
+        for item in other[key]:
+            push_top(collector, key, item)
+
+# Same walk as src/core/disk_usage.py DiskUsageScanner, kept stdlib-only for the helper image.
+def load_usage_node(path, dir_stat, options, collector):
+    now = time.monotonic()
+    with DISK_USAGE_CACHE_LOCK:
+        node = DISK_USAGE_CACHE.get(path)
+    if (
+        node is not None
+        and not options["refresh"]
+        and node["mtime_ns"] == dir_stat.st_mtime_ns
+        and now - node["scanned_at"] <= options["max_age"]
+    ):
+        collector["reused"] += 1
+        return node
+    own_bytes = 0
+    files = 0
+    children = []
+    sizes = []
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        children.append(entry.name)
+                        continue
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    collector["errors"] += 1
+                    continue
+                size = allocated_bytes(entry_stat)
+                own_bytes += size
+                files += 1
+                sizes.append((size, entry.name))
+    except OSError:
+        collector["errors"] += 1
+    node = {
+        "mtime_ns": dir_stat.st_mtime_ns,
+        "scanned_at": now,
+        "bytes": own_bytes,
+        "files": files,
+        "children": children,
+        "top_files": heapq.nlargest(DISK_USAGE_MAX_TOP, sizes),
+    }
+    with DISK_USAGE_CACHE_LOCK:
+        if len(DISK_USAGE_CACHE) >= DISK_USAGE_CACHE_MAX_NODES:
+            DISK_USAGE_CACHE.clear()
+        DISK_USAGE_CACHE[path] = node
+    collector["scanned"] += 1
+    return node
+
+def enter_usage_directory(path, device, options, collector):
+    try:
+        dir_stat = os.stat(path, follow_symlinks=False)
+    except OSError:
+        collector["errors"] += 1
+        return None
+    if dir_stat.st_dev != device:
+        return None
+    node = load_usage_node(path, dir_stat, options, collector)
+    for size, name in node["top_files"]:
+        push_top(collector, "top_files", (size, os.path.join(path, name)))
+    return {
+        "path": path,
+        "total": allocated_bytes(dir_stat) + node["bytes"],
+        "files": node["files"],
+        "directories": 0,
+        "pending": list(reversed(node["children"])),
+    }
 
-payload = json.loads(base64.b64decode(sys.argv[2]).decode("utf-8")) if len(sys.argv) > 2 else {}
-action = sys.argv[1]
-actions = {
-    "directory": action_directory,
+def scan_usage_directory(path, device, options, collector):
+    root = enter_usage_directory(path, device, options, collector)
+    if root is None:
+        return 0, 0, 0
+    stack = [root]
+    while True:
+        frame = stack[-1]
+        if frame["pending"]:
+            child = enter_usage_directory(os.path.join(frame["path"], frame["pending"].pop()), device, options, collector)
+            if child is not None:
+                stack.append(child)
+            else:
+                frame["directories"] += 1
+            continue
+        stack.pop()
+        push_top(collector, "top_directories", (frame["total"], frame["path"]))
+        if not stack:
+            return frame["total"], frame["files"], frame["directories"]
+        parent = stack[-1]
+        parent["total"] += frame["total"]
+        parent["files"] += frame["files"]
+        parent["directories"] += 1 + frame["directories"]
+
+def scan_usage_subtree(path, device, options):
+    collector = new_usage_collector(options["top"])
+    total, files, directories = scan_usage_directory(path, device, options, collector)
+    return total, files, directories, collector
+
+def action_disk_usage(payload):
+    target_path = resolve_target_path(payload.get("path", "/"))
+    if not os.path.isdir(target_path):
+        fail(400, "Invalid Request", "Disk usage can only be calculated for directories")
+    options = {
+        "top": max(1, min(int(payload.get("top") or 20), DISK_USAGE_MAX_TOP)),
+        "refresh": bool(payload.get("refresh")),
+        "max_age": float(payload.get("max_age") or 600),
+    }
+    root_stat = os.stat(target_path, follow_symlinks=False)
+    collector = new_usage_collector(options["top"])
+    root_node = load_usage_node(target_path, root_stat, options, collector)
+    totals = [allocated_bytes(root_stat) + root_node["bytes"], root_node["files"], 0]
+    for size, name in root_node["top_files"]:
+        push_top(collector, "top_files", (size, os.path.join(target_path, name)))
+    children = []
+    with ThreadPoolExecutor(max_workers=max(1, int(payload.get("workers") or 4))) as executor:
+        futures = {
+            executor.submit(scan_usage_subtree, os.path.join(target_path, name), root_stat.st_dev, options): name
+            for name in root_node["children"]
+        }
+        for future in as_completed(futures):
+            child_path = os.path.join(target_path, futures[future])
+            child_bytes, child_files, child_directories, child_collector = future.result()
+            merge_usage_collector(collector, child_collector)
+            if child_collector["scanned"] + child_collector["reused"] == 0:
+                continue
+            totals[0] += child_bytes
+            totals[1] += child_files
+            totals[2] += 1 + child_directories
+            child = {
+                "name": futures[future],
+                "path": normalize_item_path(ROOT, child_path),
+                "bytes": child_bytes,
+                "files": child_files,
+                "directories": child_directories,
+            }
+            children.append(child)
+            emit_progress(child)
+    return {
+        "path": normalize_item_path(ROOT, target_path),
+        "bytes": totals[0],
+        "files": totals[1],
+        "directories": totals[2],
+        "children": sorted(children, key=lambda item: (-item["bytes"], item["name"])),
+        "top_directories": [{"path": normalize_item_path(ROOT, item), "bytes": size} for size, item in sorted(collector["top_directories"], reverse=True)],
+        "top_files": [{"path": normalize_item_path(ROOT, item), "bytes": size} for size, item in sorted(collector["top_files"], reverse=True)],
+        "scanned_directories": collector["scanned"],
+        "cached_directories": collector["reused"],
+        "errors": collector["errors"],
+    }
+
+class BinaryFile(Exception):
+    pass
+
+def search_file_lines(file_path, pattern, context, max_line_chars):
+    with open(file_path, "rb") as handle:
+        if b"\x00" in handle.read(8192):
+            raise BinaryFile(file_path)
+        handle.seek(0)
+        before = deque(maxlen=context)
+        pending = []
+        for line_number, raw_line in enumerate(handle, start=1):
+            line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+            shown = line[:max_line_chars]
+            for match in pending:
+                match["after"].append(shown)
+            while pending and len(pending[0]["after"]) >= context:
+                yield pending.pop(0)
+            if pattern.search(line):
+                match = {"line_number": line_number, "line": shown, "before": list(before), "after": []}
+                if context:
+                    pending.append(match)
+                else:
+                    yield match
+            before.append(shown)
+        yield from pending
+
+def write_event(event):
+    # A closed exec connection (the caller cancelled) surfaces here as BrokenPipeError and ends the process.
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+# Same search as src/core/content_search.py search_tree, writing NDJSON events to stdout.
+def action_search(payload):
+    start_path = resolve_target_path(payload.get("path", "/"))
+    if not os.path.isdir(start_path):
+        fail(400, "Invalid Request", "Search can only start from a directory")
+    flags = 0 if payload.get("case_sensitive") else re.IGNORECASE
+    query = str(payload.get("query") or "")
+    try:
+        pattern = re.compile(query if payload.get("regex") else re.escape(query), flags)
+    except re.error as exc:
+        fail(400, "Invalid Request", f"Invalid regular expression: {exc}")
+    include = str(payload.get("include") or "")
+    context = int(payload.get("context") or 0)
+    max_matches = int(payload.get("max_matches") or 500)
+    max_file_bytes = int(payload.get("max_file_bytes") or TEXT_FILE_LIMIT_BYTES)
+    max_line_chars = int(payload.get("max_line_chars") or 1000)
+    time_limit = float(payload.get("time_limit") or 120)
+    progress_interval = float(payload.get("progress_interval") or 0.5)
+    started = time.monotonic()
+    last_progress = started
+    counters = {"files_scanned": 0, "files_skipped": 0, "matches": 0}
+    truncated = False
+    timed_out = False
+    for directory, directory_names, file_names in os.walk(start_path):
+        directory_names.sort()
+        for file_name in sorted(file_names):
+            if include and not fnmatch.fnmatch(file_name, include):
+                continue
+            file_path = os.path.join(directory, file_name)
+            try:
+                file_stat = os.lstat(file_path)
+            except OSError:
+                counters["files_skipped"] += 1
+                continue
+            if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size > max_file_bytes:
+                counters["files_skipped"] += 1
+                continue
+            try:
+                for match in search_file_lines(file_path, pattern, context, max_line_chars):
+                    counters["matches"] += 1
+                    write_event({"type": "match", "path": normalize_item_path(ROOT, file_path), **match})
+                    if counters["matches"] >= max_matches:
+                        truncated = True
+                        break
+            except (BinaryFile, OSError):
+                counters["files_skipped"] += 1
+                continue
+            counters["files_scanned"] += 1
+            now = time.monotonic()
+            if truncated:
+                break
+            if now - started > time_limit:
+                timed_out = True
+                break
+            if now - last_progress >= progress_interval:
+                last_progress = now
+                write_event({"type": "progress", **counters})
+        if truncated or timed_out:
+            break
+    write_event({"type": "done", **counters, "truncated": truncated, "timed_out": timed_out})
+    return None
+
+ACTIONS = {
+    "list-entries": action_list_entries,
+    "describe-entries": action_describe_entries,
     "metadata": action_metadata,
     "read-text": action_read_text,
     "write-text": action_write_text,
@@ -393,25 +780,209 @@ actions = {
     "attributes": action_attributes,
     "delete": action_delete,
     "upload": action_upload,
-    "download": action_download,
+    "commit-upload": action_commit_upload,
+    "disk-usage": action_disk_usage,
+}
+# Actions that use stdin/stdout as raw byte streams; only available as one-off execs, never in serve mode.
+STREAM_ACTIONS = {
+    "read-stream": action_read_stream,
+    "write-chunk": action_write_chunk,
+    "search": action_search,
 }
+# Stream actions whose stdout is the payload; their failures are reported on stderr instead.
+RAW_OUTPUT_ACTIONS = {"read-stream", "search"}
 
-try:
-    handler = actions[action]
-except KeyError:
-    fail(400, "Invalid Request", f"Unknown helper action: {action}")
-
-try:
-    handler(payload)
-except FileExistsError:
-    fail(400, "Invalid Request", "A file or directory with the same name already exists")
-except PermissionError as exc:
-    fail(500, "File Operation Error", str(exc))
-except OSError as exc:
-    fail(500, "File Operation Error", str(exc))
+def dispatch(action, payload, actions=ACTIONS):
+    handler = actions.get(action)
+    if handler is None:
+        return failure_response(400, "Invalid Request", f"Unknown helper action: {action}")
+    try:
+        return {"ok": True, "data": handler(payload)}
+    except HelperFailure as exc:
+        return failure_response(exc.status_code, exc.message, exc.details)
+    except FileExistsError:
+        return failure_response(400, "Invalid Request", "A file or directory with the same name already exists")
+    except Exception as exc:
+        return failure_response(500, "File Operation Error", str(exc))
+
+def write_message(message):
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+def serve():
+    # One JSON request per line on stdin, one JSON response per line on stdout. json.dumps never
+    # emits raw newlines, so a line is always exactly one frame. Long actions may write
+    # {"id", "progress"} lines before their response.
+    global progress_sink
+    while True:
+        line = sys.stdin.buffer.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line.decode("utf-8"))
+            request_id = request.get("id")
+            progress_sink = lambda data, request_id=request_id: write_message({"id": request_id, "progress": data})
+            response = dispatch(request.get("action"), request.get("payload") or {})
+        except (ValueError, AttributeError) as exc:
+            response = failure_response(400, "Invalid Request", f"Malformed helper request: {exc}")
+        finally:
+            progress_sink = None
+        response["id"] = request_id
+        write_message(response)
+
+if sys.argv[1] == "serve":
+    serve()
+else:
+    action = sys.argv[1]
+    payload = json.loads(base64.b64decode(sys.argv[2]).decode("utf-8")) if len(sys.argv) > 2 else {}
+    response = dispatch(action, payload, STREAM_ACTIONS if action in STREAM_ACTIONS else ACTIONS)
+    if action in RAW_OUTPUT_ACTIONS:
+        # stdout carries the payload; only failures are reported, on stderr.
+        if not response["ok"]:
+            sys.stderr.write(json.dumps(response))
+    else:
+        print(json.dumps(response))
+    sys.exit(0 if response["ok"] else 1)
 '''
 
 
+def _iter_docker_frames(exec_socket) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield ``(stream_type, payload)`` from a non-TTY Docker exec socket until the peer closes it.
+
+    Each frame has an 8-byte header: stream type (1 stdout, 2 stderr), 3 padding bytes and a
+    big-endian payload length.
+    """
+    while True:
+        header = _recv_exactly(exec_socket, 8, allow_eof=True)
+        if header is None:
+            return
+        yield header[0], _recv_exactly(exec_socket, int.from_bytes(header[4:8], "big"))
+
+
+def _recv_exactly(exec_socket, size: int, *, allow_eof: bool = False) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = exec_socket.recv(min(remaining, 65536))
+        if not chunk:
+            if allow_eof and remaining == size:
+                return None
+            raise EOFError("Docker helper closed the connection")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+class HelperWorkerError(Exception):
+    def __init__(self, message: str, *, sent: bool):
+        super().__init__(message)
+        self.sent = sent
+
+
+class HelperWorker:
+    """
+    Long-lived ``DOCKER_HELPER_SCRIPT serve`` process inside a helper container.
+
+    Requests are written as JSON lines to the exec's stdin; responses come back as JSON lines on
+    stdout, wrapped in Docker's multiplexed stream frames. One request is in flight at a time.
+    """
+
+    _STDOUT_STREAM = 1
+
+    def __init__(self, docker_client, container_id: str):
+        api = docker_client.api
+        exec_id = api.exec_create(
+            container_id,
+            ["python3", "-u", "-c", DOCKER_HELPER_SCRIPT, "serve"],
+            stdin=True,
+            stdout=True,
+            stderr=False,
+            tty=False,
+            environment={"WEBSOFT9_FILE_HELPER_ROOT": DOCKER_HELPER_MOUNT_PATH},
+        )["Id"]
+        exec_socket = api.exec_start(exec_id, socket=True)
+        # docker-py hands back a SocketIO wrapper; talk to the underlying socket directly.
+        self._socket = getattr(exec_socket, "_sock", exec_socket)
+        self._frames = _iter_docker_frames(self._socket)
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._next_id = 0
+        self.closed = False
+
+    def call(
+        self,
+        action: str,
+        payload: dict[str, object],
+        *,
+        blocking: bool = True,
+        on_progress: Optional[Callable[[dict[str, object]], None]] = None,
+    ) -> Optional[dict[str, object]]:
+        """
+        Run one action and return the raw helper response, or None when non-blocking and busy.
+
+        Progress lines the action writes before its response are passed to on_progress. Raises
+        HelperWorkerError (and closes the worker) on any transport failure; ``sent`` tells
+        whether the request may already have been executed.
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return None
+        try:
+            if self.closed:
+                raise HelperWorkerError("Docker helper worker is closed", sent=False)
+            self._next_id += 1
+            request_id = self._next_id
+            request = json.dumps({"id": request_id, "action": action, "payload": payload}).encode("utf-8") + b"\n"
+            try:
+                self._socket.sendall(request)
+            except OSError as exc:
+                self._close_locked()
+                raise HelperWorkerError(f"Failed to send request to Docker helper worker: {exc}", sent=False)
+            while True:
+                try:
+                    response = json.loads(self._read_line().decode("utf-8"))
+                except (OSError, EOFError, ValueError) as exc:
+                    self._close_locked()
+                    raise HelperWorkerError(f"Failed to read Docker helper worker response: {exc}", sent=True)
+                if not isinstance(response, dict) or "progress" not in response or response.get("id") != request_id:
+                    break
+                if on_progress is not None:
+                    on_progress(response["progress"])
+            if not isinstance(response, dict) or response.get("id") != request_id:
+                self._close_locked()
+                raise HelperWorkerError("Docker helper worker response is out of sequence", sent=True)
+            return response
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            # Closing stdin ends the serve loop, which ends the exec.
+            self._socket.close()
+        except OSError:
+            pass
+
+    def _read_line(self) -> bytes:
+        while b"\n" not in self._buffer:
+            frame = next(self._frames, None)
+            if frame is None:
+                raise EOFError("Docker helper worker closed the connection")
+            if frame[0] == self._STDOUT_STREAM:
+                self._buffer += frame[1]
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+
 class DockerHelperManager:
     def __init__(self, docker_client=None, helper_image: Optional[str] = None, idle_ttl_seconds: int = DOCKER_HELPER_IDLE_TTL_SECONDS):
         self.docker_client = docker_client
@@ -423,12 +994,38 @@ class DockerHelperManager:
         self._start_background_sweeper()
         self.prune_orphaned_helpers()
 
-    def execute(self, root_path: str, action: str, payload: dict[str, object]) -> dict[str, object]:
-        encoded_payload = base64.b64encode(json.dumps(payload).encode("utf-8")).decode("utf-8")
+    def execute(
+        self,
+        root_path: str,
+        action: str,
+        payload: dict[str, object],
+        on_progress: Optional[Callable[[dict[str, object]], None]] = None,
+    ) -> dict[str, object]:
+        """
+        Run a helper action. on_progress only receives updates when the persistent worker runs it.
+        """
         container = self._ensure_container(root_path)
+        worker = self._get_worker(root_path, container)
+        if worker is not None:
+            try:
+                # A busy worker (another request in flight) falls through to a one-off exec.
+                response = worker.call(
+                    action,
+                    payload,
+                    blocking=action in DOCKER_HELPER_WORKER_ACTIONS,
+                    on_progress=on_progress,
+                )
+            except HelperWorkerError as exc:
+                self._discard_worker(root_path, worker)
+                if exc.sent and action not in DOCKER_HELPER_RETRYABLE_ACTIONS:
+                    raise CustomException(500, "File Operation Error", str(exc))
+                response = None
+            if response is not None:
+                return self._parse_response(response)
+
         try:
             result = container.exec_run(
-                ["python3", "-c", DOCKER_HELPER_SCRIPT, action, encoded_payload],
+                ["python3", "-c", DOCKER_HELPER_SCRIPT, action, self._encode_payload(payload)],
                 environment={"WEBSOFT9_FILE_HELPER_ROOT": DOCKER_HELPER_MOUNT_PATH},
             )
         except Exception as exc:
@@ -437,6 +1034,121 @@ class DockerHelperManager:
         output = result.output.decode("utf-8", errors="replace").strip()
         return self._parse_output(output)
 
+    def stream_file(self, root_path: str, relative_path: str, offset: int, length: int) -> Iterator[bytes]:
+        """
+        Stream length bytes of a file starting at offset as raw exec output (no JSON/base64 envelope).
+
+        The caller is expected to have checked the file with the "metadata" action; a failure after
+        streaming started can only surface as a truncated body.
+        """
+        container = self._ensure_container(root_path)
+        api = self._get_docker_client().api
+        try:
+            exec_id = api.exec_create(
+                container.id,
+                ["python3", "-c", DOCKER_HELPER_SCRIPT, "read-stream", self._encode_payload({"path": relative_path, "offset": offset, "length": length})],
+                stdout=True,
+                stderr=False,
+                environment={"WEBSOFT9_FILE_HELPER_ROOT": DOCKER_HELPER_MOUNT_PATH},
+            )["Id"]
+            stream = api.exec_start(exec_id, stream=True)
+        except Exception as exc:
+            raise CustomException(500, "File Operation Error", f"Failed to stream file from Docker helper: {exc}")
+        return self._iter_exec_stream(api, exec_id, stream)
+
+    def write_file_chunk(self, root_path: str, relative_path: str, offset: int, content: bytes) -> dict[str, object]:
+        """
+        Append content to an existing file, which must currently be offset bytes long.
+
+        The bytes travel raw over the exec's stdin; closing the write side marks the end of the chunk.
+        """
+        container = self._ensure_container(root_path)
+        api = self._get_docker_client().api
+        try:
+            exec_id = api.exec_create(
+                container.id,
+                ["python3", "-c", DOCKER_HELPER_SCRIPT, "write-chunk", self._encode_payload({"path": relative_path, "offset": offset})],
+                stdin=True,
+                stdout=True,
+                stderr=False,
+                tty=False,
+                environment={"WEBSOFT9_FILE_HELPER_ROOT": DOCKER_HELPER_MOUNT_PATH},
+            )["Id"]
+            exec_socket = api.exec_start(exec_id, socket=True)
+        except Exception as exc:
+            raise CustomException(500, "File Operation Error", f"Failed to execute Docker helper action: {exc}")
+
+        raw_socket = getattr(exec_socket, "_sock", exec_socket)
+        try:
+            raw_socket.sendall(content)
+            raw_socket.shutdown(socket.SHUT_WR)
+            output = b"".join(data for stream_type, data in _iter_docker_frames(raw_socket) if stream_type == 1)
+        except (OSError, EOFError) as exc:
+            raise CustomException(500, "File Operation Error", f"Failed to write file chunk through Docker helper: {exc}")
+        finally:
+            try:
+                raw_socket.close()
+            except OSError:
+                pass
+        return self._parse_output(output.decode("utf-8", errors="replace").strip())
+
+    def stream_search(self, root_path: str, payload: dict[str, object]) -> Iterator[dict[str, object]]:
+        """
+        Run a content search in a one-off exec and yield its NDJSON events as they arrive.
+
+        Closing the returned generator closes the exec connection, which ends the search process
+        on its next write.
+        """
+        container = self._ensure_container(root_path)
+        api = self._get_docker_client().api
+        try:
+            exec_id = api.exec_create(
+                container.id,
+                ["python3", "-c", DOCKER_HELPER_SCRIPT, "search", self._encode_payload(payload)],
+                stdout=True,
+                stderr=True,
+                tty=False,
+                environment={"WEBSOFT9_FILE_HELPER_ROOT": DOCKER_HELPER_MOUNT_PATH},
+            )["Id"]
+            exec_socket = api.exec_start(exec_id, socket=True)
+        except Exception as exc:
+            raise CustomException(500, "File Operation Error", f"Failed to execute Docker helper action: {exc}")
+        return self._iter_exec_events(getattr(exec_socket, "_sock", exec_socket))
+
+    @classmethod
+    def _iter_exec_events(cls, raw_socket) -> Iterator[dict[str, object]]:
+        buffer = b""
+        errors = b""
+        try:
+            for stream_type, data in _iter_docker_frames(raw_socket):
+                if stream_type != 1:
+                    errors += data
+                    continue
+                buffer += data
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    if line.strip():
+                        yield json.loads(line.decode("utf-8"))
+        except (OSError, EOFError, ValueError) as exc:
+            raise CustomException(500, "File Operation Error", f"Failed to read Docker helper output: {exc}")
+        finally:
+            try:
+                raw_socket.close()
+            except OSError:
+                pass
+        if errors.strip():
+            cls._parse_output(errors.decode("utf-8", errors="replace").strip())
+
+    @staticmethod
+    def _iter_exec_stream(api, exec_id: str, stream: Iterable[bytes]) -> Iterator[bytes]:
+        yield from stream
+        if api.exec_inspect(exec_id).get("ExitCode"):
+            raise CustomException(500, "File Operation Error", "Docker helper failed while streaming the file")
+
+    @staticmethod
+    def _encode_payload(payload: dict[str, object]) -> str:
+        return base64.b64encode(json.dumps(payload).encode("utf-8")).decode("utf-8")
+
     def _ensure_container(self, root_path: str):
         with self._lock:
             self._prune_stale_locked()
@@ -446,12 +1158,44 @@ class DockerHelperManager:
                 if container is not None:
                     entry["last_used"] = time.monotonic()
                     return container
-                self._helpers.pop(root_path, None)
+                self._close_worker(self._helpers.pop(root_path, {}))
 
             container = self._create_container(root_path)
             self._helpers[root_path] = {"container_id": container.id, "last_used": time.monotonic()}
             return container
 
+    def _get_worker(self, root_path: str, container) -> Optional[HelperWorker]:
+        if not DOCKER_HELPER_PERSISTENT_WORKER:
+            return None
+        with self._lock:
+            entry = self._helpers.get(root_path)
+            if entry is None or entry.get("container_id") != container.id or entry.get("worker_unavailable"):
+                return None
+            worker = entry.get("worker")
+            if isinstance(worker, HelperWorker) and not worker.closed:
+                return worker
+            try:
+                worker = HelperWorker(self._get_docker_client(), container.id)
+            except Exception:
+                # Keep using exec for this container rather than retrying the attach on every call.
+                entry["worker_unavailable"] = True
+                return None
+            entry["worker"] = worker
+            return worker
+
+    def _discard_worker(self, root_path: str, worker: HelperWorker) -> None:
+        worker.close()
+        with self._lock:
+            entry = self._helpers.get(root_path)
+            if entry is not None and entry.get("worker") is worker:
+                entry.pop("worker", None)
+
+    @staticmethod
+    def _close_worker(entry: dict[str, object]) -> None:
+        worker = entry.get("worker")
+        if isinstance(worker, HelperWorker):
+            worker.close()
+
     def _prune_stale_locked(self) -> None:
         now = time.monotonic()
         stale_roots = [
@@ -460,8 +1204,9 @@ class DockerHelperManager:
             if now - float(entry.get("last_used") or 0.0) > self.idle_ttl_seconds
         ]
         for root_path in stale_roots:
-            container_id = self._helpers.pop(root_path, {}).get("container_id")
-            self._remove_container(container_id)
+            entry = self._helpers.pop(root_path, {})
+            self._close_worker(entry)
+            self._remove_container(entry.get("container_id"))
 
     def prune_orphaned_helpers(self) -> None:
         with self._lock:
@@ -556,6 +1301,8 @@ class DockerHelperManager:
     def _drop_container(self, root_path: str, *, force_remove: bool) -> None:
         with self._lock:
             entry = self._helpers.pop(root_path, None)
+        if entry is not None:
+            self._close_worker(entry)
         if force_remove and entry is not None:
             self._remove_container(entry.get("container_id"))
 
@@ -601,14 +1348,18 @@ class DockerHelperManager:
         self.helper_image = DOCKER_HELPER_IMAGE_FALLBACK
         return self.helper_image
 
-    @staticmethod
-    def _parse_output(output: str) -> dict[str, object]:
+    @classmethod
+    def _parse_output(cls, output: str) -> dict[str, object]:
         if not output:
             raise CustomException(500, "File Operation Error", "Docker helper returned no output")
         try:
             payload = json.loads(output)
         except json.JSONDecodeError as exc:
             raise CustomException(500, "File Operation Error", f"Invalid Docker helper response: {exc}: {output}")
+        return cls._parse_response(payload)
+
+    @staticmethod
+    def _parse_response(payload: dict[str, object]) -> dict[str, object]:
         if not payload.get("ok"):
             raise CustomException(
                 int(payload.get("status_code") or 500),
@@ -630,6 +1381,31 @@ class AgentPathRequest(BaseModel):
     display_name: str = Field(default="")
 
 
+class AgentDirectoryRequest(AgentPathRequest):
+    sort: str = Field(default="name")
+    order: str = Field(default="asc")
+    name_filter: str = Field(default="")
+    cursor: Optional[str] = Field(default=None)
+    limit: Optional[int] = Field(default=None, ge=1, le=MAX_DIRECTORY_PAGE_SIZE)
+    include_details: bool = Field(default=True)
+
+
+class AgentDiskUsageRequest(AgentPathRequest):
+    top: int = Field(default=DISK_USAGE_DEFAULT_TOP, ge=1, le=DISK_USAGE_MAX_TOP)
+    refresh: bool = Field(default=False)
+    stream: bool = Field(default=False)
+
+
+class AgentSearchRequest(AgentPathRequest):
+    query: str = Field(min_length=1, max_length=1024)
+    regex: bool = Field(default=False)
+    case_sensitive: bool = Field(default=False)
+    context: int = Field(default=0, ge=0)
+    include: str = Field(default="", max_length=255)
+    max_matches: Optional[int] = Field(default=None, ge=1)
+    max_file_bytes: Optional[int] = Field(default=None, ge=1)
+
+
 class AgentWriteTextRequest(AgentPathRequest):
     content: str = Field(default="", max_length=TEXT_FILE_LIMIT_BYTES)
 
@@ -674,6 +1450,32 @@ class AgentUploadRequest(BaseModel):
     display_name: str = Field(default="")
 
 
+class AgentUploadSessionRequest(BaseModel):
+    root_path: str = Field(min_length=1)
+    parent_path: str = Field(default="/")
+    file_name: str = Field(min_length=1, max_length=255)
+    size: int = Field(ge=0)
+    display_name: str = Field(default="")
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    root_path: str
+    use_helper: bool
+    part_path: str
+    target_path: str
+    size: int
+    updated_at: float
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+_upload_sessions: dict[str, UploadSession] = {}
+_upload_sessions_lock = threading.Lock()
+_upload_registry_lock = threading.Lock()
+_disk_usage_scanner = DiskUsageScanner()
+
+
 app = FastAPI(title="Websoft9 Files Agent", docs_url=None, redoc_url=None, openapi_url=None)
 
 
@@ -700,10 +1502,18 @@ async def healthz():
 
 
 @app.post("/internal/files/directory")
-async def list_directory(payload: AgentPathRequest):
+async def list_directory(payload: AgentDirectoryRequest):
     root_path = _normalize_root_path(payload.root_path)
+    page_request = DirectoryPageRequest.from_params(
+        sort=payload.sort,
+        order=payload.order,
+        name_filter=payload.name_filter,
+        cursor=payload.cursor,
+        limit=payload.limit,
+        include_details=payload.include_details,
+    )
     if _should_use_helper_root(root_path):
-        return _helper_manager().execute(root_path, "directory", payload.model_dump(exclude_none=True))
+        return _list_helper_directory(root_path, payload, page_request)
     target_path = _resolve_target_path(root_path, payload.path)
     if not os.path.isdir(target_path):
         raise CustomException(400, "Invalid Request", "The requested path is not a directory")
@@ -718,14 +1528,32 @@ async def list_directory(payload: AgentPathRequest):
     )
 
     try:
-        entries = sorted(os.scandir(target_path), key=lambda entry: entry.name.lower())
+        entries = list(os.scandir(target_path))
     except FileNotFoundError:
         raise CustomException(404, "File Not Found", "The requested path disappeared while being read")
 
+    # Only sorting by size/modified needs a stat of every entry; otherwise just the page is stat'ed.
+    entry_stats = {}
+    if page_request.needs_stat:
+        for entry in entries:
+            try:
+                entry_stats[entry.name] = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+        entries = [entry for entry in entries if entry.name in entry_stats]
+    page = paginate_directory_entries(
+        entries,
+        page_request,
+        name=lambda entry: entry.name,
+        is_directory=lambda entry: entry.is_dir(follow_symlinks=False),
+        size=lambda entry: 0 if entry.is_dir(follow_symlinks=False) else entry_stats[entry.name].st_size,
+        modified=lambda entry: entry_stats[entry.name].st_mtime,
+    )
+
     items = []
-    for entry in entries:
+    for entry in page.entries:
         try:
-            entry_stat = entry.stat(follow_symlinks=False)
+            entry_stat = entry_stats.get(entry.name) or entry.stat(follow_symlinks=False)
         except FileNotFoundError:
             continue
         item_type = "directory" if entry.is_dir(follow_symlinks=False) else "file"
@@ -737,16 +1565,177 @@ async def list_directory(payload: AgentPathRequest):
                 "item_type": item_type,
                 "size": size,
                 "mode": stat.filemode(entry_stat.st_mode),
-                "owner": _lookup_owner(entry_stat.st_uid),
-                "group": _lookup_group(entry_stat.st_gid),
+                "owner": _lookup_owner(entry_stat.st_uid) if page_request.include_details else None,
+                "group": _lookup_group(entry_stat.st_gid) if page_request.include_details else None,
                 "accessed_at": _format_timestamp(entry_stat.st_atime),
                 "modified_at": _format_timestamp(entry_stat.st_mtime),
                 "created_at": _format_timestamp(entry_stat.st_ctime),
-                "text_editable": _infer_text_editable(entry.name, item_type, size, entry_stat.st_mode),
+                "text_editable": (
+                    _infer_text_editable(entry.name, item_type, size, entry_stat.st_mode)
+                    if page_request.include_details
+                    else None
+                ),
             }
         )
 
-    return {"metadata": metadata, "items": items}
+    return {"metadata": metadata, "items": items, "next_cursor": page.next_cursor, "total_items": page.total_items}
+
+
+def _list_helper_directory(root_path: str, payload: AgentDirectoryRequest, page_request: DirectoryPageRequest):
+    manager = _helper_manager()
+    listed = manager.execute(root_path, "list-entries", {"path": payload.path, "with_stat": page_request.needs_stat})
+    page = paginate_directory_entries(
+        listed.get("entries") or [],
+        page_request,
+        name=lambda entry: entry[0],
+        is_directory=lambda entry: bool(entry[1]),
+        size=lambda entry: entry[2],
+        modified=lambda entry: entry[3],
+    )
+    described = manager.execute(
+        root_path,
+        "describe-entries",
+        {
+            "path": payload.path,
+            "names": [entry[0] for entry in page.entries],
+            "include_details": page_request.include_details,
+            "display_name": payload.display_name,
+        },
+    )
+    return {
+        "metadata": described.get("metadata"),
+        "items": described.get("items") or [],
+        "next_cursor": page.next_cursor,
+        "total_items": page.total_items,
+    }
+
+
+@app.post("/internal/files/disk-usage")
+def disk_usage(payload: AgentDiskUsageRequest):
+    # A plain def: the walk can take minutes and must not block the event loop.
+    root_path = _normalize_root_path(payload.root_path)
+    if not payload.stream:
+        return _compute_disk_usage(root_path, payload)
+    return StreamingResponse(_iter_disk_usage_events(root_path, payload), media_type="application/x-ndjson")
+
+
+def _compute_disk_usage(
+    root_path: str,
+    payload: AgentDiskUsageRequest,
+    on_progress: Optional[Callable[[dict[str, object]], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> dict[str, object]:
+    if _should_use_helper_root(root_path):
+        return _helper_manager().execute(
+            root_path,
+            "disk-usage",
+            {
+                "path": payload.path,
+                "top": payload.top,
+                "refresh": payload.refresh,
+                "max_age": DISK_USAGE_CACHE_MAX_AGE_SECONDS,
+                "workers": DISK_USAGE_WORKERS,
+            },
+            on_progress=on_progress,
+        )
+    target_path = _resolve_target_path(root_path, payload.path)
+    if not os.path.isdir(target_path):
+        raise CustomException(400, "Invalid Request", "Disk usage can only be calculated for directories")
+    return _disk_usage_scanner.scan(
+        target_path,
+        display_path=lambda path: _normalize_item_path(root_path, path),
+        top=payload.top,
+        refresh=payload.refresh,
+        on_progress=on_progress,
+        cancel=cancel,
+    )
+
+
+def _iter_disk_usage_events(root_path: str, payload: AgentDiskUsageRequest) -> Iterator[bytes]:
+    """
+    NDJSON stream: one "progress" event per finished top-level subtree, then "result" or "error".
+
+    Heartbeats keep the connection alive while a single large subtree is being walked. When the
+    client disconnects the response closes this generator, which cancels a local walk; helper-backed
+    scans finish in the persistent helper worker and only warm its cache.
+    """
+    events: "queue.Queue[dict[str, object]]" = queue.Queue()
+    cancel = threading.Event()
+
+    def run() -> None:
+        try:
+            usage = _compute_disk_usage(
+                root_path,
+                payload,
+                on_progress=lambda entry: events.put({"type": "progress", "entry": entry}),
+                cancel=cancel,
+            )
+            events.put({"type": "result", "usage": usage})
+        except DiskUsageCancelled:
+            return
+        except CustomException as exc:
+            events.put({"type": "error", "status_code": exc.status_code, "message": exc.message, "details": exc.details})
+        except Exception as exc:
+            events.put({"type": "error", "status_code": 500, "message": "File Operation Error", "details": str(exc)})
+
+    threading.Thread(target=run, name="disk-usage", daemon=True).start()
+    try:
+        while True:
+            try:
+                event = events.get(timeout=DISK_USAGE_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield b'{"type":"heartbeat"}\n'
+                continue
+            yield json.dumps(event).encode("utf-8") + b"\n"
+            if event["type"] != "progress":
+                return
+    finally:
+        cancel.set()
+
+
+@app.post("/internal/files/search")
+def search_files(payload: AgentSearchRequest):
+    root_path = _normalize_root_path(payload.root_path)
+    options = ContentSearchOptions.from_params(
+        payload.query,
+        regex=payload.regex,
+        case_sensitive=payload.case_sensitive,
+        context=payload.context,
+        include=payload.include,
+        max_matches=payload.max_matches,
+        max_file_bytes=payload.max_file_bytes,
+    )
+    if _should_use_helper_root(root_path):
+        events = _helper_manager().stream_search(
+            root_path,
+            {
+                "path": payload.path,
+                **options.to_payload(),
+                "max_line_chars": SEARCH_MAX_LINE_CHARS,
+                "time_limit": SEARCH_TIME_LIMIT_SECONDS,
+                "progress_interval": SEARCH_PROGRESS_INTERVAL_SECONDS,
+            },
+        )
+    else:
+        start_path = _resolve_target_path(root_path, payload.path)
+        if not os.path.isdir(start_path):
+            raise CustomException(400, "Invalid Request", "Search can only start from a directory")
+        events = search_tree(start_path, options, display_path=lambda path: _normalize_item_path(root_path, path))
+    return StreamingResponse(_iter_ndjson_events(events), media_type="application/x-ndjson")
+
+
+def _iter_ndjson_events(events: Iterator[dict[str, object]]) -> Iterator[bytes]:
+    # When the client disconnects the response stops pulling and closes this generator, which
+    # closes events and with it the helper exec.
+    try:
+        for event in events:
+            yield json.dumps(event).encode("utf-8") + b"\n"
+    except CustomException as exc:
+        yield json.dumps({"type": "error", "status_code": exc.status_code, "message": exc.message, "details": exc.details}).encode("utf-8") + b"\n"
+    finally:
+        close = getattr(events, "close", None)
+        if close is not None:
+            close()
 
 
 @app.post("/internal/files/metadata")
@@ -1017,17 +2006,330 @@ async def upload_file(payload: AgentUploadRequest):
 
 
 @app.post("/internal/files/download")
-async def download_file(payload: AgentPathRequest):
+async def download_file(payload: AgentPathRequest, range_header: Optional[str] = Header(default=None, alias="Range")):
     root_path = _normalize_root_path(payload.root_path)
     if _should_use_helper_root(root_path):
-        response = _helper_manager().execute(root_path, "download", payload.model_dump(exclude_none=True))
-        return Response(content=base64.b64decode(str(response.get("content_base64") or "").encode("utf-8")), media_type="application/octet-stream")
+        metadata = _helper_manager().execute(root_path, "metadata", payload.model_dump(exclude_none=True))
+        if metadata.get("item_type") != "file":
+            raise CustomException(400, "Invalid Request", "Only file downloads are supported")
+        return _build_download_response(
+            int(metadata.get("size") or 0),
+            range_header,
+            lambda offset, length: _helper_manager().stream_file(root_path, payload.path, offset, length),
+        )
     target_path = _resolve_target_path(root_path, payload.path, allow_root=False)
     if not os.path.isfile(target_path):
         raise CustomException(400, "Invalid Request", "Only file downloads are supported")
+    return _build_download_response(
+        os.path.getsize(target_path),
+        range_header,
+        lambda offset, length: _iter_file_chunks(target_path, offset, length),
+    )
+
+
+@app.post("/internal/files/uploads")
+async def start_upload(payload: AgentUploadSessionRequest):
+    root_path = _normalize_root_path(payload.root_path)
+    _prune_upload_sessions()
+    relative_parent = _normalize_relative_path(payload.parent_path)
+    file_name = _normalize_name(payload.file_name)
+    upload_id = secrets.token_hex(16)
+    session = UploadSession(
+        upload_id=upload_id,
+        root_path=root_path,
+        use_helper=_should_use_helper_root(root_path),
+        part_path=str(PurePosixPath(relative_parent) / f"{UPLOAD_PART_PREFIX}{upload_id}.part"),
+        target_path=str(PurePosixPath(relative_parent) / file_name),
+        size=payload.size,
+        updated_at=time.monotonic(),
+    )
+    if session.use_helper:
+        parent_metadata = _helper_manager().execute(root_path, "metadata", {"path": relative_parent})
+        if parent_metadata.get("item_type") != "directory":
+            raise CustomException(400, "Invalid Request", "Upload target directory does not exist")
+        _helper_manager().execute(root_path, "create-file", {"path": session.part_path})
+    else:
+        parent_path = _resolve_target_path(root_path, relative_parent)
+        if not os.path.isdir(parent_path):
+            raise CustomException(400, "Invalid Request", "Upload target directory does not exist")
+        if os.path.isdir(_resolve_target_path(root_path, session.target_path, allow_root=False, require_exists=False)):
+            raise CustomException(400, "Invalid Request", "A directory with the same name already exists")
+        part_path = _resolve_target_path(root_path, session.part_path, allow_root=False, require_exists=False)
+        with open(part_path, "xb"):
+            pass
+        try:
+            parent_stat = os.stat(parent_path)
+            os.chown(part_path, parent_stat.st_uid, parent_stat.st_gid)
+        except OSError:
+            pass
+
+    with _upload_sessions_lock:
+        _upload_sessions[upload_id] = session
+    _update_upload_registry(upload_id, session)
+    if session.size == 0:
+        with session.lock:
+            return _complete_upload(session)
+    return _upload_session_payload(session, 0)
+
+
+@app.get("/internal/files/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    session = _get_upload_session(upload_id)
+    with session.lock:
+        return _upload_session_payload(session, _upload_part_size(session))
+
+
+@app.put("/internal/files/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(ge=0),
+    content_sha256: Optional[str] = Header(default=None, alias="X-Content-SHA256"),
+):
+    session = _get_upload_session(upload_id)
+    content = await _read_request_body(request, UPLOAD_CHUNK_MAX_BYTES)
+    if content_sha256 and hashlib.sha256(content).hexdigest() != content_sha256.strip().lower():
+        raise CustomException(400, "Checksum Mismatch", "The chunk does not match its X-Content-SHA256 checksum")
+    if offset + len(content) > session.size:
+        raise CustomException(400, "Invalid Request", "The chunk extends past the declared upload size")
+
+    with session.lock:
+        current_size = _upload_part_size(session)
+        if offset != current_size:
+            raise CustomException(409, "Upload Offset Mismatch", f"The upload is at offset {current_size}")
+        if session.use_helper:
+            new_size = int(_helper_manager().write_file_chunk(session.root_path, session.part_path, offset, content).get("size") or 0)
+        else:
+            with open(_resolve_target_path(session.root_path, session.part_path, allow_root=False), "r+b") as handle:
+                handle.seek(offset)
+                handle.write(content)
+            new_size = offset + len(content)
+        session.updated_at = time.monotonic()
+        if new_size >= session.size:
+            return _complete_upload(session)
+        return _upload_session_payload(session, new_size)
+
+
+@app.delete("/internal/files/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    session = _get_upload_session(upload_id)
+    with _upload_sessions_lock:
+        _upload_sessions.pop(upload_id, None)
+    _remove_upload_part(session)
+    _update_upload_registry(upload_id, None)
+    return {"status": "ok"}
+
+
+def _parse_range_header(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive (start, end) offsets.
+
+    Returns None when the header is absent, malformed or asks for several ranges (the full file
+    is served then), and raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = str(range_header or "").partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, separator, end_text = spec.strip().partition("-")
+    if not separator or not (start_text.strip() or end_text.strip()):
+        return None
+    try:
+        start = int(start_text) if start_text.strip() else None
+        end = int(end_text) if end_text.strip() else None
+    except ValueError:
+        return None
+
+    if start is None:
+        if end <= 0:
+            raise ValueError("Empty suffix range")
+        return max(size - end, 0), size - 1
+    if start >= size or (end is not None and end < start):
+        raise ValueError("Range starts past the end of the file")
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def _build_download_response(size: int, range_header: Optional[str], open_chunks: Callable[[int, int], Iterator[bytes]]) -> Response:
+    try:
+        byte_range = _parse_range_header(range_header, size)
+    except ValueError:
+        return JSONResponse(
+            status_code=416,
+            content=ErrorResponse(message="Range Not Satisfiable", details=f"bytes */{size}").model_dump(),
+            headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"},
+        )
+    start, end = byte_range or (0, size - 1)
+    length = max(end - start + 1, 0)
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(length)}
+    if byte_range is not None:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        open_chunks(start, length) if length else iter(()),
+        status_code=206 if byte_range is not None else 200,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+def _iter_file_chunks(target_path: str, offset: int, length: int) -> Iterator[bytes]:
     with open(target_path, "rb") as handle:
-        content = handle.read()
-    return Response(content=content, media_type="application/octet-stream")
+        handle.seek(offset)
+        remaining = length
+        while remaining > 0:
+            chunk = handle.read(min(STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def _read_request_body(request: Request, limit: int) -> bytes:
+    content = bytearray()
+    async for chunk in request.stream():
+        content.extend(chunk)
+        if len(content) > limit:
+            raise CustomException(413, "Payload Too Large", f"Upload chunks are limited to {limit} bytes")
+    return bytes(content)
+
+
+def _get_upload_session(upload_id: str) -> UploadSession:
+    with _upload_sessions_lock:
+        session = _upload_sessions.get(upload_id)
+    if session is None:
+        raise CustomException(404, "Upload Not Found", "The upload session does not exist or has expired")
+    return session
+
+
+def _upload_session_payload(session: UploadSession, offset: int, completed: bool = False) -> dict[str, object]:
+    return {
+        "upload_id": session.upload_id,
+        "path": session.target_path,
+        "offset": offset,
+        "size": session.size,
+        "chunk_size": UPLOAD_CHUNK_MAX_BYTES,
+        "completed": completed,
+    }
+
+
+def _upload_part_size(session: UploadSession) -> int:
+    # The part file is the source of truth for the resume offset.
+    if session.use_helper:
+        return int(_helper_manager().execute(session.root_path, "metadata", {"path": session.part_path}).get("size") or 0)
+    return os.path.getsize(_resolve_target_path(session.root_path, session.part_path, allow_root=False))
+
+
+def _complete_upload(session: UploadSession) -> dict[str, object]:
+    if session.use_helper:
+        _helper_manager().execute(
+            session.root_path,
+            "commit-upload",
+            {"source_path": session.part_path, "target_path": session.target_path},
+        )
+    else:
+        part_path = _resolve_target_path(session.root_path, session.part_path, allow_root=False)
+        target_path = _resolve_target_path(session.root_path, session.target_path, allow_root=False, require_exists=False)
+        if os.path.isdir(target_path):
+            raise CustomException(400, "Invalid Request", "A directory with the same name already exists")
+        if os.path.exists(target_path):
+            # Replacing an existing file keeps its owner and mode, like an in-place write would.
+            original_stat = os.stat(target_path)
+            try:
+                os.chown(part_path, original_stat.st_uid, original_stat.st_gid)
+                os.chmod(part_path, stat.S_IMODE(original_stat.st_mode))
+            except OSError:
+                pass
+        os.replace(part_path, target_path)
+    with _upload_sessions_lock:
+        _upload_sessions.pop(session.upload_id, None)
+    _update_upload_registry(session.upload_id, None)
+    return _upload_session_payload(session, session.size, completed=True)
+
+
+def _remove_upload_part(session: UploadSession) -> None:
+    try:
+        if session.use_helper:
+            _helper_manager().execute(session.root_path, "delete", {"path": session.part_path})
+        else:
+            os.remove(_resolve_target_path(session.root_path, session.part_path, allow_root=False))
+    except (CustomException, OSError):
+        pass
+
+
+def _update_upload_registry(upload_id: str, session: Optional[UploadSession]) -> None:
+    """Record the part file of an upload in the registry, or forget it when session is None."""
+    with _upload_registry_lock:
+        entries = _read_upload_registry()
+        if session is None:
+            if entries.pop(upload_id, None) is None:
+                return
+        else:
+            entries[upload_id] = {"root_path": session.root_path, "use_helper": session.use_helper, "part_path": session.part_path}
+        try:
+            os.makedirs(os.path.dirname(UPLOAD_REGISTRY_PATH), exist_ok=True)
+            temporary_path = f"{UPLOAD_REGISTRY_PATH}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as handle:
+                json.dump(entries, handle)
+            os.replace(temporary_path, UPLOAD_REGISTRY_PATH)
+        except OSError:
+            # Only the cleanup after a restart depends on the registry; the upload itself works without it.
+            pass
+
+
+def _read_upload_registry() -> dict[str, dict[str, object]]:
+    try:
+        with open(UPLOAD_REGISTRY_PATH, encoding="utf-8") as handle:
+            entries = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _sweep_orphaned_upload_parts() -> int:
+    """
+    Remove the part files of uploads that an earlier agent process left unfinished.
+
+    Upload sessions only live in memory, so a part recorded in the registry without a session in
+    this process can never be resumed or completed. Only the registered paths are touched.
+    """
+    with _upload_registry_lock:
+        entries = _read_upload_registry()
+    removed = 0
+    for upload_id, entry in entries.items():
+        with _upload_sessions_lock:
+            if upload_id in _upload_sessions:
+                continue
+        try:
+            session = UploadSession(
+                upload_id=upload_id,
+                root_path=_normalize_root_path(str(entry["root_path"])),
+                use_helper=bool(entry["use_helper"]),
+                part_path=str(entry["part_path"]),
+                target_path="",
+                size=0,
+                updated_at=0.0,
+            )
+        except (CustomException, KeyError, TypeError):
+            session = None
+        if session is not None and PurePosixPath(session.part_path).name.startswith(UPLOAD_PART_PREFIX):
+            _remove_upload_part(session)
+            removed += 1
+        _update_upload_registry(upload_id, None)
+    return removed
+
+
+@app.on_event("startup")
+def _start_orphaned_upload_sweep() -> None:
+    threading.Thread(target=_sweep_orphaned_upload_parts, name="upload-part-sweep", daemon=True).start()
+
+
+def _prune_upload_sessions() -> None:
+    cutoff = time.monotonic() - UPLOAD_SESSION_TTL_SECONDS
+    with _upload_sessions_lock:
+        expired = [session for session in _upload_sessions.values() if session.updated_at < cutoff]
+        for session in expired:
+            _upload_sessions.pop(session.upload_id, None)
+    for session in expired:
+        _remove_upload_part(session)
+        _update_upload_registry(session.upload_id, None)
 
 
 def _normalize_root_path(root_path: str) -> str:
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class AppResourceUsage(BaseModel):
+    app_id: str = Field(..., description="Compose project name of the app")
+    containers: int = Field(0, description="Running containers whose cgroup accounting was readable")
+    cpu_percent: Optional[float] = Field(None, description="CPU usage in percent of one core, summed over the app's containers")
+    memory_bytes: Optional[int] = Field(None, description="Memory working set in bytes (usage minus inactive file cache)")
+    network_rx_rate_bytes: Optional[int] = Field(None, description="Inbound network traffic in bytes per second")
+    network_tx_rate_bytes: Optional[int] = Field(None, description="Outbound network traffic in bytes per second")
+    block_read_rate_bytes: Optional[int] = Field(None, description="Block device reads in bytes per second")
+    block_write_rate_bytes: Optional[int] = Field(None, description="Block device writes in bytes per second")
+    block_read_bytes: Optional[int] = Field(None, description="Block device bytes read since the containers started")
+    block_write_bytes: Optional[int] = Field(None, description="Block device bytes written since the containers started")
+
+
+class AppResourceMetricsResponse(BaseModel):
+    collected_at: str = Field(..., description="Collection timestamp in UTC ISO format")
+    interval_seconds: Optional[float] = Field(None, description="Seconds between the two samples rates were computed from")
+    sort: str = Field(..., description="Metric the apps are ordered by")
+    apps: list[AppResourceUsage] = Field(default_factory=list, description="Apps ordered by the sort metric, largest first")
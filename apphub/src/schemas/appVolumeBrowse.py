@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -22,6 +24,8 @@ class AppVolumeBrowseTreeResponse(BaseModel):
     directory: AppVolumeBrowseItem
     truncated: bool = False
     items: list[AppVolumeBrowseItem]
+    next_cursor: Optional[str] = None
+    total_items: Optional[int] = None
 
 
 class AppVolumeBrowseContentResponse(BaseModel):
@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class BackupProgress(BaseModel):
+    percent_done: float = Field(..., description="Percent of the backup completed", example=42.5)
+    files_done: int = Field(..., description="Files processed so far", example=1200)
+    total_files: Optional[int] = Field(None, description="Files found so far; grows while Restic is still scanning", example=3471)
+    bytes_done: int = Field(..., description="Bytes processed so far", example=108000000)
+    total_bytes: Optional[int] = Field(None, description="Bytes found so far; grows while Restic is still scanning", example=255549458)
+    throughput_bytes: Optional[int] = Field(None, description="Average bytes processed per second", example=21600000)
+    seconds_elapsed: int = Field(..., description="Seconds since the backup started", example=5)
+    seconds_remaining: Optional[int] = Field(None, description="Restic's estimate of the seconds left", example=7)
+    current_files: List[str] = Field(default_factory=list, description="Files being read right now", example=["/wp_bl0zt_mysql_data/ibdata1"])
+
+class BackupJob(BaseModel):
+    job_id: str = Field(..., description="Backup job ID", example="5f0c7a9d1e2b4c3a8d6e9f0a1b2c3d4e")
+    app_id: str = Field(..., description="App being backed up", example="wp_bl0zt")
+    status: str = Field(..., description="running, success or failed", example="running")
+    started_at: str = Field(..., description="Job start time", example="2025-08-13T08:30:30Z")
+    finished_at: Optional[str] = Field(None, description="Job end time", example=None)
+    progress: Optional[BackupProgress] = Field(None, description="Latest Restic progress")
+    summary: Optional[Dict[str, Any]] = Field(None, description="Restic backup summary once the job succeeded")
+    error: Optional[str] = Field(None, description="Error message when the job failed")
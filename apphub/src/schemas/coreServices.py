@@ -28,6 +28,13 @@ class ServiceIndicator(BaseModel):
     detail: Optional[str] = None
 
 
+class ServiceHealthCheck(BaseModel):
+    checked_at: Optional[str] = None
+    latency_ms: Optional[float] = None
+    consecutive_failures: int = 0
+    latency_histogram: dict[str, int] = Field(default_factory=dict)
+
+
 class CoreServiceSummary(BaseModel):
     key: str
     label: str
@@ -41,6 +48,7 @@ class CoreServiceSummary(BaseModel):
     logs_available: bool = False
     runtime_logs_href: Optional[str] = None
     indicators: list[ServiceIndicator] = Field(default_factory=list)
+    health_check: Optional[ServiceHealthCheck] = None
 
 
 class CoreServicesInventoryResponse(BaseModel):
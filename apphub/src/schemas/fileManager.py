@@ -52,7 +52,7 @@ class FileManagerItem(BaseModel):
     accessed_at: Optional[str] = None
     modified_at: Optional[str] = None
     created_at: Optional[str] = None
-    text_editable: bool = False
+    text_editable: Optional[bool] = False
 
 
 class FileManagerDirectoryResponse(BaseModel):
@@ -60,6 +60,8 @@ class FileManagerDirectoryResponse(BaseModel):
     current_path: str
     metadata: Optional['FileManagerMetadataResponse'] = None
     items: list[FileManagerItem]
+    next_cursor: Optional[str] = None
+    total_items: Optional[int] = None
 
 
 class FileManagerTextFileResponse(BaseModel):
@@ -254,3 +256,65 @@ class FileManagerUploadRequest(BaseModel):
     @classmethod
     def normalize_file_name(cls, value: str) -> str:
         return _normalize_name(value)
+
+
+class FileManagerUploadSessionRequest(BaseModel):
+    volume_id: str = Field(min_length=1, max_length=256)
+    parent_path: str = Field(default="/", max_length=4096)
+    file_name: str = Field(min_length=1, max_length=255)
+    size: int = Field(ge=0, description="Total size of the file in bytes")
+
+    @field_validator("volume_id", mode="before")
+    @classmethod
+    def normalize_volume_id(cls, value: str) -> str:
+        return _normalize_volume_id(value)
+
+    @field_validator("parent_path", mode="before")
+    @classmethod
+    def normalize_parent_path(cls, value: Optional[str]) -> str:
+        return _normalize_path(value)
+
+    @field_validator("file_name", mode="before")
+    @classmethod
+    def normalize_file_name(cls, value: str) -> str:
+        return _normalize_name(value)
+
+
+class FileManagerUploadSessionResponse(BaseModel):
+    upload_id: str
+    path: str
+    offset: int = Field(description="Number of bytes received so far; the next chunk must start here")
+    size: int
+    chunk_size: int = Field(description="Maximum accepted chunk size in bytes")
+    completed: bool = False
+    volume_name: Optional[str] = None
+
+
+class FileManagerUploadAbortResponse(BaseModel):
+    upload_id: str
+    status: str
+
+
+class FileManagerDiskUsageEntry(BaseModel):
+    path: str
+    bytes: int = Field(description="Bytes allocated on disk")
+
+
+class FileManagerDiskUsageChild(FileManagerDiskUsageEntry):
+    name: str
+    files: int = 0
+    directories: int = 0
+
+
+class FileManagerDiskUsageResponse(BaseModel):
+    volume_name: str
+    path: str
+    bytes: int = Field(description="Bytes allocated on disk by the directory tree")
+    files: int = 0
+    directories: int = 0
+    children: list[FileManagerDiskUsageChild] = Field(default_factory=list, description="Direct subdirectories, largest first")
+    top_directories: list[FileManagerDiskUsageEntry] = Field(default_factory=list)
+    top_files: list[FileManagerDiskUsageEntry] = Field(default_factory=list)
+    scanned_directories: int = Field(default=0, description="Directories read during this request")
+    cached_directories: int = Field(default=0, description="Directories reused from the mtime-keyed cache")
+    errors: int = Field(default=0, description="Entries that could not be read")
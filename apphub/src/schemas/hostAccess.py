@@ -146,7 +146,7 @@ class HostAccessFileItem(BaseModel):
     accessed_at: Optional[str] = None
     modified_at: Optional[str] = None
     created_at: Optional[str] = None
-    text_editable: bool = False
+    text_editable: Optional[bool] = False
 
 
 class HostAccessFileMetadata(HostAccessFileItem):
@@ -166,6 +166,8 @@ class HostAccessDirectoryResponse(BaseModel):
     current_path: str
     metadata: HostAccessFileMetadata
     items: list[HostAccessFileItem]
+    next_cursor: Optional[str] = None
+    total_items: Optional[int] = None
 
 
 class HostAccessTextFileResponse(BaseModel):
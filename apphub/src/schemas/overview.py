@@ -24,6 +24,7 @@ class OverviewAlert(BaseModel):
 class OverviewProductSummary(BaseModel):
     available: bool = Field(default=True, description="Whether product summary loaded successfully")
     unavailable_reason: Optional[str] = Field(default=None, description="Reason when summary is unavailable")
+    stale: bool = Field(default=False, description="Whether this is the previous result, served because the loader missed its deadline")
     version: Optional[str] = Field(default=None, description="Current product version")
     edition_key: Optional[str] = Field(default=None, description="Current edition key")
     edition_name: Optional[str] = Field(default=None, description="Current edition display name")
@@ -37,6 +38,7 @@ class OverviewProductSummary(BaseModel):
 class OverviewHostSummary(BaseModel):
     available: bool = Field(default=True, description="Whether host summary loaded successfully")
     unavailable_reason: Optional[str] = Field(default=None, description="Reason when host summary is unavailable")
+    stale: bool = Field(default=False, description="Whether this is the previous result, served because the loader missed its deadline")
     hostname: Optional[str] = Field(default=None, description="Host name")
     os_name: Optional[str] = Field(default=None, description="Host operating system display name")
     kernel_version: Optional[str] = Field(default=None, description="Host kernel version")
@@ -48,6 +50,7 @@ class OverviewHostSummary(BaseModel):
 class OverviewRuntimeSummary(BaseModel):
     available: bool = Field(default=True, description="Whether runtime resource summary loaded successfully")
     unavailable_reason: Optional[str] = Field(default=None, description="Reason when runtime summary is unavailable")
+    stale: bool = Field(default=False, description="Whether this is the previous result, served because the loader missed its deadline")
     runtime_scope: Literal["container", "system"] = Field(default="system", description="Whether runtime metrics were sourced from cgroup/container scope or system scope")
     health_state: Literal["healthy", "warning", "critical"] = Field(default="healthy", description="Overall runtime health state")
     cpu_percent: Optional[float] = Field(default=None, description="Approximate CPU load percent")
@@ -63,11 +66,14 @@ class OverviewRuntimeSummary(BaseModel):
     disk_percent: Optional[float] = Field(default=None, description="Current root filesystem usage percent")
     disk_used_bytes: Optional[int] = Field(default=None, description="Current root filesystem used bytes")
     disk_total_bytes: Optional[int] = Field(default=None, description="Current root filesystem total bytes")
+    disk_read_rate_bytes: Optional[int] = Field(default=None, description="Current disk read rate in bytes per second across physical disks")
+    disk_write_rate_bytes: Optional[int] = Field(default=None, description="Current disk write rate in bytes per second across physical disks")
 
 
 class OverviewAppsSummary(BaseModel):
     available: bool = Field(default=True, description="Whether app summary loaded successfully")
     unavailable_reason: Optional[str] = Field(default=None, description="Reason when app summary is unavailable")
+    stale: bool = Field(default=False, description="Whether this is the previous result, served because the loader missed its deadline")
     installed_count: int = Field(default=0, description="Installed app count")
     active_count: int = Field(default=0, description="Active app count")
     inactive_count: int = Field(default=0, description="Inactive app count")
@@ -79,6 +85,7 @@ class OverviewAppsSummary(BaseModel):
 class OverviewServicesSummary(BaseModel):
     available: bool = Field(default=True, description="Whether service summary loaded successfully")
     unavailable_reason: Optional[str] = Field(default=None, description="Reason when service summary is unavailable")
+    stale: bool = Field(default=False, description="Whether this is the previous result, served because the loader missed its deadline")
     total_count: int = Field(default=0, description="Total bundled services count")
     healthy_count: int = Field(default=0, description="Healthy service count")
     degraded_count: int = Field(default=0, description="Degraded service count")
@@ -89,6 +96,7 @@ class OverviewServicesSummary(BaseModel):
 class OverviewTasksSummary(BaseModel):
     available: bool = Field(default=True, description="Whether task summary loaded successfully")
     unavailable_reason: Optional[str] = Field(default=None, description="Reason when task summary is unavailable")
+    stale: bool = Field(default=False, description="Whether this is the previous result, served because the loader missed its deadline")
     items: list[OverviewTaskItem] = Field(default_factory=list, description="Recent task summary items")
     target_route: str = Field(default="/myapps", description="Default owning module route")
 
@@ -103,3 +111,14 @@ class OverviewResponse(BaseModel):
     services: OverviewServicesSummary
     tasks: OverviewTasksSummary
     alerts: list[OverviewAlert] = Field(default_factory=list, description="Compact homepage alerts")
+    timed_out: list[str] = Field(default_factory=list, description="Loaders that missed their deadline; their sections are stale or unavailable")
+
+
+class OverviewMetricsSeriesResponse(BaseModel):
+    window: str = Field(..., description="Series window, 1h or 24h")
+    interval_seconds: float = Field(..., description="Seconds covered by each point")
+    timestamps: list[str] = Field(default_factory=list, description="End of each point's interval in UTC ISO format, oldest first")
+    series: dict[str, list[Optional[float]]] = Field(
+        default_factory=dict,
+        description="Averaged values per metric, aligned with timestamps; null where no sample was recorded",
+    )
@@ -74,6 +74,49 @@ class RuntimeLogsQuery(BaseModel):
         return current - ALLOWED_TIME_RANGES[self.time_range]
 
 
+class RuntimeLogsSearchQuery(BaseModel):
+    level: Optional[str] = None
+    keyword: Optional[str] = None
+    component: Optional[str] = None
+    time_range: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    before: Optional[int] = Field(default=None, ge=1)
+    limit: int = Field(default=200, ge=1, le=1000)
+
+    @field_validator("level", mode="before")
+    @classmethod
+    def normalize_level(cls, value: Optional[str]) -> Optional[str]:
+        return _normalize_level(value)
+
+    @field_validator("keyword", mode="before")
+    @classmethod
+    def normalize_keyword(cls, value: Optional[str]) -> Optional[str]:
+        return _normalize_keyword(value)
+
+    @field_validator("component", mode="before")
+    @classmethod
+    def normalize_component(cls, value: Optional[str]) -> Optional[str]:
+        normalized = _normalize_keyword(value)
+        return normalized.lower() if normalized else None
+
+    @field_validator("time_range", mode="before")
+    @classmethod
+    def normalize_time_range(cls, value: Optional[str]) -> Optional[str]:
+        return _normalize_time_range(value)
+
+    @field_validator("since", "until", mode="after")
+    @classmethod
+    def normalize_bound(cls, value: Optional[datetime]) -> Optional[datetime]:
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    def lower_bound(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        bounds = [bound for bound in (self.since, RuntimeLogsQuery(time_range=self.time_range).threshold(now)) if bound is not None]
+        return max(bounds) if bounds else None
+
+
 class RuntimeLogsSourceSummary(BaseModel):
     key: str = "runtime-console"
     label: str = "Runtime Console"
@@ -91,4 +134,12 @@ class RuntimeLogsResponse(BaseModel):
 
 
 class RuntimeLogsSourcesResponse(BaseModel):
-    sources: list[RuntimeLogsSourceSummary]
\ No newline at end of file
+    sources: list[RuntimeLogsSourceSummary]
+
+
+class RuntimeLogsSearchResponse(BaseModel):
+    source: str = "runtime-console"
+    entries: list[RuntimeLogEntry]
+    next_cursor: Optional[int] = None
+    # True while the index is still ingesting a backlog, so the newest entries may be missing.
+    indexing: bool = False
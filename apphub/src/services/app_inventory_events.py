@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from src.core.logger import logger
+
+
+COMPOSE_PROJECT_LABEL = "com.docker.compose.project"
+
+# Container actions that change what the apps inventory shows, mapped to the
+# resulting container state. Exec/attach/resize/top events are ignored on
+# purpose: the files helper and terminals generate them constantly.
+_CONTAINER_ACTION_STATES = {
+    "create": "created",
+    "start": "running",
+    "restart": "running",
+    "unpause": "running",
+    "pause": "paused",
+    "die": "exited",
+    "stop": "exited",
+    "oom": "exited",
+}
+_VOLUME_ACTIONS = {"create", "destroy"}
+_NETWORK_ACTIONS = {"create", "destroy", "connect", "disconnect"}
+
+_RECONNECT_BACKOFF_SECONDS = (1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+def _events_enabled() -> bool:
+    return (os.getenv("WEBSOFT9_APPS_EVENT_STREAM", "true") or "").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _build_docker_client():
+    import docker
+
+    return docker.from_env()
+
+
+class AppInventoryEventWatcher:
+    """
+    Keep an in-memory model of compose-project containers up to date from the Docker events stream.
+
+    The model maps each container id to its compose project, state and health. Every event that
+    actually changes the model bumps ``generation``; events that leave it untouched (repeated
+    health probes, exec sessions, events for unlabelled containers) are dropped. Consumers compare
+    generations to decide whether the app inventory needs to be rebuilt at all.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any] = _build_docker_client) -> None:
+        self._client_factory = client_factory
+        self._condition = threading.Condition()
+        self._containers: dict[str, dict[str, Optional[str]]] = {}
+        self._generation = 0
+        self._active = False
+        self._started = False
+        self._stopping = False
+        self._client = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def is_active(self) -> bool:
+        """Whether the events stream is currently connected and the model is trustworthy."""
+        return self._active
+
+    def ensure_started(self) -> None:
+        if self._started or not _events_enabled():
+            return
+        with self._condition:
+            if self._started:
+                return
+            self._started = True
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="apps-inventory-events", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._started = False
+            self._active = False
+            client = self._client
+            self._condition.notify_all()
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def wait_for_change(self, generation: int, timeout: float) -> int:
+        """Block until the generation moves past ``generation`` or ``timeout`` expires."""
+        with self._condition:
+            if self._generation == generation:
+                self._condition.wait(timeout=max(timeout, 0.0))
+            return self._generation
+
+    def get_project_states(self) -> dict[str, dict[str, str]]:
+        """Return ``{project: {container_id: state}}`` for the containers currently known."""
+        with self._condition:
+            projects: dict[str, dict[str, str]] = {}
+            for container_id, container in self._containers.items():
+                projects.setdefault(str(container["project"]), {})[container_id] = str(container["state"] or "")
+            return projects
+
+    def seed(self, containers: list[dict[str, Any]]) -> None:
+        """Replace the model with a container listing (Docker ``/containers/json`` shape)."""
+        snapshot: dict[str, dict[str, Optional[str]]] = {}
+        for container in containers or []:
+            labels = container.get("Labels") or {}
+            project = labels.get(COMPOSE_PROJECT_LABEL)
+            container_id = container.get("Id")
+            if not project or not container_id:
+                continue
+            snapshot[container_id] = {
+                "project": project,
+                "state": str(container.get("State") or "").lower() or None,
+                "health": None,
+            }
+
+        with self._condition:
+            if snapshot != self._containers:
+                self._containers = snapshot
+                self._bump_locked()
+
+    def apply_event(self, event: dict[str, Any]) -> bool:
+        """Apply one decoded Docker event to the model. Returns True when the model changed."""
+        event_type = event.get("Type")
+        action = str(event.get("Action") or "")
+        actor = event.get("Actor") or {}
+        actor_id = actor.get("ID") or event.get("id")
+        attributes = actor.get("Attributes") or {}
+
+        with self._condition:
+            if event_type == "container":
+                changed = self._apply_container_event_locked(actor_id, action, attributes)
+            elif event_type == "volume":
+                changed = action in _VOLUME_ACTIONS
+            elif event_type == "network":
+                changed = self._apply_network_event_locked(action, attributes)
+            else:
+                changed = False
+
+            if changed:
+                self._bump_locked()
+            return changed
+
+    def _apply_container_event_locked(self, container_id: Optional[str], action: str, attributes: dict[str, Any]) -> bool:
+        project = attributes.get(COMPOSE_PROJECT_LABEL)
+        if not container_id or not project:
+            return False
+
+        current = self._containers.get(container_id)
+        if action == "destroy":
+            return self._containers.pop(container_id, None) is not None
+        if action == "rename":
+            return True
+
+        updated = dict(current or {"project": project, "state": None, "health": None})
+        updated["project"] = project
+        if action.startswith("health_status"):
+            updated["health"] = action.split(":", 1)[-1].strip() or None
+        elif action in _CONTAINER_ACTION_STATES:
+            updated["state"] = _CONTAINER_ACTION_STATES[action]
+        else:
+            return False
+
+        if updated == current:
+            return False
+        self._containers[container_id] = updated
+        return True
+
+    def _apply_network_event_locked(self, action: str, attributes: dict[str, Any]) -> bool:
+        if action not in _NETWORK_ACTIONS:
+            return False
+        if action in {"connect", "disconnect"}:
+            return attributes.get("container") in self._containers
+        return True
+
+    def _bump_locked(self) -> None:
+        self._generation += 1
+        self._condition.notify_all()
+
+    def _run(self) -> None:
+        attempt = 0
+        while not self._stopping:
+            try:
+                client = self._client_factory()
+                self._client = client
+                events = client.events(decode=True, filters={"type": ["container", "volume", "network"]})
+                self.seed(client.api.containers(all=True, filters={"label": COMPOSE_PROJECT_LABEL}))
+                self._active = True
+                attempt = 0
+                logger.info("Apps inventory events stream connected")
+                for event in events:
+                    if self._stopping:
+                        break
+                    if isinstance(event, dict):
+                        self.apply_event(event)
+            except Exception as exc:
+                if not self._stopping and attempt == 0:
+                    logger.warning(f"Apps inventory events stream unavailable, falling back to timed refresh: {exc}")
+            finally:
+                was_active = self._active
+                self._active = False
+                if was_active:
+                    # Anything may have happened while disconnected; force consumers to rebuild.
+                    with self._condition:
+                        self._bump_locked()
+                client, self._client = self._client, None
+                if client is not None:
+                    try:
+                        client.close()
+                    except Exception:
+                        pass
+
+            if self._stopping:
+                break
+            delay = _RECONNECT_BACKOFF_SECONDS[min(attempt, len(_RECONNECT_BACKOFF_SECONDS) - 1)]
+            attempt += 1
+            time.sleep(delay)
+
+
+app_inventory_events = AppInventoryEventWatcher()
@@ -18,9 +18,12 @@ import asyncio
 import aiodocker
 import docker
 import asyncio
+import threading
+from collections import OrderedDict
 from typing import Tuple
 from datetime import datetime
 from pathlib import Path
+from src.core.cache import TTLCache, get_cache
 from src.core.config import ConfigManager
 from src.core.envHelper import EnvHelper
 from src.core.exception import CustomException
@@ -28,6 +31,7 @@ from src.schemas.appInstall import appInstall
 from src.schemas.appResponse import AppResponse
 from src.services.common_check import check_apps_number, check_endpointId
 from src.services.git_manager import GitManager
+from src.services.image_pull_scheduler import ImagePullScheduler
 from src.services.gitea_manager import GiteaManager
 from src.services.portainer_manager import PortainerManager
 from src.core.logger import logger
@@ -43,31 +47,38 @@ from src.services.app_status import appInstalling, appInstallingError,start_app_
 
 
 class AppManger:
-    # 简单的类级缓存
-    _cache = {}
-    _cache_timestamps = {}
+    # 类级缓存：应用商店/目录数据（有界 LRU + TTL，并发未命中只加载一次）
     _cache_ttl = 300  # 5分钟缓存
+    _cache = TTLCache("app_manager", max_entries=64, default_ttl=_cache_ttl)
+    # 与 ProxyManager 共享（按名称获取），其增删改会使之失效
+    _proxy_hosts_cache = get_cache("proxy_hosts", max_entries=8, default_ttl=10)
     _missing_stack_containers_error = "No containers were created for this stack."
+    # Container Env is immutable for a container id, so inspect results can be kept until evicted.
+    _container_env_cache: "OrderedDict[str, list[str]]" = OrderedDict()
+    _container_env_cache_lock = threading.Lock()
+    _container_env_cache_size = 512
+    _container_inspect_workers = 8
     
     @classmethod
     def clear_cache(cls):
         """清除所有缓存"""
         cls._cache.clear()
-        cls._cache_timestamps.clear()
+        cls._proxy_hosts_cache.clear()
     
     @classmethod 
     def clear_cache_by_pattern(cls, pattern: str):
-        """根据模式清除缓存"""
-        keys_to_remove = [key for key in cls._cache.keys() if pattern in key]
-        for key in keys_to_remove:
-            cls._cache.pop(key, None)
-            cls._cache_timestamps.pop(key, None)
+        """根据标签清除缓存（available_apps / catalog / locale:<zh|en>）"""
+        cls._cache.invalidate_tag(pattern)
 
-    def _get_capability_flags(self, app_name: str | None) -> tuple[bool, bool]:
+    def _get_capability_flags(self, app_name: str | None, capability_sets: tuple[set[str], set[str]] | None = None) -> tuple[bool, bool]:
         normalized_name = (app_name or "").strip()
         if not normalized_name:
             return False, False
 
+        php_apps, monitor_apps = capability_sets or self._load_capability_sets()
+        return normalized_name in php_apps, normalized_name in monitor_apps
+
+    def _load_capability_sets(self) -> tuple[set[str], set[str]]:
         system_config = ConfigManager("system.ini")
         php_apps = {
             item.strip()
@@ -80,7 +91,7 @@ class AppManger:
             if item.strip()
         }
 
-        return normalized_name in php_apps, normalized_name in monitor_apps
+        return php_apps, monitor_apps
 
     def _parse_app_env(self, app_env: list[str] | None) -> tuple[dict[str, str], str | None, str | None, str | None, str | None, str | bool]:
         app_env_format: dict[str, str] = {}
@@ -158,9 +169,13 @@ class AppManger:
                 proxy_hosts_by_app.setdefault(app_id, []).append(proxy_host)
         return proxy_hosts_by_app
 
+    @classmethod
+    def _get_cached_proxy_hosts(cls) -> list[dict]:
+        return cls._proxy_hosts_cache.get_or_load("proxy_hosts", lambda: ProxyManager().get_proxy_hosts() or [], tags=("proxy_hosts",))
+
     def _get_proxy_hosts_safe(self) -> list[dict]:
         try:
-            return ProxyManager().get_proxy_hosts()
+            return self._get_cached_proxy_hosts()
         except CustomException as exc:
             logger.warning(f"Proxy host listing unavailable during app inventory: {exc.details or exc.message}")
             return []
@@ -170,7 +185,7 @@ class AppManger:
 
     def _get_proxy_host_by_app_safe(self, app_id: str) -> list[dict]:
         try:
-            return ProxyManager().get_proxy_host_by_app(app_id)
+            return [proxy_host for proxy_host in self._get_cached_proxy_hosts() if proxy_host.get("forward_host") == app_id]
         except CustomException as exc:
             logger.warning(f"Proxy host lookup unavailable for app {app_id}: {exc.details or exc.message}")
             return []
@@ -181,12 +196,48 @@ class AppManger:
     def _group_volumes_by_app(self, volumes: list[dict] | None) -> dict[str, list[dict]]:
         volumes_by_app: dict[str, list[dict]] = {}
         for volume in volumes or []:
+            if not isinstance(volume, dict):
+                continue
             labels = volume.get("Labels") or {}
             app_id = labels.get("com.docker.compose.project")
             if isinstance(app_id, str) and app_id:
                 volumes_by_app.setdefault(app_id, []).append(volume)
         return volumes_by_app
 
+    def _find_main_container_id(self, stack_name: str, stack_containers: list[dict] | None) -> str | None:
+        for container in stack_containers or []:
+            if f"/{stack_name}" in container.get("Names", []):
+                return container.get("Id", "") or None
+        return None
+
+    def _get_containers_env(self, portainerManager: PortainerManager, endpointId: int, container_ids: list[str]) -> dict[str, list[str]]:
+        """Resolve container Env for many containers, inspecting only ids missing from the cache."""
+        cls = type(self)
+        envs: dict[str, list[str]] = {}
+        missing_ids: list[str] = []
+        with cls._container_env_cache_lock:
+            for container_id in container_ids:
+                cached_env = cls._container_env_cache.get(container_id)
+                if cached_env is None:
+                    missing_ids.append(container_id)
+                else:
+                    cls._container_env_cache.move_to_end(container_id)
+                    envs[container_id] = cached_env
+
+        if not missing_ids:
+            return envs
+
+        inspected = portainerManager.get_containers_by_ids(endpointId, missing_ids, max_workers=cls._container_inspect_workers)
+        with cls._container_env_cache_lock:
+            for container_id, container_info in inspected.items():
+                app_env = (container_info.get("Config") or {}).get("Env") or []
+                envs[container_id] = app_env
+                cls._container_env_cache[container_id] = app_env
+                cls._container_env_cache.move_to_end(container_id)
+            while len(cls._container_env_cache) > cls._container_env_cache_size:
+                cls._container_env_cache.popitem(last=False)
+        return envs
+
     def _normalize_locale(self, locale: str | None) -> str:
         normalized_locale = (locale or "en").strip().lower()
         return "zh" if normalized_locale.startswith("zh") else "en"
@@ -569,12 +620,19 @@ class AppManger:
         """
         try:
             normalized_locale = self._normalize_locale(locale)
-            app_media_path = self._ensure_media_asset(f"catalog_{normalized_locale}.json")
-            
-            # Get the app catalog list
-            with open(app_media_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data
+
+            def load_catalog():
+                app_media_path = self._ensure_media_asset(f"catalog_{normalized_locale}.json")
+
+                # Get the app catalog list
+                with open(app_media_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+
+            return self._cache.get_or_load(
+                f"catalog_{normalized_locale}",
+                load_catalog,
+                tags=("catalog", f"locale:{normalized_locale}"),
+            )
         except (CustomException,Exception) as e:
             logger.error(f"Get app'catalog error:{e}")
             raise CustomException()
@@ -592,80 +650,75 @@ class AppManger:
         
         # 缓存检查 - 包含配置信息在key中
         cache_key = f"available_apps_{normalized_locale}_{initial_apps or 'all'}"
-        current_time = time.time()
+        try:
+            return self._cache.get_or_load(
+                cache_key,
+                lambda: self._load_available_apps(normalized_locale, initial_apps),
+                tags=("available_apps", f"locale:{normalized_locale}"),
+            )
+        except (CustomException,Exception) as e:
+            logger.error(f"Get available apps error:{e}")
+            raise CustomException()
+
+    def _load_available_apps(self, normalized_locale: str, initial_apps: str | None) -> list[dict]:
+        """Build the available apps list from the media catalog and app library .env files."""
+        # 预先读取所有配置，避免重复读取
+        config_manager = ConfigManager("system.ini")
+        app_lib_path = config_manager.get_value("docker_library", "path")
+        app_media_path = self._ensure_media_asset(f"product_{normalized_locale}.json")
         
-        # 检查缓存是否存在且未过期
-        if (cache_key in self._cache and 
-            cache_key in self._cache_timestamps and 
-            current_time - self._cache_timestamps[cache_key] < self._cache_ttl):
-            return self._cache[cache_key]
+        # Get the app available list
+        with open(app_media_path, "r", encoding='utf-8') as f:
+            data = json.load(f)
         
-        try:
-            # 预先读取所有配置，避免重复读取
-            config_manager = ConfigManager("system.ini")
-            app_lib_path = config_manager.get_value("docker_library", "path")
-            app_media_path = self._ensure_media_asset(f"product_{normalized_locale}.json")
-            
-            # Get the app available list
-            with open(app_media_path, "r", encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # 使用已获取的配置，避免重复读取
-            app_keys_filter = set(initial_apps.split(",")) if initial_apps else None
-            
-            # 如果有过滤条件，先过滤数据，减少后续处理量
-            if app_keys_filter:
-                data = [item for item in data if item.get("key") in app_keys_filter]
-            
-            # 关键优化：批量收集需要处理的环境文件路径
-            env_files_to_read = []
-            item_key_map = {}  # 建立索引映射
-            
-            for item in data:
-                key = item.get("key")
-                if key:
-                    env_path = f"{app_lib_path}/{key}/.env"
-                    if os.path.exists(env_path):
-                        env_files_to_read.append(env_path)
-                        item_key_map[env_path] = item
-                    else:
-                        # 文件不存在时直接设置默认值
-                        item["settings"] = {}
-                        item["is_web_app"] = False
-            
-            # 批量解析环境变量内容 - 使用EnvHelper的dotenv_values方法
-            for env_path in env_files_to_read:
-                item = item_key_map[env_path]
-                try:
-                    # 使用EnvHelper读取环境变量，自动处理引号等问题
-                    env_helper = EnvHelper(env_path)
-                    all_values = env_helper.get_all_values()
-                    
-                    # 检查是否为web应用
-                    is_web_app = "W9_URL" in all_values
-                    
-                    # 只获取以_SET结尾且以W9_开头的变量
-                    settings = {key: value for key, value in all_values.items() 
-                               if key.endswith("_SET") and key.startswith("W9_")}
-                    
-                    item["settings"] = settings
-                    item["is_web_app"] = is_web_app
-                except Exception as e:
-                    logger.warning(f"Failed to process env file {env_path}: {e}")
+        # 使用已获取的配置，避免重复读取
+        app_keys_filter = set(initial_apps.split(",")) if initial_apps else None
+        
+        # 如果有过滤条件，先过滤数据，减少后续处理量
+        if app_keys_filter:
+            data = [item for item in data if item.get("key") in app_keys_filter]
+        
+        # 关键优化：批量收集需要处理的环境文件路径
+        env_files_to_read = []
+        item_key_map = {}  # 建立索引映射
+        
+        for item in data:
+            key = item.get("key")
+            if key:
+                env_path = f"{app_lib_path}/{key}/.env"
+                if os.path.exists(env_path):
+                    env_files_to_read.append(env_path)
+                    item_key_map[env_path] = item
+                else:
+                    # 文件不存在时直接设置默认值
                     item["settings"] = {}
                     item["is_web_app"] = False
+        
+        # 批量解析环境变量内容 - 使用EnvHelper的dotenv_values方法
+        for env_path in env_files_to_read:
+            item = item_key_map[env_path]
+            try:
+                # 使用EnvHelper读取环境变量，自动处理引号等问题
+                env_helper = EnvHelper(env_path)
+                all_values = env_helper.get_all_values()
+                
+                # 检查是否为web应用
+                is_web_app = "W9_URL" in all_values
+                
+                # 只获取以_SET结尾且以W9_开头的变量
+                settings = {key: value for key, value in all_values.items() 
+                           if key.endswith("_SET") and key.startswith("W9_")}
+                
+                item["settings"] = settings
+                item["is_web_app"] = is_web_app
+            except Exception as e:
+                logger.warning(f"Failed to process env file {env_path}: {e}")
+                item["settings"] = {}
+                item["is_web_app"] = False
 
-            data = [self._normalize_available_app_media(item, normalized_locale) for item in data if isinstance(item, dict)]
-            
-            # 缓存结果
-            self._cache[cache_key] = data
-            self._cache_timestamps[cache_key] = current_time
-            
-            return data
-            
-        except (CustomException,Exception) as e:
-            logger.error(f"Get available apps error:{e}")
-            raise CustomException()
+        data = [self._normalize_available_app_media(item, normalized_locale) for item in data if isinstance(item, dict)]
+        
+        return data
 
     def _get_available_app_logo_map(self, locale: str | None) -> dict[str, str]:
         normalized_locale = self._normalize_locale(locale)
@@ -675,6 +728,17 @@ class AppManger:
             logger.warning(f"Failed to resolve available app logos for locale {normalized_locale}: {exc}")
             return {}
 
+        # 与 available apps 列表共用标签，列表失效时映射一并失效
+        initial_apps = ConfigManager("config.ini").get_value("initial_apps", "keys")
+        cache_key = f"available_app_logos_{normalized_locale}_{initial_apps or 'all'}"
+        return self._cache.get_or_load(
+            cache_key,
+            lambda: self._build_available_app_logo_map(available_apps),
+            tags=("available_apps", f"locale:{normalized_locale}"),
+        )
+
+    @staticmethod
+    def _build_available_app_logo_map(available_apps: list[dict] | None) -> dict[str, str]:
         logo_map: dict[str, str] = {}
         for item in available_apps or []:
             if not isinstance(item, dict):
@@ -802,8 +866,12 @@ class AppManger:
             apps_info = []
             logo_map = self._get_available_app_logo_map(locale)
             # Get the stacks by endpointId from portainer
+            # Build the app list from one inventory snapshot: a single stacks,
+            # containers and volumes listing instead of per-stack requests.
             stacks = portainerManager.get_stacks(endpointId)
             all_containers = portainerManager.get_containers(endpointId)
+            volumes_by_app = self._group_volumes_by_app(portainerManager.get_volumes(endpointId, False))
+            capability_sets = self._load_capability_sets()
             proxy_hosts_by_app = self._group_proxy_hosts_by_app(self._get_proxy_hosts_safe())
             install_errors_by_app_id = {
                 app.get("app_id"): (app_uuid, app)
@@ -824,6 +892,18 @@ class AppManger:
                 if isinstance(container_project, str) and container_project:
                     containers_by_project.setdefault(container_project, []).append(container)
 
+            # Only the main container of each running stack needs a full inspect (for its Env);
+            # issue those concurrently and serve repeat refreshes from the container env cache.
+            main_container_ids: dict[str, str] = {}
+            for stack in stacks:
+                stack_name = stack.get("Name")
+                if stack_name is None or stack.get("Status", 0) != 1:
+                    continue
+                main_container_id = self._find_main_container_id(stack_name, containers_by_project.get(stack_name))
+                if main_container_id:
+                    main_container_ids[stack_name] = main_container_id
+            main_container_envs = self._get_containers_env(portainerManager, endpointId, list(main_container_ids.values()))
+
             for stack in stacks:
                 stack_name = stack.get("Name",None)
                 if stack_name is not None:
@@ -839,22 +919,16 @@ class AppManger:
                     stack_containers = containers_by_project.get(stack_name, [])
                     stack_status, stack_error = self._resolve_stack_runtime_state(stack_status, stack_containers)
                     display_error = self._resolve_display_error(stack_name, stack_error)
-                    stack_volumes = portainerManager.get_volumes_by_stack_name(stack_name, endpointId, False)
+                    stack_volumes = volumes_by_app.get(stack_name, [])
 
                     if stack_status == 1 and stack_containers and not stack_error and stack_name in install_errors_by_app_id:
                         remove_app_from_errors_by_app_id(stack_name)
                         install_errors_by_app_id.pop(stack_name, None)
 
                     if stack_status == 1 and stack_containers:
-                        main_container_id = None
-                        for container in stack_containers:
-                            if f"/{stack_name}" in container.get("Names", []):
-                                main_container_id = container.get("Id", "")
-                                break
-
-                        if main_container_id:
-                            main_container_info = portainerManager.get_container_by_id(endpointId, main_container_id)
-                            app_env = main_container_info.get("Config", {}).get("Env", [])
+                        main_container_id = main_container_ids.get(stack_name)
+                        if main_container_id and main_container_id in main_container_envs:
+                            app_env = main_container_envs[main_container_id]
                             app_env_format, app_name, app_dist, app_version, w9_url, w9_url_replace = self._parse_app_env(app_env)
                             domain_names = self._enrich_proxy_hosts(domain_names, w9_url_replace, w9_url)
 
@@ -863,7 +937,7 @@ class AppManger:
                     if not app_name and gitConfig:
                         app_name = self._read_app_name_from_gitea_env(stack_name)
 
-                    is_php_app, is_monitor_app = self._get_capability_flags(app_name)
+                    is_php_app, is_monitor_app = self._get_capability_flags(app_name, capability_sets)
 
                     # Compose apps are deployed via the compose editor (have
                     # GitConfig) but lack the W9_APP_NAME env var that store
@@ -2472,44 +2546,11 @@ class AppManger:
         # Initialize Docker client with host's Docker socket
         docker_client = docker.DockerClient(base_url='unix://var/run/docker.sock')
 
-        def pull_image(image):
-            success = False  # 标志位，跟踪是否成功拉取镜像
-            try:
-                logger.access(f"Pulling image: {image}")
-                # Try pulling the image directly first
-                for line in docker_client.api.pull(image, stream=True, decode=True):
-                    add_installing_logs(app_uuid,"Pulling docker image",line)
-                success = True  # 成功拉取镜像
-                return
-            except Exception as e:
-                pass
-
-            # If direct pull fails, try using accelerators
-            for accelerator in image_accelerators:
-                try:
-                    # Replace the image name with the accelerator URL
-                    accelerated_image = f"{accelerator}/{image}"
-                    logger.access(f"Pulling image from {accelerator}: {accelerated_image}")
-                    for line in docker_client.api.pull(accelerated_image, stream=True, decode=True):
-                        add_installing_logs(app_uuid,"Pulling docker image",line)
-                    
-                    # Tag the image back to its original name
-                    docker_client.api.tag(accelerated_image, image)
-                    # Remove the accelerated image tag
-                    docker_client.api.remove_image(accelerated_image)
-                    success = True  # 成功拉取镜像
-                    return
-                except docker.errors.APIError as e:
-                    logger.error(f"Failed to pull image from {accelerator}: {e}")
-            
-            if not success:
-                raise CustomException(f"Failed to pull image: {image}")
-
+        images = []
         for yml_file in yml_files:
             with open(yml_file, 'r') as file:
                 compose_content = yaml.safe_load(file)
                 services = compose_content.get('services', {})
-                # for service in services.values():
                 for service_name, service in services.items():
                     if 'build' in service:
                         logger.access(f"Service '{service_name}' has build configuration, skipping image pull.")
@@ -2517,12 +2558,11 @@ class AppManger:
                     image = service.get('image')
                     if image:
                         # Replace environment variables in the image string
-                        image = self._replace_env_variables(image, env_helper)
-                        try:
-                            # Check if the image already exists
-                            logger.access(f"Checking if image exists: {image}")
-                            docker_client.images.get(image)
-                            continue
-                        except docker.errors.ImageNotFound:
-                            logger.access(f"Image not found: {image}")
-                            pull_image(image)
+                        images.append(self._replace_env_variables(image, env_helper))
+
+        # Identical images are pulled once; independent images are pulled in parallel
+        ImagePullScheduler(
+            docker_client,
+            accelerators=image_accelerators,
+            on_progress=lambda line: add_installing_logs(app_uuid, "Pulling docker image", line),
+        ).pull_all(images)
@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.core.exception import CustomException
+from src.core.logger import logger
+from src.services.app_inventory_events import COMPOSE_PROJECT_LABEL, app_inventory_events
+
+
+# The host's cgroup tree and /proc; AppHub needs them mounted (or cgroupns=host) to see other containers.
+HOST_CGROUP_ROOT = os.getenv("WEBSOFT9_HOST_CGROUP_ROOT", "/sys/fs/cgroup")
+HOST_PROC_ROOT = os.getenv("WEBSOFT9_HOST_PROC_ROOT", "/proc")
+# Calls closer together than this reuse the previous collection, so rates are never computed
+# over a few milliseconds.
+APP_METRICS_MIN_INTERVAL_SECONDS = 2.0
+APP_METRICS_SORT_KEYS = {
+    "cpu": ("cpu_percent",),
+    "memory": ("memory_bytes",),
+    "network": ("network_rx_rate_bytes", "network_tx_rate_bytes"),
+    "block": ("block_read_rate_bytes", "block_write_rate_bytes"),
+}
+
+
+@dataclass(frozen=True)
+class _ContainerSample:
+    at_ns: int
+    cpu_ns: Optional[int]
+    memory_bytes: Optional[int]
+    network: Optional[tuple[int, int]]
+    block: Optional[tuple[int, int]]
+
+
+def _build_docker_client():
+    import docker
+
+    return docker.from_env()
+
+
+def _list_running_project_containers() -> dict[str, list[str]]:
+    if app_inventory_events.is_active():
+        return {
+            project: [container_id for container_id, state in containers.items() if state == "running"]
+            for project, containers in app_inventory_events.get_project_states().items()
+        }
+    client = _build_docker_client()
+    try:
+        projects: dict[str, list[str]] = {}
+        for container in client.api.containers(filters={"label": COMPOSE_PROJECT_LABEL, "status": "running"}):
+            project = (container.get("Labels") or {}).get(COMPOSE_PROJECT_LABEL)
+            if project and container.get("Id"):
+                projects.setdefault(project, []).append(container["Id"])
+        return projects
+    finally:
+        client.close()
+
+
+class AppResourceMetricsCollector:
+    """
+    Per-app CPU, memory, network and block I/O usage read straight from cgroup accounting files.
+
+    One collect() call reads a handful of small files per running compose container (cgroup v2
+    cpu.stat, memory.current/memory.stat and io.stat, or the v1 cpuacct, memory and blkio
+    equivalents, plus /proc/<pid>/net/dev of the container's first process) and sums them per
+    compose project, instead of opening one Docker stats stream per container. Rates are the
+    difference to the previous collection; the first one only has totals and gauges.
+    """
+
+    def __init__(
+        self,
+        cgroup_root: str = HOST_CGROUP_ROOT,
+        proc_root: str = HOST_PROC_ROOT,
+        container_lister: Callable[[], dict[str, list[str]]] = _list_running_project_containers,
+        min_interval_seconds: float = APP_METRICS_MIN_INTERVAL_SECONDS,
+    ):
+        self.cgroup_root = Path(cgroup_root)
+        self.proc_root = Path(proc_root)
+        self.min_interval_seconds = min_interval_seconds
+        self._container_lister = container_lister
+        self._lock = threading.Lock()
+        self._samples: dict[str, _ContainerSample] = {}
+        self._cgroup_dirs: dict[str, Optional[dict[str, Path]]] = {}
+        self._last: Optional[tuple[int, dict[str, Any]]] = None
+
+    def collect(self) -> dict[str, Any]:
+        """Return {"collected_at", "interval_seconds", "apps": [usage, ...]} for the local Docker host."""
+        with self._lock:
+            now_ns = time.monotonic_ns()
+            if self._last is not None and now_ns - self._last[0] < self.min_interval_seconds * 1_000_000_000:
+                return self._last[1]
+
+            projects = self._container_lister()
+            previous_samples = self._samples
+            samples: dict[str, _ContainerSample] = {}
+            interval_ns: Optional[int] = None
+            apps = []
+            for project, container_ids in sorted(projects.items()):
+                usage = self._empty_usage(project)
+                for container_id in container_ids:
+                    sample = self._sample_container(container_id)
+                    if sample is None:
+                        continue
+                    samples[container_id] = sample
+                    usage["containers"] += 1
+                    self._add(usage, "memory_bytes", sample.memory_bytes)
+                    if sample.block is not None:
+                        self._add(usage, "block_read_bytes", sample.block[0])
+                        self._add(usage, "block_write_bytes", sample.block[1])
+                    previous = previous_samples.get(container_id)
+                    if previous is not None and sample.at_ns > previous.at_ns:
+                        interval_ns = sample.at_ns - previous.at_ns
+                        self._add_rates(usage, previous, sample)
+                if usage["cpu_percent"] is not None:
+                    usage["cpu_percent"] = round(usage["cpu_percent"], 1)
+                apps.append(usage)
+
+            # Containers that stopped drop out here, so their cgroup paths are looked up again if they return.
+            self._samples = samples
+            self._cgroup_dirs = {container_id: self._cgroup_dirs.get(container_id) for container_id in samples}
+            result = {
+                "collected_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "interval_seconds": round(interval_ns / 1_000_000_000, 2) if interval_ns else None,
+                "apps": apps,
+            }
+            self._last = (now_ns, result)
+            return result
+
+    def top(self, sort: str = "cpu", limit: Optional[int] = None) -> dict[str, Any]:
+        """collect() with apps ordered by the sort metric, largest first, cut to limit."""
+        if sort not in APP_METRICS_SORT_KEYS:
+            raise CustomException(400, "Invalid Request", f"sort must be one of: {', '.join(APP_METRICS_SORT_KEYS)}")
+        result = self.collect()
+        keys = APP_METRICS_SORT_KEYS[sort]
+        apps = sorted(result["apps"], key=lambda usage: (-sum(usage.get(key) or 0 for key in keys), usage["app_id"]))
+        return {**result, "sort": sort, "apps": apps[:limit] if limit else apps}
+
+    def _sample_container(self, container_id: str) -> Optional[_ContainerSample]:
+        if self._cgroup_dirs.get(container_id) is None:
+            self._cgroup_dirs[container_id] = self._resolve_cgroup_dirs(container_id)
+        directories = self._cgroup_dirs[container_id]
+        if directories is None:
+            return None
+        try:
+            if "unified" in directories:
+                unified = directories["unified"]
+                cpu_ns = self._read_key_value(unified / "cpu.stat", "usage_usec")
+                cpu_ns = cpu_ns * 1000 if cpu_ns is not None else None
+                memory_bytes = self._working_set(unified / "memory.current", unified / "memory.stat", ("inactive_file",))
+                block = self._read_io_stat(unified / "io.stat")
+                pid = self._first_pid(unified / "cgroup.procs")
+            else:
+                cpu_ns = self._read_int(directories["cpuacct"] / "cpuacct.usage") if "cpuacct" in directories else None
+                memory = directories.get("memory")
+                memory_bytes = (
+                    self._working_set(memory / "memory.usage_in_bytes", memory / "memory.stat", ("total_inactive_file", "inactive_file"))
+                    if memory is not None
+                    else None
+                )
+                blkio = directories.get("blkio")
+                block = (
+                    self._read_blkio(blkio / "blkio.throttle.io_service_bytes_recursive") or self._read_blkio(blkio / "blkio.io_service_bytes_recursive")
+                    if blkio is not None
+                    else None
+                )
+                pid = self._first_pid(next(iter(directories.values())) / "cgroup.procs")
+        except OSError:
+            # The container stopped between listing and reading.
+            self._cgroup_dirs[container_id] = None
+            return None
+        network = self._read_network(pid) if pid is not None else None
+        return _ContainerSample(at_ns=time.monotonic_ns(), cpu_ns=cpu_ns, memory_bytes=memory_bytes, network=network, block=block)
+
+    def _resolve_cgroup_dirs(self, container_id: str) -> Optional[dict[str, Path]]:
+        # systemd cgroup driver first, then the cgroupfs driver layout.
+        scopes = (Path("system.slice") / f"docker-{container_id}.scope", Path("docker") / container_id)
+        if (self.cgroup_root / "cgroup.controllers").exists():
+            for scope in scopes:
+                if (self.cgroup_root / scope / "cgroup.procs").exists():
+                    return {"unified": self.cgroup_root / scope}
+            return None
+        directories = {}
+        for controller in ("cpuacct", "memory", "blkio"):
+            for scope in scopes:
+                candidate = self.cgroup_root / controller / scope
+                if candidate.is_dir():
+                    directories[controller] = candidate
+                    break
+        return directories or None
+
+    def _read_network(self, pid: int) -> Optional[tuple[int, int]]:
+        try:
+            raw = (self.proc_root / str(pid) / "net" / "dev").read_text(encoding="utf-8")
+        except OSError:
+            return None
+        received = transmitted = 0
+        for line in raw.splitlines()[2:]:
+            interface_name, _, payload = line.partition(":")
+            parts = payload.split()
+            if interface_name.strip() in {"", "lo"} or len(parts) < 9:
+                continue
+            try:
+                received += int(parts[0])
+                transmitted += int(parts[8])
+            except ValueError:
+                continue
+        return received, transmitted
+
+    def _working_set(self, usage_path: Path, stat_path: Path, inactive_keys: tuple[str, ...]) -> Optional[int]:
+        usage = self._read_int(usage_path)
+        if usage is None:
+            return None
+        inactive = 0
+        for key in inactive_keys:
+            value = self._read_key_value(stat_path, key)
+            if value is not None:
+                inactive = value
+                break
+        return max(usage - inactive, 0)
+
+    @staticmethod
+    def _read_io_stat(path: Path) -> Optional[tuple[int, int]]:
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        read_bytes = written_bytes = 0
+        for line in raw.splitlines():
+            for field in line.split()[1:]:
+                key, _, value = field.partition("=")
+                if key == "rbytes" and value.isdigit():
+                    read_bytes += int(value)
+                elif key == "wbytes" and value.isdigit():
+                    written_bytes += int(value)
+        return read_bytes, written_bytes
+
+    @staticmethod
+    def _read_blkio(path: Path) -> Optional[tuple[int, int]]:
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        totals = {"Read": 0, "Write": 0}
+        found = False
+        for line in raw.splitlines():
+            parts = line.split()
+            if len(parts) == 3 and parts[1] in totals and parts[2].isdigit():
+                totals[parts[1]] += int(parts[2])
+                found = True
+        return (totals["Read"], totals["Write"]) if found else None
+
+    @staticmethod
+    def _read_int(path: Path) -> Optional[int]:
+        try:
+            return int(path.read_text(encoding="utf-8").strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _read_key_value(path: Path, key: str) -> Optional[int]:
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        for line in raw.splitlines():
+            name, _, value = line.partition(" ")
+            if name == key:
+                try:
+                    return int(value.strip())
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    def _first_pid(path: Path) -> Optional[int]:
+        try:
+            with path.open(encoding="utf-8") as handle:
+                line = handle.readline().strip()
+        except FileNotFoundError:
+            return None
+        return int(line) if line.isdigit() else None
+
+    @staticmethod
+    def _empty_usage(app_id: str) -> dict[str, Any]:
+        return {
+            "app_id": app_id,
+            "containers": 0,
+            "cpu_percent": None,
+            "memory_bytes": None,
+            "network_rx_rate_bytes": None,
+            "network_tx_rate_bytes": None,
+            "block_read_rate_bytes": None,
+            "block_write_rate_bytes": None,
+            "block_read_bytes": None,
+            "block_write_bytes": None,
+        }
+
+    @staticmethod
+    def _add(usage: dict[str, Any], key: str, value: Optional[float]) -> None:
+        if value is not None:
+            usage[key] = (usage[key] or 0) + value
+
+    @classmethod
+    def _add_rates(cls, usage: dict[str, Any], previous: _ContainerSample, current: _ContainerSample) -> None:
+        elapsed_ns = current.at_ns - previous.at_ns
+
+        def rate(before: Optional[int], after: Optional[int]) -> Optional[int]:
+            if before is None or after is None:
+                return None
+            # Counters reset when a container restarts; report no traffic rather than a negative rate.
+            return int(max(after - before, 0) * 1_000_000_000 / elapsed_ns)
+
+        if previous.cpu_ns is not None and current.cpu_ns is not None:
+            cls._add(usage, "cpu_percent", max(current.cpu_ns - previous.cpu_ns, 0) / elapsed_ns * 100)
+        if previous.network is not None and current.network is not None:
+            cls._add(usage, "network_rx_rate_bytes", rate(previous.network[0], current.network[0]))
+            cls._add(usage, "network_tx_rate_bytes", rate(previous.network[1], current.network[1]))
+        if previous.block is not None and current.block is not None:
+            cls._add(usage, "block_read_rate_bytes", rate(previous.block[0], current.block[0]))
+            cls._add(usage, "block_write_rate_bytes", rate(previous.block[1], current.block[1]))
+
+
+app_resource_metrics = AppResourceMetricsCollector()
+
+
+def collect_app_resource_metrics_safely() -> Optional[dict[str, Any]]:
+    """collect() for the apps stream: None instead of an exception when the host is not readable."""
+    try:
+        return app_resource_metrics.collect()
+    except Exception as exc:
+        logger.debug(f"App resource metrics unavailable: {exc}")
+        return None
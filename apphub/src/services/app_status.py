@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import sqlite3
 import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from src.core.env_settings import env_float, env_int
 from src.core.logger import logger, set_tracking_context
+from src.core.sqlite_storage import get_sqlite_storage
 
 
 MAX_SUB_LOGS = 30
 
+
+# Docker pull progress lines are buffered and written in batches: after this many raw lines,
+# or once the oldest buffered line is this old, whichever comes first.
+INSTALL_LOG_FLUSH_LINES = env_int("WEBSOFT9_INSTALL_LOG_FLUSH_LINES", 200, minimum=1)
+INSTALL_LOG_FLUSH_INTERVAL_SECONDS = env_float("WEBSOFT9_INSTALL_LOG_FLUSH_INTERVAL_SECONDS", 1.0, minimum=0.0)
+
 # Increment this when adding a new migration to _run_migrations().
 CURRENT_SCHEMA_VERSION = 1
 
@@ -29,85 +40,95 @@ def _json_dumps(value: Any) -> str:
 class InstallStateStore:
     def __init__(self, data_dir: str | None = None):
         self._lock = threading.RLock()
+        self._revision = 0
+        # tracking_id -> buffered progress lines of the stage currently being written
+        self._pending_logs: dict[str, dict[str, Any]] = {}
+        self._flush_timer: threading.Timer | None = None
         self.reconfigure(data_dir)
 
+    @property
+    def revision(self) -> int:
+        """Counter bumped on every task write, so readers can detect changes without querying."""
+        return self._revision
+
     def reconfigure(self, data_dir: str | None = None) -> None:
         data_root = os.getenv("WEBSOFT9_DATA_ROOT", "/opt/websoft9/data")
         base_dir = data_dir or os.getenv("WEBSOFT9_INSTALL_TRACKING_DIR") or f"{data_root}/config/apphub"
-        self.data_dir = Path(base_dir)
-        self.database_file = self.data_dir / "install-tracking.sqlite"
+        with self._lock:
+            if getattr(self, "database_file", None) is not None:
+                self._flush_all_pending_locked()
+            self.data_dir = Path(base_dir)
+            self.database_file = self.data_dir / "install-tracking.sqlite"
         self._ensure_storage()
+        with self._lock:
+            self._revision += 1
 
     def _db_connect(self) -> sqlite3.Connection:
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        connection = sqlite3.connect(self.database_file, timeout=30)
-        connection.row_factory = sqlite3.Row
-        connection.execute("PRAGMA journal_mode=WAL")
-        connection.execute("PRAGMA foreign_keys=ON")
-        return connection
+        return get_sqlite_storage(self.database_file).connect()
 
     def _ensure_storage(self) -> None:
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        with self._db_connect() as connection:
-            connection.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS install_tasks (
-                    tracking_id TEXT PRIMARY KEY,
-                    app_id TEXT NOT NULL,
-                    app_name TEXT,
-                    app_official INTEGER NOT NULL DEFAULT 1,
-                    status INTEGER NOT NULL,
-                    error TEXT,
-                    reserved_ports TEXT NOT NULL DEFAULT '[]',
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS install_stages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    tracking_id TEXT NOT NULL,
-                    stage_name TEXT NOT NULL,
-                    stage_order INTEGER NOT NULL,
-                    started_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    UNIQUE(tracking_id, stage_name),
-                    FOREIGN KEY (tracking_id) REFERENCES install_tasks(tracking_id) ON DELETE CASCADE
-                );
-
-                CREATE TABLE IF NOT EXISTS install_stage_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    stage_id INTEGER NOT NULL,
-                    entry_order INTEGER NOT NULL,
-                    level TEXT NOT NULL DEFAULT 'info',
-                    message TEXT NOT NULL,
-                    raw_payload TEXT,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY (stage_id) REFERENCES install_stages(id) ON DELETE CASCADE
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_install_tasks_status ON install_tasks(status);
-                CREATE INDEX IF NOT EXISTS idx_install_stages_tracking_id ON install_stages(tracking_id, stage_order);
-                CREATE INDEX IF NOT EXISTS idx_install_stage_logs_stage_id ON install_stage_logs(stage_id, entry_order);
-
-                CREATE TABLE IF NOT EXISTS app_custom_fields (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    app_id TEXT NOT NULL,
-                    field_name TEXT NOT NULL,
-                    field_value TEXT NOT NULL DEFAULT '',
-                    field_type TEXT NOT NULL DEFAULT 'text',
-                    sort_order INTEGER NOT NULL DEFAULT 0,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                );
-                CREATE INDEX IF NOT EXISTS idx_app_custom_fields_app_id ON app_custom_fields(app_id);
-
-                CREATE TABLE IF NOT EXISTS schema_version (
-                    version INTEGER NOT NULL
-                );
-                """
-            )
-            self._run_migrations(connection)
-            connection.commit()
+        get_sqlite_storage(self.database_file).ensure_schema("install_state", self._initialize_schema)
+
+    def _initialize_schema(self, connection: sqlite3.Connection) -> None:
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS install_tasks (
+                tracking_id TEXT PRIMARY KEY,
+                app_id TEXT NOT NULL,
+                app_name TEXT,
+                app_official INTEGER NOT NULL DEFAULT 1,
+                status INTEGER NOT NULL,
+                error TEXT,
+                reserved_ports TEXT NOT NULL DEFAULT '[]',
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS install_stages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tracking_id TEXT NOT NULL,
+                stage_name TEXT NOT NULL,
+                stage_order INTEGER NOT NULL,
+                started_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                UNIQUE(tracking_id, stage_name),
+                FOREIGN KEY (tracking_id) REFERENCES install_tasks(tracking_id) ON DELETE CASCADE
+            );
+
+            CREATE TABLE IF NOT EXISTS install_stage_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                stage_id INTEGER NOT NULL,
+                entry_order INTEGER NOT NULL,
+                level TEXT NOT NULL DEFAULT 'info',
+                message TEXT NOT NULL,
+                raw_payload TEXT,
+                created_at TEXT NOT NULL,
+                FOREIGN KEY (stage_id) REFERENCES install_stages(id) ON DELETE CASCADE
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_install_tasks_status ON install_tasks(status);
+            CREATE INDEX IF NOT EXISTS idx_install_stages_tracking_id ON install_stages(tracking_id, stage_order);
+            CREATE INDEX IF NOT EXISTS idx_install_stage_logs_stage_id ON install_stage_logs(stage_id, entry_order);
+
+            CREATE TABLE IF NOT EXISTS app_custom_fields (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                app_id TEXT NOT NULL,
+                field_name TEXT NOT NULL,
+                field_value TEXT NOT NULL DEFAULT '',
+                field_type TEXT NOT NULL DEFAULT 'text',
+                sort_order INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_app_custom_fields_app_id ON app_custom_fields(app_id);
+
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER NOT NULL
+            );
+            """
+        )
+        self._run_migrations(connection)
+        connection.commit()
 
     # ── Schema migrations (versioned, data-safe) ──────────────────────
 
@@ -258,6 +279,8 @@ class InstallStateStore:
     def create_task(self, app_id: str, app_name: str | None, tracking_id: str | None = None, reserved_ports: Any = None, status: int = 3, app_official: bool = True, error: str | None = None, logs: list[dict[str, Any]] | None = None) -> str:
         tracking_id = tracking_id or str(uuid.uuid4())
         now = _utc_now()
+        with self._lock:
+            self._pending_logs.pop(tracking_id, None)
         with self._lock, self._db_connect() as connection:
             connection.execute(
                 """
@@ -293,22 +316,108 @@ class InstallStateStore:
                             (stage_row["id"], entry_order, level, message, raw_payload, _utc_now()),
                         )
             connection.commit()
+            self._revision += 1
         return tracking_id
 
     def append_log(self, tracking_id: str, stage_name: str, log: Any) -> None:
+        if self._is_progress_log(log):
+            self._buffer_progress_log(tracking_id, stage_name, log)
+            return
+
+        with self._lock:
+            self._flush_pending_locked(tracking_id)
+            self._write_logs(tracking_id, stage_name, [log])
+
+    def flush_pending_logs(self) -> None:
+        """Write every buffered progress line now."""
+        with self._lock:
+            self._flush_all_pending_locked()
+
+    @staticmethod
+    def _is_progress_log(log: Any) -> bool:
+        # Docker pull/push stream lines; stage markers and plain messages are written immediately.
+        return isinstance(log, dict) and "error" not in log and "errorDetail" not in log
+
+    def _buffer_progress_log(self, tracking_id: str, stage_name: str, log: dict[str, Any]) -> None:
+        with self._lock:
+            pending = self._pending_logs.get(tracking_id)
+            if pending is not None and pending["stage"] != stage_name:
+                self._flush_pending_locked(tracking_id)
+                pending = None
+            if pending is None:
+                pending = {
+                    "stage": stage_name,
+                    "entries": OrderedDict(),
+                    "raw_count": 0,
+                    "started_at": time.monotonic(),
+                }
+                self._pending_logs[tracking_id] = pending
+
+            # Layer progress ("Downloading", "Extracting", ...) collapses to the latest line per layer id.
+            layer_id = log.get("id")
+            entry_key = ("layer", str(layer_id)) if layer_id not in (None, "") else ("line", pending["raw_count"])
+            pending["entries"].pop(entry_key, None)
+            pending["entries"][entry_key] = log
+            pending["raw_count"] += 1
+
+            if (
+                pending["raw_count"] >= INSTALL_LOG_FLUSH_LINES
+                or time.monotonic() - pending["started_at"] >= INSTALL_LOG_FLUSH_INTERVAL_SECONDS
+            ):
+                self._flush_pending_locked(tracking_id)
+            else:
+                self._schedule_flush_locked()
+
+    def _schedule_flush_locked(self) -> None:
+        if self._flush_timer is not None:
+            return
+        timer = threading.Timer(INSTALL_LOG_FLUSH_INTERVAL_SECONDS, self._on_flush_timer)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+
+    def _on_flush_timer(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+            try:
+                self._flush_all_pending_locked()
+            except Exception as exc:
+                logger.warning(f"Failed to flush buffered install logs: {exc}")
+
+    def _flush_all_pending_locked(self) -> None:
+        for tracking_id in list(self._pending_logs):
+            self._flush_pending_locked(tracking_id)
+
+    def _flush_pending_locked(self, tracking_id: str) -> None:
+        pending = self._pending_logs.pop(tracking_id, None)
+        if pending is None or not pending["entries"]:
+            return
+        self._write_logs(tracking_id, pending["stage"], list(pending["entries"].values()))
+
+    def _write_logs(self, tracking_id: str, stage_name: str, logs: list[Any]) -> None:
+        """Append logs to a stage in one transaction, trimming the stage to MAX_SUB_LOGS."""
+        now = _utc_now()
+        messages: list[str] = []
         with self._lock, self._db_connect() as connection:
             stage_row = self._ensure_stage(connection, tracking_id, stage_name)
-            message, raw_payload, level = self._serialize_log_payload(log)
-            now = _utc_now()
-
-            if message != "" or raw_payload not in (None, '""'):
+            rows = []
+            for log in logs:
+                message, raw_payload, level = self._serialize_log_payload(log)
+                messages.append(message)
+                if message != "" or raw_payload not in (None, '""'):
+                    rows.append((level, message, raw_payload))
+
+            if rows:
                 next_order = connection.execute(
                     "SELECT COALESCE(MAX(entry_order), 0) + 1 AS next_order FROM install_stage_logs WHERE stage_id = ?",
                     (stage_row["id"],),
                 ).fetchone()["next_order"]
-                connection.execute(
+                connection.executemany(
                     "INSERT INTO install_stage_logs (stage_id, entry_order, level, message, raw_payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
-                    (stage_row["id"], next_order, level, message, raw_payload, now),
+                    [
+                        (stage_row["id"], next_order + offset, level, message, raw_payload, now)
+                        for offset, (level, message, raw_payload) in enumerate(rows)
+                    ],
                 )
 
                 overflow_rows = connection.execute(
@@ -326,26 +435,33 @@ class InstallStateStore:
                 (now, tracking_id),
             )
             connection.commit()
+            self._revision += 1
 
         set_tracking_context(tracking_id=tracking_id, stage=stage_name)
-        logger.install(message or f"Stage entered: {stage_name}")
+        for message in messages:
+            logger.install(message or f"Stage entered: {stage_name}")
         set_tracking_context()
 
     def update_task_status(self, tracking_id: str, status: int, error: str | None = None) -> None:
         with self._lock, self._db_connect() as connection:
+            self._flush_pending_locked(tracking_id)
             connection.execute(
                 "UPDATE install_tasks SET status = ?, error = ?, updated_at = ? WHERE tracking_id = ?",
                 (status, error, _utc_now(), tracking_id),
             )
             connection.commit()
+            self._revision += 1
 
     def delete_task(self, tracking_id: str) -> None:
         with self._lock, self._db_connect() as connection:
+            self._pending_logs.pop(tracking_id, None)
             connection.execute("DELETE FROM install_tasks WHERE tracking_id = ?", (tracking_id,))
             connection.commit()
+            self._revision += 1
 
     def delete_tasks_by_app_id(self, app_id: str, statuses: tuple[int, ...] | None = None) -> None:
         with self._lock, self._db_connect() as connection:
+            self._flush_all_pending_locked()
             if statuses:
                 placeholders = ", ".join("?" for _ in statuses)
                 connection.execute(
@@ -355,12 +471,14 @@ class InstallStateStore:
             else:
                 connection.execute("DELETE FROM install_tasks WHERE app_id = ?", (app_id,))
             connection.commit()
+            self._revision += 1
 
     def has_task(self, tracking_id: str, statuses: tuple[int, ...] | None = None) -> bool:
         return self.get_task(tracking_id, statuses=statuses) is not None
 
     def get_task(self, tracking_id: str, statuses: tuple[int, ...] | None = None) -> dict[str, Any] | None:
         with self._lock, self._db_connect() as connection:
+            self._flush_pending_locked(tracking_id)
             query = "SELECT * FROM install_tasks WHERE tracking_id = ?"
             params: list[Any] = [tracking_id]
             if statuses:
@@ -374,6 +492,7 @@ class InstallStateStore:
 
     def list_tasks(self, statuses: tuple[int, ...]) -> list[tuple[str, dict[str, Any]]]:
         with self._lock, self._db_connect() as connection:
+            self._flush_all_pending_locked()
             placeholders = ", ".join("?" for _ in statuses)
             rows = connection.execute(
                 f"SELECT * FROM install_tasks WHERE status IN ({placeholders}) ORDER BY created_at ASC",
@@ -503,6 +622,7 @@ class InstallStateCollection:
 
 
 _install_state_store = InstallStateStore()
+atexit.register(_install_state_store.flush_pending_logs)
 appInstalling = InstallStateCollection(_install_state_store, (3,))
 appInstallingError = InstallStateCollection(_install_state_store, (4,))
 
@@ -511,6 +631,10 @@ def configure_install_state_store(data_dir: str | None = None) -> None:
     _install_state_store.reconfigure(data_dir)
 
 
+def get_install_state_revision() -> int:
+    return _install_state_store.revision
+
+
 def start_app_installation(app_id, app_name, app_uuid=None, reserved_ports=None):
     return _install_state_store.create_task(app_id, app_name, tracking_id=app_uuid, reserved_ports=reserved_ports, status=3)
 
@@ -1,17 +1,27 @@
+import re
+import time
 from pathlib import PurePosixPath
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 import docker
 
+from src.core.content_search import SEARCH_MAX_LINE_CHARS, SEARCH_PROGRESS_INTERVAL_SECONDS, SEARCH_TIME_LIMIT_SECONDS, ContentSearchOptions
+from src.core.directory_listing import DirectoryPageRequest, paginate_directory_entries
 from src.core.exception import CustomException
 from src.services.product_auth import ProductAuthService
 
 
 TEXT_FILE_LIMIT_BYTES = 1024 * 1024
+# Page size when the caller does not ask for one; larger directories report truncated=True.
 DIRECTORY_ITEM_LIMIT = 500
+# Entry names passed to one stat exec, well below the exec argument size limit.
+DIRECTORY_STAT_BATCH_SIZE = 200
 
+# Without extra arguments the script lists the type and name of every entry using only shell
+# tests; with entry names after the root it stats just those entries.
 _LIST_DIRECTORY_SCRIPT = r'''dir="$1"
 root="$2"
+shift 2
 if [ ! -d "$root" ]; then
     exit 2
 fi
@@ -26,39 +36,49 @@ if [ ! -d "$PWD" ]; then
     exit 2
 fi
 dir="$PWD"
-printf 'W9B1\0'
-metadata=$(stat -c '%A|%U|%G|%s|%X|%Y|%Z' -- "$dir") || exit 2
-old_ifs=$IFS
-IFS='|'
-set -- $metadata
-IFS=$old_ifs
-[ "$#" -eq 7 ] || exit 2
-printf 'R\0%s\0%s\0%s\0%s\0%s\0%s\0%s\0' "$1" "$2" "$3" "$4" "$5" "$6" "$7"
-count=0
-truncated=false
-for entry in "$dir"/* "$dir"/.[!.]* "$dir"/..?*; do
-    [ -e "$entry" ] || [ -L "$entry" ] || continue
-    [ -L "$entry" ] && continue
-    if [ "$count" -ge "500" ]; then
-        truncated=true
-        break
-    fi
-    name=${entry##*/}
-    metadata=$(stat -c '%A|%U|%G|%s|%X|%Y|%Z' -- "$entry") || continue
+emit_stat() {
+    record="$1"
+    name="$3"
+    has_name=$#
+    metadata=$(stat -c '%A|%U|%G|%s|%X|%Y|%Z' -- "$2") || return 1
     old_ifs=$IFS
     IFS='|'
     set -- $metadata
     IFS=$old_ifs
-    [ "$#" -eq 7 ] || continue
-    if [ -d "$entry" ]; then
-        printf 'D\0%s\0%s\0%s\0%s\0%s\0%s\0%s\0%s\0' "$name" "$1" "$2" "$3" "$4" "$5" "$6" "$7"
-        count=$((count + 1))
-    elif [ -f "$entry" ]; then
-        printf 'F\0%s\0%s\0%s\0%s\0%s\0%s\0%s\0%s\0' "$name" "$1" "$2" "$3" "$4" "$5" "$6" "$7"
-        count=$((count + 1))
+    [ "$#" -eq 7 ] || return 1
+    if [ "$has_name" -ge 3 ]; then
+        printf '%s\0%s\0' "$record" "$name"
+    else
+        printf '%s\0' "$record"
     fi
-done
-printf 'T\0%s\0' "$truncated"
+    printf '%s\0%s\0%s\0%s\0%s\0%s\0%s\0' "$1" "$2" "$3" "$4" "$5" "$6" "$7"
+}
+printf 'W9B1\0'
+emit_stat R "$dir" || exit 2
+if [ "$#" -gt 0 ]; then
+    for name in "$@"; do
+        case "$name" in ''|.|..|*/*) continue ;; esac
+        entry="$dir/$name"
+        [ -L "$entry" ] && continue
+        if [ -d "$entry" ]; then
+            emit_stat D "$entry" "$name"
+        elif [ -f "$entry" ]; then
+            emit_stat F "$entry" "$name"
+        fi
+    done
+else
+    for entry in "$dir"/* "$dir"/.[!.]* "$dir"/..?*; do
+        [ -e "$entry" ] || [ -L "$entry" ] || continue
+        [ -L "$entry" ] && continue
+        name=${entry##*/}
+        if [ -d "$entry" ]; then
+            printf 'd\0%s\0' "$name"
+        elif [ -f "$entry" ]; then
+            printf 'f\0%s\0' "$name"
+        fi
+    done
+fi
+printf 'T\0false\0'
 '''
 
 _READ_TEXT_SCRIPT = r'''file="$1"
@@ -91,24 +111,84 @@ cat "$file_name"
 '''
 
 
+# Application images rarely ship Python, so search runs grep once per file (which also keeps the
+# file name out of grep's own output) and frames each result as P\0<path>\0<grep output>\0.
+# Files without a match only produce S\0 so the caller can count them. find -size rounds up to
+# whole units, so the size limit is passed in bytes: -size -<max_file_bytes + 1>c.
+_SEARCH_SCRIPT = r'''dir="$1"
+root="$2"
+pattern="$3"
+flags="$4"
+max_size="$5"
+include="$6"
+if [ ! -d "$root" ]; then
+    exit 2
+fi
+cd -P -- "$root" || exit 2
+root_dir="$PWD"
+cd -P -- "$dir" || exit 2
+case "$root_dir" in
+    /) ;;
+    *) case "$PWD" in "$root_dir"|"$root_dir"/*) ;; *) exit 2 ;; esac ;;
+esac
+printf 'W9S1\0'
+if [ -n "$include" ]; then
+    find "$PWD" -type f -name "$include" -size -"$max_size"c
+else
+    find "$PWD" -type f -size -"$max_size"c
+fi | while IFS= read -r file; do
+    output=$(grep -n $flags -e "$pattern" -- "$file" 2>/dev/null)
+    if [ -n "$output" ]; then
+        printf 'P\0%s\0%s\0' "${file#"$root_dir"}" "$output"
+    else
+        printf 'S\0'
+    fi
+done
+'''
+_GREP_LINE_PATTERN = re.compile(r"^(\d+)([:-])(.*)$")
+
+
 class AppVolumeBrowseService:
     def __init__(self, docker_client: Optional[Any] = None, auth_service: Optional[ProductAuthService] = None):
         self.docker_client = docker_client
         self.auth_service = auth_service or ProductAuthService()
 
-    def list_directory(self, session_token: Optional[str], app_id: str, volume_id: str, relative_path: str) -> dict[str, Any]:
+    def list_directory(
+        self,
+        session_token: Optional[str],
+        app_id: str,
+        volume_id: str,
+        relative_path: str,
+        page_request: Optional[DirectoryPageRequest] = None,
+    ) -> dict[str, Any]:
         self.auth_service._require_authenticated_operator(session_token)
         volume_name, container, mount_path = self._resolve_container_mount(app_id, volume_id)
         normalized_path = self._normalize_relative_path(relative_path)
-        output = self._exec(container, _LIST_DIRECTORY_SCRIPT, self._join_container_path(mount_path, normalized_path), mount_path)
-        directory, items, truncated = self._parse_directory_output(output, normalized_path)
+        page_request = page_request or DirectoryPageRequest(limit=DIRECTORY_ITEM_LIMIT)
+        target_path = self._join_container_path(mount_path, normalized_path)
+        output = self._exec(container, _LIST_DIRECTORY_SCRIPT, target_path, mount_path)
+        directory, entries, truncated = self._parse_directory_output(output, normalized_path)
+        # The listing only carries names and types; stat everything only when the sort needs it.
+        if page_request.needs_stat:
+            entries = self._stat_entries(container, target_path, mount_path, normalized_path, entries)
+        page = paginate_directory_entries(
+            entries,
+            page_request,
+            name=lambda item: item["name"],
+            is_directory=lambda item: item["item_type"] == "directory",
+            size=lambda item: item["size"],
+            modified=lambda item: item["modified_at"],
+        )
+        items = self._stat_entries(container, target_path, mount_path, normalized_path, page.entries)
         return {
             "volume_name": volume_name,
             "source_container": self._container_name(container),
             "current_path": normalized_path,
             "directory": directory,
-            "truncated": truncated,
+            "truncated": truncated or page.next_cursor is not None,
             "items": items,
+            "next_cursor": page.next_cursor,
+            "total_items": page.total_items,
         }
 
     def read_text_file(self, session_token: Optional[str], app_id: str, volume_id: str, relative_path: str) -> dict[str, Any]:
@@ -129,6 +209,133 @@ class AppVolumeBrowseService:
             "content": content,
         }
 
+    def search_files(
+        self,
+        session_token: Optional[str],
+        app_id: str,
+        volume_id: str,
+        relative_path: str,
+        options: ContentSearchOptions,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Search text files below a volume path inside the application container.
+
+        Returns match/progress/done events as grep finds them; closing the iterator closes the
+        exec stream, which ends the search in the container. regex queries run as grep -E, so
+        they are limited to the syntax Python and POSIX extended expressions share, and grep's
+        matches are checked against the Python pattern like the other search paths.
+        """
+        self.auth_service._require_authenticated_operator(session_token)
+        options.require_posix_compatible()
+        _volume_name, container, mount_path = self._resolve_container_mount(app_id, volume_id)
+        normalized_path = self._normalize_relative_path(relative_path)
+        flags = ["-E" if options.regex else "-F"]
+        if not options.case_sensitive:
+            flags.append("-i")
+        if options.context:
+            flags.append(f"-C{options.context}")
+        command = [
+            "/bin/sh",
+            "-c",
+            _SEARCH_SCRIPT,
+            "websoft9-volume-search",
+            self._join_container_path(mount_path, normalized_path),
+            mount_path,
+            options.query,
+            " ".join(flags),
+            str(options.max_file_bytes + 1),
+            options.include,
+        ]
+        try:
+            result = container.exec_run(command, stream=True)
+        except Exception as exc:
+            raise CustomException(503, "Container Search Failed", f"Failed to search the application container: {exc}")
+        return self._iter_search_events(result.output, options)
+
+    @classmethod
+    def _iter_search_events(cls, chunks: Iterable[bytes], options: ContentSearchOptions) -> Iterator[dict[str, Any]]:
+        started = time.monotonic()
+        last_progress = started
+        counters = {"files_scanned": 0, "files_skipped": 0, "matches": 0}
+        truncated = False
+        timed_out = False
+        fields = cls._iter_nul_fields(chunks)
+        pattern = options.compile()
+        try:
+            if next(fields, None) != b"W9S1":
+                raise CustomException(404, "File Not Found", "The requested path does not exist or cannot be searched")
+            for record_type in fields:
+                if record_type == b"S":
+                    counters["files_scanned"] += 1
+                elif record_type == b"P":
+                    raw_path, raw_output = next(fields, b""), next(fields, b"")
+                    path = "/" + raw_path.decode("utf-8", errors="replace").lstrip("/")
+                    output = raw_output.decode("utf-8", errors="replace")
+                    matches = cls._parse_grep_output(output, options.context, pattern)
+                    # grep reports binary files with a message instead of numbered lines.
+                    counters["files_skipped" if _GREP_LINE_PATTERN.match(output.split("\n", 1)[0]) is None else "files_scanned"] += 1
+                    for match in matches:
+                        counters["matches"] += 1
+                        yield {"type": "match", "path": path, **match}
+                        if counters["matches"] >= options.max_matches:
+                            truncated = True
+                            break
+                else:
+                    raise CustomException(500, "Container Search Failed", "The application container returned an invalid search record")
+                now = time.monotonic()
+                if truncated:
+                    break
+                if now - started > SEARCH_TIME_LIMIT_SECONDS:
+                    timed_out = True
+                    break
+                if now - last_progress >= SEARCH_PROGRESS_INTERVAL_SECONDS:
+                    last_progress = now
+                    yield {"type": "progress", **counters}
+            yield {"type": "done", **counters, "truncated": truncated, "timed_out": timed_out}
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    @staticmethod
+    def _iter_nul_fields(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        buffer = b""
+        for chunk in chunks:
+            buffer += chunk
+            *fields, buffer = buffer.split(b"\x00")
+            yield from fields
+
+    @staticmethod
+    def _parse_grep_output(output: str, context: int, pattern: "re.Pattern[str]") -> list[dict[str, Any]]:
+        """
+        Turn ``grep -n -C`` output of one file into matches with before/after context lines.
+
+        Lines grep selected that the Python pattern does not match are kept as context only.
+        """
+        groups: list[list[tuple[int, bool, str]]] = [[]]
+        for line in output.split("\n"):
+            if line == "--":
+                groups.append([])
+                continue
+            parsed = _GREP_LINE_PATTERN.match(line)
+            if parsed is not None:
+                is_match = parsed.group(2) == ":" and pattern.search(parsed.group(3)) is not None
+                groups[-1].append((int(parsed.group(1)), is_match, parsed.group(3)[:SEARCH_MAX_LINE_CHARS]))
+        matches = []
+        for group in groups:
+            for index, (line_number, is_match, text) in enumerate(group):
+                if not is_match:
+                    continue
+                matches.append(
+                    {
+                        "line_number": line_number,
+                        "line": text,
+                        "before": [item[2] for item in group[max(0, index - context):index]],
+                        "after": [item[2] for item in group[index + 1:index + 1 + context]],
+                    }
+                )
+        return matches
+
     def _resolve_container_mount(self, app_id: str, volume_id: str) -> tuple[str, Any, str]:
         normalized_app_id = str(app_id or "").strip()
         normalized_volume_id = str(volume_id or "").strip()
@@ -169,9 +376,42 @@ class AppVolumeBrowseService:
         matches.sort(key=lambda item: item[0])
         return normalized_volume_id, matches[0][1], matches[0][2]
 
-    def _exec(self, container: Any, script: str, target_path: str, mount_path: str, read_text: bool = False) -> bytes:
+    def _stat_entries(
+        self,
+        container: Any,
+        target_path: str,
+        mount_path: str,
+        current_path: str,
+        entries: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Replace name-only listing records with full stat records; entries gone in between are dropped."""
+        pending = [entry["name"] for entry in entries if "mode" not in entry]
+        if not pending:
+            return list(entries)
+        described: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(pending), DIRECTORY_STAT_BATCH_SIZE):
+            output = self._exec(
+                container,
+                _LIST_DIRECTORY_SCRIPT,
+                target_path,
+                mount_path,
+                arguments=pending[start:start + DIRECTORY_STAT_BATCH_SIZE],
+            )
+            _, batch, _ = self._parse_directory_output(output, current_path)
+            described.update((item["name"], item) for item in batch if "mode" in item)
+        return [entry if "mode" in entry else described[entry["name"]] for entry in entries if "mode" in entry or entry["name"] in described]
+
+    def _exec(
+        self,
+        container: Any,
+        script: str,
+        target_path: str,
+        mount_path: str,
+        read_text: bool = False,
+        arguments: tuple[str, ...] | list[str] = (),
+    ) -> bytes:
         try:
-            result = container.exec_run(["/bin/sh", "-c", script, "websoft9-volume-browse", target_path, mount_path])
+            result = container.exec_run(["/bin/sh", "-c", script, "websoft9-volume-browse", target_path, mount_path, *arguments])
         except Exception as exc:
             raise CustomException(503, "Container Browse Failed", f"Failed to browse the application container: {exc}")
         exit_code = int(getattr(result, "exit_code", 1))
@@ -205,6 +445,17 @@ class AppVolumeBrowseService:
                     raise CustomException(500, "Container Browse Failed", "The application container returned an invalid directory response")
                 truncated = fields[index] == b"true"
                 break
+            if record_type in {b"d", b"f"}:
+                if index >= len(fields):
+                    raise CustomException(500, "Container Browse Failed", "The application container returned an invalid directory record")
+                try:
+                    name = fields[index].decode("utf-8")
+                except UnicodeDecodeError:
+                    raise CustomException(500, "Container Browse Failed", "The application container returned an invalid directory record")
+                index += 1
+                path = f"/{name}" if current_path == "/" else f"{current_path}/{name}"
+                items.append({"name": name, "path": path, "item_type": "directory" if record_type == b"d" else "file"})
+                continue
             if record_type not in {b"D", b"F"}:
                 raise CustomException(500, "Container Browse Failed", "The application container returned an invalid directory record")
             if index + 6 >= len(fields):
@@ -4,26 +4,59 @@ import hashlib
 import json
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from fastapi.encoders import jsonable_encoder
 
 from src.core.logger import logger
 
 
+# While the Docker events stream is connected, inventory changes arrive as events, so the
+# timed rebuild only has to catch state that never produces Docker events (proxy hosts,
+# Portainer stack metadata).
+EVENT_DRIVEN_RESYNC_SECONDS = 30.0
+# Coalesce bursts of events (compose up emits dozens) into one rebuild.
+MIN_REBUILD_INTERVAL_SECONDS = 0.5
+# Number of past snapshots per stream key that delta clients can resume from.
+APPS_STREAM_HISTORY_SIZE = 32
+
+
 @dataclass(frozen=True)
 class AppsStreamSnapshot:
     apps: list[dict[str, Any]]
     digest: str
     event_json: str
     refresh_interval_seconds: float
+    inventory_generation: int = 0
+
+
+@dataclass(frozen=True)
+class AppsStreamDelta:
+    base_digest: str
+    digest: str
+    upserted: int
+    removed: int
+    event_json: str
+
+    @property
+    def is_empty(self) -> bool:
+        return self.upserted == 0 and self.removed == 0
+
+
+def compute_app_key(app: dict[str, Any]) -> str:
+    """Stable identity of an app record in the stream: ``<app_id>:<tracking_id>``."""
+    return f"{app.get('app_id') or ''}:{app.get('tracking_id') or ''}"
 
 
 class AppsStreamCache:
-    def __init__(self) -> None:
+    def __init__(self, inventory_watcher=None, revision_provider: Optional[Callable[[], int]] = None) -> None:
         self._lock = threading.RLock()
         self._entries: dict[tuple[int | None, str], dict[str, Any]] = {}
+        self._history: dict[tuple[int | None, str], OrderedDict[str, dict[str, str]]] = {}
+        self._inventory_watcher = inventory_watcher
+        self._revision_provider = revision_provider
 
     def get_snapshot(
         self,
@@ -33,43 +66,157 @@ class AppsStreamCache:
         force_refresh: bool = False,
     ) -> AppsStreamSnapshot:
         cache_key = (endpoint_id, locale)
+        watcher = self._get_inventory_watcher()
+        watcher.ensure_started()
+        inventory_generation = watcher.generation
+        install_revision = (self._revision_provider or _get_install_state_revision)()
         now = time.monotonic()
 
         with self._lock:
             entry = self._entries.get(cache_key)
             should_refresh = force_refresh or entry is None or now >= entry['next_refresh_at']
+            if not should_refresh and self._has_pending_changes(entry, inventory_generation, install_revision):
+                should_refresh = now - entry['built_at'] >= MIN_REBUILD_INTERVAL_SECONDS
             if not should_refresh:
                 return self._entry_to_snapshot(entry)
 
             try:
                 apps = jsonable_encoder(_build_app_manager().get_apps(endpoint_id, locale))
+                records = self._index_apps(apps)
+                app_digests = {key: self._compute_digest(app) for key, app in records.items()}
                 digest = self._compute_digest(apps)
-                refresh_interval_seconds = self._resolve_refresh_interval_seconds(apps)
-                event_json = json.dumps(
-                    {
-                        'apps': apps,
-                        'digest': digest,
-                        'refresh_hint_ms': int(refresh_interval_seconds * 1000),
-                    },
-                    ensure_ascii=False,
-                    separators=(',', ':'),
-                )
+                refresh_interval_seconds = self._resolve_refresh_interval_seconds(apps, event_driven=watcher.is_active())
+                if entry is not None and entry['digest'] == digest:
+                    event_json = entry['event_json']
+                else:
+                    event_json = json.dumps(
+                        {
+                            'apps': list(records.values()),
+                            'keys': list(records),
+                            'digest': digest,
+                            'refresh_hint_ms': int(refresh_interval_seconds * 1000),
+                        },
+                        ensure_ascii=False,
+                        separators=(',', ':'),
+                    )
+                deltas = entry['deltas'] if entry is not None and entry['digest'] == digest else {}
                 entry = {
                     'apps': apps,
+                    'records': records,
+                    'app_digests': app_digests,
+                    'deltas': deltas,
                     'digest': digest,
                     'event_json': event_json,
                     'refresh_interval_seconds': refresh_interval_seconds,
                     'next_refresh_at': now + refresh_interval_seconds,
+                    'built_at': now,
+                    'inventory_generation': inventory_generation,
+                    'install_revision': install_revision,
                 }
                 self._entries[cache_key] = entry
+                self._remember_digests(cache_key, digest, app_digests)
                 return self._entry_to_snapshot(entry)
             except Exception as exc:
                 if entry is not None:
                     entry['next_refresh_at'] = now + min(float(entry['refresh_interval_seconds']), 5.0)
+                    entry['built_at'] = now
+                    entry['inventory_generation'] = inventory_generation
+                    entry['install_revision'] = install_revision
                     logger.warning(f'Apps stream refresh failed, serving stale snapshot: {exc}')
                     return self._entry_to_snapshot(entry)
                 raise
 
+    def get_delta(self, endpoint_id: Optional[int], locale: str, base_digest: str) -> Optional[AppsStreamDelta]:
+        """
+        Diff the current snapshot against an earlier one the client already holds.
+
+        Returns None when ``base_digest`` is unknown (expired from history or never served), in
+        which case the caller has to fall back to a full snapshot.
+        """
+        cache_key = (endpoint_id, locale)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            base_app_digests = self._history.get(cache_key, OrderedDict()).get(base_digest)
+            if entry is None or base_app_digests is None:
+                return None
+
+            cached = entry['deltas'].get(base_digest)
+            if cached is not None:
+                return cached
+
+            upsert_keys = [
+                key
+                for key in entry['records']
+                if base_app_digests.get(key) != entry['app_digests'][key]
+            ]
+            upserts = [entry['records'][key] for key in upsert_keys]
+            removed = [key for key in base_app_digests if key not in entry['records']]
+            event_json = json.dumps(
+                {
+                    'base_digest': base_digest,
+                    'digest': entry['digest'],
+                    'upserts': upserts,
+                    'upsert_keys': upsert_keys,
+                    'removed': removed,
+                    'refresh_hint_ms': int(float(entry['refresh_interval_seconds']) * 1000),
+                },
+                ensure_ascii=False,
+                separators=(',', ':'),
+            )
+            delta = AppsStreamDelta(
+                base_digest=base_digest,
+                digest=str(entry['digest']),
+                upserted=len(upserts),
+                removed=len(removed),
+                event_json=event_json,
+            )
+            if len(entry['deltas']) >= APPS_STREAM_HISTORY_SIZE:
+                entry['deltas'].pop(next(iter(entry['deltas'])))
+            entry['deltas'][base_digest] = delta
+            return delta
+
+    def has_pending_changes(self, inventory_generation: int) -> bool:
+        """Cheap check used by idle streams: has anything changed since ``inventory_generation``?"""
+        watcher = self._get_inventory_watcher()
+        return watcher.generation != inventory_generation
+
+    def _get_inventory_watcher(self):
+        if self._inventory_watcher is None:
+            from src.services.app_inventory_events import app_inventory_events
+
+            self._inventory_watcher = app_inventory_events
+        return self._inventory_watcher
+
+    def _remember_digests(self, cache_key: tuple[int | None, str], digest: str, app_digests: dict[str, str]) -> None:
+        history = self._history.setdefault(cache_key, OrderedDict())
+        history[digest] = app_digests
+        history.move_to_end(digest)
+        while len(history) > APPS_STREAM_HISTORY_SIZE:
+            history.popitem(last=False)
+
+    @staticmethod
+    def _index_apps(apps: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        # Duplicate identities get a "#N" suffix. Clients must not rebuild these keys themselves:
+        # snapshots and deltas carry them in 'keys' / 'upsert_keys', parallel to the app lists.
+        records: dict[str, dict[str, Any]] = {}
+        for app in apps:
+            if not isinstance(app, dict):
+                continue
+            key = compute_app_key(app)
+            suffix = 1
+            while key in records:
+                suffix += 1
+                key = f"{compute_app_key(app)}#{suffix}"
+            records[key] = app
+        return records
+
+    @staticmethod
+    def _has_pending_changes(entry: dict[str, Any], inventory_generation: int, install_revision: int) -> bool:
+        return (
+            entry.get('inventory_generation') != inventory_generation
+            or entry.get('install_revision') != install_revision
+        )
+
     @staticmethod
     def _entry_to_snapshot(entry: dict[str, Any]) -> AppsStreamSnapshot:
         return AppsStreamSnapshot(
@@ -77,17 +224,20 @@ class AppsStreamCache:
             digest=str(entry['digest']),
             event_json=str(entry['event_json']),
             refresh_interval_seconds=float(entry['refresh_interval_seconds']),
+            inventory_generation=int(entry.get('inventory_generation') or 0),
         )
 
     @staticmethod
-    def _compute_digest(apps: list[dict[str, Any]]) -> str:
+    def _compute_digest(apps: Any) -> str:
         payload = json.dumps(apps, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
         return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
     @staticmethod
-    def _resolve_refresh_interval_seconds(apps: list[dict[str, Any]]) -> float:
+    def _resolve_refresh_interval_seconds(apps: list[dict[str, Any]], event_driven: bool = False) -> float:
         has_installing_app = any(isinstance(app, dict) and app.get('status') == 3 for app in apps)
-        return 3.0 if has_installing_app else 5.0
+        if has_installing_app:
+            return 3.0
+        return EVENT_DRIVEN_RESYNC_SECONDS if event_driven else 5.0
 
 
 def _build_app_manager():
@@ -96,4 +246,10 @@ def _build_app_manager():
     return AppManger()
 
 
-apps_stream_cache = AppsStreamCache()
\ No newline at end of file
+def _get_install_state_revision() -> int:
+    from src.services.app_status import get_install_state_revision
+
+    return get_install_state_revision()
+
+
+apps_stream_cache = AppsStreamCache()
@@ -2,10 +2,12 @@ import json
 import os
 import re
 import subprocess
+import threading
 import time
 import docker
+from hashlib import sha1
 import requests
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from src.core.exception import CustomException
 from src.core.logger import logger
 from src.core.config import ConfigManager
@@ -13,6 +15,19 @@ from src.services.app_manager import AppManger
 from src.services.portainer_manager import PortainerManager
 
 RESTIC_CACHE_PATH = "/data/restic-cache"
+# Long-lived container that runs repository-only commands (cat config, snapshots, forget) via exec.
+RESTIC_RUNNER_NAME = "websoft9-restic-runner"
+RESTIC_RUNNER_SIGNATURE_LABEL = "websoft9.restic-runner.signature"
+# Every Restic container uses the same hostname so restic finds the previous snapshot of the
+# same paths as parent and only rereads changed files.
+RESTIC_HOSTNAME = "websoft9-backup-host"
+RESTIC_PROGRESS_FPS = "2"
+# Restic's message when the repository is missing; it invalidates the cached initialized state.
+RESTIC_MISSING_REPOSITORY_MARKER = "unable to open config file"
+
+# Repository paths known to hold an initialized repository in this process.
+_initialized_repositories: set = set()
+_restic_runner_lock = threading.Lock()
 
 
 def _extract_restic_error(data: Dict[str, Any]) -> str:
@@ -33,6 +48,34 @@ def _extract_restic_error(data: Dict[str, Any]) -> str:
     return data.get("message") or "Unknown Restic error"
 
 
+def _extract_restic_stderr_error(stderr_output: str) -> str:
+    """Pick the error message out of Restic's JSON stderr output."""
+    lines = [line for line in stderr_output.strip().split("\n") if line.strip()]
+    # Restic v0.19+ outputs fatal errors to stderr as JSON with message_type
+    # "exit_error" (top-level "message" key).  Older versions may use "error"
+    # with a nested error.message.
+    for line in lines:
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if (data.get("message_type") or "") in ("exit_error", "fatal_error", "error"):
+            return _extract_restic_error(data)
+    # Fallback: try top-level message from the last JSON line
+    for line in reversed(lines):
+        try:
+            fallback = json.loads(line).get("message")
+        except (json.JSONDecodeError, AttributeError):
+            continue
+        if fallback:
+            return fallback
+    return lines[-1] if lines else "Unknown error"
+
+
+def _decode_output(output: Optional[bytes]) -> str:
+    return output.decode("utf-8", errors="replace") if output else ""
+
+
 def _normalize_mirror(value: str) -> str:
     normalized = value.strip().rstrip("/")
     if normalized.startswith("http://"):
@@ -169,66 +212,111 @@ class BackupManager:
 
         raise CustomException(500, f"Failed to pull {self.restic_image}", "Image Pull Error")
 
-    def _run_restic_container(self, command: List[str], extra_volumes: Dict[str, Dict[str, str]]) -> str:
+    def _run_restic_container(
+        self,
+        command: List[str],
+        extra_volumes: Dict[str, Dict[str, str]],
+        on_line: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Run Restic in a one-off container with extra volume mounts, streaming stdout lines to on_line.
+
+        Progress ("status") lines are passed to on_line but left out of the returned output.
+        """
         self._ensure_restic_image()
 
-        volumes: Dict[str, Dict[str, str]] = {
-            self._resolve_host_path(self.repository_path): {"bind": "/repo", "mode": "rw"},
-            self._resolve_host_path(RESTIC_CACHE_PATH): {"bind": "/root/.cache/restic", "mode": "rw"},
-        }
+        volumes: Dict[str, Dict[str, str]] = self._repository_volumes()
         volumes.update(extra_volumes)
 
+        container = None
         try:
-            result = self.docker_client.containers.run(
+            container = self.docker_client.containers.run(
                 image=self.restic_image,
                 command=["-r", "/repo"] + command + self.RESTIC_LOCAL_ARGS,
                 volumes=volumes,
-                remove=True,
-                detach=False,
-                stdout=True,
-                stderr=True,
+                hostname=RESTIC_HOSTNAME,
+                environment={"RESTIC_PROGRESS_FPS": RESTIC_PROGRESS_FPS},
+                detach=True,
             )
-            output = result.decode("utf-8") if isinstance(result, bytes) else str(result)
-            return output
-        except docker.errors.ContainerError as e:
-            stderr_output = e.stderr.decode("utf-8") if e.stderr else str(e)
-            msg = "Unknown error"
-            # Restic v0.19+ outputs fatal errors to stderr as JSON with
-            # message_type "exit_error" (top-level "message" key).  Older
-            # versions may use "error" with a nested error.message.
-            for line in stderr_output.strip().split("\n"):
-                if not line.strip():
-                    continue
-                try:
-                    data = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                msg_type = data.get("message_type") or ""
-                if msg_type in ("exit_error", "fatal_error"):
-                    msg = data.get("message") or "Fatal Restic error"
-                    break
-                if msg_type == "error":
-                    err_info = data.get("error", {})
-                    if isinstance(err_info, dict):
-                        msg = err_info.get("message") or str(err_info)
-                    else:
-                        msg = str(err_info) if err_info else msg
-                    break
-            if msg == "Unknown error":
-                # Fallback: try top-level message from the last JSON line
-                for line in reversed(stderr_output.strip().split("\n")):
-                    if not line.strip():
-                        continue
-                    try:
-                        fallback = json.loads(line).get("message")
-                        if fallback:
-                            msg = fallback
-                            break
-                    except json.JSONDecodeError:
-                        continue
-            raise CustomException(500, msg, "Restic Container Error")
+            lines: List[str] = []
+            pending = b""
+            for chunk in container.logs(stream=True, follow=True, stdout=True, stderr=False):
+                pending += chunk
+                *complete, pending = pending.split(b"\n")
+                for raw_line in complete:
+                    self._collect_output_line(_decode_output(raw_line), lines, on_line)
+            if pending.strip():
+                self._collect_output_line(_decode_output(pending), lines, on_line)
+
+            exit_code = container.wait().get("StatusCode", 1)
+            if exit_code != 0:
+                stderr_output = _decode_output(container.logs(stdout=False, stderr=True))
+                raise self._restic_failure(stderr_output, "Restic Container Error")
+            return "\n".join(lines)
+        except CustomException:
+            raise
         except Exception as e:
             raise CustomException(500, f"Restic container failed: {e}", "Container Error")
+        finally:
+            if container is not None:
+                try:
+                    container.remove(force=True)
+                except Exception:
+                    pass
+
+    @staticmethod
+    def _collect_output_line(line: str, lines: List[str], on_line: Optional[Callable[[str], None]]) -> None:
+        if not line.strip():
+            return
+        if on_line is not None:
+            on_line(line)
+        if '"message_type":"status"' not in line:
+            lines.append(line)
+
+    def _restic_failure(self, stderr_output: str, details: str) -> CustomException:
+        message = _extract_restic_stderr_error(stderr_output)
+        if RESTIC_MISSING_REPOSITORY_MARKER in message:
+            _initialized_repositories.discard(getattr(self, "repository_path", None))
+        return CustomException(500, message, details)
+
+    def _repository_volumes(self) -> Dict[str, Dict[str, str]]:
+        return {
+            self._resolve_host_path(self.repository_path): {"bind": "/repo", "mode": "rw"},
+            self._resolve_host_path(RESTIC_CACHE_PATH): {"bind": "/root/.cache/restic", "mode": "rw"},
+        }
+
+    def _restic_runner(self):
+        """Return the running Restic runner container, creating or replacing it when needed."""
+        volumes = self._repository_volumes()
+        signature = sha1(json.dumps([self.restic_image, volumes], sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        with _restic_runner_lock:
+            try:
+                container = self.docker_client.containers.get(RESTIC_RUNNER_NAME)
+                if (container.labels or {}).get(RESTIC_RUNNER_SIGNATURE_LABEL) == signature:
+                    if container.status != "running":
+                        container.start()
+                    return container
+                # Image or repository location changed since the runner was created.
+                container.remove(force=True)
+            except docker.errors.NotFound:
+                pass
+
+            self._ensure_restic_image()
+            try:
+                return self.docker_client.containers.run(
+                    image=self.restic_image,
+                    entrypoint=["/bin/sh", "-c", "trap 'exit 0' TERM; while :; do sleep 3600 & wait $!; done"],
+                    name=RESTIC_RUNNER_NAME,
+                    hostname=RESTIC_HOSTNAME,
+                    labels={RESTIC_RUNNER_SIGNATURE_LABEL: signature},
+                    volumes=volumes,
+                    restart_policy={"Name": "unless-stopped"},
+                    detach=True,
+                )
+            except docker.errors.APIError as e:
+                # Another worker process created it first.
+                if getattr(e, "status_code", None) == 409:
+                    return self.docker_client.containers.get(RESTIC_RUNNER_NAME)
+                raise
 
     def _build_restic_volume_mounts(self, volumes_info: List[Dict[str, Any]]) -> tuple[Dict[str, Dict[str, str]], List[str]]:
         extra_volumes: Dict[str, Dict[str, str]] = {}
@@ -247,19 +335,42 @@ class BackupManager:
         return extra_volumes, container_paths
 
     def _run_restic_repo_command(self, command: List[str]) -> str:
-        return self._run_restic_container(command, {})
+        """Run a repository-only Restic command inside the warm runner container."""
+        try:
+            container = self._restic_runner()
+            api = self.docker_client.api
+            exec_id = api.exec_create(
+                container.id,
+                ["restic", "-r", "/repo"] + command + self.RESTIC_LOCAL_ARGS,
+                stdout=True,
+                stderr=True,
+            )["Id"]
+            stdout, stderr = api.exec_start(exec_id, demux=True)
+            if api.exec_inspect(exec_id).get("ExitCode") != 0:
+                raise self._restic_failure(_decode_output(stderr), "Restic Runner Error")
+            return _decode_output(stdout)
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException(500, f"Restic runner failed: {e}", "Container Error")
 
     # ------------------------------------------------------------------
     #  Repository management
     # ------------------------------------------------------------------
     def _check_repository(self) -> bool:
+        repository_path = getattr(self, "repository_path", None)
+        if repository_path and repository_path in _initialized_repositories:
+            return True
         try:
             cfg = json.loads(self._run_restic_repo_command(["cat", "config"]))
-            return bool(cfg.get("id") and cfg.get("version"))
+            initialized = bool(cfg.get("id") and cfg.get("version"))
         except CustomException:
             return False
         except (json.JSONDecodeError, KeyError):
             return False
+        if initialized and repository_path:
+            _initialized_repositories.add(repository_path)
+        return initialized
 
     def _init_repository(self):
         if self._check_repository():
@@ -269,6 +380,8 @@ class BackupManager:
             result = json.loads(output)
             if result.get("message_type") != "initialized":
                 logger.error(f"Unexpected init response: {result}")
+            elif self.repository_path:
+                _initialized_repositories.add(self.repository_path)
         except CustomException as e:
             logger.error(f"Repository init failed: {e}")
             raise
@@ -310,7 +423,12 @@ class BackupManager:
     # ------------------------------------------------------------------
     #  Read-write operations — Docker runner (needs volume mounts)
     # ------------------------------------------------------------------
-    def create_backup(self, app_id: str) -> None:
+    def create_backup(self, app_id: str, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Back up the app's volumes and return Restic's summary.
+
+        on_progress receives each Restic status event (percent_done, bytes_done, total_bytes,
+        seconds_remaining, ...) while the backup runs.
+        """
         try:
             app_info = AppManger().get_app_by_id(app_id)
             volumes_info = getattr(app_info, "volumes", [])
@@ -324,10 +442,10 @@ class BackupManager:
                 self._init_repository()
 
             command = ["backup"] + container_paths + ["--tag", app_id]
-            output = self._run_restic_container(command, extra_volumes)
+            output = self._run_restic_container(command, extra_volumes, self._progress_forwarder(on_progress))
 
             backup_error = None
-            summary_found = False
+            summary: Optional[Dict[str, Any]] = None
             for line in output.strip().split("\n"):
                 if not line.strip():
                     continue
@@ -338,22 +456,38 @@ class BackupManager:
                     continue
                 msg_type = data.get("message_type") or ""
                 if msg_type == "summary" and "snapshot_id" in data:
-                    summary_found = True
+                    summary = data
                 elif msg_type in ("exit_error", "fatal_error", "error"):
                     backup_error = _extract_restic_error(data)
 
             if backup_error:
                 raise CustomException(500, backup_error, f"Restic backup failed for app: {app_id}")
-            if not summary_found:
+            if summary is None:
                 raise CustomException(500, f"Backup incomplete — no summary returned for app: {app_id}", "Backup Failed")
 
             logger.access(f"Backup successful for app: {app_id}")
+            return summary
         except CustomException:
             raise
         except Exception as e:
             logger.error(f"Backup error for app: {app_id}: {e}")
             raise CustomException(500, str(e), "Backup Error")
 
+    @staticmethod
+    def _progress_forwarder(on_progress: Optional[Callable[[Dict[str, Any]], None]]) -> Optional[Callable[[str], None]]:
+        if on_progress is None:
+            return None
+
+        def forward(line: str) -> None:
+            if '"message_type":"status"' not in line:
+                return
+            try:
+                on_progress(json.loads(line))
+            except json.JSONDecodeError:
+                pass
+
+        return forward
+
     def restore_backup(self, app_id: str, snapshot_id: str) -> None:
         try:
             logger.access(f"Restoring snapshot: {snapshot_id}")
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.core.exception import CustomException
+from src.core.logger import logger
+
+
+# Finished jobs kept for late stream subscribers and status lookups.
+BACKUP_JOBS_RETAINED = 50
+# Streams send a heartbeat after this long without a job change.
+BACKUP_STREAM_KEEPALIVE_SECONDS = 15.0
+
+
+def _timestamp_now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@dataclass
+class BackupJob:
+    job_id: str
+    app_id: str
+    status: str = "running"
+    started_at: str = field(default_factory=_timestamp_now)
+    finished_at: Optional[str] = None
+    progress: Optional[Dict[str, Any]] = None
+    summary: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Bumped on every change so streams can tell whether there is something new to send.
+    version: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "app_id": self.app_id,
+            "status": self.status,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "summary": self.summary,
+            "error": self.error,
+        }
+
+
+def _normalize_progress(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a Restic backup status event into percent, throughput and ETA figures."""
+    seconds_elapsed = event.get("seconds_elapsed") or 0
+    bytes_done = event.get("bytes_done") or 0
+    return {
+        "percent_done": round(float(event.get("percent_done") or 0) * 100, 1),
+        "files_done": event.get("files_done") or 0,
+        "total_files": event.get("total_files"),
+        "bytes_done": bytes_done,
+        "total_bytes": event.get("total_bytes"),
+        "throughput_bytes": int(bytes_done / seconds_elapsed) if seconds_elapsed else None,
+        "seconds_elapsed": seconds_elapsed,
+        "seconds_remaining": event.get("seconds_remaining"),
+        "current_files": list(event.get("current_files") or [])[:5],
+    }
+
+
+def _build_backup_manager():
+    from src.services.back_manager import BackupManager
+
+    return BackupManager()
+
+
+class BackupJobTracker:
+    """
+    Runs app backups on background threads and records their progress.
+
+    start() returns immediately with a job; the thread feeds Restic's status events into the
+    job as they arrive. Only one backup per app runs at a time: starting another while one is
+    running returns the running job. stream() follows one job for Server-Sent Events.
+    """
+
+    def __init__(self, manager_factory: Callable[[], Any] = _build_backup_manager):
+        self._manager_factory = manager_factory
+        self._lock = threading.Lock()
+        # Notified on every job change so streams wake up instead of polling.
+        self._changed = threading.Condition(self._lock)
+        self._jobs: "OrderedDict[str, BackupJob]" = OrderedDict()
+
+    def start(self, app_id: str) -> Dict[str, Any]:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.app_id == app_id and job.status == "running":
+                    return job.to_dict()
+            job = BackupJob(job_id=uuid.uuid4().hex, app_id=app_id)
+            self._jobs[job.job_id] = job
+            self._prune_locked()
+            snapshot = job.to_dict()
+        threading.Thread(target=self._run, args=(job.job_id, app_id), name=f"backup-{app_id}", daemon=True).start()
+        return snapshot
+
+    def get(self, job_id: str) -> tuple[Dict[str, Any], int]:
+        """Return (job payload, version) or raise 404."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise CustomException(404, "Backup Job Not Found", f"Backup job {job_id} does not exist")
+            return job.to_dict(), job.version
+
+    def stream(self, job_id: str, keepalive_seconds: float = BACKUP_STREAM_KEEPALIVE_SECONDS) -> Iterator[Dict[str, Any]]:
+        """
+        Return the events of a job: "progress" with the job payload whenever it changes, "heartbeat"
+        after keepalive_seconds without a change, and a final "done" once it has finished.
+
+        An unknown job raises 404 here, before any event; a job pruned while it is being streamed
+        raises the same error from the iterator.
+        """
+        self.get(job_id)
+        return self._iter_events(job_id, keepalive_seconds)
+
+    def _iter_events(self, job_id: str, keepalive_seconds: float) -> Iterator[Dict[str, Any]]:
+        last_version = -1
+        last_sent = time.monotonic()
+        while True:
+            with self._changed:
+                job = self._jobs.get(job_id)
+                if job is not None and job.version == last_version:
+                    self._changed.wait(max(0.0, last_sent + keepalive_seconds - time.monotonic()))
+                    job = self._jobs.get(job_id)
+                if job is None:
+                    raise CustomException(404, "Backup Job Not Found", f"Backup job {job_id} no longer exists")
+                payload, version = job.to_dict(), job.version
+
+            if version != last_version:
+                last_version = version
+                last_sent = time.monotonic()
+                if payload["status"] != "running":
+                    yield {"type": "done", **payload}
+                    return
+                yield {"type": "progress", **payload}
+            elif time.monotonic() - last_sent >= keepalive_seconds:
+                last_sent = time.monotonic()
+                yield {"type": "heartbeat"}
+
+    def _run(self, job_id: str, app_id: str) -> None:
+        try:
+            manager = self._manager_factory()
+            summary = manager.create_backup(app_id, on_progress=lambda event: self._update(job_id, progress=_normalize_progress(event)))
+            self._update(job_id, status="success", summary=summary, finished_at=_timestamp_now())
+        except CustomException as exc:
+            logger.error(f"Backup job {job_id} for app {app_id} failed: {exc.message}")
+            self._update(job_id, status="failed", error=exc.message, finished_at=_timestamp_now())
+        except Exception as exc:
+            logger.error(f"Backup job {job_id} for app {app_id} failed: {exc}")
+            self._update(job_id, status="failed", error=str(exc), finished_at=_timestamp_now())
+
+    def _update(self, job_id: str, **changes: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.version += 1
+            self._changed.notify_all()
+
+    def _prune_locked(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status != "running"]
+        for job_id in finished[: max(len(finished) - BACKUP_JOBS_RETAINED, 0)]:
+            del self._jobs[job_id]
+
+
+backup_jobs = BackupJobTracker()
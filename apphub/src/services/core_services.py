@@ -1,8 +1,9 @@
 import os
 import re
 import subprocess
+import threading
+import time
 from hashlib import sha1
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -11,7 +12,10 @@ from typing import Callable, Optional, Sequence
 import requests
 
 from src.core.exception import CustomException
-from src.schemas.coreServices import CoreServiceSummary, ISO_PREFIX_PATTERN, ServiceIndicator, ServiceLogEntry, ServiceLogsQuery, ServiceLogsResponse
+from src.core.log_tail import iter_lines_reversed, log_time_index
+from src.core.log_tail_multiplexer import LOG_STREAM_AUTH_RECHECK_SECONDS, LogTailSource, LogTailSubscription, log_tail_multiplexer
+from src.schemas.coreServices import CoreServiceSummary, ServiceHealthCheck, ISO_PREFIX_PATTERN, ServiceIndicator, ServiceLogEntry, ServiceLogsQuery, ServiceLogsResponse
+from src.services.core_services_health import SUPERVISOR_SOCKET, ServiceHealthMonitor, ServiceHealthObservation, load_supervisor_statuses
 from src.services.product_auth import ProductAuthService
 
 
@@ -77,21 +81,14 @@ class HealthProbeResult:
     detail: Optional[str] = None
 
 
-@dataclass
-class ServiceLogFileCursor:
-    path: Path
-    device: int
-    inode: int
-    position: int
-
-
 @dataclass
 class ServiceLogsStreamCursor:
     service_key: str
     query: ServiceLogsQuery
+    subscription: LogTailSubscription
+    authenticated_at: float
     entries: list[ServiceLogEntry] = field(default_factory=list)
     unavailable_reason: Optional[str] = None
-    file_cursors: dict[str, ServiceLogFileCursor] = field(default_factory=dict)
 
 
 @dataclass
@@ -162,6 +159,10 @@ DEFAULT_SERVICE_DEFINITIONS = (
 )
 
 
+_default_health_monitor: Optional[ServiceHealthMonitor] = None
+_default_health_monitor_lock = threading.Lock()
+
+
 class CoreServicesService:
     def __init__(
         self,
@@ -170,88 +171,73 @@ class CoreServicesService:
         supervisor_status_loader: Optional[Callable[[], dict[str, str]]] = None,
         health_probe: Optional[Callable[[ServiceDefinition], HealthProbeResult]] = None,
         now_provider: Optional[Callable[[], datetime]] = None,
+        health_monitor: Optional[ServiceHealthMonitor] = None,
     ):
         self.auth_service = auth_service or ProductAuthService()
         self.service_definitions = tuple(service_definitions or DEFAULT_SERVICE_DEFINITIONS)
         self._supervisor_status_loader = supervisor_status_loader or self._load_supervisor_statuses
         self._health_probe = health_probe or self._probe_health
         self._now_provider = now_provider or (lambda: datetime.now(timezone.utc))
+        if health_monitor is None:
+            uses_defaults = service_definitions is None and supervisor_status_loader is None and health_probe is None
+            health_monitor = self._shared_health_monitor() if uses_defaults else self._build_health_monitor(background=False)
+        self._health_monitor = health_monitor
 
     def list_services(self, session_token: Optional[str]) -> list[CoreServiceSummary]:
         self.auth_service._require_authenticated_operator(session_token)
-        statuses = self._safe_load_supervisor_statuses()
+        health = self._health_monitor.snapshot()
         updated_at = self._timestamp_now()
 
         payload: list[CoreServiceSummary] = []
         for definition in self.service_definitions:
-            payload.append(self._build_summary(definition, statuses, updated_at))
+            observation = health.observations.get(definition.key) or ServiceHealthObservation(error="Health not checked yet")
+            payload.append(self._build_summary(definition, health.statuses, observation, updated_at))
         return payload
 
     def get_service_logs(self, session_token: Optional[str], service_key: str, query: ServiceLogsQuery) -> ServiceLogsResponse:
         self.auth_service._require_authenticated_operator(session_token)
         definition = self._get_definition(service_key)
-        entries, unavailable_reason = self._read_service_logs(definition, query.limit)
+        cutoff = None
+        if query.time_range != "all":
+            cutoff = self._now_provider().astimezone(timezone.utc) - TIME_RANGE_DELTAS[query.time_range]
+        entries, unavailable_reason = self._read_service_logs(definition, query.limit, cutoff)
         entries = self._filter_log_entries(entries, query)
         return self._build_service_logs_payload(definition, query, entries, unavailable_reason)
 
     def open_service_logs_stream(self, session_token: Optional[str], service_key: str, query: ServiceLogsQuery) -> tuple[ServiceLogsResponse, ServiceLogsStreamCursor]:
-        response = self.get_service_logs(session_token, service_key, query)
+        self.auth_service._require_authenticated_operator(session_token)
         definition = self._get_definition(service_key)
+        # Subscribe before reading the snapshot so nothing written in between is lost; entries
+        # seen twice are dropped by id when polling.
+        subscription = log_tail_multiplexer.subscribe(self._log_tail_source(definition))
+        try:
+            response = self.get_service_logs(session_token, service_key, query)
+        except Exception:
+            subscription.close()
+            raise
         cursor = ServiceLogsStreamCursor(
             service_key=definition.key,
             query=query.model_copy(deep=True),
+            subscription=subscription,
+            authenticated_at=time.monotonic(),
             entries=list(response.entries),
             unavailable_reason=response.unavailable_reason,
-            file_cursors=self._capture_log_file_cursors(definition),
         )
         return response, cursor
 
     def poll_service_logs_stream(self, session_token: Optional[str], cursor: ServiceLogsStreamCursor) -> ServiceLogsStreamDelta:
-        self.auth_service._require_authenticated_operator(session_token)
+        if time.monotonic() - cursor.authenticated_at >= LOG_STREAM_AUTH_RECHECK_SECONDS:
+            self.auth_service._require_authenticated_operator(session_token)
+            cursor.authenticated_at = time.monotonic()
         definition = self._get_definition(cursor.service_key)
-        files = self._recent_log_files(definition.log_root, definition.log_paths)
-        unavailable_reason = "Service raw logs are not currently available"
 
-        if not files:
-            if cursor.unavailable_reason == unavailable_reason and not cursor.entries:
-                cursor.file_cursors = {}
-                return ServiceLogsStreamDelta()
-            cursor.entries = []
-            cursor.unavailable_reason = unavailable_reason
-            cursor.file_cursors = {}
-            return ServiceLogsStreamDelta(snapshot=self._build_service_logs_payload(definition, cursor.query, [], unavailable_reason))
-
-        current_file_keys = {str(path) for path in files}
-        previous_file_keys = set(cursor.file_cursors)
-        if previous_file_keys != current_file_keys:
+        # The shared tailer reports a reset when files appear, disappear, rotate or are truncated.
+        incremental_entries, reset = cursor.subscription.poll()
+        if reset:
             return self._reset_service_logs_stream(session_token, definition, cursor)
 
-        incremental_entries: list[ServiceLogEntry] = []
-        next_file_cursors: dict[str, ServiceLogFileCursor] = {}
-
-        for path in files:
-            file_key = str(path)
-            previous = cursor.file_cursors.get(file_key)
-            if previous is None:
-                return self._reset_service_logs_stream(session_token, definition, cursor)
-
-            try:
-                stat = path.stat()
-            except OSError:
-                return self._reset_service_logs_stream(session_token, definition, cursor)
-
-            if stat.st_ino != previous.inode or stat.st_dev != previous.device or stat.st_size < previous.position:
-                return self._reset_service_logs_stream(session_token, definition, cursor)
-
-            try:
-                file_entries, position = self._read_incremental_log_entries(path, previous.position)
-            except OSError:
-                return self._reset_service_logs_stream(session_token, definition, cursor)
-
-            incremental_entries.extend(file_entries)
-            next_file_cursors[file_key] = ServiceLogFileCursor(path=path, device=stat.st_dev, inode=stat.st_ino, position=position)
-
-        filtered_new_entries = self._filter_log_entries(incremental_entries, cursor.query)
+        known_ids = {entry.id for entry in cursor.entries}
+        filtered_new_entries = [entry for entry in self._filter_log_entries(incremental_entries, cursor.query) if entry.id not in known_ids]
         next_entries = [*cursor.entries, *filtered_new_entries]
         removed_entries = False
 
@@ -264,9 +250,6 @@ class CoreServicesService:
         if len(next_entries) > cursor.query.limit:
             next_entries = next_entries[-cursor.query.limit:]
 
-        cursor.file_cursors = next_file_cursors
-        cursor.unavailable_reason = None
-
         if removed_entries:
             cursor.entries = next_entries
             return ServiceLogsStreamDelta(snapshot=self._build_service_logs_payload(definition, cursor.query, next_entries, None))
@@ -278,12 +261,22 @@ class CoreServicesService:
         cursor.entries = next_entries
         return ServiceLogsStreamDelta()
 
-    def _build_summary(self, definition: ServiceDefinition, statuses: dict[str, str], updated_at: str) -> CoreServiceSummary:
+    def close_service_logs_stream(self, cursor: Optional[ServiceLogsStreamCursor]) -> None:
+        if cursor is not None:
+            cursor.subscription.close()
+
+    def _build_summary(
+        self,
+        definition: ServiceDefinition,
+        statuses: dict[str, str],
+        observation: ServiceHealthObservation,
+        updated_at: str,
+    ) -> CoreServiceSummary:
         indicators: list[ServiceIndicator] = []
         raw_supervisor_status = statuses.get(definition.supervisor_program or "") if definition.supervisor_program else None
 
-        try:
-            health_result = self._health_probe(definition)
+        if observation.result is not None:
+            health_result = observation.result
             indicators.append(
                 ServiceIndicator(
                     key="health-endpoint",
@@ -291,9 +284,9 @@ class CoreServicesService:
                     value=health_result.detail,
                 )
             )
-        except Exception as exc:
-            health_result = HealthProbeResult(ok=False, detail=str(exc))
-            indicators.append(ServiceIndicator(key="health-endpoint", status="error", detail=str(exc)))
+        else:
+            health_result = HealthProbeResult(ok=False, detail=observation.error)
+            indicators.append(ServiceIndicator(key="health-endpoint", status="error", detail=observation.error))
 
         marker_states = [marker.exists() for marker in definition.markers]
         for marker, exists in zip(definition.markers, marker_states):
@@ -330,6 +323,12 @@ class CoreServicesService:
             logs_available=logs_available,
             runtime_logs_href=f"/logs?keyword={definition.key}",
             indicators=indicators,
+            health_check=ServiceHealthCheck(
+                checked_at=observation.checked_at,
+                latency_ms=observation.latency_ms,
+                consecutive_failures=observation.consecutive_failures,
+                latency_histogram=observation.histogram(),
+            ),
         )
 
     def _resolve_runtime_state(self, raw_supervisor_status: Optional[str], health_result: HealthProbeResult) -> tuple[str, Optional[str]]:
@@ -370,13 +369,30 @@ class CoreServicesService:
                 return definition
         raise CustomException(404, "Service Not Found", f"Service {service_key} is not supported")
 
-    def _safe_load_supervisor_statuses(self) -> dict[str, str]:
-        try:
-            return self._supervisor_status_loader()
-        except Exception:
-            return {}
+    def _shared_health_monitor(self) -> ServiceHealthMonitor:
+        # Every default-configured instance (the router's, the overview's) reads the same monitor,
+        # so services are probed once per interval no matter how many callers there are.
+        global _default_health_monitor
+        with _default_health_monitor_lock:
+            if _default_health_monitor is None:
+                _default_health_monitor = self._build_health_monitor(background=True)
+            return _default_health_monitor
+
+    def _build_health_monitor(self, background: bool) -> ServiceHealthMonitor:
+        # Only the shared monitor probes on a schedule; instances with injected definitions,
+        # loaders or probes refresh on demand and never leave a thread behind.
+        return ServiceHealthMonitor(
+            self.service_definitions,
+            supervisor_status_loader=self._supervisor_status_loader,
+            health_probe=self._health_probe,
+            now_provider=self._now_provider,
+            background=background,
+        )
 
     def _load_supervisor_statuses(self) -> dict[str, str]:
+        if os.path.exists(SUPERVISOR_SOCKET):
+            return load_supervisor_statuses(SUPERVISOR_SOCKET)
+        # Without the RPC socket (development hosts), fall back to the supervisorctl CLI.
         supervisor_config = os.getenv("WEBSOFT9_SUPERVISOR_CONFIG", "/etc/supervisor/conf.d/websoft9-platform.conf")
         result = subprocess.run(
             ["supervisorctl", "-c", supervisor_config, "status"],
@@ -402,7 +418,7 @@ class CoreServicesService:
             return HealthProbeResult(ok=True, detail=f"HTTP {response.status_code}")
         return HealthProbeResult(ok=False, detail=f"HTTP {response.status_code}")
 
-    def _read_service_logs(self, definition: ServiceDefinition, limit: int) -> tuple[list[ServiceLogEntry], Optional[str]]:
+    def _read_service_logs(self, definition: ServiceDefinition, limit: int, cutoff: Optional[datetime] = None) -> tuple[list[ServiceLogEntry], Optional[str]]:
         if not definition.log_root.exists() and not definition.log_paths:
             return [], "Service raw logs are not currently available"
 
@@ -410,58 +426,54 @@ class CoreServicesService:
         if not files:
             return [], "Service raw logs are not currently available"
 
-        lines: deque[tuple[str, str, str]] = deque(maxlen=max(limit * 10, 400))
-        for path in files:
+        # Walk the newest file backwards first and stop once enough lines are collected, so only
+        # the tail of large logs is read. Files (and file prefixes) older than cutoff are skipped.
+        tail = max(limit * 10, 400)
+        lines: list[tuple[str, str, str]] = []
+        for path in reversed(files):
             try:
-                with path.open("r", encoding="utf-8", errors="replace") as handle:
-                    while True:
-                        offset = handle.tell()
-                        line = handle.readline()
-                        if not line:
+                if cutoff is not None and path.stat().st_mtime < cutoff.timestamp():
+                    break
+                stop_offset = 0
+                if cutoff is not None:
+                    stop_offset = log_time_index.find_offset(path, cutoff.timestamp(), lambda raw: self._line_timestamp(path.name, raw))
+                for offset, raw_line in iter_lines_reversed(path, stop_offset=stop_offset):
+                    stripped = self._sanitize_log_line(raw_line.decode("utf-8", errors="replace"))
+                    if stripped:
+                        lines.append((path.name, stripped, f"{path.name}:{offset}"))
+                        if len(lines) >= tail:
                             break
-                        stripped = self._sanitize_log_line(line)
-                        if stripped:
-                            lines.append((path.name, stripped, f"{path.name}:{offset}"))
             except OSError:
                 continue
+            if len(lines) >= tail:
+                break
 
-        entries = [self._parse_log_line(source, raw_line, fingerprint) for source, raw_line, fingerprint in lines]
+        entries = [self._parse_log_line(source, raw_line, fingerprint) for source, raw_line, fingerprint in reversed(lines)]
         return [entry for entry in entries if entry is not None], None
 
-    def _read_incremental_log_entries(self, path: Path, start_position: int) -> tuple[list[ServiceLogEntry], int]:
-        entries: list[ServiceLogEntry] = []
-        with path.open("r", encoding="utf-8", errors="replace") as handle:
-            handle.seek(start_position)
-            while True:
-                offset = handle.tell()
-                line = handle.readline()
-                if not line:
-                    break
-                stripped = self._sanitize_log_line(line)
-                if not stripped:
-                    continue
-                entry = self._parse_log_line(path.name, stripped, f"{path.name}:{offset}")
-                if entry is not None:
-                    entries.append(entry)
-            position = handle.tell()
-        return entries, position
+    def _line_timestamp(self, source: str, raw_line: bytes) -> Optional[float]:
+        entry = self._parse_log_line(source, self._sanitize_log_line(raw_line.decode("utf-8", errors="replace")), "")
+        if entry is None or not entry.timestamp:
+            return None
+        return datetime.fromisoformat(entry.timestamp.replace("Z", "+00:00")).timestamp()
 
-    def _capture_log_file_cursors(self, definition: ServiceDefinition) -> dict[str, ServiceLogFileCursor]:
-        files = self._recent_log_files(definition.log_root, definition.log_paths)
-        cursors: dict[str, ServiceLogFileCursor] = {}
-        for path in files:
-            try:
-                stat = path.stat()
-            except OSError:
-                continue
-            cursors[str(path)] = ServiceLogFileCursor(path=path, device=stat.st_dev, inode=stat.st_ino, position=stat.st_size)
-        return cursors
+    def _log_tail_source(self, definition: ServiceDefinition) -> LogTailSource:
+        return LogTailSource(
+            key=f"service:{definition.key}:{definition.log_root}",
+            list_files=lambda: self._recent_log_files(definition.log_root, definition.log_paths),
+            parse_line=self._parse_tailed_line,
+        )
+
+    def _parse_tailed_line(self, path: Path, offset: int, raw_line: bytes) -> Optional[ServiceLogEntry]:
+        stripped = self._sanitize_log_line(raw_line.decode("utf-8", errors="replace"))
+        if not stripped:
+            return None
+        return self._parse_log_line(path.name, stripped, f"{path.name}:{offset}")
 
     def _reset_service_logs_stream(self, session_token: Optional[str], definition: ServiceDefinition, cursor: ServiceLogsStreamCursor) -> ServiceLogsStreamDelta:
         response = self.get_service_logs(session_token, definition.key, cursor.query)
         cursor.entries = list(response.entries)
         cursor.unavailable_reason = response.unavailable_reason
-        cursor.file_cursors = self._capture_log_file_cursors(definition)
         return ServiceLogsStreamDelta(snapshot=response)
 
     def _has_log_files(self, log_root: Path, log_paths: Sequence[Path]) -> bool:
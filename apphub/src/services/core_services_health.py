@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import concurrent.futures
+import http.client
+import os
+import socket
+import threading
+import time
+import xmlrpc.client
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+
+from src.core.env_settings import env_float
+from src.core.logger import logger
+
+if TYPE_CHECKING:
+    from src.services.core_services import HealthProbeResult, ServiceDefinition
+
+
+SUPERVISOR_SOCKET = os.getenv("WEBSOFT9_SUPERVISOR_SOCKET", "/run/supervisor.sock")
+SUPERVISOR_RPC_TIMEOUT_SECONDS = 5.0
+SERVICE_HEALTH_INTERVAL_SECONDS = env_float("WEBSOFT9_SERVICE_HEALTH_INTERVAL_SECONDS", 15.0, minimum=1.0)
+# The probe thread stops after this long without a reader and restarts on the next request.
+SERVICE_HEALTH_IDLE_SECONDS = 300.0
+# Upper bounds in milliseconds of the probe latency histogram buckets; the last bucket is open.
+SERVICE_HEALTH_LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000)
+
+_service_health_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="service-health")
+
+
+class _UnixSocketHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class _UnixSocketTransport(xmlrpc.client.Transport):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__()
+        self._socket_path = socket_path
+        self._timeout = timeout
+
+    def make_connection(self, host):
+        return _UnixSocketHTTPConnection(self._socket_path, self._timeout)
+
+
+def load_supervisor_statuses(socket_path: str = SUPERVISOR_SOCKET) -> dict[str, str]:
+    """
+    Return {program: state name} from supervisord's XML-RPC interface on its unix socket.
+
+    Grouped programs are listed as "group:name", like supervisorctl status prints them, and
+    also under their bare name when that is not taken.
+    """
+    proxy = xmlrpc.client.ServerProxy(
+        "http://localhost/RPC2",
+        transport=_UnixSocketTransport(socket_path, SUPERVISOR_RPC_TIMEOUT_SECONDS),
+    )
+    try:
+        processes = proxy.supervisor.getAllProcessInfo()
+    except xmlrpc.client.Fault as exc:
+        raise OSError(f"supervisor RPC failed: {exc.faultString}") from exc
+    finally:
+        proxy("close")()
+
+    statuses: dict[str, str] = {}
+    for process in processes:
+        name = str(process.get("name") or "")
+        group = str(process.get("group") or name)
+        state = str(process.get("statename") or "")
+        if not name:
+            continue
+        statuses[name if group == name else f"{group}:{name}"] = state
+    for process in processes:
+        name = str(process.get("name") or "")
+        if name:
+            statuses.setdefault(name, str(process.get("statename") or ""))
+    return statuses
+
+
+@dataclass
+class ServiceHealthObservation:
+    result: Optional["HealthProbeResult"] = None
+    error: Optional[str] = None
+    checked_at: Optional[str] = None
+    latency_ms: Optional[float] = None
+    consecutive_failures: int = 0
+    latency_histogram: list[int] = field(default_factory=lambda: [0] * (len(SERVICE_HEALTH_LATENCY_BUCKETS_MS) + 1))
+
+    def histogram(self) -> dict[str, int]:
+        labels = [str(bound) for bound in SERVICE_HEALTH_LATENCY_BUCKETS_MS] + ["+Inf"]
+        return dict(zip(labels, self.latency_histogram))
+
+
+@dataclass(frozen=True)
+class ServiceHealthSnapshot:
+    statuses: dict[str, str]
+    observations: dict[str, ServiceHealthObservation]
+
+
+class ServiceHealthMonitor:
+    """
+    Probes every core service concurrently on a schedule and keeps the latest result.
+
+    A refresh reads the supervisor program states once and runs all health probes in parallel,
+    so a cold refresh costs the slowest probe rather than the sum of them. Each service keeps
+    its last result with the time it was taken, its latency, a count of consecutive failures and
+    a cumulative latency histogram. snapshot() reads that state and only refreshes synchronously
+    when it is missing or older than the refresh interval allows.
+
+    With background=True the first snapshot() also starts a thread that refreshes every
+    interval_seconds and stops again once nobody has read a snapshot for
+    SERVICE_HEALTH_IDLE_SECONDS. Without it, results are refreshed on demand only.
+    """
+
+    def __init__(
+        self,
+        service_definitions: Sequence["ServiceDefinition"],
+        supervisor_status_loader: Callable[[], dict[str, str]],
+        health_probe: Callable[["ServiceDefinition"], "HealthProbeResult"],
+        now_provider: Optional[Callable[[], datetime]] = None,
+        interval_seconds: float = SERVICE_HEALTH_INTERVAL_SECONDS,
+        executor: Optional[concurrent.futures.Executor] = None,
+        background: bool = False,
+    ):
+        self.service_definitions = tuple(service_definitions)
+        self.interval_seconds = interval_seconds
+        self.background = background
+        self._supervisor_status_loader = supervisor_status_loader
+        self._health_probe = health_probe
+        self._now_provider = now_provider or (lambda: datetime.now(timezone.utc))
+        self._executor = executor or _service_health_executor
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._statuses: dict[str, str] = {}
+        self._observations: dict[str, ServiceHealthObservation] = {}
+        self._refreshed_at: Optional[float] = None
+        self._last_read = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def snapshot(self) -> ServiceHealthSnapshot:
+        # The background thread refreshes every interval, so only results that missed a whole cycle
+        # (first read, or the thread idled out) are stale; on-demand monitors refresh every interval.
+        max_age = self.interval_seconds * 2 if self.background else self.interval_seconds
+        with self._lock:
+            self._last_read = time.monotonic()
+            refreshed_at = self._refreshed_at
+        if refreshed_at is None or time.monotonic() - refreshed_at > max_age:
+            self.refresh(max_age=max_age)
+        if self.background:
+            self.ensure_started()
+        with self._lock:
+            return ServiceHealthSnapshot(
+                statuses=dict(self._statuses),
+                observations={key: self._copy(observation) for key, observation in self._observations.items()},
+            )
+
+    def refresh(self, max_age: Optional[float] = None) -> None:
+        """Probe all services now, or only when the last results are older than max_age seconds."""
+        # Concurrent stale readers wait for the refresh already running instead of probing again.
+        with self._refresh_lock:
+            refreshed_at = self._refreshed_at
+            if max_age is not None and refreshed_at is not None and time.monotonic() - refreshed_at <= max_age:
+                return
+            status_future = self._executor.submit(self._supervisor_status_loader)
+            probe_futures = {
+                definition.key: self._executor.submit(self._timed_probe, definition)
+                for definition in self.service_definitions
+            }
+            try:
+                statuses = status_future.result()
+            except Exception as exc:
+                logger.debug(f"Supervisor status unavailable: {exc}")
+                statuses = {}
+            checked_at = self._timestamp_now()
+            probes = {key: future.result() for key, future in probe_futures.items()}
+
+            with self._lock:
+                self._statuses = statuses
+                for key, (result, error, latency_ms) in probes.items():
+                    observation = self._observations.setdefault(key, ServiceHealthObservation())
+                    observation.result = result
+                    observation.error = error
+                    observation.checked_at = checked_at
+                    observation.latency_ms = round(latency_ms, 1)
+                    observation.consecutive_failures = 0 if result is not None and result.ok else observation.consecutive_failures + 1
+                    observation.latency_histogram[self._bucket_index(latency_ms)] += 1
+                self._refreshed_at = time.monotonic()
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="service-health", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=self.interval_seconds + 1)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            with self._lock:
+                if time.monotonic() - self._last_read > SERVICE_HEALTH_IDLE_SECONDS:
+                    self._thread = None
+                    return
+            try:
+                self.refresh()
+            except Exception as exc:
+                logger.warning(f"Core service health refresh failed: {exc}")
+
+    def _timed_probe(self, definition: "ServiceDefinition") -> tuple[Optional["HealthProbeResult"], Optional[str], float]:
+        started = time.perf_counter()
+        try:
+            result, error = self._health_probe(definition), None
+        except Exception as exc:
+            result, error = None, str(exc)
+        return result, error, (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def _bucket_index(latency_ms: float) -> int:
+        for index, bound in enumerate(SERVICE_HEALTH_LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                return index
+        return len(SERVICE_HEALTH_LATENCY_BUCKETS_MS)
+
+    @staticmethod
+    def _copy(observation: ServiceHealthObservation) -> ServiceHealthObservation:
+        return ServiceHealthObservation(
+            result=observation.result,
+            error=observation.error,
+            checked_at=observation.checked_at,
+            latency_ms=observation.latency_ms,
+            consecutive_failures=observation.consecutive_failures,
+            latency_histogram=list(observation.latency_histogram),
+        )
+
+    def _timestamp_now(self) -> str:
+        return self._now_provider().astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -1,12 +1,19 @@
 import base64
+import hashlib
+import json
 import os
 import time
+from dataclasses import dataclass
 from pathlib import PurePosixPath
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+from urllib.parse import quote
 
 import docker
 import requests
 
+from src.core.content_search import ContentSearchOptions
+from src.core.directory_listing import DirectoryPageRequest
+from src.core.disk_usage import DISK_USAGE_DEFAULT_TOP
 from src.core.exception import CustomException
 from src.services.product_auth import ProductAuthService
 
@@ -15,9 +22,24 @@ VOLUME_NAME_CACHE_TTL_SECONDS = 5.0
 DEFAULT_FILES_AGENT_URL = "http://127.0.0.1:8091"
 DOCKER_VOLUMES_ROOT_SENTINEL = "__docker_volumes_root__"
 PLATFORM_GATEWAY_CERTIFICATES_SENTINEL = "platform-gateway-certificates"
+FILE_UPLOAD_CHUNK_MAX_BYTES = max(int(os.getenv("WEBSOFT9_FILES_UPLOAD_CHUNK_MAX_BYTES", str(8 * 1024 * 1024)) or "0"), 1024 * 1024)
+FILE_DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+# A full walk of a large volume can take minutes; streamed scans send a heartbeat every 15s instead.
+FILE_DISK_USAGE_TIMEOUT_SECONDS = 900.0
+# Read timeout between lines of an agent NDJSON stream (disk usage, search), which emit progress regularly.
+FILE_AGENT_STREAM_READ_TIMEOUT_SECONDS = 60.0
+_DOWNLOAD_PASSTHROUGH_HEADERS = ("Content-Length", "Content-Range", "Accept-Ranges")
 _volume_name_cache: dict[str, Any] = {"expires_at": 0.0, "names": tuple()}
 
 
+@dataclass
+class FileDownloadStream:
+    status_code: int
+    headers: dict[str, str]
+    chunks: Iterator[bytes]
+    file_name: str = ""
+
+
 class FilesAgentExecutor:
     def __init__(self, base_url: Optional[str] = None, session: Optional[requests.Session] = None):
         configured_url = base_url or os.getenv("WEBSOFT9_FILES_AGENT_URL", DEFAULT_FILES_AGENT_URL)
@@ -31,18 +53,28 @@ class FilesAgentExecutor:
         *,
         json_payload: Optional[dict[str, Any]] = None,
         timeout: float = 30.0,
-        expect_binary: bool = False,
+        params: Optional[dict[str, Any]] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
         try:
             response = self.session.request(
                 method=method,
                 url=f"{self.base_url}{path}",
                 json=json_payload,
+                params=params,
+                data=data,
+                headers=headers,
                 timeout=timeout,
+                stream=stream,
             )
         except requests.RequestException as exc:
             raise CustomException(503, "Files Agent Error", f"Failed to reach internal files agent: {exc}")
 
+        if stream and response.status_code < 400:
+            return response
+
         if response.status_code >= 400:
             message = "Files Agent Error"
             details = response.text
@@ -55,20 +87,22 @@ class FilesAgentExecutor:
             status_code = response.status_code if 400 <= response.status_code < 600 else 500
             raise CustomException(status_code, message, details)
 
-        if expect_binary:
-            return response.content
-
         try:
             return response.json()
         except ValueError as exc:
             raise CustomException(500, "Files Agent Error", f"Invalid files-agent response: {exc}")
 
-    def list_directory(self, root_path: str, relative_path: str, display_name: str) -> dict[str, Any]:
-        return self._request(
-            "POST",
-            "/internal/files/directory",
-            json_payload={"root_path": root_path, "path": relative_path, "display_name": display_name},
-        )
+    def list_directory(
+        self,
+        root_path: str,
+        relative_path: str,
+        display_name: str,
+        page_request: Optional[DirectoryPageRequest] = None,
+    ) -> dict[str, Any]:
+        payload = {"root_path": root_path, "path": relative_path, "display_name": display_name}
+        if page_request is not None:
+            payload.update(page_request.to_payload())
+        return self._request("POST", "/internal/files/directory", json_payload=payload)
 
     def get_metadata(self, root_path: str, relative_path: str, display_name: str) -> dict[str, Any]:
         return self._request(
@@ -179,14 +213,112 @@ class FilesAgentExecutor:
             },
         )
 
-    def download_file(self, root_path: str, relative_path: str, display_name: str) -> bytes:
-        return self._request(
+    def open_download(self, root_path: str, relative_path: str, display_name: str, range_header: Optional[str] = None) -> FileDownloadStream:
+        response = self._request(
             "POST",
             "/internal/files/download",
             json_payload={"root_path": root_path, "path": relative_path, "display_name": display_name},
-            expect_binary=True,
+            headers={"Range": range_header} if range_header else None,
+            stream=True,
+        )
+        return FileDownloadStream(
+            status_code=response.status_code,
+            headers={name: response.headers[name] for name in _DOWNLOAD_PASSTHROUGH_HEADERS if name in response.headers},
+            chunks=self._iter_response(response),
+        )
+
+    def start_upload(self, root_path: str, parent_relative_path: str, file_name: str, size: int, display_name: str) -> dict[str, Any]:
+        return self._request(
+            "POST",
+            "/internal/files/uploads",
+            json_payload={
+                "root_path": root_path,
+                "parent_path": parent_relative_path,
+                "file_name": file_name,
+                "size": size,
+                "display_name": display_name,
+            },
+        )
+
+    def get_upload(self, upload_id: str) -> dict[str, Any]:
+        return self._request("GET", f"/internal/files/uploads/{quote(upload_id, safe='')}")
+
+    def upload_chunk(self, upload_id: str, offset: int, content: bytes, checksum: Optional[str] = None) -> dict[str, Any]:
+        # Without a client checksum, still protect the hop to the agent.
+        return self._request(
+            "PUT",
+            f"/internal/files/uploads/{quote(upload_id, safe='')}",
+            params={"offset": offset},
+            data=content,
+            headers={
+                "Content-Type": "application/octet-stream",
+                "X-Content-SHA256": checksum or hashlib.sha256(content).hexdigest(),
+            },
+            timeout=300.0,
+        )
+
+    def abort_upload(self, upload_id: str) -> None:
+        self._request("DELETE", f"/internal/files/uploads/{quote(upload_id, safe='')}")
+
+    def get_disk_usage(self, root_path: str, relative_path: str, display_name: str, top: int, refresh: bool) -> dict[str, Any]:
+        return self._request(
+            "POST",
+            "/internal/files/disk-usage",
+            json_payload={"root_path": root_path, "path": relative_path, "display_name": display_name, "top": top, "refresh": refresh},
+            timeout=FILE_DISK_USAGE_TIMEOUT_SECONDS,
         )
 
+    def stream_disk_usage(self, root_path: str, relative_path: str, display_name: str, top: int, refresh: bool) -> Iterator[dict[str, Any]]:
+        response = self._request(
+            "POST",
+            "/internal/files/disk-usage",
+            json_payload={
+                "root_path": root_path,
+                "path": relative_path,
+                "display_name": display_name,
+                "top": top,
+                "refresh": refresh,
+                "stream": True,
+            },
+            timeout=FILE_AGENT_STREAM_READ_TIMEOUT_SECONDS,
+            stream=True,
+        )
+        return self._iter_json_lines(response)
+
+    def stream_search(
+        self,
+        root_path: str,
+        relative_path: str,
+        display_name: str,
+        options: ContentSearchOptions,
+    ) -> Iterator[dict[str, Any]]:
+        response = self._request(
+            "POST",
+            "/internal/files/search",
+            json_payload={"root_path": root_path, "path": relative_path, "display_name": display_name, **options.to_payload()},
+            timeout=FILE_AGENT_STREAM_READ_TIMEOUT_SECONDS,
+            stream=True,
+        )
+        return self._iter_json_lines(response)
+
+    @staticmethod
+    def _iter_response(response: requests.Response) -> Iterator[bytes]:
+        try:
+            yield from response.iter_content(chunk_size=FILE_DOWNLOAD_CHUNK_BYTES)
+        finally:
+            response.close()
+
+    @staticmethod
+    def _iter_json_lines(response: requests.Response) -> Iterator[dict[str, Any]]:
+        try:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+        except (requests.RequestException, ValueError) as exc:
+            raise CustomException(503, "Files Agent Error", f"Files-agent stream was interrupted: {exc}")
+        finally:
+            response.close()
+
 
 HelperContainerExecutor = FilesAgentExecutor
 
@@ -227,17 +359,25 @@ class FileManagerService:
         )
         return summaries
 
-    def list_directory(self, session_token: Optional[str], volume_id: str, relative_path: str) -> dict[str, Any]:
+    def list_directory(
+        self,
+        session_token: Optional[str],
+        volume_id: str,
+        relative_path: str,
+        page_request: Optional[DirectoryPageRequest] = None,
+    ) -> dict[str, Any]:
         self.auth_service._require_authenticated_operator(session_token)
         normalized_path = self._normalize_relative_path(relative_path)
         volume_name, root_path, display_name = self._resolve_scope(volume_id)
-        directory_payload = self.helper_executor.list_directory(root_path, normalized_path, display_name)
+        directory_payload = self.helper_executor.list_directory(root_path, normalized_path, display_name, page_request=page_request)
         metadata = directory_payload.get("metadata") or {}
         return {
             "volume_name": volume_name,
             "current_path": normalized_path,
             "metadata": {"volume_name": volume_name, **metadata},
             "items": directory_payload.get("items", []),
+            "next_cursor": directory_payload.get("next_cursor"),
+            "total_items": directory_payload.get("total_items"),
         }
 
     def read_text_file(self, session_token: Optional[str], volume_id: str, relative_path: str) -> dict[str, Any]:
@@ -260,16 +400,18 @@ class FileManagerService:
         metadata = self.helper_executor.get_metadata(root_path, "/", "volumes")
         return {"volume_name": "", **metadata}
 
-    def get_root_directory(self, session_token: Optional[str]) -> dict[str, Any]:
+    def get_root_directory(self, session_token: Optional[str], page_request: Optional[DirectoryPageRequest] = None) -> dict[str, Any]:
         self.auth_service._require_authenticated_operator(session_token)
         root_path = self._docker_volumes_root_path()
-        directory_payload = self.helper_executor.list_directory(root_path, "/", "volumes")
+        directory_payload = self.helper_executor.list_directory(root_path, "/", "volumes", page_request=page_request)
         metadata = directory_payload.get("metadata") or {}
         return {
             "volume_name": "",
             "current_path": "/",
             "metadata": {"volume_name": "", **metadata},
             "items": directory_payload.get("items", []),
+            "next_cursor": directory_payload.get("next_cursor"),
+            "total_items": directory_payload.get("total_items"),
         }
 
     def write_text_file(self, session_token: Optional[str], volume_id: str, relative_path: str, content: str) -> dict[str, Any]:
@@ -357,12 +499,106 @@ class FileManagerService:
         self.helper_executor.upload_file(root_path, normalized_parent, normalized_name, payload, display_name)
         return {"volume_name": volume_name, "path": self._join_relative_path(normalized_parent, normalized_name), "operation": "upload"}
 
-    def download_file(self, session_token: Optional[str], volume_id: str, relative_path: str) -> tuple[str, bytes]:
+    def open_download(
+        self,
+        session_token: Optional[str],
+        volume_id: str,
+        relative_path: str,
+        range_header: Optional[str] = None,
+    ) -> FileDownloadStream:
         self.auth_service._require_authenticated_operator(session_token)
         normalized_path = self._normalize_relative_path(relative_path, allow_root=False)
         volume_name, root_path, display_name = self._resolve_scope(volume_id)
-        payload = self.helper_executor.download_file(root_path, normalized_path, display_name)
-        return PurePosixPath(normalized_path).name, payload
+        download = self.helper_executor.open_download(root_path, normalized_path, display_name, range_header)
+        download.file_name = PurePosixPath(normalized_path).name
+        return download
+
+    def start_upload(self, session_token: Optional[str], volume_id: str, parent_path: str, file_name: str, size: int) -> dict[str, Any]:
+        self.auth_service._require_authenticated_operator(session_token)
+        volume_name, root_path, display_name = self._resolve_scope(volume_id)
+        normalized_parent = self._normalize_relative_path(parent_path)
+        normalized_name = self._normalize_name(file_name)
+        upload = self.helper_executor.start_upload(root_path, normalized_parent, normalized_name, size, display_name)
+        return {**upload, "volume_name": volume_name}
+
+    def get_upload(self, session_token: Optional[str], upload_id: str) -> dict[str, Any]:
+        self.auth_service._require_authenticated_operator(session_token)
+        return self.helper_executor.get_upload(upload_id)
+
+    def upload_chunk(
+        self,
+        session_token: Optional[str],
+        upload_id: str,
+        offset: int,
+        content: bytes,
+        checksum: Optional[str] = None,
+    ) -> dict[str, Any]:
+        self.auth_service._require_authenticated_operator(session_token)
+        return self.helper_executor.upload_chunk(upload_id, offset, content, checksum)
+
+    def abort_upload(self, session_token: Optional[str], upload_id: str) -> dict[str, Any]:
+        self.auth_service._require_authenticated_operator(session_token)
+        self.helper_executor.abort_upload(upload_id)
+        return {"upload_id": upload_id, "status": "aborted"}
+
+    def get_disk_usage(
+        self,
+        session_token: Optional[str],
+        volume_id: str,
+        relative_path: str,
+        top: int = DISK_USAGE_DEFAULT_TOP,
+        refresh: bool = False,
+    ) -> dict[str, Any]:
+        self.auth_service._require_authenticated_operator(session_token)
+        normalized_path = self._normalize_relative_path(relative_path)
+        volume_name, root_path, display_name = self._resolve_scope(volume_id)
+        usage = self.helper_executor.get_disk_usage(root_path, normalized_path, display_name, top, refresh)
+        return {"volume_name": volume_name, **usage}
+
+    def stream_disk_usage(
+        self,
+        session_token: Optional[str],
+        volume_id: str,
+        relative_path: str,
+        top: int = DISK_USAGE_DEFAULT_TOP,
+        refresh: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Start a disk usage scan and return its events: "progress" per finished top-level entry,
+        "heartbeat" while walking, then a final "result" or "error".
+
+        Authentication and scope errors are raised here, before any event is produced.
+        """
+        self.auth_service._require_authenticated_operator(session_token)
+        normalized_path = self._normalize_relative_path(relative_path)
+        volume_name, root_path, display_name = self._resolve_scope(volume_id)
+        events = self.helper_executor.stream_disk_usage(root_path, normalized_path, display_name, top, refresh)
+        return self._iter_disk_usage_events(volume_name, events)
+
+    def search_files(
+        self,
+        session_token: Optional[str],
+        volume_id: str,
+        relative_path: str,
+        options: ContentSearchOptions,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Search file contents below a volume path; returns the events as the agent finds them.
+
+        Closing the returned iterator cancels the search in the helper.
+        """
+        self.auth_service._require_authenticated_operator(session_token)
+        normalized_path = self._normalize_relative_path(relative_path)
+        _volume_name, root_path, display_name = self._resolve_scope(volume_id)
+        return self.helper_executor.stream_search(root_path, normalized_path, display_name, options)
+
+    @staticmethod
+    def _iter_disk_usage_events(volume_name: str, events: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for event in events:
+            if event.get("type") == "result":
+                yield {**event, "usage": {"volume_name": volume_name, **(event.get("usage") or {})}}
+            else:
+                yield event
 
     @staticmethod
     def build_permission_mode(payload: dict[str, Any]) -> Optional[int]:
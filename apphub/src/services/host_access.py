@@ -9,12 +9,14 @@ import sys
 import threading
 import time
 import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, ExitStack
 from datetime import datetime, timezone
 from io import BytesIO
 from io import StringIO
 from pathlib import Path, PurePosixPath
-from typing import Any, Iterator, Optional
+from typing import Any, Callable, Iterator, Optional
 
 try:
     import paramiko
@@ -24,7 +26,11 @@ except ModuleNotFoundError:
         sys.path.append(fallback_site_packages)
     import paramiko
 
+from src.core.directory_listing import DirectoryPageRequest, paginate_directory_entries
+from src.core.env_settings import env_int
 from src.core.exception import CustomException
+from src.core.sqlite_storage import get_sqlite_storage
+from src.core.terminal_buffer import TerminalOutputBuffer
 from src.services.product_auth import ProductAuthService
 
 
@@ -33,21 +39,33 @@ try:
     HOST_ACCESS_PORT = max(1, min(65535, int(os.getenv("WEBSOFT9_HOST_ACCESS_PORT", "22"))))
 except ValueError:
     HOST_ACCESS_PORT = 22
+SFTP_CHANNELS_PER_HOST = env_int("WEBSOFT9_HOST_ACCESS_SFTP_CHANNELS", 4, minimum=1)
 TEXT_FILE_PREVIEW_LIMIT = 2 * 1024 * 1024
-FILE_BROWSER_CLIENT_IDLE_TTL_SECONDS = 20
+# Pooled clients send SSH keepalives (and enable TCP keepalive), so they survive idle periods.
+FILE_BROWSER_CLIENT_IDLE_TTL_SECONDS = 120
+SSH_KEEPALIVE_INTERVAL_SECONDS = 15
+SFTP_CHANNEL_WAIT_SECONDS = 30
+# Files of at least two chunks are transferred in parallel, one chunk per pooled SFTP channel.
+SFTP_TRANSFER_CHUNK_BYTES = 8 * 1024 * 1024
+REMOTE_COMMAND_TIMEOUT_SECONDS = 15
+# rm -rf and cp -a on a large tree can run for a long time without output; this bounds the whole run.
+REMOTE_FILE_COMMAND_TIMEOUT_SECONDS = 600
+REMOTE_COMMAND_READ_BYTES = 32 * 1024
 IDENTITY_SOURCE_CACHE_TTL_SECONDS = 300
 TERMINAL_SESSION_IDLE_TTL_SECONDS = 300
 TERMINAL_SESSION_BUFFER_LIMIT = 256 * 1024
-TERMINAL_SESSION_CHUNK_LIMIT = 512
+TERMINAL_SESSION_READ_LIMIT = 64 * 1024
 
 
 class HostAccessService:
     _lock = threading.RLock()
     _runtime_profiles: dict[str, dict[str, Any]] = {}
     _terminal_sessions: dict[str, dict[str, Any]] = {}
-    _identity_label_cache: dict[str, str] = {}
-    _identity_source_cache: dict[str, dict[str, Any]] = {}
+    # Owner/group labels belong to the host behind an SFTP session, so they are cached per client
+    # (and dropped with it) instead of being shared across every configured host.
+    _identity_caches: "weakref.WeakKeyDictionary[Any, dict[str, dict]]" = weakref.WeakKeyDictionary()
     _file_browser_clients: dict[str, dict[str, Any]] = {}
+    _sftp_pool_condition = threading.Condition(_lock)
 
     def __init__(self, data_dir: Optional[str] = None, auth_service: Optional[ProductAuthService] = None):
         data_root = os.getenv("WEBSOFT9_DATA_ROOT", "/opt/websoft9/data")
@@ -218,17 +236,36 @@ class HostAccessService:
 
         return self._get_profile_for_operator(operator["id"])
 
-    def list_directory(self, session_token: Optional[str], path: str, profile_id: Optional[str] = None) -> dict[str, Any]:
+    def list_directory(
+        self,
+        session_token: Optional[str],
+        path: str,
+        profile_id: Optional[str] = None,
+        page_request: Optional[DirectoryPageRequest] = None,
+    ) -> dict[str, Any]:
         profile = self.get_connection_profile(session_token, profile_id=profile_id)
+        page_request = page_request or DirectoryPageRequest()
         with self._open_sftp(profile) as sftp:
             resolved = self._resolve_directory_path(sftp, path or profile["working_directory"])
-            directory_entries = sorted(sftp.listdir_attr(resolved), key=lambda item: (not stat.S_ISDIR(item.st_mode), item.filename.lower()))
-            metadata_entry = sftp.stat(resolved)
-            owner_labels, group_labels = self._load_identity_labels(
-                sftp,
-                [self._extract_stat_id(metadata_entry, "st_uid"), *[self._extract_stat_id(entry, "st_uid") for entry in directory_entries]],
-                [self._extract_stat_id(metadata_entry, "st_gid"), *[self._extract_stat_id(entry, "st_gid") for entry in directory_entries]],
+            # listdir_attr already carries size/mtime, so sorting costs no extra round trips.
+            page = paginate_directory_entries(
+                sftp.listdir_attr(resolved),
+                page_request,
+                name=lambda entry: entry.filename,
+                is_directory=lambda entry: stat.S_ISDIR(entry.st_mode),
+                size=lambda entry: 0 if stat.S_ISDIR(entry.st_mode) else getattr(entry, "st_size", 0),
+                modified=lambda entry: getattr(entry, "st_mtime", 0),
             )
+            directory_entries = page.entries
+            metadata_entry = sftp.stat(resolved)
+            owner_labels: dict[int, str] = {}
+            group_labels: dict[int, str] = {}
+            if page_request.include_details:
+                owner_labels, group_labels = self._load_identity_labels(
+                    sftp,
+                    [self._extract_stat_id(metadata_entry, "st_uid"), *[self._extract_stat_id(entry, "st_uid") for entry in directory_entries]],
+                    [self._extract_stat_id(metadata_entry, "st_gid"), *[self._extract_stat_id(entry, "st_gid") for entry in directory_entries]],
+                )
             metadata = self._build_path_metadata(
                 sftp,
                 resolved,
@@ -246,7 +283,16 @@ class HostAccessService:
                         group_labels=group_labels,
                     )
                 )
-            return {"current_path": resolved, "metadata": metadata, "items": items}
+            if not page_request.include_details:
+                for item in items:
+                    item.update({"owner": None, "group": None})
+            return {
+                "current_path": resolved,
+                "metadata": metadata,
+                "items": items,
+                "next_cursor": page.next_cursor,
+                "total_items": page.total_items,
+            }
 
     def read_text_file(self, session_token: Optional[str], path: str, profile_id: Optional[str] = None) -> dict[str, Any]:
         profile = self.get_connection_profile(session_token, profile_id=profile_id)
@@ -337,13 +383,25 @@ class HostAccessService:
 
         with self._open_sftp(profile) as sftp:
             entry = self._ensure_remote_exists(sftp, normalized_path)
-            try:
-                if stat.S_ISDIR(int(getattr(entry, "st_mode", 0) or 0)):
-                    self._remove_directory_tree(sftp, normalized_path)
-                else:
+            is_directory = stat.S_ISDIR(int(getattr(entry, "st_mode", 0) or 0))
+            if not is_directory:
+                try:
                     sftp.remove(normalized_path)
-            except IOError as exc:
-                raise CustomException(400, "Delete Failed", f"Failed to delete item: {exc}")
+                except IOError as exc:
+                    raise CustomException(400, "Delete Failed", f"Failed to delete item: {exc}")
+
+        if is_directory:
+            # One server-side rm replaces an SFTP round trip per entry; SFTP-only accounts fall back.
+            with self._open_file_client(profile) as client:
+                result = self._exec_remote_command(client, f"rm -rf -- {shlex.quote(normalized_path)}")
+            if result is None:
+                with self._open_sftp(profile) as sftp:
+                    try:
+                        self._remove_directory_tree(sftp, normalized_path)
+                    except IOError as exc:
+                        raise CustomException(400, "Delete Failed", f"Failed to delete item: {exc}")
+            elif result[0] != 0:
+                raise CustomException(400, "Delete Failed", f"Failed to delete item: {result[1] or f'Exit code {result[0]}'}")
 
         return {"path": normalized_path, "operation": "delete"}
 
@@ -355,11 +413,18 @@ class HostAccessService:
             if stat.S_ISDIR(int(getattr(entry, "st_mode", 0) or 0)):
                 raise CustomException(400, "Download Failed", "Directories cannot be downloaded from the terminal file browser")
 
-            try:
-                with sftp.open(normalized_path, "rb") as handle:
-                    content = handle.read()
-            except IOError as exc:
-                raise CustomException(400, "Download Failed", f"Failed to download file: {exc}")
+            size = int(getattr(entry, "st_size", 0) or 0)
+            content: Optional[bytes] = None
+            if size < 2 * SFTP_TRANSFER_CHUNK_BYTES:
+                try:
+                    with sftp.open(normalized_path, "rb") as handle:
+                        handle.prefetch(size)
+                        content = handle.read()
+                except IOError as exc:
+                    raise CustomException(400, "Download Failed", f"Failed to download file: {exc}")
+
+        if content is None:
+            content = self._parallel_read(profile, normalized_path, size)
 
         return {
             "file_name": PurePosixPath(normalized_path).name or "download",
@@ -374,61 +439,57 @@ class HostAccessService:
         owner = str(payload.get("owner") or "").strip() or None
         group = str(payload.get("group") or "").strip() or None
 
-        with self._open_file_client(profile) as client:
-            sftp = client.open_sftp()
-            try:
-                entry = self._ensure_remote_exists(sftp, normalized_source)
-                target_path = normalized_source
+        with self._open_file_client(profile) as client, self._open_sftp(profile) as sftp:
+            entry = self._ensure_remote_exists(sftp, normalized_source)
+            target_path = normalized_source
 
-                if target_name and target_name != PurePosixPath(normalized_source).name:
-                    if normalized_source == "/":
-                        raise CustomException(400, "Update Attributes Failed", "The root directory cannot be renamed")
-                    target_path = self._join_remote_path(str(PurePosixPath(normalized_source).parent) or "/", target_name)
-                    try:
-                        sftp.stat(target_path)
-                    except IOError:
-                        pass
-                    else:
-                        raise CustomException(400, "Update Attributes Failed", "A file or directory with the same name already exists")
-                    try:
-                        sftp.rename(normalized_source, target_path)
-                    except IOError as exc:
-                        raise CustomException(400, "Update Attributes Failed", f"Failed to rename item: {exc}")
-
-                permission_mode = self._build_permission_mode(payload)
-                if owner is not None or group is not None:
-                    owner_spec = owner or ""
-                    group_spec = group or ""
-                    self._run_remote_command(
-                        client,
-                        f"chown {shlex.quote(f'{owner_spec}:{group_spec}' if group is not None else owner_spec)} -- {shlex.quote(target_path)}",
-                        "Update Attributes Failed",
-                        "Failed to update owner or group",
-                    )
-
-                if permission_mode is not None:
-                    self._run_remote_command(
-                        client,
-                        f"chmod {permission_mode} -- {shlex.quote(target_path)}",
-                        "Update Attributes Failed",
-                        "Failed to update permissions",
-                    )
+            if target_name and target_name != PurePosixPath(normalized_source).name:
+                if normalized_source == "/":
+                    raise CustomException(400, "Update Attributes Failed", "The root directory cannot be renamed")
+                target_path = self._join_remote_path(str(PurePosixPath(normalized_source).parent) or "/", target_name)
+                try:
+                    sftp.stat(target_path)
+                except IOError:
+                    pass
+                else:
+                    raise CustomException(400, "Update Attributes Failed", "A file or directory with the same name already exists")
+                try:
+                    sftp.rename(normalized_source, target_path)
+                except IOError as exc:
+                    raise CustomException(400, "Update Attributes Failed", f"Failed to rename item: {exc}")
 
-                refreshed_entry = self._ensure_remote_exists(sftp, target_path)
-                owner_labels, group_labels = self._load_identity_labels(
-                    sftp,
-                    [self._extract_stat_id(refreshed_entry, "st_uid")],
-                    [self._extract_stat_id(refreshed_entry, "st_gid")],
+            permission_mode = self._build_permission_mode(payload)
+            if owner is not None or group is not None:
+                owner_spec = owner or ""
+                group_spec = group or ""
+                self._run_remote_command(
+                    client,
+                    f"chown {shlex.quote(f'{owner_spec}:{group_spec}' if group is not None else owner_spec)} -- {shlex.quote(target_path)}",
+                    "Update Attributes Failed",
+                    "Failed to update owner or group",
                 )
-                metadata = self._build_path_metadata(
-                    sftp,
-                    target_path,
-                    entry=refreshed_entry,
-                    owner_labels=owner_labels,
-                    group_labels=group_labels,
+
+            if permission_mode is not None:
+                self._run_remote_command(
+                    client,
+                    f"chmod {permission_mode} -- {shlex.quote(target_path)}",
+                    "Update Attributes Failed",
+                    "Failed to update permissions",
                 )
-            finally:
-                sftp.close()
+
+            refreshed_entry = self._ensure_remote_exists(sftp, target_path)
+            owner_labels, group_labels = self._load_identity_labels(
+                sftp,
+                [self._extract_stat_id(refreshed_entry, "st_uid")],
+                [self._extract_stat_id(refreshed_entry, "st_gid")],
+            )
+            metadata = self._build_path_metadata(
+                sftp,
+                target_path,
+                entry=refreshed_entry,
+                owner_labels=owner_labels,
+                group_labels=group_labels,
+            )
 
         return {"path": target_path, "operation": "update-attributes", "metadata": metadata}
 
@@ -438,29 +499,25 @@ class HostAccessService:
         if normalized_source == "/":
             raise CustomException(400, "Copy Failed", "The root directory cannot be copied")
 
-        with self._open_file_client(profile) as client:
-            sftp = client.open_sftp()
+        with self._open_sftp(profile) as sftp:
+            self._ensure_remote_exists(sftp, normalized_source)
+            resolved_destination = self._resolve_directory_path(sftp, destination_path)
+            target_path = self._join_remote_path(resolved_destination, PurePosixPath(normalized_source).name)
+            if target_path == normalized_source:
+                raise CustomException(400, "Copy Failed", "The selected item is already in this directory")
             try:
-                self._ensure_remote_exists(sftp, normalized_source)
-                resolved_destination = self._resolve_directory_path(sftp, destination_path)
-                target_path = self._join_remote_path(resolved_destination, PurePosixPath(normalized_source).name)
-                if target_path == normalized_source:
-                    raise CustomException(400, "Copy Failed", "The selected item is already in this directory")
-                try:
-                    sftp.stat(target_path)
-                except IOError:
-                    pass
-                else:
-                    raise CustomException(400, "Copy Failed", "A file or directory with the same name already exists")
+                sftp.stat(target_path)
+            except IOError:
+                pass
+            else:
+                raise CustomException(400, "Copy Failed", "A file or directory with the same name already exists")
 
-                self._run_remote_command(
-                    client,
-                    f"cp -a -- {shlex.quote(normalized_source)} {shlex.quote(target_path)}",
-                    "Copy Failed",
-                    "Failed to copy item",
-                )
-            finally:
-                sftp.close()
+        with self._open_file_client(profile) as client:
+            result = self._exec_remote_command(client, f"cp -a -- {shlex.quote(normalized_source)} {shlex.quote(target_path)}")
+        if result is None:
+            self._copy_tree_over_sftp(profile, normalized_source, target_path)
+        elif result[0] != 0:
+            raise CustomException(400, "Copy Failed", f"Failed to copy item: {result[1] or f'Exit code {result[0]}'}")
 
         return {"path": target_path, "operation": "copy"}
 
@@ -496,9 +553,16 @@ class HostAccessService:
             resolved_parent = self._resolve_directory_path(sftp, parent_path)
             target_path = self._join_remote_path(resolved_parent, file_name)
             try:
-                sftp.putfo(BytesIO(payload), target_path)
+                if len(payload) < 2 * SFTP_TRANSFER_CHUNK_BYTES:
+                    sftp.putfo(BytesIO(payload), target_path)
+                else:
+                    # Create (or truncate) the target before the parallel chunk writers open it.
+                    sftp.open(target_path, "wb").close()
             except IOError as exc:
                 raise CustomException(400, "Upload Failed", f"Failed to upload file: {exc}")
+
+        if len(payload) >= 2 * SFTP_TRANSFER_CHUNK_BYTES:
+            self._parallel_write(profile, target_path, payload)
         return {"path": target_path, "operation": "upload"}
 
     def get_connection_profile(self, session_token: Optional[str], profile_id: Optional[str] = None) -> dict[str, Any]:
@@ -627,10 +691,10 @@ class HostAccessService:
                     existing['detached_at'] = None
                     existing['last_activity_at'] = time.time()
                     existing['channel'].resize_pty(width=max(cols, 40), height=max(rows, 10))
+                    # The caller replays the retained output by reading from its oldest byte.
                     return {
                         'profile': dict(existing['profile']),
-                        'buffer': str(existing['buffer']),
-                        'cursor': int(existing['cursor']),
+                        'cursor': existing['output'].start,
                         'closed': bool(existing['closed']),
                     }
                 self._close_terminal_session_locked(normalized_session_id)
@@ -641,9 +705,7 @@ class HostAccessService:
             'client': client,
             'channel': channel,
             'profile': dict(profile),
-            'buffer': '',
-            'chunks': [],
-            'cursor': 0,
+            'output': TerminalOutputBuffer(TERMINAL_SESSION_BUFFER_LIMIT),
             'closed': False,
             'detached_at': None,
             'created_at': time.time(),
@@ -655,19 +717,39 @@ class HostAccessService:
             self._start_terminal_reader_locked(normalized_session_id)
         return {
             'profile': dict(profile),
-            'buffer': '',
             'cursor': 0,
             'closed': False,
         }
 
-    def read_terminal_updates(self, session_id: str, after_cursor: int) -> tuple[list[str], int, bool]:
+    def read_terminal_updates(self, session_id: str, after_cursor: int) -> tuple[bytes, int, bool]:
+        """
+        Return (raw output after after_cursor, next cursor, closed).
+
+        At most TERMINAL_SESSION_READ_LIMIT bytes are returned per call; closed is only reported
+        once the remaining output has been read.
+        """
         normalized_session_id = str(session_id or '').strip()
         with self._lock:
             session = self._terminal_sessions.get(normalized_session_id)
             if session is None:
-                return [], after_cursor, True
-            updates = [payload for cursor, payload in session['chunks'] if cursor > after_cursor]
-            return updates, int(session['cursor']), bool(session['closed'])
+                return b'', after_cursor, True
+            output: TerminalOutputBuffer = session['output']
+            closed = bool(session['closed'])
+        payload, cursor = output.read(after_cursor, TERMINAL_SESSION_READ_LIMIT)
+        return payload, cursor, closed and cursor >= output.end
+
+    def subscribe_terminal_output(self, session_id: str, listener: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call listener (from the session's reader thread) whenever output arrives or the session closes.
+
+        Returns a function that unsubscribes.
+        """
+        normalized_session_id = str(session_id or '').strip()
+        with self._lock:
+            session = self._terminal_sessions.get(normalized_session_id)
+        if session is None:
+            return lambda: None
+        return session['output'].add_listener(listener)
 
     def send_terminal_input(self, session_id: str, data: str) -> None:
         session = self._get_terminal_session_for_io(session_id)
@@ -715,67 +797,37 @@ class HostAccessService:
         session = self._terminal_sessions[session_id]
 
         def _reader() -> None:
-            while True:
-                with self._lock:
-                    current = self._terminal_sessions.get(session_id)
-                    if current is not session:
-                        return
-                    channel = current['channel']
-
-                try:
-                    emitted = False
-                    should_close = False
-
-                    while channel.recv_ready():
-                        payload = channel.recv(4096)
-                        if not payload:
-                            should_close = True
-                            break
-                        self._append_terminal_output(session_id, payload.decode('utf-8', errors='ignore'))
-                        emitted = True
-
-                    while not should_close and channel.recv_stderr_ready():
-                        payload = channel.recv_stderr(4096)
-                        if not payload:
-                            break
-                        self._append_terminal_output(session_id, payload.decode('utf-8', errors='ignore'))
-                        emitted = True
-
-                    if should_close or channel.closed or channel.exit_status_ready():
+            channel = session['channel']
+            try:
+                # The PTY merges stderr into stdout, so a blocking recv sees all output as it arrives.
+                while True:
+                    payload = channel.recv(32768)
+                    if not payload:
                         break
-
-                    if not emitted:
-                        time.sleep(0.02)
-                except Exception:
-                    break
+                    self._append_terminal_output(session, payload)
+                while channel.recv_stderr_ready():
+                    payload = channel.recv_stderr(32768)
+                    if not payload:
+                        break
+                    self._append_terminal_output(session, payload)
+            except Exception:
+                pass
 
             with self._lock:
                 current = self._terminal_sessions.get(session_id)
-                if current is not session:
-                    return
-                current['closed'] = True
-                current['detached_at'] = time.time()
-                self._close_terminal_resources_locked(current)
+                if current is session:
+                    current['closed'] = True
+                    current['detached_at'] = time.time()
+                    self._close_terminal_resources_locked(current)
+            session['output'].notify()
 
         thread = threading.Thread(target=_reader, name=f'host-access-terminal-{session_id}', daemon=True)
         session['reader'] = thread
         thread.start()
 
-    def _append_terminal_output(self, session_id: str, payload: str) -> None:
-        if not payload:
-            return
-        with self._lock:
-            session = self._terminal_sessions.get(session_id)
-            if session is None:
-                return
-            session['cursor'] += 1
-            session['chunks'].append((session['cursor'], payload))
-            if len(session['chunks']) > TERMINAL_SESSION_CHUNK_LIMIT:
-                session['chunks'] = session['chunks'][-TERMINAL_SESSION_CHUNK_LIMIT:]
-            session['buffer'] = f"{session['buffer']}{payload}"
-            if len(session['buffer']) > TERMINAL_SESSION_BUFFER_LIMIT:
-                session['buffer'] = session['buffer'][-TERMINAL_SESSION_BUFFER_LIMIT:]
-            session['last_activity_at'] = time.time()
+    def _append_terminal_output(self, session: dict[str, Any], payload: bytes) -> None:
+        session['output'].append(payload)
+        session['last_activity_at'] = time.time()
 
     def _is_terminal_session_alive_locked(self, session: dict[str, Any]) -> bool:
         if session.get('closed'):
@@ -831,12 +883,15 @@ class HostAccessService:
                     client = self._connect_client(profile)
                     self._file_browser_clients[cache_key] = {
                         "client": client,
-                        "sftp": None,
-                        "lock": threading.RLock(),
+                        "sftp_idle": [],
+                        "sftp_in_use": 0,
                         "last_used_at": time.time(),
                     }
 
             yield client
+        except CustomException:
+            # Request errors (missing paths, name clashes) say nothing about the connection.
+            raise
         except Exception:
             with self._lock:
                 self._close_file_browser_client_locked(cache_key)
@@ -867,69 +922,72 @@ class HostAccessService:
     @contextmanager
     def _open_sftp_impl(self, profile: dict[str, Any]) -> Iterator[paramiko.SFTPClient]:
         cache_key = self._build_file_client_cache_key(profile)
-        client: Optional[paramiko.SSHClient] = None
-        sftp: Optional[paramiko.SFTPClient] = None
-        cache_entry: Optional[dict[str, Any]] = None
-        entry_lock: Optional[threading.RLock] = None
-        should_close_on_exit = False
         try:
-            with self._open_file_client(profile) as active_client:
-                client = active_client
-                with self._lock:
-                    cache_entry = self._file_browser_clients.get(cache_key)
-                    if cache_entry and cache_entry.get("client") is client:
-                        cached_lock = cache_entry.get("lock")
-                        if cached_lock is not None and hasattr(cached_lock, "acquire") and hasattr(cached_lock, "release"):
-                            entry_lock = cached_lock
-                        else:
-                            entry_lock = threading.RLock()
-                            cache_entry["lock"] = entry_lock
-                if entry_lock is not None:
-                    entry_lock.acquire()
-
+            with self._open_file_client(profile) as client:
+                sftp, cache_entry = self._acquire_pooled_sftp(cache_key, client)
+                discard = False
                 try:
-                    if cache_entry is not None:
-                        cached_sftp = cache_entry.get("sftp")
-                        if cached_sftp is not None and self._is_sftp_client_active(cached_sftp):
-                            sftp = cached_sftp
-                        else:
-                            if cached_sftp is not None:
-                                try:
-                                    cached_sftp.close()
-                                except Exception:
-                                    pass
-                            sftp = client.open_sftp()
-                            cache_entry["sftp"] = sftp
-                    else:
-                        sftp = client.open_sftp()
-                        should_close_on_exit = True
-
                     yield sftp
+                except CustomException:
+                    raise
                 except Exception:
-                    if cache_entry is not None and sftp is not None:
-                        with self._lock:
-                            if cache_entry.get("sftp") is sftp:
-                                try:
-                                    sftp.close()
-                                except Exception:
-                                    pass
-                                cache_entry["sftp"] = None
+                    discard = True
                     raise
                 finally:
-                    if cache_entry is not None:
-                        with self._lock:
-                            current_entry = self._file_browser_clients.get(cache_key)
-                            if current_entry is cache_entry:
-                                current_entry["last_used_at"] = time.time()
-                    if entry_lock is not None:
-                        entry_lock.release()
+                    self._release_pooled_sftp(cache_key, cache_entry, sftp, discard)
         except CustomException:
             raise
         except Exception as exc:
             raise CustomException(500, "SFTP Error", f"Failed to open SFTP session: {exc}")
-        finally:
-            if should_close_on_exit and sftp is not None:
-                sftp.close()
+
+    def _acquire_pooled_sftp(self, cache_key: str, client: paramiko.SSHClient) -> tuple[paramiko.SFTPClient, Optional[dict[str, Any]]]:
+        """
+        Take an idle SFTP channel of the cached client, or open one while the host has fewer than
+        SFTP_CHANNELS_PER_HOST in use. Waits up to SFTP_CHANNEL_WAIT_SECONDS for a free channel.
+        """
+        deadline = time.monotonic() + SFTP_CHANNEL_WAIT_SECONDS
+        with self._sftp_pool_condition:
+            while True:
+                cache_entry = self._file_browser_clients.get(cache_key)
+                if cache_entry is None or cache_entry.get("client") is not client:
+                    cache_entry = None
+                    break
+                idle_channels = cache_entry["sftp_idle"]
+                while idle_channels:
+                    sftp = idle_channels.pop()
+                    if self._is_sftp_client_active(sftp):
+                        cache_entry["sftp_in_use"] += 1
+                        return sftp, cache_entry
+                    self._close_quietly(sftp)
+                if cache_entry["sftp_in_use"] < SFTP_CHANNELS_PER_HOST:
+                    cache_entry["sftp_in_use"] += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CustomException(503, "SFTP Busy", "All SFTP channels to the host are busy, please retry")
+                self._sftp_pool_condition.wait(remaining)
+
+        try:
+            return client.open_sftp(), cache_entry
+        except Exception:
+            if cache_entry is not None:
+                with self._sftp_pool_condition:
+                    cache_entry["sftp_in_use"] -= 1
+                    self._sftp_pool_condition.notify()
+            raise
+
+    def _release_pooled_sftp(self, cache_key: str, cache_entry: Optional[dict[str, Any]], sftp: paramiko.SFTPClient, discard: bool) -> None:
+        with self._sftp_pool_condition:
+            keep = False
+            if cache_entry is not None:
+                cache_entry["sftp_in_use"] -= 1
+                keep = not discard and self._file_browser_clients.get(cache_key) is cache_entry and self._is_sftp_client_active(sftp)
+                if keep:
+                    cache_entry["sftp_idle"].append(sftp)
+                    cache_entry["last_used_at"] = time.time()
+                self._sftp_pool_condition.notify()
+        if not keep:
+            self._close_quietly(sftp)
 
     def _build_file_client_cache_key(self, profile: dict[str, Any]) -> str:
         fingerprint = json.dumps(
@@ -951,7 +1009,7 @@ class HostAccessService:
         stale_keys = [
             cache_key
             for cache_key, cache_entry in self._file_browser_clients.items()
-            if now - float(cache_entry.get("last_used_at") or 0) > FILE_BROWSER_CLIENT_IDLE_TTL_SECONDS
+            if (now - float(cache_entry.get("last_used_at") or 0) > FILE_BROWSER_CLIENT_IDLE_TTL_SECONDS and not cache_entry.get("sftp_in_use"))
             or not self._is_ssh_client_active(cache_entry.get("client"))
         ]
         for cache_key in stale_keys:
@@ -959,13 +1017,9 @@ class HostAccessService:
 
     def _close_file_browser_client_locked(self, cache_key: str) -> None:
         cache_entry = self._file_browser_clients.pop(cache_key, None)
-        sftp = cache_entry.get("sftp") if cache_entry else None
         client = cache_entry.get("client") if cache_entry else None
-        if sftp is not None:
-            try:
-                sftp.close()
-            except Exception:
-                pass
+        for sftp in cache_entry.get("sftp_idle", []) if cache_entry else []:
+            self._close_quietly(sftp)
         if client is None:
             return
         try:
@@ -973,6 +1027,12 @@ class HostAccessService:
         except Exception:
             return
 
+    def _close_quietly(self, resource: Any) -> None:
+        try:
+            resource.close()
+        except Exception:
+            pass
+
     def _is_ssh_client_active(self, client: Any) -> bool:
         try:
             transport = client.get_transport() if client is not None else None
@@ -1028,8 +1088,20 @@ class HostAccessService:
         except Exception as exc:
             client.close()
             raise CustomException(400, "SSH Authentication Failed", f"Unable to connect to the local host over SSH ({target_host}:{target_port}): {exc}")
+        self._enable_keepalive(client)
         return client
 
+    def _enable_keepalive(self, client: paramiko.SSHClient) -> None:
+        transport = client.get_transport()
+        if transport is None:
+            return
+        transport.set_keepalive(SSH_KEEPALIVE_INTERVAL_SECONDS)
+        try:
+            transport.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        except (AttributeError, OSError):
+            # Proxy or test transports are not plain sockets.
+            pass
+
     def _connect_client_with_password_fallback(self, host: str, port: int, username: str, password: str) -> paramiko.SSHClient:
         sock: Optional[socket.socket] = None
         transport: Optional[paramiko.Transport] = None
@@ -1045,6 +1117,7 @@ class HostAccessService:
             client = paramiko.SSHClient()
             client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             client._transport = transport
+            self._enable_keepalive(client)
             return client
         except Exception:
             if transport is not None:
@@ -1369,12 +1442,13 @@ class HostAccessService:
     def _load_identity_lookup(self, sftp: paramiko.SFTPClient, identity_ids: list[int], source: str) -> dict[int, str]:
         if not identity_ids:
             return {}
+        label_cache = self._get_identity_cache(sftp)["labels"]
         cache_prefix = f"{source}:"
         cached: dict[int, str] = {}
         missing_ids: list[int] = []
         for identity_id in identity_ids:
             cache_key = f"{cache_prefix}{identity_id}"
-            cached_label = self._identity_label_cache.get(cache_key)
+            cached_label = label_cache.get(cache_key)
             if cached_label is None:
                 missing_ids.append(identity_id)
                 continue
@@ -1384,13 +1458,22 @@ class HostAccessService:
         labels = self._load_identity_source_labels(sftp, source)
         resolved = {identity_id: labels.get(identity_id, str(identity_id)) for identity_id in missing_ids}
         for identity_id, label in resolved.items():
-            self._identity_label_cache[f"{cache_prefix}{identity_id}"] = label
+            label_cache[f"{cache_prefix}{identity_id}"] = label
         return {**cached, **resolved}
 
+    def _get_identity_cache(self, sftp: paramiko.SFTPClient) -> dict[str, dict]:
+        with self._lock:
+            try:
+                return self._identity_caches.setdefault(sftp, {"labels": {}, "sources": {}})
+            except TypeError:
+                # Clients that cannot be weakly referenced get an uncached lookup.
+                return {"labels": {}, "sources": {}}
+
     def _load_identity_source_labels(self, sftp: paramiko.SFTPClient, source: str) -> dict[int, str]:
         now = time.time()
         cache_prefix = f"{source}:"
-        cached_entry = self._identity_source_cache.get(source)
+        identity_cache = self._get_identity_cache(sftp)
+        cached_entry = identity_cache["sources"].get(source)
         if cached_entry and now - float(cached_entry.get("loaded_at") or 0) <= IDENTITY_SOURCE_CACHE_TTL_SECONDS:
             return dict(cached_entry.get("labels") or {})
 
@@ -1423,8 +1506,8 @@ class HostAccessService:
                 continue
 
         for identity_id, label in labels.items():
-            self._identity_label_cache[f"{cache_prefix}{identity_id}"] = label
-        self._identity_source_cache[source] = {"labels": dict(labels), "loaded_at": now}
+            identity_cache["labels"][f"{cache_prefix}{identity_id}"] = label
+        identity_cache["sources"][source] = {"labels": dict(labels), "loaded_at": now}
         return labels
 
     def _build_permission_mode(self, payload: dict[str, Any]) -> Optional[str]:
@@ -1439,7 +1522,7 @@ class HostAccessService:
 
     def _run_remote_command(self, client: paramiko.SSHClient, command: str, title: str, prefix: str) -> None:
         try:
-            _, stdout, stderr = client.exec_command(command, timeout=15)
+            _, stdout, stderr = client.exec_command(command, timeout=REMOTE_COMMAND_TIMEOUT_SECONDS)
             exit_code = stdout.channel.recv_exit_status()
             error_text = stderr.read().decode("utf-8", errors="ignore").strip()
         except Exception as exc:
@@ -1447,6 +1530,55 @@ class HostAccessService:
         if exit_code != 0:
             raise CustomException(400, title, f"{prefix}: {error_text or f'Exit code {exit_code}'}")
 
+    def _exec_remote_command(self, client: paramiko.SSHClient, command: str) -> Optional[tuple[int, str]]:
+        """
+        Run command on the host and return (exit code, stderr).
+
+        Returns None when the account cannot run commands (SFTP-only accounts, missing binaries), so
+        callers can fall back to doing the work over SFTP. OpenSSH's ForceCommand internal-sftp
+        rejects exec requests with "This service allows sftp connections only." on stdout and exit
+        code 1, so both streams are checked for that message.
+        """
+        try:
+            _, stdout, _stderr = client.exec_command(command, timeout=REMOTE_COMMAND_TIMEOUT_SECONDS)
+            exit_code, output, errors = self._drain_remote_command(stdout.channel, REMOTE_FILE_COMMAND_TIMEOUT_SECONDS)
+        except socket.timeout:
+            raise CustomException(400, "Remote Command Failed", f"The command did not finish within {REMOTE_FILE_COMMAND_TIMEOUT_SECONDS} seconds")
+        except (paramiko.SSHException, OSError):
+            return None
+        output_text = output.decode("utf-8", errors="ignore").strip()
+        error_text = errors.decode("utf-8", errors="ignore").strip()
+        if exit_code in (126, 127) or any("sftp connections only" in text.lower() for text in (output_text, error_text)):
+            return None
+        return exit_code, error_text
+
+    @staticmethod
+    def _drain_remote_command(channel: "paramiko.Channel", timeout: float) -> tuple[int, bytes, bytes]:
+        """
+        Read stdout and stderr until the command exits; return (exit code, stdout, stderr).
+
+        Both streams are drained while waiting, so a command that writes more than the channel
+        window (a flood of "Permission denied" lines) cannot block on a full pipe. The channel is
+        closed and socket.timeout raised when the command is still running after timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        output = bytearray()
+        errors = bytearray()
+        while True:
+            while channel.recv_ready():
+                output += channel.recv(REMOTE_COMMAND_READ_BYTES)
+            while channel.recv_stderr_ready():
+                errors += channel.recv_stderr(REMOTE_COMMAND_READ_BYTES)
+            # The server sends the exit status after the command's output, so nothing is left to read.
+            if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                return channel.recv_exit_status(), bytes(output), bytes(errors)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                channel.close()
+                raise socket.timeout(f"remote command still running after {timeout} seconds")
+            # Set when the exit status arrives; otherwise a short poll interval for more output.
+            channel.status_event.wait(min(remaining, 0.1))
+
     def _normalize_file_preferences(self, payload: dict[str, Any]) -> dict[str, Any]:
         view_mode = str(payload.get("view_mode") or "list").strip().lower()
         if view_mode not in {"list", "grid"}:
@@ -1592,6 +1724,106 @@ class HostAccessService:
                 sftp.remove(child_path)
         sftp.rmdir(path)
 
+    def _copy_tree_over_sftp(self, profile: dict[str, Any], source_path: str, target_path: str) -> None:
+        """Copy like ``cp -a`` through SFTP, copying regular files in parallel over pooled channels."""
+        files: list[tuple[str, str, Any]] = []
+        directories: list[tuple[str, Any]] = []
+        with self._open_sftp(profile) as sftp:
+            try:
+                pending = [(source_path, target_path, sftp.lstat(source_path))]
+                while pending:
+                    source, target, entry = pending.pop()
+                    mode = int(getattr(entry, "st_mode", 0) or 0)
+                    if stat.S_ISDIR(mode):
+                        sftp.mkdir(target)
+                        directories.append((target, entry))
+                        for child in sftp.listdir_attr(source):
+                            pending.append((self._join_remote_path(source, child.filename), self._join_remote_path(target, child.filename), child))
+                    elif stat.S_ISLNK(mode):
+                        sftp.symlink(sftp.readlink(source), target)
+                    elif stat.S_ISREG(mode):
+                        files.append((source, target, entry))
+            except IOError as exc:
+                raise CustomException(400, "Copy Failed", f"Failed to copy item: {exc}")
+
+        if files:
+            with ThreadPoolExecutor(max_workers=min(SFTP_CHANNELS_PER_HOST, len(files)), thread_name_prefix="sftp-copy") as executor:
+                list(executor.map(lambda item: self._copy_remote_file(profile, *item), files))
+
+        with self._open_sftp(profile) as sftp:
+            try:
+                # Children first, so a parent restored to read-only does not block the updates below it.
+                for target, entry in reversed(directories):
+                    self._apply_remote_attributes(sftp, target, entry)
+            except IOError as exc:
+                raise CustomException(400, "Copy Failed", f"Failed to copy item: {exc}")
+
+    def _copy_remote_file(self, profile: dict[str, Any], source_path: str, target_path: str, entry: Any) -> None:
+        with self._open_sftp(profile) as sftp:
+            try:
+                with sftp.open(source_path, "rb") as reader, sftp.open(target_path, "wb") as writer:
+                    reader.prefetch(int(getattr(entry, "st_size", 0) or 0))
+                    writer.set_pipelined(True)
+                    while True:
+                        chunk = reader.read(SFTP_TRANSFER_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        writer.write(chunk)
+                self._apply_remote_attributes(sftp, target_path, entry)
+            except IOError as exc:
+                raise CustomException(400, "Copy Failed", f"Failed to copy {source_path}: {exc}")
+
+    def _apply_remote_attributes(self, sftp: paramiko.SFTPClient, path: str, entry: Any) -> None:
+        mode = getattr(entry, "st_mode", None)
+        if mode is not None:
+            sftp.chmod(path, stat.S_IMODE(int(mode)))
+        if getattr(entry, "st_mtime", None) is not None:
+            sftp.utime(path, (int(getattr(entry, "st_atime", None) or entry.st_mtime), int(entry.st_mtime)))
+
+    def _split_transfer_ranges(self, size: int) -> list[tuple[int, int]]:
+        return [(offset, min(SFTP_TRANSFER_CHUNK_BYTES, size - offset)) for offset in range(0, size, SFTP_TRANSFER_CHUNK_BYTES)]
+
+    def _parallel_read(self, profile: dict[str, Any], path: str, size: int) -> bytes:
+        """Download a large file as SFTP_TRANSFER_CHUNK_BYTES ranges, each pipelined on its own pooled channel."""
+        buffer = bytearray(size)
+
+        def read_range(transfer_range: tuple[int, int]) -> None:
+            offset, length = transfer_range
+            position = offset
+            with self._open_sftp(profile) as sftp:
+                try:
+                    with sftp.open(path, "rb") as handle:
+                        for data in handle.readv([transfer_range]):
+                            buffer[position:position + len(data)] = data
+                            position += len(data)
+                except IOError as exc:
+                    raise CustomException(400, "Download Failed", f"Failed to download file: {exc}")
+            if position != offset + length:
+                raise CustomException(409, "Download Failed", "The file changed while it was being downloaded")
+
+        ranges = self._split_transfer_ranges(size)
+        with ThreadPoolExecutor(max_workers=min(SFTP_CHANNELS_PER_HOST, len(ranges)), thread_name_prefix="sftp-read") as executor:
+            list(executor.map(read_range, ranges))
+        return bytes(buffer)
+
+    def _parallel_write(self, profile: dict[str, Any], path: str, payload: bytes) -> None:
+        """Upload into an existing remote file as SFTP_TRANSFER_CHUNK_BYTES ranges in parallel, with pipelined writes."""
+
+        def write_range(transfer_range: tuple[int, int]) -> None:
+            offset, length = transfer_range
+            with self._open_sftp(profile) as sftp:
+                try:
+                    with sftp.open(path, "r+b") as handle:
+                        handle.set_pipelined(True)
+                        handle.seek(offset)
+                        handle.write(payload[offset:offset + length])
+                except IOError as exc:
+                    raise CustomException(400, "Upload Failed", f"Failed to upload file: {exc}")
+
+        ranges = self._split_transfer_ranges(len(payload))
+        with ThreadPoolExecutor(max_workers=min(SFTP_CHANNELS_PER_HOST, len(ranges)), thread_name_prefix="sftp-write") as executor:
+            list(executor.map(write_range, ranges))
+
     def _ensure_unique_profile_username(self, operator_id: str, profile: dict[str, Any]) -> None:
         self._ensure_storage()
         normalized_host = str(profile.get("host") or "").strip().casefold()
@@ -1623,9 +1855,7 @@ class HostAccessService:
             connection.commit()
 
     def _ensure_storage(self) -> None:
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        with self._db_connect() as connection:
-            self._initialize_schema(connection)
+        get_sqlite_storage(self.database_file).ensure_schema("host_access", self._initialize_schema)
 
     def _get_active_profile_id(self, operator_id: str) -> Optional[str]:
         self._ensure_storage()
@@ -1655,9 +1885,7 @@ class HostAccessService:
             connection.commit()
 
     def _db_connect(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(self.database_file)
-        connection.row_factory = sqlite3.Row
-        return connection
+        return get_sqlite_storage(self.database_file).connect()
 
     def _initialize_schema(self, connection: sqlite3.Connection) -> None:
         existing_columns = {
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+import docker
+import requests
+
+from src.core.env_settings import env_int
+from src.core.exception import CustomException
+from src.core.logger import logger
+
+
+IMAGE_PULL_CONCURRENCY = env_int("WEBSOFT9_IMAGE_PULL_CONCURRENCY", 3, minimum=1)
+MIRROR_PROBE_TIMEOUT_SECONDS = 3.0
+MIRROR_PROBE_TTL_SECONDS = 3600.0
+
+DIRECT_SOURCE = ""
+DOCKER_HUB_REGISTRY = "docker.io"
+_DOCKER_HUB_PROBE_HOST = "registry-1.docker.io"
+
+
+def get_image_registry(image: str) -> str:
+    """Registry host of an image reference (``docker.io`` for Docker Hub short names)."""
+    first, _, rest = image.partition("/")
+    if rest and ("." in first or ":" in first or first == "localhost"):
+        return first.lower()
+    return DOCKER_HUB_REGISTRY
+
+
+class MirrorSelector:
+    """
+    Order pull sources (direct registry plus configured accelerators) per registry.
+
+    A source that completed a pull is remembered with its pull time and tried first next time.
+    Until a registry has such a record, sources are ordered by a concurrent ``/v2/`` probe, which
+    is cached for MIRROR_PROBE_TTL_SECONDS. Sources that failed a pull are moved to the back.
+    """
+
+    def __init__(self, probe: Optional[Callable[[str], Optional[float]]] = None):
+        self._probe = probe or self._probe_source
+        self._lock = threading.Lock()
+        self._pull_seconds: dict[str, dict[str, float]] = {}
+        self._failures: dict[str, set[str]] = {}
+        self._probes: dict[tuple[str, tuple[str, ...]], tuple[float, list[str]]] = {}
+
+    def order_sources(self, registry: str, accelerators: list[str]) -> list[str]:
+        sources = [DIRECT_SOURCE, *[item for item in accelerators if item]]
+        if len(sources) == 1:
+            return sources
+
+        with self._lock:
+            pull_seconds = dict(self._pull_seconds.get(registry, {}))
+            failures = set(self._failures.get(registry, set()))
+
+        ranked = self._probe_order(registry, sources) if not pull_seconds else list(sources)
+        ranked.sort(key=lambda source: (source in failures, pull_seconds.get(source, float("inf"))))
+        return ranked
+
+    def record_success(self, registry: str, source: str, seconds: float) -> None:
+        with self._lock:
+            known = self._pull_seconds.setdefault(registry, {})
+            previous = known.get(source)
+            known[source] = seconds if previous is None else (previous + seconds) / 2
+            self._failures.get(registry, set()).discard(source)
+
+    def record_failure(self, registry: str, source: str) -> None:
+        with self._lock:
+            self._failures.setdefault(registry, set()).add(source)
+            self._pull_seconds.get(registry, {}).pop(source, None)
+
+    def _probe_order(self, registry: str, sources: list[str]) -> list[str]:
+        cache_key = (registry, tuple(sources))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._probes.get(cache_key)
+            if cached is not None and now - cached[0] < MIRROR_PROBE_TTL_SECONDS:
+                return list(cached[1])
+
+        probe_targets = [self._probe_host(registry, source) for source in sources]
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            latencies = list(executor.map(self._probe, probe_targets))
+        reachable = sorted(
+            (latency, index, source)
+            for index, (source, latency) in enumerate(zip(sources, latencies))
+            if latency is not None
+        )
+        # Unreachable sources keep their configured order at the back.
+        ordered = [source for _, _, source in reachable]
+        ordered += [source for source, latency in zip(sources, latencies) if latency is None]
+
+        with self._lock:
+            self._probes[cache_key] = (now, ordered)
+        return list(ordered)
+
+    @staticmethod
+    def _probe_host(registry: str, source: str) -> str:
+        if source:
+            return source
+        return _DOCKER_HUB_PROBE_HOST if registry == DOCKER_HUB_REGISTRY else registry
+
+    @staticmethod
+    def _probe_source(host: str) -> Optional[float]:
+        started = time.monotonic()
+        try:
+            # Any HTTP answer (usually 401) means the registry API is reachable.
+            requests.get(f"https://{host}/v2/", timeout=MIRROR_PROBE_TIMEOUT_SECONDS)
+        except requests.RequestException:
+            return None
+        return time.monotonic() - started
+
+
+mirror_selector = MirrorSelector()
+
+
+class ImagePullScheduler:
+    """
+    Pull a set of images with bounded parallelism.
+
+    Duplicate references are pulled once and images already present locally are skipped. Each
+    image tries its sources in the order given by the MirrorSelector; a pull through an
+    accelerator is re-tagged to the original reference and the accelerator tag removed.
+
+    Attributes:
+        docker_client: Docker SDK client
+        accelerators (list[str]): Registry mirrors, as configured in docker_mirror.url
+        on_progress (Callable): Receives every decoded pull stream line
+        max_workers (int): Maximum concurrent pulls
+    """
+
+    def __init__(
+        self,
+        docker_client,
+        accelerators: Optional[list[str]] = None,
+        on_progress: Optional[Callable[[dict[str, Any]], None]] = None,
+        max_workers: Optional[int] = None,
+        selector: Optional[MirrorSelector] = None,
+    ):
+        self.docker_client = docker_client
+        self.accelerators = list(accelerators or [])
+        self.on_progress = on_progress or (lambda line: None)
+        self.max_workers = max_workers or IMAGE_PULL_CONCURRENCY
+        self.selector = selector or mirror_selector
+
+    def pull_all(self, images: Iterable[str]) -> None:
+        """
+        Pull every missing image. Raises CustomException naming the images that could not be pulled.
+        """
+        missing = [image for image in dict.fromkeys(images) if image and not self._image_exists(image)]
+        if not missing:
+            return
+
+        failed: list[str] = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing)), thread_name_prefix="image-pull") as executor:
+            for image, succeeded in zip(missing, executor.map(self.pull, missing)):
+                if not succeeded:
+                    failed.append(image)
+
+        if failed:
+            raise CustomException(500, "Image Pull Failed", f"Failed to pull image: {', '.join(failed)}")
+
+    def pull(self, image: str) -> bool:
+        registry = get_image_registry(image)
+        for source in self.selector.order_sources(registry, self.accelerators):
+            started = time.monotonic()
+            try:
+                if source:
+                    self._pull_through_accelerator(source, image)
+                else:
+                    logger.access(f"Pulling image: {image}")
+                    self._pull_stream(image)
+            except Exception as exc:
+                self.selector.record_failure(registry, source)
+                if source:
+                    logger.error(f"Failed to pull image from {source}: {exc}")
+                else:
+                    logger.access(f"Direct pull of {image} failed: {exc}")
+                continue
+            self.selector.record_success(registry, source, time.monotonic() - started)
+            return True
+        return False
+
+    def _pull_through_accelerator(self, accelerator: str, image: str) -> None:
+        accelerated_image = f"{accelerator}/{image}"
+        logger.access(f"Pulling image from {accelerator}: {accelerated_image}")
+        self._pull_stream(accelerated_image)
+        # Tag the image back to its original name and drop the accelerator tag
+        self.docker_client.api.tag(accelerated_image, image)
+        self.docker_client.api.remove_image(accelerated_image)
+
+    def _pull_stream(self, image: str) -> None:
+        for line in self.docker_client.api.pull(image, stream=True, decode=True):
+            if isinstance(line, dict) and line.get("error"):
+                raise docker.errors.APIError(str(line.get("error")))
+            self.on_progress(line)
+
+    def _image_exists(self, image: str) -> bool:
+        try:
+            logger.access(f"Checking if image exists: {image}")
+            self.docker_client.images.get(image)
+            return True
+        except docker.errors.ImageNotFound:
+            logger.access(f"Image not found: {image}")
+            return False
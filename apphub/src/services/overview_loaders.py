@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, Optional
+
+from src.core.env_settings import env_int
+
+
+# Loaders that miss their deadline keep running on these threads, so the pool is sized for a
+# full overview fan-out plus a few stragglers.
+OVERVIEW_LOADER_WORKERS = env_int("WEBSOFT9_OVERVIEW_LOADER_WORKERS", 12, minimum=1)
+
+_overview_loader_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=OVERVIEW_LOADER_WORKERS,
+    thread_name_prefix="overview-loader",
+)
+
+
+@dataclass(frozen=True)
+class LoaderResult:
+    # fresh: loaded within the deadline; stale: previous value served because the loader is still
+    # running; timeout: still running and nothing to fall back on; error: the loader raised.
+    state: Literal["fresh", "stale", "timeout", "error"]
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def missed_deadline(self) -> bool:
+        return self.state in {"stale", "timeout"}
+
+
+class OverviewLoaderFanout:
+    """
+    Runs independent overview loaders concurrently, each with its own deadline.
+
+    run() submits every loader to a shared thread pool and waits for each one until its own
+    deadline, measured from the start of the call, so the total wait is the slowest deadline
+    rather than the sum of all loaders. A loader that is still running after its deadline is
+    not cancelled: the caller gets the last value it returned (stale) or a timeout, and the
+    result still lands in the cache once it finishes. While a loader is in flight, further
+    calls wait on the same run instead of starting another one, so a hung integration ties up
+    at most one worker.
+    """
+
+    def __init__(self, executor: Optional[concurrent.futures.Executor] = None):
+        self._executor = executor or _overview_loader_executor
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, concurrent.futures.Future] = {}
+        self._last_values: dict[str, Any] = {}
+
+    def run(self, loaders: dict[str, tuple[Callable[[], Any], float]]) -> dict[str, LoaderResult]:
+        started = time.monotonic()
+        futures = {name: self._submit(name, load) for name, (load, _timeout_seconds) in loaders.items()}
+        results: dict[str, LoaderResult] = {}
+        for name, future in futures.items():
+            remaining = started + loaders[name][1] - time.monotonic()
+            try:
+                results[name] = LoaderResult("fresh", future.result(timeout=max(remaining, 0.0)))
+            except concurrent.futures.TimeoutError:
+                with self._lock:
+                    has_previous = name in self._last_values
+                    previous = self._last_values.get(name)
+                results[name] = LoaderResult("stale", previous) if has_previous else LoaderResult("timeout")
+            except Exception as exc:
+                results[name] = LoaderResult("error", error=exc)
+        return results
+
+    def _submit(self, name: str, load: Callable[[], Any]) -> concurrent.futures.Future:
+        with self._lock:
+            future = self._in_flight.get(name)
+            if future is not None and not future.done():
+                return future
+            future = self._executor.submit(load)
+            self._in_flight[name] = future
+        future.add_done_callback(functools.partial(self._record, name))
+        return future
+
+    def _record(self, name: str, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._in_flight.get(name) is future:
+                del self._in_flight[name]
+            if not future.cancelled() and future.exception() is None:
+                self._last_values[name] = future.result()
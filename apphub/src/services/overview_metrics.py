@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from src.core.env_settings import env_float
+from src.core.exception import CustomException
+from src.core.logger import logger
+
+
+OVERVIEW_METRICS_INTERVAL_SECONDS = env_float("WEBSOFT9_OVERVIEW_METRICS_INTERVAL_SECONDS", 5.0, minimum=1.0)
+# Samples older than this many intervals are not served as "current" values.
+OVERVIEW_METRICS_STALE_INTERVALS = 3
+OVERVIEW_METRICS_COARSE_SECONDS = 60
+OVERVIEW_METRICS_WINDOWS = {"1h": 3600, "24h": 86400}
+OVERVIEW_METRICS_DEFAULT_POINTS = 60
+OVERVIEW_METRICS_MAX_POINTS = 360
+
+# (summary section, field) pairs recorded in the series, exposed as "<section>.<field>".
+OVERVIEW_METRICS_FIELDS = (
+    ("runtime", "cpu_percent"),
+    ("runtime", "memory_percent"),
+    ("runtime", "network_rx_rate_bytes"),
+    ("runtime", "network_tx_rate_bytes"),
+    ("host_runtime", "cpu_percent"),
+    ("host_runtime", "memory_percent"),
+    ("host_runtime", "disk_percent"),
+    ("host_runtime", "network_rx_rate_bytes"),
+    ("host_runtime", "network_tx_rate_bytes"),
+    ("host_runtime", "disk_read_rate_bytes"),
+    ("host_runtime", "disk_write_rate_bytes"),
+)
+
+
+class MetricsSampler:
+    """
+    Background sampler for the overview runtime metrics.
+
+    A daemon thread calls collect() every interval_seconds and keeps the result as the latest
+    sample, so requests read precomputed values instead of sampling /proc and cgroup files
+    themselves. The numeric fields in OVERVIEW_METRICS_FIELDS are also recorded into two
+    fixed-size rings: every sample for the last hour, and one-minute averages for the last day.
+    series() downsamples either ring into evenly spaced points for sparklines.
+
+    With background=True the thread starts on the first ensure_started() call and runs for the
+    life of the process. Without it, ensure_started() does nothing and samples are only taken by
+    calling sample_once().
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[], dict[str, dict[str, Any]]],
+        interval_seconds: float = OVERVIEW_METRICS_INTERVAL_SECONDS,
+        background: bool = False,
+    ):
+        self.interval_seconds = interval_seconds
+        self.background = background
+        self._collect = collect
+        self._lock = threading.Lock()
+        self._latest: Optional[tuple[float, dict[str, dict[str, Any]]]] = None
+        self._fine: deque = deque(maxlen=math.ceil(OVERVIEW_METRICS_WINDOWS["1h"] / interval_seconds))
+        self._coarse: deque = deque(maxlen=OVERVIEW_METRICS_WINDOWS["24h"] // OVERVIEW_METRICS_COARSE_SECONDS)
+        # Running sums of the minute that is still being filled: (minute start, sums, counts).
+        self._pending_minute: Optional[tuple[float, list[float], list[int]]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def ensure_started(self) -> None:
+        if not self.background:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="overview-metrics", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=self.interval_seconds + 1)
+
+    def latest(self, section: str) -> Optional[dict[str, Any]]:
+        """Return the most recent sample of section, or None when there is no fresh one."""
+        with self._lock:
+            latest = self._latest
+        if latest is None or time.time() - latest[0] > self.interval_seconds * OVERVIEW_METRICS_STALE_INTERVALS:
+            return None
+        return latest[1].get(section)
+
+    def sample_once(self, now: Optional[float] = None) -> None:
+        payload = self._collect()
+        now = time.time() if now is None else now
+        values = [self._numeric(payload.get(section, {}).get(field)) for section, field in OVERVIEW_METRICS_FIELDS]
+        with self._lock:
+            self._latest = (now, payload)
+            self._fine.append((now, values))
+            self._record_minute(now, values)
+
+    def series(self, window: str, points: int = OVERVIEW_METRICS_DEFAULT_POINTS, now: Optional[float] = None) -> dict[str, Any]:
+        if window not in OVERVIEW_METRICS_WINDOWS:
+            raise CustomException(400, "Invalid Request", f"window must be one of: {', '.join(OVERVIEW_METRICS_WINDOWS)}")
+        points = max(1, min(int(points), OVERVIEW_METRICS_MAX_POINTS))
+        span = OVERVIEW_METRICS_WINDOWS[window]
+        end = time.time() if now is None else now
+        start = end - span
+        bucket_seconds = span / points
+
+        with self._lock:
+            samples = list(self._fine if window == "1h" else self._coarse)
+            if window != "1h" and self._pending_minute is not None:
+                samples.append(self._minute_average(self._pending_minute))
+
+        sums = [[0.0] * points for _ in OVERVIEW_METRICS_FIELDS]
+        counts = [[0] * points for _ in OVERVIEW_METRICS_FIELDS]
+        for sampled_at, values in samples:
+            if sampled_at < start or sampled_at > end:
+                continue
+            bucket = min(int((sampled_at - start) / bucket_seconds), points - 1)
+            for index, value in enumerate(values):
+                if value is not None:
+                    sums[index][bucket] += value
+                    counts[index][bucket] += 1
+
+        return {
+            "window": window,
+            "interval_seconds": round(bucket_seconds, 3),
+            "timestamps": [self._isoformat(start + (bucket + 1) * bucket_seconds) for bucket in range(points)],
+            "series": {
+                f"{'host' if section == 'host_runtime' else section}.{field}": [
+                    round(sums[index][bucket] / counts[index][bucket], 2) if counts[index][bucket] else None
+                    for bucket in range(points)
+                ]
+                for index, (section, field) in enumerate(OVERVIEW_METRICS_FIELDS)
+            },
+        }
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            try:
+                self.sample_once()
+            except Exception as exc:
+                logger.warning(f"Overview metrics sample failed: {exc}")
+            self._stopped.wait(max(0.0, self.interval_seconds - (time.monotonic() - started)))
+
+    def _record_minute(self, now: float, values: list[Optional[float]]) -> None:
+        minute = now - now % OVERVIEW_METRICS_COARSE_SECONDS
+        pending = self._pending_minute
+        if pending is not None and pending[0] != minute:
+            self._coarse.append(self._minute_average(pending))
+            pending = None
+        if pending is None:
+            pending = (minute, [0.0] * len(values), [0] * len(values))
+            self._pending_minute = pending
+        for index, value in enumerate(values):
+            if value is not None:
+                pending[1][index] += value
+                pending[2][index] += 1
+
+    @staticmethod
+    def _minute_average(pending: tuple[float, list[float], list[int]]) -> tuple[float, list[Optional[float]]]:
+        minute, sums, counts = pending
+        return minute + OVERVIEW_METRICS_COARSE_SECONDS / 2, [total / count if count else None for total, count in zip(sums, counts)]
+
+    @staticmethod
+    def _numeric(value: Any) -> Optional[float]:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        return float(value)
+
+    @staticmethod
+    def _isoformat(epoch: float) -> str:
+        return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+_sampling_service = None
+
+
+def _collect_overview_metrics() -> dict[str, dict[str, Any]]:
+    global _sampling_service
+    if _sampling_service is None:
+        from src.services.overview_service import OverviewService
+
+        _sampling_service = OverviewService()
+    payload: dict[str, dict[str, Any]] = {}
+    for section, loader in (("runtime", _sampling_service._load_runtime_summary), ("host_runtime", _sampling_service._load_host_runtime_summary)):
+        try:
+            payload[section] = loader()
+        except Exception as exc:
+            logger.warning(f"Overview metrics {section} sample failed: {exc}")
+    return payload
+
+
+overview_metrics_sampler = MetricsSampler(_collect_overview_metrics, background=True)
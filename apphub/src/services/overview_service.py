@@ -16,6 +16,7 @@ from src.schemas.overview import (
     OverviewAlert,
     OverviewAppsSummary,
     OverviewHostSummary,
+    OverviewMetricsSeriesResponse,
     OverviewProductSummary,
     OverviewResponse,
     OverviewRuntimeSummary,
@@ -24,10 +25,26 @@ from src.schemas.overview import (
     OverviewTasksSummary,
 )
 from src.services.core_services import CoreServicesService
+from src.services.overview_loaders import LoaderResult, OverviewLoaderFanout
+from src.services.overview_metrics import MetricsSampler, overview_metrics_sampler
 from src.services.product_auth import ProductAuthService
 from src.services.product_metadata import read_product_edition, read_product_metadata
 
 
+# Per-loader deadlines for get_overview. Services run supervisorctl plus HTTP health probes and
+# the app inventory talks to Docker, so they get more room than the local file readers.
+OVERVIEW_LOADER_TIMEOUT_SECONDS = {
+    "apps": 4.0,
+    "product": 2.0,
+    "catalog": 2.0,
+    "host": 2.0,
+    "runtime": 2.0,
+    "host_runtime": 2.0,
+    "services": 4.0,
+    "tasks": 4.0,
+}
+
+
 class OverviewService:
     def __init__(
         self,
@@ -41,36 +58,55 @@ class OverviewService:
         services_loader: Optional[Callable[[Optional[str]], Sequence[CoreServiceSummary]]] = None,
         tasks_loader: Optional[Callable[[], Sequence[OverviewTaskItem]]] = None,
         now_provider: Optional[Callable[[], datetime]] = None,
+        metrics_sampler: Optional[MetricsSampler] = None,
+        loader_timeouts: Optional[dict[str, float]] = None,
     ):
         self.auth_service = auth_service or ProductAuthService()
+        self._metrics_sampler = metrics_sampler or overview_metrics_sampler
         self._product_metadata_loader = product_metadata_loader or self._load_product_metadata
         self._available_catalog_count_loader = available_catalog_count_loader or self._load_available_catalog_count
         self._host_summary_loader = host_summary_loader or self._load_host_summary
-        self._host_runtime_summary_loader = host_runtime_summary_loader or self._load_host_runtime_summary
+        self._host_runtime_summary_loader = host_runtime_summary_loader or self._load_sampled_host_runtime_summary
         self._apps_loader = apps_loader or self._load_overview_apps
-        self._runtime_summary_loader = runtime_summary_loader or self._load_runtime_summary
+        self._runtime_summary_loader = runtime_summary_loader or self._load_sampled_runtime_summary
         self._services_loader = services_loader or (lambda session_token: CoreServicesService().list_services(session_token))
         self._tasks_loader = tasks_loader or self._load_recent_tasks
         self._now_provider = now_provider or (lambda: datetime.now(timezone.utc))
         self._uses_default_tasks_loader = tasks_loader is None
+        self._loader_timeouts = {**OVERVIEW_LOADER_TIMEOUT_SECONDS, **(loader_timeouts or {})}
+        self._loader_fanout = OverviewLoaderFanout()
         self._last_cpu_usage_sample: Optional[tuple[int, int]] = None
         self._last_host_cpu_sample: Optional[tuple[int, int]] = None
         self._cached_host_cpu_percent: Optional[tuple[float, int]] = None
         self._last_network_sample: Optional[tuple[int, int, int]] = None
+        self._last_disk_io_sample: Optional[tuple[int, int, int]] = None
         self._docker_host_info_cache_lock = threading.RLock()
         self._cached_docker_host_info: Optional[tuple[dict, int]] = None
 
     def get_overview(self, session_token: Optional[str]) -> OverviewResponse:
         self.auth_service._require_authenticated_operator(session_token)
 
-        app_inventory = self._load_apps_inventory()
-        apps = self._safe_apps_summary(app_inventory)
-        product = self._safe_product_summary(apps)
-        host = self._safe_host_summary()
-        runtime = self._safe_runtime_summary()
-        host_runtime = self._safe_host_runtime_summary()
-        services = self._safe_services_summary(session_token)
-        tasks = self._safe_tasks_summary(app_inventory)
+        loaders: dict[str, tuple[Callable[[], object], float]] = {
+            "apps": (lambda: list(self._apps_loader() or []), self._loader_timeouts["apps"]),
+            "product": (lambda: self._product_metadata_loader() or {}, self._loader_timeouts["product"]),
+            "catalog": (self._available_catalog_count_loader, self._loader_timeouts["catalog"]),
+            "host": (lambda: self._host_summary_loader() or {}, self._loader_timeouts["host"]),
+            "runtime": (lambda: self._runtime_summary_loader() or {}, self._loader_timeouts["runtime"]),
+            "host_runtime": (lambda: self._host_runtime_summary_loader() or {}, self._loader_timeouts["host_runtime"]),
+            "services": (lambda: list(self._services_loader(session_token) or []), self._loader_timeouts["services"]),
+        }
+        if not self._uses_default_tasks_loader:
+            loaders["tasks"] = (lambda: list(self._tasks_loader() or []), self._loader_timeouts["tasks"])
+        results = self._loader_fanout.run(loaders)
+
+        # Product and tasks are derived from the app inventory, so they are built once it is in.
+        apps = self._safe_apps_summary(results["apps"])
+        product = self._safe_product_summary(results["product"], results["catalog"], apps)
+        host = self._safe_host_summary(results["host"])
+        runtime = self._safe_runtime_summary(results["runtime"])
+        host_runtime = self._safe_host_runtime_summary(results["host_runtime"])
+        services = self._safe_services_summary(results["services"])
+        tasks = self._safe_tasks_summary(results.get("tasks", results["apps"]))
 
         return OverviewResponse(
             generated_at=self._timestamp_now(),
@@ -82,21 +118,25 @@ class OverviewService:
             services=services,
             tasks=tasks,
             alerts=self._build_alerts(apps=apps, services=services, tasks=tasks),
+            timed_out=sorted(name for name, result in results.items() if result.missed_deadline),
         )
 
-    def _safe_product_summary(self, apps: OverviewAppsSummary) -> OverviewProductSummary:
+    def get_metrics_series(self, session_token: Optional[str], window: str, points: int) -> OverviewMetricsSeriesResponse:
+        self.auth_service._require_authenticated_operator(session_token)
+        self._metrics_sampler.ensure_started()
+        return OverviewMetricsSeriesResponse(**self._metrics_sampler.series(window, points))
+
+    def _safe_product_summary(self, metadata: LoaderResult, catalog: LoaderResult, apps: OverviewAppsSummary) -> OverviewProductSummary:
+        if metadata.value is None:
+            return OverviewProductSummary(available=False, unavailable_reason=self._unavailable_reason(metadata))
         try:
-            payload = self._product_metadata_loader() or {}
-            catalog_app_count: Optional[int] = None
-            try:
-                catalog_app_count = self._available_catalog_count_loader()
-            except Exception:
-                catalog_app_count = None
+            payload = metadata.value
             return OverviewProductSummary(
+                stale=metadata.state == "stale" or catalog.state == "stale",
                 version=payload.get("version") or None,
                 edition_key=payload.get("edition_key") or None,
                 edition_name=payload.get("edition_name") or None,
-                catalog_app_count=catalog_app_count,
+                catalog_app_count=catalog.value,
                 installed_count=apps.installed_count if apps.available else None,
                 available_app_count=payload.get("max_apps"),
                 upgrade_state=payload.get("upgrade_state") or "unknown",
@@ -104,37 +144,30 @@ class OverviewService:
         except Exception as exc:
             return OverviewProductSummary(available=False, unavailable_reason=str(exc))
 
-    def _safe_runtime_summary(self) -> OverviewRuntimeSummary:
+    def _safe_runtime_summary(self, result: LoaderResult) -> OverviewRuntimeSummary:
+        if result.value is None:
+            return OverviewRuntimeSummary(available=False, unavailable_reason=self._unavailable_reason(result), health_state="critical")
         try:
-            payload = self._runtime_summary_loader() or {}
-            return OverviewRuntimeSummary(**payload)
+            return OverviewRuntimeSummary(**result.value, stale=result.state == "stale")
         except Exception as exc:
             return OverviewRuntimeSummary(available=False, unavailable_reason=str(exc), health_state="critical")
 
-    def _safe_host_summary(self) -> OverviewHostSummary:
+    def _safe_host_summary(self, result: LoaderResult) -> OverviewHostSummary:
+        if result.value is None:
+            return OverviewHostSummary(available=False, unavailable_reason=self._unavailable_reason(result))
         try:
-            payload = self._host_summary_loader() or {}
-            return OverviewHostSummary(**payload)
+            return OverviewHostSummary(**result.value, stale=result.state == "stale")
         except Exception as exc:
             return OverviewHostSummary(available=False, unavailable_reason=str(exc))
 
-    def _safe_host_runtime_summary(self) -> OverviewRuntimeSummary:
-        try:
-            payload = self._host_runtime_summary_loader() or {}
-            return OverviewRuntimeSummary(**payload)
-        except Exception as exc:
-            return OverviewRuntimeSummary(available=False, unavailable_reason=str(exc), health_state="critical")
+    def _safe_host_runtime_summary(self, result: LoaderResult) -> OverviewRuntimeSummary:
+        return self._safe_runtime_summary(result)
 
-    def _safe_apps_summary(self, apps: Sequence[object] | Exception | None = None) -> OverviewAppsSummary:
-        if isinstance(apps, Exception):
-            return OverviewAppsSummary(available=False, unavailable_reason=str(apps))
-
-        if apps is None:
-            apps = self._load_apps_inventory()
-
-        if isinstance(apps, Exception):
-            return OverviewAppsSummary(available=False, unavailable_reason=str(apps))
+    def _safe_apps_summary(self, result: LoaderResult) -> OverviewAppsSummary:
+        if result.value is None:
+            return OverviewAppsSummary(available=False, unavailable_reason=self._unavailable_reason(result))
 
+        apps = result.value
         installed_count = len(apps)
         active_count = sum(1 for app in apps if self._app_status(app) == 1)
         inactive_count = sum(1 for app in apps if self._app_status(app) == 2)
@@ -142,6 +175,7 @@ class OverviewService:
         error_count = sum(1 for app in apps if self._app_status(app) == 4)
 
         return OverviewAppsSummary(
+            stale=result.state == "stale",
             installed_count=installed_count,
             active_count=active_count,
             inactive_count=inactive_count,
@@ -149,37 +183,38 @@ class OverviewService:
             error_count=error_count,
         )
 
-    def _safe_services_summary(self, session_token: Optional[str]) -> OverviewServicesSummary:
-        try:
-            services = list(self._services_loader(session_token) or [])
-        except Exception as exc:
-            return OverviewServicesSummary(available=False, unavailable_reason=str(exc))
+    def _safe_services_summary(self, result: LoaderResult) -> OverviewServicesSummary:
+        if result.value is None:
+            return OverviewServicesSummary(available=False, unavailable_reason=self._unavailable_reason(result))
 
+        services = result.value
         return OverviewServicesSummary(
+            stale=result.state == "stale",
             total_count=len(services),
             healthy_count=sum(1 for service in services if service.health_state == "healthy"),
             degraded_count=sum(1 for service in services if service.health_state == "degraded"),
             unavailable_count=sum(1 for service in services if service.health_state == "unavailable"),
         )
 
-    def _safe_tasks_summary(self, apps: Sequence[object] | Exception | None = None) -> OverviewTasksSummary:
-        if isinstance(apps, Exception) and self._uses_default_tasks_loader:
-            return OverviewTasksSummary(available=False, unavailable_reason=str(apps))
+    def _safe_tasks_summary(self, result: LoaderResult) -> OverviewTasksSummary:
+        """Summarize tasks from the tasks loader result, or from the app inventory with the default loader."""
+        if result.value is None:
+            return OverviewTasksSummary(available=False, unavailable_reason=self._unavailable_reason(result))
 
         try:
-            if apps is not None and self._uses_default_tasks_loader:
-                items = list(self._load_recent_tasks_from_apps(apps))
+            if self._uses_default_tasks_loader:
+                items = list(self._load_recent_tasks_from_apps(result.value))
             else:
-                items = list(self._tasks_loader() or [])
+                items = list(result.value)
         except Exception as exc:
             return OverviewTasksSummary(available=False, unavailable_reason=str(exc))
-        return OverviewTasksSummary(items=items)
+        return OverviewTasksSummary(items=items, stale=result.state == "stale")
 
-    def _load_apps_inventory(self) -> list[object] | Exception:
-        try:
-            return list(self._apps_loader() or [])
-        except Exception as exc:
-            return exc
+    @staticmethod
+    def _unavailable_reason(result: LoaderResult) -> str:
+        if result.state == "timeout":
+            return "Timed out waiting for the summary"
+        return str(result.error) if result.error is not None else "Summary unavailable"
 
     def _build_alerts(
         self,
@@ -325,6 +360,18 @@ class OverviewService:
             "uptime_seconds": self._read_uptime_seconds(),
         }
 
+    def _load_sampled_runtime_summary(self) -> dict:
+        return self._load_sampled_summary("runtime", self._load_runtime_summary)
+
+    def _load_sampled_host_runtime_summary(self) -> dict:
+        return self._load_sampled_summary("host_runtime", self._load_host_runtime_summary)
+
+    def _load_sampled_summary(self, section: str, loader: Callable[[], dict]) -> dict:
+        # The background sampler keeps these current; sample inline only until it has a fresh value.
+        self._metrics_sampler.ensure_started()
+        sampled = self._metrics_sampler.latest(section)
+        return dict(sampled) if sampled is not None else loader()
+
     def _load_runtime_summary(self) -> dict:
         runtime_scope = "system"
         cpu_quota_cores = self._read_cgroup_cpu_limit_cores()
@@ -382,6 +429,8 @@ class OverviewService:
             "disk_percent": None,
             "disk_used_bytes": None,
             "disk_total_bytes": None,
+            "disk_read_rate_bytes": None,
+            "disk_write_rate_bytes": None,
         }
 
     def _load_host_runtime_summary(self) -> dict:
@@ -409,6 +458,7 @@ class OverviewService:
         disk_percent = round((disk_used_bytes / disk_total_bytes) * 100, 1) if disk_total_bytes > 0 else 0.0
 
         network_rx_bytes, network_tx_bytes, network_rx_rate_bytes, network_tx_rate_bytes = self._read_network_summary()
+        disk_read_rate_bytes, disk_write_rate_bytes = self._read_disk_io_rates()
 
         peak_percent = max(cpu_percent, memory_percent, disk_percent)
         if peak_percent >= 90:
@@ -434,6 +484,8 @@ class OverviewService:
             "disk_percent": disk_percent,
             "disk_used_bytes": disk_used_bytes,
             "disk_total_bytes": disk_total_bytes,
+            "disk_read_rate_bytes": disk_read_rate_bytes,
+            "disk_write_rate_bytes": disk_write_rate_bytes,
         }
 
     def _read_network_summary(self) -> tuple[int | None, int | None, int | None, int | None]:
@@ -490,6 +542,50 @@ class OverviewService:
             return None
         return total_rx, total_tx
 
+    def _read_disk_io_rates(self) -> tuple[int | None, int | None]:
+        snapshot = self._read_disk_io_snapshot()
+        if snapshot is None:
+            return None, None
+
+        read_bytes, written_bytes = snapshot
+        now_ns = time.monotonic_ns()
+        sample = self._last_disk_io_sample
+        self._last_disk_io_sample = (read_bytes, written_bytes, now_ns)
+        if sample is None or now_ns <= sample[2]:
+            return None, None
+
+        delta_time_ns = now_ns - sample[2]
+        read_rate = int((max(read_bytes - sample[0], 0) * 1_000_000_000) / delta_time_ns)
+        write_rate = int((max(written_bytes - sample[1], 0) * 1_000_000_000) / delta_time_ns)
+        return read_rate, write_rate
+
+    def _read_disk_io_snapshot(self) -> Optional[tuple[int, int]]:
+        raw_stats = self._read_text_file(Path("/proc/diskstats"))
+        if not raw_stats:
+            return None
+
+        total_read = 0
+        total_written = 0
+        found_device = False
+        for line in raw_stats.splitlines():
+            parts = line.split()
+            if len(parts) < 10:
+                continue
+            device_name = parts[2]
+            # Whole physical disks only: partitions and stacked devices would count the same I/O twice.
+            if device_name.startswith(("loop", "ram", "zram", "dm-", "md", "sr", "fd")) or not Path("/sys/block", device_name).exists():
+                continue
+            try:
+                total_read += int(parts[5]) * 512
+                total_written += int(parts[9]) * 512
+            except ValueError:
+                continue
+            found_device = True
+
+        if not found_device:
+            return None
+        return total_read, total_written
+
     def _read_cgroup_cpu_percent(self, cpu_quota_cores: Optional[float]) -> Optional[float]:
         usage_ns = self._read_cgroup_cpu_usage_ns()
         if usage_ns is None:
@@ -716,10 +812,7 @@ class OverviewService:
         return content or None
 
     def _load_recent_tasks(self) -> list[OverviewTaskItem]:
-        apps = self._load_apps_inventory()
-        if isinstance(apps, Exception):
-            raise apps
-        return self._load_recent_tasks_from_apps(apps)
+        return self._load_recent_tasks_from_apps(list(self._apps_loader() or []))
 
     def _load_recent_tasks_from_apps(self, apps: Sequence[object]) -> list[OverviewTaskItem]:
         items: list[OverviewTaskItem] = []
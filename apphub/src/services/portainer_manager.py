@@ -3,6 +3,7 @@ import os
 import re
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from src.core.exception import CustomException
 from src.external.portainer_api import PortainerAPI
@@ -46,6 +47,7 @@ class PortainerManager:
         remove_stack(stack_id, endpoint_id): Remove stack by id
         remove_stack_and_volumes(stack_id, endpoint_id): Remove stack and volumes by id
         get_volumes_by_stack_name(stack_name, endpoint_id): Get volumes by stack name
+        get_containers_by_ids(endpoint_id, container_ids, max_workers): Inspect containers concurrently
         remove_volume(volume_names, endpoint_id): Remove volume by name
     """
     def __init__(self):
@@ -686,4 +688,36 @@ class PortainerManager:
             return response.json()
         else:
             logger.error(f"Get container by id:{container_id} error: {response.status_code}:{response.text}")
-            raise CustomException()
\ No newline at end of file
+            raise CustomException()
+
+    def get_containers_by_ids(self, endpoint_id: int, container_ids: list[str], max_workers: int = 8) -> dict[str, dict]:
+        """
+        Inspect several containers concurrently with bounded parallelism
+
+        Args:
+            endpoint_id (int): endpoint id
+            container_ids (list): container ids
+            max_workers (int): maximum number of concurrent inspect requests
+
+        Returns:
+            dict: container info keyed by container id; containers that fail to inspect are omitted
+        """
+        unique_ids = [container_id for container_id in dict.fromkeys(container_ids or []) if container_id]
+        if not unique_ids:
+            return {}
+
+        def inspect(container_id: str):
+            try:
+                return container_id, self.get_container_by_id(endpoint_id, container_id)
+            except Exception as exc:
+                logger.warning(f"Inspect container:{container_id} skipped: {exc}")
+                return container_id, None
+
+        workers = max(1, min(max_workers, len(unique_ids)))
+        if workers == 1:
+            results = [inspect(container_id) for container_id in unique_ids]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="portainer-inspect") as executor:
+                results = list(executor.map(inspect, unique_ids))
+
+        return {container_id: info for container_id, info in results if isinstance(info, dict)}
@@ -6,15 +6,18 @@ import os
 import secrets
 import sqlite3
 import threading
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Optional, Tuple
 from urllib.parse import urlparse
 
+from src.core.cache import get_cache
 from src.core.config import ConfigManager
 from src.core.exception import CustomException
 from src.core.logger import logger
+from src.core.sqlite_storage import get_sqlite_storage
 
 
 DEFAULT_PRODUCT_AUTH_PROTECTED_MODULES = ["users", "files", "terminal", "services", "logs"]
@@ -39,6 +42,13 @@ def _resolve_product_auth_cookie_name() -> str:
 
 PRODUCT_AUTH_COOKIE_NAME = _resolve_product_auth_cookie_name()
 SESSION_TTL_HOURS = int(os.getenv("WEBSOFT9_SESSION_TTL_HOURS", "24"))
+# last_seen_at is only rewritten when it is older than this, so polling clients don't write per request.
+SESSION_TOUCH_INTERVAL_SECONDS = int(os.getenv("WEBSOFT9_SESSION_TOUCH_INTERVAL_SECONDS", "60"))
+# Expired/invalidated sessions are kept this long for auditing, then pruned in the background.
+SESSION_RETENTION_HOURS = int(os.getenv("WEBSOFT9_SESSION_RETENTION_HOURS", "168"))
+SESSION_PRUNE_INTERVAL_SECONDS = int(os.getenv("WEBSOFT9_SESSION_PRUNE_INTERVAL_SECONDS", "3600"))
+# Resolved sessions are kept in memory this long; logout and operator changes invalidate them explicitly.
+SESSION_CACHE_TTL_SECONDS = float(os.getenv("WEBSOFT9_SESSION_CACHE_TTL_SECONDS", "15"))
 PASSWORD_HASH_ITERATIONS = 310_000
 DOCKER_BOOTSTRAP_ACTOR = "docker-bootstrap"
 PENDING_MIGRATED_FAVORITES_KEY = "migrated_favorite_apps_pending"
@@ -46,6 +56,10 @@ PENDING_MIGRATED_FAVORITES_KEY = "migrated_favorite_apps_pending"
 
 class ProductAuthService:
     _lock = threading.RLock()
+    _prune_lock = threading.Lock()
+    _last_prune_at: dict[str, float] = {}
+    _session_secrets: dict[str, str] = {}
+    _session_cache = get_cache("product_auth_sessions", max_entries=1024, default_ttl=SESSION_CACHE_TTL_SECONDS)
 
     def __init__(self, data_dir: Optional[str] = None):
         data_root = os.getenv("WEBSOFT9_DATA_ROOT", "/opt/websoft9/data")
@@ -254,17 +268,15 @@ class ProductAuthService:
             return self.get_status(session_token=None)
 
         with self._lock:
-            sessions = self._load_sessions()
             token_hash = self._hash_session_token(session_token)
+            session = self._load_session_by_token_hash(token_hash)
             operator_id = None
-            for session in sessions:
-                if session.get("token_hash") != token_hash or session.get("invalidated_at"):
-                    continue
-                session["invalidated_at"] = self._now_iso()
+            if session is not None and not session.get("invalidated_at"):
+                self._invalidate_session(session["id"])
                 operator_id = session.get("operator_id")
-                break
+            # After the database write, so a lookup that read the session before it cannot cache it.
+            self._session_cache.invalidate(self._session_cache_key(token_hash))
 
-            self._store_sessions(sessions)
             self._append_audit(
                 event="logout",
                 operator_id=operator_id,
@@ -276,16 +288,17 @@ class ProductAuthService:
 
     def invalidate_sessions_for_operator(self, operator_id: str, reason: str) -> None:
         with self._lock:
-            sessions = self._load_sessions()
-            updated = False
-            for session in sessions:
-                if session.get("operator_id") != operator_id or session.get("invalidated_at"):
-                    continue
-                session["invalidated_at"] = self._now_iso()
-                updated = True
+            self._ensure_storage()
+            with self._db_connect() as connection:
+                cursor = connection.execute(
+                    "UPDATE sessions SET invalidated_at = ? WHERE operator_id = ? AND invalidated_at IS NULL",
+                    (self._now_iso(), operator_id),
+                )
+                connection.commit()
+                updated = bool(cursor.rowcount and cursor.rowcount > 0)
+            self._session_cache.invalidate_tag(self._session_cache_operator_tag(operator_id))
 
             if updated:
-                self._store_sessions(sessions)
                 self._append_audit(event="session_invalidation", operator_id=operator_id, reason=reason)
 
     def list_operators(self, session_token: Optional[str]) -> list[dict[str, Any]]:
@@ -716,44 +729,72 @@ class ProductAuthService:
         if not session_token:
             return None
 
-        with self._lock:
-            sessions = self._load_sessions()
-            token_hash = self._hash_session_token(session_token)
-            now = self._now()
-            matched_session = None
-            for session in sessions:
-                if session.get("token_hash") != token_hash:
-                    continue
-                matched_session = session
-                break
-
-            if matched_session is None:
-                return None
-
-            if matched_session.get("invalidated_at"):
-                return None
-
-            expires_at = self._parse_iso(matched_session["expires_at"])
-            if expires_at <= now:
-                matched_session["invalidated_at"] = self._now_iso()
-                self._store_sessions(sessions)
-                self._append_audit(event="session_expired", operator_id=matched_session.get("operator_id"))
-                return None
-
-            operator = self._get_operator_by_id(matched_session["operator_id"])
-            if operator is None or operator.get("deleted") or operator.get("disabled"):
-                matched_session["invalidated_at"] = self._now_iso()
-                self._store_sessions(sessions)
-                self._append_audit(
-                    event="session_invalidation",
-                    operator_id=matched_session.get("operator_id"),
-                    reason="operator-unavailable",
-                )
-                return None
+        token_hash = self._hash_session_token(session_token)
+        cache_key = self._session_cache_key(token_hash)
+        cached = self._session_cache.get(cache_key)
+        if cached is not None:
+            self._touch_cached_session(cached)
+            return dict(cached["operator"])
+
+        # Reads don't take the class lock; only the rare state transitions below do. A logout or
+        # operator change that lands while this lookup runs bumps the cache generation, and the
+        # result is then returned without being cached.
+        generation = self._session_cache.generation()
+        matched_session = self._load_session_by_token_hash(token_hash)
+        self._schedule_session_prune()
+        if matched_session is None or matched_session.get("invalidated_at"):
+            return None
+
+        now = self._now()
+        expires_at = self._parse_iso(matched_session["expires_at"])
+        if expires_at <= now:
+            with self._lock:
+                if self._invalidate_session(matched_session["id"]):
+                    self._append_audit(event="session_expired", operator_id=matched_session.get("operator_id"))
+            return None
+
+        operator = self._get_operator_by_id(matched_session["operator_id"])
+        if operator is None or operator.get("deleted") or operator.get("disabled"):
+            with self._lock:
+                if self._invalidate_session(matched_session["id"]):
+                    self._append_audit(
+                        event="session_invalidation",
+                        operator_id=matched_session.get("operator_id"),
+                        reason="operator-unavailable",
+                    )
+            return None
+
+        public_operator = self._public_operator(operator)
+        cached = {
+            "session_id": matched_session["id"],
+            "operator": public_operator,
+            "last_seen_at": self._parse_iso(matched_session["last_seen_at"]),
+        }
+        self._touch_cached_session(cached)
+        self._session_cache.set(
+            cache_key,
+            cached,
+            ttl=min(SESSION_CACHE_TTL_SECONDS, (expires_at - now).total_seconds()),
+            tags=(self._session_cache_operator_tag(operator["id"]), self._session_cache_database_tag()),
+            generation=generation,
+        )
+        return dict(public_operator)
+
+    def _touch_cached_session(self, cached: dict[str, Any]) -> None:
+        now = self._now()
+        if (now - cached["last_seen_at"]).total_seconds() < SESSION_TOUCH_INTERVAL_SECONDS:
+            return
+        cached["last_seen_at"] = now
+        self._touch_session(cached["session_id"], self._iso(now))
+
+    def _session_cache_key(self, token_hash: str) -> tuple[str, str]:
+        return (str(self.database_file), token_hash)
 
-            matched_session["last_seen_at"] = self._now_iso()
-            self._store_sessions(sessions)
-            return self._public_operator(operator)
+    def _session_cache_operator_tag(self, operator_id: str) -> str:
+        return f"{self.database_file}:operator:{operator_id}"
+
+    def _session_cache_database_tag(self) -> str:
+        return f"{self.database_file}:sessions"
 
     def _build_operator(
         self,
@@ -829,10 +870,9 @@ class ProductAuthService:
             )
 
     def _create_session(self, operator_id: str) -> str:
-        sessions = self._load_sessions()
         session_token = secrets.token_urlsafe(32)
         now = self._now()
-        sessions.append(
+        self._insert_session(
             {
                 "id": str(uuid.uuid4()),
                 "operator_id": operator_id,
@@ -843,7 +883,7 @@ class ProductAuthService:
                 "invalidated_at": None,
             }
         )
-        self._store_sessions(sessions)
+        self._schedule_session_prune()
         return session_token
 
     def _get_operator_by_username(self, username: str) -> Optional[dict[str, Any]]:
@@ -959,6 +999,11 @@ class ProductAuthService:
         return hmac.new(session_secret.encode("utf-8"), session_token.encode("utf-8"), hashlib.sha256).hexdigest()
 
     def _get_session_secret(self) -> str:
+        database_key = str(self.database_file)
+        cached_secret = self._session_secrets.get(database_key)
+        if cached_secret is not None:
+            return cached_secret
+
         self._ensure_storage()
         with self._db_connect() as connection:
             payload = connection.execute(
@@ -969,7 +1014,8 @@ class ProductAuthService:
         if payload is not None:
             decoded = self._decode_metadata_json(payload["value"], key="session_secret_payload")
             if isinstance(decoded, dict) and decoded.get("secret"):
-                return str(decoded["secret"])
+                self._session_secrets[database_key] = str(decoded["secret"])
+                return self._session_secrets[database_key]
 
         secret = secrets.token_urlsafe(48)
         with self._db_connect() as connection:
@@ -978,6 +1024,7 @@ class ProductAuthService:
                 ("session_secret_payload", json.dumps({"secret": secret, "created_at": self._now_iso()}, ensure_ascii=True)),
             )
             connection.commit()
+        self._session_secrets[database_key] = secret
         return secret
 
     def _build_storage_boundary(self) -> dict[str, str]:
@@ -1078,15 +1125,10 @@ class ProductAuthService:
         return imported
 
     def _ensure_storage(self) -> None:
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        with self._db_connect() as connection:
-            self._initialize_schema(connection)
+        get_sqlite_storage(self.database_file).ensure_schema("product_auth", self._initialize_schema)
 
     def _db_connect(self) -> sqlite3.Connection:
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        connection = sqlite3.connect(self.database_file)
-        connection.row_factory = sqlite3.Row
-        return connection
+        return get_sqlite_storage(self.database_file).connect()
 
     def _initialize_schema(self, connection: sqlite3.Connection) -> None:
         connection.executescript(
@@ -1134,6 +1176,9 @@ class ProductAuthService:
                 created_at TEXT NOT NULL,
                 PRIMARY KEY (operator_id, app_key)
             );
+
+            CREATE INDEX IF NOT EXISTS idx_sessions_operator_id ON sessions (operator_id);
+            CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
             """
         )
         connection.execute("ALTER TABLE operators ADD COLUMN email TEXT") if not self._column_exists(connection, "operators", "email") else None
@@ -1183,44 +1228,93 @@ class ProductAuthService:
                 ],
             )
             connection.commit()
+        # Cached sessions embed the public operator record; any operator write drops them.
+        self._session_cache.invalidate_tag(self._session_cache_database_tag())
 
-    def _load_sessions(self) -> list[dict[str, Any]]:
+    def _load_session_by_token_hash(self, token_hash: str) -> Optional[dict[str, Any]]:
         self._ensure_storage()
         with self._db_connect() as connection:
-            rows = connection.execute(
+            row = connection.execute(
                 """
                 SELECT id, operator_id, token_hash, created_at, last_seen_at, expires_at, invalidated_at
                 FROM sessions
-                ORDER BY created_at, id
-                """
-            ).fetchall()
-        return [self._session_row_to_dict(row) for row in rows]
+                WHERE token_hash = ?
+                """,
+                (token_hash,),
+            ).fetchone()
+        return self._session_row_to_dict(row) if row is not None else None
 
-    def _store_sessions(self, sessions: list[dict[str, Any]]) -> None:
+    def _insert_session(self, session: dict[str, Any]) -> None:
         self._ensure_storage()
         with self._db_connect() as connection:
-            connection.execute("DELETE FROM sessions")
-            connection.executemany(
+            connection.execute(
                 """
                 INSERT INTO sessions (
                     id, operator_id, token_hash, created_at, last_seen_at, expires_at, invalidated_at
                 ) VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                [
-                    (
-                        item["id"],
-                        item["operator_id"],
-                        item["token_hash"],
-                        item["created_at"],
-                        item["last_seen_at"],
-                        item["expires_at"],
-                        item.get("invalidated_at"),
-                    )
-                    for item in sessions
-                ],
+                (
+                    session["id"],
+                    session["operator_id"],
+                    session["token_hash"],
+                    session["created_at"],
+                    session["last_seen_at"],
+                    session["expires_at"],
+                    session.get("invalidated_at"),
+                ),
             )
             connection.commit()
 
+    def _invalidate_session(self, session_id: str) -> bool:
+        with self._db_connect() as connection:
+            cursor = connection.execute(
+                "UPDATE sessions SET invalidated_at = ? WHERE id = ? AND invalidated_at IS NULL",
+                (self._now_iso(), session_id),
+            )
+            connection.commit()
+        return bool(cursor.rowcount and cursor.rowcount > 0)
+
+    def _touch_session(self, session_id: str, last_seen_at: str) -> None:
+        try:
+            with self._db_connect() as connection:
+                connection.execute(
+                    "UPDATE sessions SET last_seen_at = ? WHERE id = ? AND last_seen_at < ?",
+                    (last_seen_at, session_id, last_seen_at),
+                )
+                connection.commit()
+        except sqlite3.OperationalError as exc:
+            # last_seen_at is informational; a busy database must not fail the request.
+            logger.warning(f"Failed to update product auth session activity: {exc}")
+
+    def _schedule_session_prune(self) -> None:
+        database_key = str(self.database_file)
+        now = time.monotonic()
+        with self._prune_lock:
+            last_prune_at = self._last_prune_at.get(database_key)
+            if last_prune_at is not None and now - last_prune_at < SESSION_PRUNE_INTERVAL_SECONDS:
+                return
+            self._last_prune_at[database_key] = now
+
+        threading.Thread(target=self._prune_sessions, name="product-auth-session-prune", daemon=True).start()
+
+    def _prune_sessions(self) -> int:
+        cutoff = self._iso(self._now() - timedelta(hours=SESSION_RETENTION_HOURS))
+        try:
+            with self._db_connect() as connection:
+                cursor = connection.execute(
+                    "DELETE FROM sessions WHERE expires_at < ? OR (invalidated_at IS NOT NULL AND invalidated_at < ?)",
+                    (cutoff, cutoff),
+                )
+                connection.commit()
+            removed = int(cursor.rowcount or 0)
+        except sqlite3.Error as exc:
+            logger.warning(f"Failed to prune product auth sessions: {exc}")
+            return 0
+
+        if removed:
+            logger.info(f"Pruned {removed} stale product auth sessions")
+        return removed
+
     def _decode_metadata_json(self, value: str, key: str) -> Any:
         try:
             return json.loads(value)
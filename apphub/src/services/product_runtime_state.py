@@ -3,12 +3,14 @@ from __future__ import annotations
 import configparser
 import json
 import os
+import sqlite3
 import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional
 
 from src.core.product_catalog import resolve_product_edition_definition
+from src.core.sqlite_storage import get_sqlite_storage
 from src.services.app_status import InstallStateStore, _utc_now
 
 
@@ -150,21 +152,23 @@ class ProductRuntimeStateStore(InstallStateStore):
 
     def _ensure_storage(self) -> None:
         super()._ensure_storage()
-        with self._db_connect() as connection:
-            connection.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS product_runtime_state (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    edition_key TEXT NOT NULL,
-                    max_apps INTEGER,
-                    state_source TEXT NOT NULL,
-                    updated_by TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    note TEXT
-                );
-                """
-            )
-            connection.commit()
+        get_sqlite_storage(self.database_file).ensure_schema("product_runtime_state", self._initialize_runtime_state_schema)
+
+    def _initialize_runtime_state_schema(self, connection: sqlite3.Connection) -> None:
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS product_runtime_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                edition_key TEXT NOT NULL,
+                max_apps INTEGER,
+                state_source TEXT NOT NULL,
+                updated_by TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                note TEXT
+            );
+            """
+        )
+        connection.commit()
 
     def get_runtime_state_row(self) -> dict[str, Any] | None:
         with self._state_lock, self._db_connect() as connection:
@@ -3,11 +3,21 @@ import os
 import time
 import jwt
 import keyring
+from src.core.cache import get_cache
 from src.core.exception import CustomException
 from src.core.logger import logger
 from src.external.nginx_proxy_manager_api import NginxProxyManagerAPI
 from src.services.integration_credentials import IntegrationCredentialProvider
 
+# Proxy host listing shared by read paths (app inventory, app detail). Every mutation made
+# through ProxyManager drops it; the short TTL bounds staleness from edits made directly in NPM.
+proxy_hosts_cache = get_cache("proxy_hosts", max_entries=8, default_ttl=10)
+
+
+def invalidate_proxy_hosts_cache():
+    proxy_hosts_cache.invalidate_tag("proxy_hosts")
+
+
 class ProxyManager:
     """
     This class is used to manage proxy hosts
@@ -223,6 +233,7 @@ class ProxyManager:
                 certificate_id=certificate_id,
             ssl_forced=ssl_forced,
         )
+        invalidate_proxy_hosts_cache()
         if response.status_code != 201:
             self._handler_nginx_error(response)
         else:
@@ -259,6 +270,7 @@ class ProxyManager:
                 req_json.pop(key, None) 
 
             response =  self.nginx.update_proxy_host(proxy_id=proxy_id, json=req_json)
+            invalidate_proxy_hosts_cache()
             if response.status_code == 200:
                 return response.json()
             else:
@@ -301,6 +313,7 @@ class ProxyManager:
                 req_json.pop(key, None)
 
             response = self.nginx.update_proxy_host(proxy_id=proxy_id, json=req_json)
+            invalidate_proxy_hosts_cache()
             if response.status_code == 200:
                 return response.json()
             self._handler_nginx_error(response)
@@ -338,6 +351,7 @@ class ProxyManager:
                 req_json.pop(key, None)
 
             response = self.nginx.update_proxy_host(proxy_id=proxy_id, json=req_json)
+            invalidate_proxy_hosts_cache()
             if response.status_code == 200:
                 return response.json()
             else:
@@ -387,6 +401,7 @@ class ProxyManager:
             if proxy_hosts:
                 for proxy_host in proxy_hosts:
                     response = self.nginx.delete_proxy_host(proxy_host.get("id"))
+                    invalidate_proxy_hosts_cache()
                     if response.status_code != 200:
                         self._handler_nginx_error(response)
         except CustomException as e:
@@ -403,6 +418,7 @@ class ProxyManager:
             proxy_id (int): Proxy id
         """
         response = self.nginx.delete_proxy_host(proxy_id)
+        invalidate_proxy_hosts_cache()
         if response.status_code != 200:
             self._handler_nginx_error(response)
 
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.core.env_settings import env_float
+from src.core.logger import logger
+from src.core.sqlite_storage import get_sqlite_storage
+from src.schemas.runtimeLogs import RuntimeLogEntry
+
+
+RUNTIME_LOG_INDEX_ENABLED = os.getenv("WEBSOFT9_RUNTIME_LOG_INDEX", "").strip().lower() in {"1", "true", "yes", "on"}
+RUNTIME_LOG_INDEX_RETENTION_DAYS = env_float("WEBSOFT9_RUNTIME_LOG_INDEX_RETENTION_DAYS", 30, minimum=0.0)
+RUNTIME_LOG_INDEX_MAX_BYTES = int(env_float("WEBSOFT9_RUNTIME_LOG_INDEX_MAX_MB", 512, minimum=0.0) * 1024 * 1024)
+RUNTIME_LOG_INDEX_COMPACT_INTERVAL_SECONDS = 600.0
+RUNTIME_LOG_INGEST_CHUNK_BYTES = 4 * 1024 * 1024
+# The first bytes of the log are kept as its fingerprint: a file that no longer starts with them
+# was truncated or replaced and is ingested again from the top.
+RUNTIME_LOG_HEAD_FINGERPRINT_BYTES = 256
+# Backlogs up to this size are ingested on the request; larger ones catch up in the background.
+RUNTIME_LOG_INLINE_INGEST_BYTES = 1024 * 1024
+# Each size-driven compaction pass drops this share of the oldest rows before measuring again.
+RUNTIME_LOG_COMPACT_BATCH_RATIO = 0.1
+# The trigram tokenizer cannot match shorter keywords; those fall back to a scan.
+RUNTIME_LOG_FTS_MIN_KEYWORD_CHARS = 3
+
+
+class RuntimeLogStore:
+    """
+    On-disk index of the platform runtime log in a SQLite database.
+
+    sync() ingests whatever PlatformRuntimeFileHandler (and the entrypoint) appended since the
+    last call, remembering per path the file position, its device and inode and a fingerprint of
+    its first bytes. A log that was rotated or truncated starts a new generation that is read from
+    the top; entry ids are only unique within a generation, so indexed entries survive rotation
+    and truncation alongside the new ones. Small increments are ingested inline; a large backlog (the first sync of an existing
+    log, or after downtime) is ingested on a background thread while sync() reports that the
+    index is still catching up. Rows carry the timestamp, level and component as indexed columns and message/raw text
+    in an FTS5 trigram index, so time range, level, component and substring filters with
+    id-based pagination are answered from the database instead of by scanning the file.
+
+    compact() drops rows older than retention_days and, while the used pages exceed max_bytes,
+    the oldest rows; freed pages are returned with incremental vacuum. sync() runs it on the
+    background thread every RUNTIME_LOG_INDEX_COMPACT_INTERVAL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        database_file: Optional[str] = None,
+        retention_days: float = RUNTIME_LOG_INDEX_RETENTION_DAYS,
+        max_bytes: int = RUNTIME_LOG_INDEX_MAX_BYTES,
+    ):
+        data_root = os.getenv("WEBSOFT9_DATA_ROOT", "/opt/websoft9/data")
+        self.database_file = Path(
+            database_file or os.getenv("WEBSOFT9_RUNTIME_LOG_INDEX_PATH") or f"{data_root}/config/apphub/runtime-logs.sqlite"
+        )
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        # _lock serializes ingestion, _compact_lock compaction; the two only share SQLite's write lock.
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._catching_up = False
+        self._has_fts: Optional[bool] = None
+        self._last_compacted_at: Optional[float] = None
+
+    def sync(self, log_path: Path, parse_line: Callable[[str, str], Optional[RuntimeLogEntry]]) -> bool:
+        """
+        Bring the index up to date with log_path.
+
+        Returns False while a background catch-up is still ingesting; the index then lacks the
+        most recent lines and callers should read the file instead where they can.
+        """
+        with self._worker_lock:
+            if self._catching_up:
+                return False
+        backlog = self._pending_bytes(log_path)
+        if backlog > RUNTIME_LOG_INLINE_INGEST_BYTES:
+            self._start_worker(log_path, parse_line, catch_up=True)
+            return False
+        if backlog:
+            with self._lock:
+                self._ingest_path(self._db_connect(), log_path, parse_line)
+        if self._compaction_due():
+            self._start_worker(log_path, parse_line, catch_up=False)
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background ingestion and compaction; returns False if still running after timeout."""
+        with self._worker_lock:
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+            return not worker.is_alive()
+        return True
+
+    def query(
+        self,
+        *,
+        level: Optional[str] = None,
+        keyword: Optional[str] = None,
+        component: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        before: Optional[int] = None,
+        limit: int = 200,
+    ) -> tuple[list[RuntimeLogEntry], Optional[int]]:
+        """
+        Return up to limit matching entries, newest first, and the cursor for the next page.
+
+        Pass the returned cursor as before to continue with older entries; it is None on the
+        last page.
+        """
+        conditions: list[str] = []
+        parameters: list[object] = []
+        if before is not None:
+            conditions.append("e.id < ?")
+            parameters.append(before)
+        # Entries without a timestamp never match a time bound, like the file-based threshold filter.
+        if since is not None:
+            conditions.append("e.ts >= ?")
+            parameters.append(since.timestamp())
+        if until is not None:
+            conditions.append("e.ts < ?")
+            parameters.append(until.timestamp())
+        if level:
+            conditions.append("e.level = ?")
+            parameters.append(level)
+        if component:
+            conditions.append("e.component = ?")
+            parameters.append(component.lower())
+        if keyword:
+            if self._has_fts and len(keyword) >= RUNTIME_LOG_FTS_MIN_KEYWORD_CHARS:
+                conditions.append("e.id IN (SELECT rowid FROM runtime_log_fts WHERE runtime_log_fts MATCH ?)")
+                parameters.append('"' + keyword.replace('"', '""') + '"')
+            else:
+                conditions.append("(instr(lower(e.raw), ?) > 0 OR instr(lower(e.message), ?) > 0)")
+                parameters.extend([keyword.lower(), keyword.lower()])
+
+        sql = "SELECT e.* FROM runtime_log_entries e"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY e.id DESC LIMIT ?"
+        parameters.append(limit + 1)
+
+        rows = self._db_connect().execute(sql, parameters).fetchall()
+        entries = [self._row_to_entry(row) for row in rows[:limit]]
+        next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+        return entries, next_cursor
+
+    def compact(self) -> int:
+        """Apply age and size retention now; returns the number of deleted rows."""
+        with self._compact_lock:
+            return self._compact_locked(self._db_connect())
+
+    def _start_worker(self, log_path: Path, parse_line, catch_up: bool) -> None:
+        # A running worker is left alone; a catch-up it does not cover is started by a later sync().
+        with self._worker_lock:
+            if self._worker is not None:
+                return
+            self._catching_up = catch_up
+            self._worker = threading.Thread(
+                target=self._run_worker,
+                args=(log_path, parse_line, catch_up),
+                name="runtime-log-index",
+                daemon=True,
+            )
+            self._worker.start()
+
+    def _run_worker(self, log_path: Path, parse_line, catch_up: bool) -> None:
+        try:
+            connection = self._db_connect()
+            if catch_up:
+                with self._lock:
+                    self._ingest_path(connection, log_path, parse_line)
+                with self._worker_lock:
+                    self._catching_up = False
+            if self._compaction_due():
+                with self._compact_lock:
+                    self._compact_locked(connection)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning(f"Runtime log index maintenance failed: {exc}")
+        finally:
+            with self._worker_lock:
+                self._catching_up = False
+                self._worker = None
+
+    def _compaction_due(self) -> bool:
+        return self._last_compacted_at is None or time.monotonic() - self._last_compacted_at >= RUNTIME_LOG_INDEX_COMPACT_INTERVAL_SECONDS
+
+    def _pending_bytes(self, log_path: Path) -> int:
+        try:
+            file_stat = log_path.stat()
+        except FileNotFoundError:
+            return 0
+        try:
+            handle = open(log_path, "rb")
+        except FileNotFoundError:
+            return 0
+        with handle:
+            position, _generation = self._resume_point(self._db_connect(), log_path, handle)
+            return os.fstat(handle.fileno()).st_size - position
+
+    def _ingest_path(self, connection: sqlite3.Connection, log_path: Path, parse_line) -> int:
+        try:
+            handle = open(log_path, "rb")
+        except FileNotFoundError:
+            return 0
+        with handle:
+            return self._ingest(connection, log_path, handle, parse_line)
+
+    def _db_connect(self) -> sqlite3.Connection:
+        storage = get_sqlite_storage(self.database_file)
+        storage.ensure_schema("runtime_log_store", self._initialize_schema)
+        connection = storage.connect()
+        if self._has_fts is None:
+            self._has_fts = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'runtime_log_fts'"
+            ).fetchone() is not None
+        return connection
+
+    def _initialize_schema(self, connection: sqlite3.Connection) -> None:
+        entries_table = connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'runtime_log_entries'"
+        ).fetchone()
+        if entries_table is not None and "generation" not in entries_table[0]:
+            # Indexes from before file generations were tracked keyed entries by offset alone; the
+            # index is derived from the log, so it is dropped and rebuilt from the file.
+            connection.executescript(
+                """
+                DROP TABLE IF EXISTS runtime_log_fts;
+                DROP TABLE IF EXISTS runtime_log_entries;
+                DROP TABLE IF EXISTS runtime_log_ingest;
+                """
+            )
+        if not connection.execute("SELECT 1 FROM sqlite_master").fetchone():
+            # Switching a new (WAL) database to incremental vacuum needs one VACUUM before the
+            # first table exists; afterwards compaction can hand freed pages back to the disk.
+            connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            connection.execute("VACUUM")
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runtime_log_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                generation INTEGER NOT NULL,
+                entry_id TEXT NOT NULL,
+                ts REAL,
+                timestamp TEXT,
+                level TEXT NOT NULL,
+                component TEXT NOT NULL,
+                source TEXT NOT NULL,
+                message TEXT NOT NULL,
+                raw TEXT NOT NULL,
+                ingested_at REAL NOT NULL,
+                UNIQUE (generation, entry_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_runtime_log_entries_ts ON runtime_log_entries(ts);
+            CREATE INDEX IF NOT EXISTS idx_runtime_log_entries_level ON runtime_log_entries(level, id);
+            CREATE INDEX IF NOT EXISTS idx_runtime_log_entries_component ON runtime_log_entries(component, id);
+
+            CREATE TABLE IF NOT EXISTS runtime_log_ingest (
+                path TEXT PRIMARY KEY,
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                generation INTEGER NOT NULL,
+                head BLOB NOT NULL
+            );
+            """
+        )
+        try:
+            connection.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS runtime_log_fts USING fts5(
+                    message, raw, content='runtime_log_entries', content_rowid='id', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS runtime_log_entries_ai AFTER INSERT ON runtime_log_entries BEGIN
+                    INSERT INTO runtime_log_fts(rowid, message, raw) VALUES (new.id, new.message, new.raw);
+                END;
+                CREATE TRIGGER IF NOT EXISTS runtime_log_entries_ad AFTER DELETE ON runtime_log_entries BEGIN
+                    INSERT INTO runtime_log_fts(runtime_log_fts, rowid, message, raw) VALUES ('delete', old.id, old.message, old.raw);
+                END;
+                """
+            )
+        except sqlite3.OperationalError as exc:
+            # SQLite without FTS5 or the trigram tokenizer (< 3.34): keyword filters scan instead.
+            logger.warning(f"Runtime log index without full-text search: {exc}")
+        connection.commit()
+
+    def _resume_point(self, connection: sqlite3.Connection, log_path: Path, handle) -> tuple[int, int]:
+        """Return (position, generation) to continue ingesting handle from."""
+        file_stat = os.fstat(handle.fileno())
+        row = connection.execute(
+            "SELECT device, inode, position, generation, head FROM runtime_log_ingest WHERE path = ?",
+            (str(log_path),),
+        ).fetchone()
+        if row is None:
+            return 0, 0
+        head = bytes(row["head"])
+        handle.seek(0)
+        if (
+            (row["device"], row["inode"]) == (file_stat.st_dev, file_stat.st_ino)
+            and row["position"] <= file_stat.st_size
+            and handle.read(len(head)) == head
+        ):
+            return row["position"], row["generation"]
+        # Replaced, or truncated in place (possibly already grown past the old position).
+        return 0, row["generation"] + 1
+
+    def _ingest(self, connection: sqlite3.Connection, log_path: Path, handle, parse_line) -> int:
+        file_stat = os.fstat(handle.fileno())
+        position, generation = self._resume_point(connection, log_path, handle)
+        handle.seek(0)
+        head = handle.read(min(RUNTIME_LOG_HEAD_FINGERPRINT_BYTES, file_stat.st_size))
+
+        inserted = 0
+        handle.seek(position)
+        while position < file_stat.st_size:
+            data = handle.read(min(RUNTIME_LOG_INGEST_CHUNK_BYTES, file_stat.st_size - position))
+            complete = data.rfind(b"\n") + 1
+            if not complete:
+                # A line longer than the chunk, or one that is still being written.
+                data += handle.readline()
+                if not data.endswith(b"\n"):
+                    break
+                complete = len(data)
+
+            rows = []
+            offset = position
+            now = time.time()
+            for raw_line in data[:complete].splitlines(keepends=True):
+                line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+                entry = parse_line(line, f"runtime:{offset}") if line.strip() else None
+                if entry is not None:
+                    rows.append(self._entry_to_row(entry, generation, now))
+                offset += len(raw_line)
+            position += complete
+            handle.seek(position)
+
+            with connection:
+                inserted += max(0, connection.executemany(
+                    "INSERT OR IGNORE INTO runtime_log_entries "
+                    "(generation, entry_id, ts, timestamp, level, component, source, message, raw, ingested_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                ).rowcount)
+                connection.execute(
+                    "INSERT INTO runtime_log_ingest (path, device, inode, position, generation, head) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET device = excluded.device, inode = excluded.inode, "
+                    "position = excluded.position, generation = excluded.generation, head = excluded.head",
+                    (str(log_path), file_stat.st_dev, file_stat.st_ino, position, generation, head),
+                )
+        return inserted
+
+    def _compact_locked(self, connection: sqlite3.Connection) -> int:
+        self._last_compacted_at = time.monotonic()
+        deleted = 0
+        cutoff = time.time() - self.retention_days * 86400
+        with connection:
+            deleted += connection.execute(
+                "DELETE FROM runtime_log_entries WHERE ts < ? OR (ts IS NULL AND ingested_at < ?)",
+                (cutoff, cutoff),
+            ).rowcount
+
+        if deleted:
+            self._optimize(connection)
+
+        while self._used_bytes(connection) > self.max_bytes:
+            total = connection.execute("SELECT COUNT(*) FROM runtime_log_entries").fetchone()[0]
+            if not total:
+                break
+            batch = max(1, int(total * RUNTIME_LOG_COMPACT_BATCH_RATIO))
+            with connection:
+                deleted += connection.execute(
+                    "DELETE FROM runtime_log_entries WHERE id IN (SELECT id FROM runtime_log_entries ORDER BY id LIMIT ?)",
+                    (batch,),
+                ).rowcount
+            # Deletions only add tombstones to the full-text index until it is merged.
+            self._optimize(connection)
+
+        if deleted:
+            # execute() only steps the pragma once (one page); executescript runs it to completion.
+            connection.executescript("PRAGMA incremental_vacuum;")
+        return deleted
+
+    def _optimize(self, connection: sqlite3.Connection) -> None:
+        if self._has_fts:
+            with connection:
+                connection.execute("INSERT INTO runtime_log_fts(runtime_log_fts) VALUES ('optimize')")
+
+    @staticmethod
+    def _used_bytes(connection: sqlite3.Connection) -> int:
+        page_size = connection.execute("PRAGMA page_size").fetchone()[0]
+        page_count = connection.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    @staticmethod
+    def _entry_to_row(entry: RuntimeLogEntry, generation: int, ingested_at: float) -> tuple:
+        timestamp = None
+        if entry.timestamp:
+            try:
+                timestamp = datetime.fromisoformat(entry.timestamp.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                timestamp = None
+        return (
+            generation,
+            entry.id,
+            timestamp,
+            entry.timestamp,
+            entry.level,
+            entry.source.lower(),
+            entry.source,
+            entry.message,
+            entry.raw,
+            ingested_at,
+        )
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> RuntimeLogEntry:
+        return RuntimeLogEntry(
+            id=row["entry_id"],
+            timestamp=row["timestamp"],
+            level=row["level"],
+            source=row["source"],
+            message=row["message"],
+            raw=row["raw"],
+        )
@@ -1,30 +1,29 @@
 import json
 import os
+import sqlite3
+import time
 from hashlib import sha1
-from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 from src.core.exception import CustomException
-from src.schemas.runtimeLogs import RuntimeLogEntry, RuntimeLogsQuery, RuntimeLogsSourceSummary
+from src.core.log_tail import iter_lines_reversed, log_time_index
+from src.core.log_tail_multiplexer import LOG_STREAM_AUTH_RECHECK_SECONDS, LogTailSource, LogTailSubscription, log_tail_multiplexer
+from src.core.logger import logger
+from src.schemas.runtimeLogs import RuntimeLogEntry, RuntimeLogsQuery, RuntimeLogsSearchQuery, RuntimeLogsSearchResponse, RuntimeLogsSourceSummary
 from src.services.product_auth import ProductAuthService
+from src.services.runtime_log_store import RUNTIME_LOG_INDEX_ENABLED, RuntimeLogStore
 from src.utils.runtime_logging import PLATFORM_RUNTIME_LOG_PATH, normalize_runtime_level
 
 
-@dataclass
-class RuntimeLogCursor:
-    device: int
-    inode: int
-    position: int
-
-
 @dataclass
 class RuntimeLogsStreamCursor:
     query: RuntimeLogsQuery
     entries: list[RuntimeLogEntry]
-    file_cursor: Optional[RuntimeLogCursor]
+    subscription: LogTailSubscription
+    authenticated_at: float
 
 
 @dataclass
@@ -38,10 +37,13 @@ class RuntimeLogsService:
         self,
         auth_service: Optional[ProductAuthService] = None,
         log_path: Optional[str] = None,
+        log_store: Optional[RuntimeLogStore] = None,
     ):
         self.auth_service = auth_service or ProductAuthService()
         self.log_path = Path(log_path or os.getenv("WEBSOFT9_PLATFORM_RUNTIME_LOG_PATH", PLATFORM_RUNTIME_LOG_PATH))
         self.excluded_components = {"apphub-api"}
+        # Optional on-disk index (WEBSOFT9_RUNTIME_LOG_INDEX); without it queries read the file tail.
+        self.log_store = log_store if log_store is not None else (RuntimeLogStore() if RUNTIME_LOG_INDEX_ENABLED else None)
 
     def list_sources(self, session_token: Optional[str]) -> list[RuntimeLogsSourceSummary]:
         self.auth_service._require_authenticated_operator(session_token)
@@ -53,38 +55,68 @@ class RuntimeLogsService:
 
     def get_runtime_logs(self, session_token: Optional[str], query: RuntimeLogsQuery) -> list[RuntimeLogEntry]:
         self.auth_service._require_authenticated_operator(session_token)
-        entries = self._read_entries(limit=query.limit)
+        if self.log_store is not None:
+            try:
+                # While the index is still catching up on a backlog, the file tail is more current.
+                if self.log_store.sync(self.log_path, self._parse_line):
+                    entries, _next_cursor = self.log_store.query(level=query.level, keyword=query.keyword, since=query.threshold(), limit=query.limit)
+                    return list(reversed(entries))
+            except sqlite3.Error as exc:
+                logger.warning(f"Runtime log index unavailable, reading {self.log_path} instead: {exc}")
+
+        entries = self._read_entries(limit=query.limit, threshold=query.threshold())
 
         return self._filter_entries(entries, query)
 
+    def search_runtime_logs(self, session_token: Optional[str], query: RuntimeLogsSearchQuery) -> RuntimeLogsSearchResponse:
+        self.auth_service._require_authenticated_operator(session_token)
+        if self.log_store is None:
+            raise CustomException(503, "Runtime Log Index Disabled", "Set WEBSOFT9_RUNTIME_LOG_INDEX=1 to keep a searchable runtime log history")
+        try:
+            indexing = not self.log_store.sync(self.log_path, self._parse_line)
+            entries, next_cursor = self.log_store.query(
+                level=query.level,
+                keyword=query.keyword,
+                component=query.component,
+                since=query.lower_bound(),
+                until=query.until,
+                before=query.before,
+                limit=query.limit,
+            )
+        except sqlite3.Error as exc:
+            raise CustomException(503, "Runtime Log Index Unavailable", f"Failed to query the runtime log index: {exc}")
+        return RuntimeLogsSearchResponse(entries=entries, next_cursor=next_cursor, indexing=indexing)
+
     def open_runtime_logs_stream(self, session_token: Optional[str], query: RuntimeLogsQuery) -> tuple[list[RuntimeLogEntry], RuntimeLogsStreamCursor]:
-        entries = self.get_runtime_logs(session_token, query)
+        self.auth_service._require_authenticated_operator(session_token)
+        # Subscribe before reading the snapshot so nothing written in between is lost; entries
+        # seen twice are dropped by id when polling.
+        subscription = log_tail_multiplexer.subscribe(self._log_tail_source())
+        try:
+            entries = self.get_runtime_logs(session_token, query)
+        except Exception:
+            subscription.close()
+            raise
         return entries, RuntimeLogsStreamCursor(
             query=query.model_copy(deep=True),
             entries=list(entries),
-            file_cursor=self._capture_file_cursor(),
+            subscription=subscription,
+            authenticated_at=time.monotonic(),
         )
 
     def poll_runtime_logs_stream(self, session_token: Optional[str], cursor: RuntimeLogsStreamCursor) -> RuntimeLogsStreamDelta:
-        self.auth_service._require_authenticated_operator(session_token)
-        next_cursor = self._capture_file_cursor()
-        previous_cursor = cursor.file_cursor
+        if time.monotonic() - cursor.authenticated_at >= LOG_STREAM_AUTH_RECHECK_SECONDS:
+            self.auth_service._require_authenticated_operator(session_token)
+            cursor.authenticated_at = time.monotonic()
 
-        if previous_cursor is None or next_cursor is None:
+        incremental_entries, reset = cursor.subscription.poll()
+        if reset:
             snapshot = self.get_runtime_logs(session_token, cursor.query)
             cursor.entries = list(snapshot)
-            cursor.file_cursor = next_cursor
             return RuntimeLogsStreamDelta(entries=[], snapshot=snapshot)
 
-        if next_cursor.inode != previous_cursor.inode or next_cursor.device != previous_cursor.device or next_cursor.position < previous_cursor.position:
-            snapshot = self.get_runtime_logs(session_token, cursor.query)
-            cursor.entries = list(snapshot)
-            cursor.file_cursor = next_cursor
-            return RuntimeLogsStreamDelta(entries=[], snapshot=snapshot)
-
-        incremental_entries, position = self._read_incremental_entries(previous_cursor.position)
-        next_file_cursor = RuntimeLogCursor(device=next_cursor.device, inode=next_cursor.inode, position=position)
-        filtered_new_entries = self._filter_entries(incremental_entries, cursor.query)
+        known_ids = {entry.id for entry in cursor.entries}
+        filtered_new_entries = [entry for entry in self._filter_entries(incremental_entries, cursor.query) if entry.id not in known_ids]
         next_entries = [*cursor.entries, *filtered_new_entries]
         removed_entries = False
 
@@ -97,8 +129,6 @@ class RuntimeLogsService:
         if len(next_entries) > cursor.query.limit:
             next_entries = next_entries[-cursor.query.limit:]
 
-        cursor.file_cursor = next_file_cursor
-
         if removed_entries:
             cursor.entries = next_entries
             return RuntimeLogsStreamDelta(entries=[], snapshot=next_entries)
@@ -110,64 +140,47 @@ class RuntimeLogsService:
         cursor.entries = next_entries
         return RuntimeLogsStreamDelta(entries=[], snapshot=None)
 
-    def _read_entries(self, limit: int) -> list[RuntimeLogEntry]:
+    def close_runtime_logs_stream(self, cursor: Optional[RuntimeLogsStreamCursor]) -> None:
+        if cursor is not None:
+            cursor.subscription.close()
+
+    def _read_entries(self, limit: int, threshold: Optional[datetime] = None) -> list[RuntimeLogEntry]:
         if not self.log_path.exists():
             raise CustomException(503, "Runtime Logs Unavailable", f"Platform runtime log source {self.log_path} is not available")
 
         tail = max(limit * 10, 400)
+        # Read backwards from the end, and never past the point where the log is older than threshold.
+        stop_offset = log_time_index.find_offset(self.log_path, threshold.timestamp(), self._line_timestamp) if threshold is not None else 0
+        lines: list[tuple[str, int]] = []
         try:
-            with self.log_path.open("r", encoding="utf-8") as handle:
-                lines = deque(maxlen=tail)
-                while True:
-                    offset = handle.tell()
-                    line = handle.readline()
-                    if not line:
+            for offset, raw_line in iter_lines_reversed(self.log_path, stop_offset=stop_offset):
+                line = raw_line.decode("utf-8", errors="replace").rstrip("\r")
+                if line.strip():
+                    lines.append((line, offset))
+                    if len(lines) >= tail:
                         break
-                    stripped = line.rstrip("\n")
-                    if stripped.strip():
-                        lines.append((stripped, offset))
         except OSError as exc:
             raise CustomException(503, "Runtime Logs Unavailable", f"Failed to read platform runtime logs: {exc}")
 
         entries: list[RuntimeLogEntry] = []
-        for line, offset in lines:
+        for line, offset in reversed(lines):
             entry = self._parse_line(line, f"runtime:{offset}")
             if entry is not None:
                 entries.append(entry)
         return entries
 
-    def _read_incremental_entries(self, start_position: int) -> tuple[list[RuntimeLogEntry], int]:
-        if not self.log_path.exists():
-            raise CustomException(503, "Runtime Logs Unavailable", f"Platform runtime log source {self.log_path} is not available")
-
-        entries: list[RuntimeLogEntry] = []
-        try:
-            with self.log_path.open("r", encoding="utf-8") as handle:
-                handle.seek(start_position)
-                while True:
-                    offset = handle.tell()
-                    line = handle.readline()
-                    if not line:
-                        break
-                    stripped = line.rstrip("\n")
-                    if not stripped.strip():
-                        continue
-                    entry = self._parse_line(stripped, f"runtime:{offset}")
-                    if entry is not None:
-                        entries.append(entry)
-                position = handle.tell()
-        except OSError as exc:
-            raise CustomException(503, "Runtime Logs Unavailable", f"Failed to read platform runtime logs: {exc}")
-        return entries, position
+    def _log_tail_source(self) -> LogTailSource:
+        return LogTailSource(
+            key=f"runtime:{self.log_path}",
+            list_files=lambda: [self.log_path] if self.log_path.exists() else [],
+            parse_line=self._parse_tailed_line,
+        )
 
-    def _capture_file_cursor(self) -> Optional[RuntimeLogCursor]:
-        if not self.log_path.exists():
+    def _parse_tailed_line(self, _path: Path, offset: int, raw_line: bytes) -> Optional[RuntimeLogEntry]:
+        line = raw_line.decode("utf-8", errors="replace")
+        if not line.strip():
             return None
-        try:
-            stat = self.log_path.stat()
-        except OSError:
-            return None
-        return RuntimeLogCursor(device=stat.st_dev, inode=stat.st_ino, position=stat.st_size)
+        return self._parse_line(line, f"runtime:{offset}")
 
     def _parse_line(self, raw_line: str, fingerprint: str) -> Optional[RuntimeLogEntry]:
         try:
@@ -214,6 +227,16 @@ class RuntimeLogsService:
 
         return filtered_entries
 
+    def _line_timestamp(self, raw_line: bytes) -> Optional[float]:
+        try:
+            payload = json.loads(raw_line)
+        except ValueError:
+            return None
+        timestamp = self._normalize_timestamp(payload.get("ts")) if isinstance(payload, dict) else None
+        if timestamp is None:
+            return None
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+
     def _compose_message(self, payload: dict) -> str:
         message = str(payload.get("message") or "").strip()
         component = str(payload.get("component") or "").strip()
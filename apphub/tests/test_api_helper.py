@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.apiHelper import APIHelper, APISessionPool
+
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return "ok"
+
+
+def test_helpers_with_same_origin_share_pooled_session():
+    APISessionPool.close_all()
+
+    first = APIHelper("http://127.0.0.1:9004/api")
+    second = APIHelper("http://127.0.0.1:9004/api/v2")
+    other = APIHelper("http://127.0.0.1:81/api")
+
+    assert first.session is second.session
+    assert first.session is not other.session
+
+    adapter = first.session.get_adapter("http://127.0.0.1:9004/api")
+    assert adapter.max_retries.total >= 1
+    assert "POST" not in adapter.max_retries.allowed_methods
+
+    APISessionPool.close_all()
+
+
+def test_request_merges_headers_and_applies_timeouts():
+    helper = APIHelper("http://127.0.0.1:3001/api/v1", {"Content-Type": "application/json"}, timeout=(1, 5))
+    helper.session = RecordingSession()
+
+    helper.get("repos", headers={"Authorization": "token abc"})
+    helper.post("repos", json={"name": "demo"}, timeout=30)
+
+    get_call, post_call = helper.session.calls
+    assert get_call[0] == "GET"
+    assert get_call[1] == "http://127.0.0.1:3001/api/v1/repos"
+    assert get_call[2]["headers"] == {"Content-Type": "application/json", "Authorization": "token abc"}
+    assert get_call[2]["timeout"] == (1, 5)
+    assert post_call[0] == "POST"
+    assert post_call[2]["json"] == {"name": "demo"}
+    assert post_call[2]["timeout"] == 30
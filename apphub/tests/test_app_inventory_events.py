@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.app_inventory_events import AppInventoryEventWatcher
+
+
+def _container_event(action, container_id='c1', project='wordpress_a1'):
+    attributes = {'name': 'wordpress_a1'}
+    if project:
+        attributes['com.docker.compose.project'] = project
+    return {'Type': 'container', 'Action': action, 'Actor': {'ID': container_id, 'Attributes': attributes}}
+
+
+def test_watcher_bumps_generation_only_on_state_changes():
+    watcher = AppInventoryEventWatcher(client_factory=lambda: None)
+    watcher.seed([
+        {'Id': 'c1', 'State': 'running', 'Labels': {'com.docker.compose.project': 'wordpress_a1'}},
+        {'Id': 'x', 'State': 'running', 'Labels': {}},
+    ])
+    seeded = watcher.generation
+
+    assert not watcher.apply_event(_container_event('start'))
+    assert not watcher.apply_event(_container_event('exec_start: sh -c ls'))
+    assert not watcher.apply_event(_container_event('die', project=None))
+    assert watcher.generation == seeded
+
+    assert watcher.apply_event(_container_event('die'))
+    assert not watcher.apply_event(_container_event('stop'))
+    assert watcher.apply_event(_container_event('health_status: unhealthy'))
+    assert not watcher.apply_event(_container_event('health_status: unhealthy'))
+    assert watcher.get_project_states() == {'wordpress_a1': {'c1': 'exited'}}
+
+    assert watcher.apply_event(_container_event('destroy'))
+    assert watcher.get_project_states() == {}
+    assert watcher.generation == seeded + 3
+
+
+def test_watcher_tracks_volume_and_network_events():
+    watcher = AppInventoryEventWatcher(client_factory=lambda: None)
+    watcher.seed([{'Id': 'c1', 'State': 'running', 'Labels': {'com.docker.compose.project': 'redis_b2'}}])
+
+    assert watcher.apply_event({'Type': 'volume', 'Action': 'destroy', 'Actor': {'ID': 'redis_b2_data'}})
+    assert not watcher.apply_event({'Type': 'volume', 'Action': 'mount', 'Actor': {'ID': 'redis_b2_data'}})
+    assert watcher.apply_event({'Type': 'network', 'Action': 'disconnect', 'Actor': {'ID': 'n1', 'Attributes': {'container': 'c1'}}})
+    assert not watcher.apply_event({'Type': 'network', 'Action': 'connect', 'Actor': {'ID': 'n1', 'Attributes': {'container': 'other'}}})
+    assert watcher.wait_for_change(watcher.generation - 1, timeout=0) == watcher.generation
@@ -36,6 +36,9 @@ class FakePortainerManager:
     def get_volumes_by_stack_name(self, stack_name: str, endpoint_id: int, dangling: bool):
         return []
 
+    def get_volumes(self, endpoint_id: int, dangling: bool):
+        return []
+
     def get_stack_by_name(self, stack_name: str, endpoint_id: int):
         return {"Id": 8, "Name": stack_name, "Status": 1, "GitConfig": {}, "CreationDate": 123}
 
@@ -61,6 +64,7 @@ def _patch_dependencies(monkeypatch):
     monkeypatch.setattr(app_manager_module, 'ProxyManager', FakeProxyManager)
     monkeypatch.setattr(app_manager_module, 'GiteaManager', FakeGiteaManager)
     monkeypatch.setattr(app_manager_module, 'check_endpointId', lambda endpoint_id, manager: None)
+    AppManger.clear_cache()
 
 
 def _clear_install_state():
@@ -127,4 +131,59 @@ def test_get_apps_turns_stale_install_into_visible_error(monkeypatch, tmp_path):
     assert tracking_id not in appInstalling
     errored = dict(appInstallingError.items())[tracking_id]
     assert 'expired before the app stack or repository became available' in errored['error']
-    assert any(app.app_id == 'wordpress_kaoq9' and app.status == 4 for app in apps)
\ No newline at end of file
+    assert any(app.app_id == 'wordpress_kaoq9' and app.status == 4 for app in apps)
+
+class BatchedInventoryPortainerManager(FakePortainerManager):
+    inspected_batches: list[list[str]] = []
+    volume_listings = 0
+
+    def get_stacks(self, endpoint_id: int):
+        return [
+            {"Name": "wordpress_a1", "Status": 1, "GitConfig": {}, "CreationDate": 1},
+            {"Name": "redis_b2", "Status": 1, "GitConfig": {}, "CreationDate": 2},
+        ]
+
+    def get_containers(self, endpoint_id: int):
+        return [
+            {"Id": "c-wp", "Names": ["/wordpress_a1"], "State": "running", "Labels": {"com.docker.compose.project": "wordpress_a1"}},
+            {"Id": "c-wp-db", "Names": ["/wordpress_a1-mysql"], "State": "running", "Labels": {"com.docker.compose.project": "wordpress_a1"}},
+            {"Id": "c-redis", "Names": ["/redis_b2"], "State": "running", "Labels": {"com.docker.compose.project": "redis_b2"}},
+        ]
+
+    def get_volumes(self, endpoint_id: int, dangling: bool):
+        type(self).volume_listings += 1
+        return [
+            {"Name": "wordpress_a1_data", "Labels": {"com.docker.compose.project": "wordpress_a1"}},
+            {"Name": "redis_b2_data", "Labels": {"com.docker.compose.project": "redis_b2"}},
+            {"Name": "orphan", "Labels": None},
+        ]
+
+    def get_volumes_by_stack_name(self, stack_name: str, endpoint_id: int, dangling: bool):
+        raise AssertionError("get_apps must not list volumes per stack")
+
+    def get_containers_by_ids(self, endpoint_id: int, container_ids: list[str], max_workers: int = 8):
+        type(self).inspected_batches.append(list(container_ids))
+        envs = {"c-wp": ["W9_APP_NAME=wordpress", "W9_VERSION=6.5"], "c-redis": ["W9_APP_NAME=redis"]}
+        return {container_id: {"Config": {"Env": envs[container_id]}} for container_id in container_ids}
+
+
+def test_get_apps_builds_inventory_from_single_snapshot(monkeypatch):
+    _patch_dependencies(monkeypatch)
+    monkeypatch.setattr(app_manager_module, 'PortainerManager', BatchedInventoryPortainerManager)
+    monkeypatch.setattr(AppManger, '_get_available_app_logo_map', lambda self, locale: {})
+    monkeypatch.setattr(AppManger, '_load_capability_sets', lambda self: (set(), set()))
+    AppManger._container_env_cache.clear()
+    BatchedInventoryPortainerManager.inspected_batches = []
+    BatchedInventoryPortainerManager.volume_listings = 0
+    _clear_install_state()
+
+    first = {app.app_id: app for app in AppManger().get_apps(endpointId=21)}
+    second = {app.app_id: app for app in AppManger().get_apps(endpointId=21)}
+
+    assert BatchedInventoryPortainerManager.volume_listings == 2
+    assert BatchedInventoryPortainerManager.inspected_batches == [["c-wp", "c-redis"]]
+    assert first["wordpress_a1"].app_name == "wordpress"
+    assert first["wordpress_a1"].app_version == "6.5"
+    assert [volume["Name"] for volume in first["wordpress_a1"].volumes] == ["wordpress_a1_data"]
+    assert second["redis_b2"].app_name == "redis"
+    assert [volume["Name"] for volume in second["redis_b2"].volumes] == ["redis_b2_data"]
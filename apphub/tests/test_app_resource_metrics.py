@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pytest
+
+from src.core.exception import CustomException
+from src.services import app_resource_metrics as metrics_module
+from src.services.app_resource_metrics import AppResourceMetricsCollector
+
+
+def write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def write_v2_container(cgroup_root: Path, proc_root: Path, container_id: str, pid: int, cpu_usec: int, memory: int, rbytes: int, rx: int):
+    scope = cgroup_root / "system.slice" / f"docker-{container_id}.scope"
+    write(scope / "cgroup.procs", f"{pid}\n{pid + 1}\n")
+    write(scope / "cpu.stat", f"usage_usec {cpu_usec}\nuser_usec 1\nsystem_usec 1\n")
+    write(scope / "memory.current", f"{memory}\n")
+    write(scope / "memory.stat", "anon 1\ninactive_file 1000\n")
+    write(scope / "io.stat", f"8:0 rbytes={rbytes} wbytes=10 rios=1 wios=1\n")
+    write(
+        proc_root / str(pid) / "net" / "dev",
+        "Inter-|   Receive\n face |bytes\n"
+        "    lo: 999 1 0 0 0 0 0 0 999 1 0 0 0 0 0 0\n"
+        f"  eth0: {rx} 1 0 0 0 0 0 0 {rx // 2} 1 0 0 0 0 0 0\n",
+    )
+
+
+def test_collects_cgroup_v2_usage_per_app_with_rates(tmp_path: Path, monkeypatch):
+    cgroup_root = tmp_path / "cgroup"
+    proc_root = tmp_path / "proc"
+    write(cgroup_root / "cgroup.controllers", "cpu io memory\n")
+    write_v2_container(cgroup_root, proc_root, "aaa", 100, cpu_usec=1_000_000, memory=11_000, rbytes=4096, rx=2000)
+    write_v2_container(cgroup_root, proc_root, "bbb", 200, cpu_usec=0, memory=6_000, rbytes=0, rx=0)
+    write_v2_container(cgroup_root, proc_root, "ccc", 300, cpu_usec=0, memory=3_000, rbytes=0, rx=0)
+
+    clock = iter([0, 0, 0, 0, 2_000_000_000, 2_000_000_000, 2_000_000_000, 2_000_000_000])
+    monkeypatch.setattr(metrics_module.time, "monotonic_ns", lambda: next(clock))
+    collector = AppResourceMetricsCollector(
+        cgroup_root=str(cgroup_root),
+        proc_root=str(proc_root),
+        container_lister=lambda: {"wordpress": ["aaa", "bbb"], "redis": ["ccc"], "gone": ["missing"]},
+    )
+
+    first = collector.collect()
+    wordpress = next(app for app in first["apps"] if app["app_id"] == "wordpress")
+    assert first["interval_seconds"] is None
+    assert wordpress["containers"] == 2
+    assert wordpress["memory_bytes"] == 15_000
+    assert wordpress["cpu_percent"] is None
+    assert next(app for app in first["apps"] if app["app_id"] == "gone")["containers"] == 0
+
+    write_v2_container(cgroup_root, proc_root, "aaa", 100, cpu_usec=2_000_000, memory=11_000, rbytes=4096 + 8192, rx=6000)
+    write_v2_container(cgroup_root, proc_root, "bbb", 200, cpu_usec=500_000, memory=6_000, rbytes=0, rx=0)
+
+    second = collector.top("cpu", limit=2)
+    assert [app["app_id"] for app in second["apps"]] == ["wordpress", "gone"]
+    wordpress = second["apps"][0]
+    assert second["interval_seconds"] == 2.0
+    assert wordpress["cpu_percent"] == 75.0
+    assert wordpress["block_read_rate_bytes"] == 4096
+    assert wordpress["block_read_bytes"] == 4096 + 8192
+    assert wordpress["network_rx_rate_bytes"] == 2000
+    assert wordpress["network_tx_rate_bytes"] == 1000
+
+    with pytest.raises(CustomException):
+        collector.top("disk")
+
+
+def test_collects_cgroup_v1_accounting_files(tmp_path: Path):
+    cgroup_root = tmp_path / "cgroup"
+    write(cgroup_root / "cpuacct" / "docker" / "abc" / "cpuacct.usage", "123456789\n")
+    write(cgroup_root / "cpuacct" / "docker" / "abc" / "cgroup.procs", "42\n")
+    write(cgroup_root / "memory" / "docker" / "abc" / "memory.usage_in_bytes", "5000\n")
+    write(cgroup_root / "memory" / "docker" / "abc" / "memory.stat", "cache 10\ntotal_inactive_file 1000\n")
+    write(
+        cgroup_root / "blkio" / "docker" / "abc" / "blkio.throttle.io_service_bytes_recursive",
+        "8:0 Read 300\n8:0 Write 700\n8:0 Total 1000\nTotal 1000\n",
+    )
+    collector = AppResourceMetricsCollector(
+        cgroup_root=str(cgroup_root),
+        proc_root=str(tmp_path / "proc"),
+        container_lister=lambda: {"mysql": ["abc"]},
+    )
+
+    [mysql] = collector.collect()["apps"]
+
+    assert mysql["containers"] == 1
+    assert mysql["memory_bytes"] == 4000
+    assert mysql["block_read_bytes"] == 300
+    assert mysql["block_write_bytes"] == 700
+    assert mysql["network_rx_rate_bytes"] is None
@@ -109,4 +109,30 @@ def test_custom_fields_migrates_legacy_unique_constraint_safely(tmp_path):
         {"field_name": "", "field_value": "", "field_type": "text"},
         {"field_name": "", "field_value": "", "field_type": "text"},
     ])
-    assert len(saved) == 2
\ No newline at end of file
+    assert len(saved) == 2
+
+def test_pull_progress_lines_are_buffered_and_collapsed_per_layer(tmp_path, monkeypatch):
+    from src.services import app_status as app_status_module
+
+    monkeypatch.setattr(app_status_module, "INSTALL_LOG_FLUSH_INTERVAL_SECONDS", 60.0)
+    store = app_status_module.InstallStateStore(str(tmp_path))
+    tracking_id = store.create_task("php_demo", "PHP")
+    store.append_log(tracking_id, "Pulling docker image", "")
+    revision = store.revision
+
+    for current in range(1, 6):
+        store.append_log(tracking_id, "Pulling docker image", {"status": "Downloading", "id": "layer-a", "progressDetail": {"current": current}})
+    store.append_log(tracking_id, "Pulling docker image", {"status": "Pull complete", "id": "layer-b"})
+    store.append_log(tracking_id, "Pulling docker image", {"status": "Download complete", "id": "layer-a"})
+
+    # Nothing has been written yet.
+    assert store.revision == revision
+
+    store.update_task_status(tracking_id, status=4, error="stopped")
+
+    logs = store.get_task(tracking_id)["logs"]
+    assert [entry["message"] for entry in logs[0]["sub_logs"]] == [
+        "Pull complete #layer-b",
+        "Download complete #layer-a",
+    ]
+    store.flush_pending_logs()
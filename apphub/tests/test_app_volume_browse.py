@@ -131,4 +131,60 @@ def test_rejects_multiple_mounts_in_one_container():
     with pytest.raises(CustomException) as error:
         service.list_directory("valid-session", "wordpress", "wordpress_data", "/")
 
-    assert error.value.status_code == 422
\ No newline at end of file
+    assert error.value.status_code == 422
+
+
+def test_search_parses_grep_records_streamed_from_container():
+    from src.core.content_search import ContentSearchOptions
+
+    grep_output = "1-[db]\n2:host = mysql\n3-port = 3306\n--\n9:host = redis"
+    chunks = [b"W9S1\x00S\x00P\x00/conf/app", b".ini\x00" + grep_output.encode(), b"\x00P\x00/blob.bin\x00Binary file matches\x00"]
+    options = ContentSearchOptions.from_params("host", context=1)
+
+    events = list(AppVolumeBrowseService._iter_search_events(iter(chunks), options))
+    missing = AppVolumeBrowseService._iter_search_events(iter([b""]), options)
+
+    assert events[0] == {"type": "match", "path": "/conf/app.ini", "line_number": 2, "line": "host = mysql", "before": ["[db]"], "after": ["port = 3306"]}
+    assert events[1]["line_number"] == 9
+    assert events[1]["before"] == []
+    assert events[-1] == {"type": "done", "files_scanned": 2, "files_skipped": 1, "matches": 2, "truncated": False, "timed_out": False}
+    with pytest.raises(CustomException) as exc_info:
+        next(missing)
+    assert exc_info.value.status_code == 404
+
+
+def test_search_keeps_grep_only_matches_as_context():
+    from src.core.content_search import ContentSearchOptions
+
+    # grep -i also selected "HOST_NAME"; with case_sensitive the Python pattern does not.
+    grep_output = "1:HOST_NAME=web\n2:host=db"
+    chunks = [b"W9S1\x00P\x00/.env\x00" + grep_output.encode() + b"\x00"]
+    options = ContentSearchOptions.from_params("host", case_sensitive=True, context=1)
+
+    events = list(AppVolumeBrowseService._iter_search_events(iter(chunks), options))
+
+    assert [event["line_number"] for event in events if event["type"] == "match"] == [2]
+    assert events[0]["before"] == ["HOST_NAME=web"]
+    assert events[-1]["files_scanned"] == 1
+
+
+def test_search_passes_byte_size_limit_and_rejects_grep_incompatible_regex():
+    from src.core.content_search import ContentSearchOptions
+
+    class SearchContainer(FakeContainer):
+        def exec_run(self, command, **kwargs):
+            self.commands.append(command)
+            return SimpleNamespace(exit_code=None, output=iter([b"W9S1\x00"]))
+
+    container = SearchContainer()
+    service = build_service(containers=[container])
+
+    events = list(service.search_files("valid-session", "wordpress", "wordpress_data", "/", ContentSearchOptions.from_params("host", max_file_bytes=1024)))
+    with pytest.raises(CustomException) as error:
+        service.search_files("valid-session", "wordpress", "wordpress_data", "/", ContentSearchOptions.from_params(r"\bhost\b", regex=True))
+
+    # find -size -1025c selects files of at most 1024 bytes, the same limit search_tree applies.
+    assert container.commands[0][8] == "1025"
+    assert events[-1]["type"] == "done"
+    assert error.value.status_code == 400
+
@@ -1,3 +1,5 @@
+import asyncio
+import json
 import sys
 import types
 from pathlib import Path
@@ -12,12 +14,27 @@ sys.modules.setdefault('keyring', types.ModuleType('keyring'))
 
 git_module = types.ModuleType('git')
 git_module.Repo = object
+git_module.GitCommandError = Exception
 sys.modules.setdefault('git', git_module)
 
+from src.api.v1.routers import app as app_router
 from src.services import apps_stream_cache as apps_stream_cache_module
 from src.services.apps_stream_cache import AppsStreamCache
 
 
+class FakeInventoryWatcher:
+    def __init__(self, active=True):
+        self.generation = 0
+        self.active = active
+        self.started = False
+
+    def ensure_started(self):
+        self.started = True
+
+    def is_active(self):
+        return self.active
+
+
 def test_apps_stream_cache_reuses_snapshot_before_refresh_deadline(monkeypatch):
     calls: list[tuple[int | None, str]] = []
 
@@ -26,7 +43,7 @@ def test_apps_stream_cache_reuses_snapshot_before_refresh_deadline(monkeypatch):
             calls.append((endpoint_id, locale))
             return [{'app_id': 'wordpress', 'status': 1}]
 
-    cache = AppsStreamCache()
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(active=False), revision_provider=lambda: 0)
     monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
 
     first = cache.get_snapshot(None, 'zh', force_refresh=True)
@@ -43,7 +60,7 @@ def test_apps_stream_cache_uses_fast_refresh_while_installing(monkeypatch):
         def get_apps(self, endpoint_id, locale):
             return [{'app_id': 'wordpress', 'status': 3}]
 
-    cache = AppsStreamCache()
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(active=False), revision_provider=lambda: 0)
     monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
 
     snapshot = cache.get_snapshot(None, 'en', force_refresh=True)
@@ -66,7 +83,7 @@ def test_apps_stream_cache_serves_stale_snapshot_on_refresh_failure(monkeypatch)
             return response
 
     monotonic_values = iter([10.0, 40.0])
-    cache = AppsStreamCache()
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(active=False), revision_provider=lambda: 0)
     monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
     monkeypatch.setattr(apps_stream_cache_module.time, 'monotonic', lambda: next(monotonic_values))
 
@@ -74,4 +91,159 @@ def test_apps_stream_cache_serves_stale_snapshot_on_refresh_failure(monkeypatch)
     second = cache.get_snapshot(None, 'en')
 
     assert second.apps == first.apps
-    assert second.digest == first.digest
\ No newline at end of file
+    assert second.digest == first.digest
+
+def test_apps_stream_cache_rebuilds_only_after_inventory_events(monkeypatch):
+    calls: list[str] = []
+
+    class FakeAppManager:
+        def get_apps(self, endpoint_id, locale):
+            calls.append(locale)
+            return [{'app_id': 'wordpress', 'status': 1}]
+
+    monotonic_values = iter([10.0, 20.0, 25.0])
+    watcher = FakeInventoryWatcher()
+    cache = AppsStreamCache(inventory_watcher=watcher, revision_provider=lambda: 7)
+    monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
+    monkeypatch.setattr(apps_stream_cache_module.time, 'monotonic', lambda: next(monotonic_values))
+
+    first = cache.get_snapshot(None, 'en', force_refresh=True)
+    idle = cache.get_snapshot(None, 'en')
+    watcher.generation = 1
+    assert cache.has_pending_changes(first.inventory_generation)
+    changed = cache.get_snapshot(None, 'en')
+
+    assert watcher.started
+    assert first.refresh_interval_seconds == apps_stream_cache_module.EVENT_DRIVEN_RESYNC_SECONDS
+    assert idle.inventory_generation == 0
+    assert changed.inventory_generation == 1
+    assert calls == ['en', 'en']
+
+
+def test_apps_stream_cache_rebuilds_after_install_state_changes(monkeypatch):
+    calls: list[str] = []
+    revisions = iter([1, 1, 2])
+
+    class FakeAppManager:
+        def get_apps(self, endpoint_id, locale):
+            calls.append(locale)
+            return [{'app_id': 'wordpress', 'status': 1}]
+
+    monotonic_values = iter([10.0, 11.0, 12.0])
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(), revision_provider=lambda: next(revisions))
+    monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
+    monkeypatch.setattr(apps_stream_cache_module.time, 'monotonic', lambda: next(monotonic_values))
+
+    cache.get_snapshot(None, 'en', force_refresh=True)
+    cache.get_snapshot(None, 'en')
+    cache.get_snapshot(None, 'en')
+
+    assert calls == ['en', 'en']
+
+
+def test_apps_stream_cache_emits_delta_against_known_digest(monkeypatch):
+    responses = [
+        [{'app_id': 'wordpress', 'status': 1}, {'app_id': 'redis', 'status': 1}],
+        [{'app_id': 'wordpress', 'status': 2}, {'app_id': 'mysql', 'tracking_id': 't1', 'status': 3}],
+    ]
+
+    class FakeAppManager:
+        def get_apps(self, endpoint_id, locale):
+            return responses.pop(0)
+
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(), revision_provider=lambda: 0)
+    monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
+
+    first = cache.get_snapshot(None, 'en', force_refresh=True)
+    second = cache.get_snapshot(None, 'en', force_refresh=True)
+
+    delta = cache.get_delta(None, 'en', first.digest)
+    payload = json.loads(delta.event_json)
+
+    assert delta.digest == second.digest
+    assert payload['base_digest'] == first.digest
+    assert payload['upserts'] == [{'app_id': 'wordpress', 'status': 2}, {'app_id': 'mysql', 'tracking_id': 't1', 'status': 3}]
+    assert payload['removed'] == ['redis:']
+    assert cache.get_delta(None, 'en', first.digest) is delta
+    assert cache.get_delta(None, 'en', second.digest).is_empty
+    assert cache.get_delta(None, 'en', 'unknown-digest') is None
+    assert payload['upsert_keys'] == ['wordpress:', 'mysql:t1']
+
+
+def test_apps_stream_cache_disambiguates_duplicate_keys_in_payload(monkeypatch):
+    class FakeAppManager:
+        def get_apps(self, endpoint_id, locale):
+            return [{'app_id': 'wordpress', 'status': 1}, {'app_id': 'wordpress', 'status': 2}]
+
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(), revision_provider=lambda: 0)
+    monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
+
+    payload = json.loads(cache.get_snapshot(None, 'en', force_refresh=True).event_json)
+
+    assert payload['keys'] == ['wordpress:', 'wordpress:#2']
+
+
+class FakeStreamRequest:
+    def __init__(self, headers):
+        self.headers = headers
+
+    async def is_disconnected(self):
+        return False
+
+
+def read_first_stream_event(response) -> str:
+    async def read():
+        chunks: list[str] = []
+        async for chunk in response.body_iterator:
+            chunks.append(chunk)
+            if chunk.startswith('id: '):
+                break
+        await response.body_iterator.aclose()
+        return ''.join(chunks)
+
+    return asyncio.run(read())
+
+
+def test_apps_stream_resumes_from_last_event_id_with_delta(monkeypatch):
+    responses = [
+        [{'app_id': 'wordpress', 'status': 1}],
+        [{'app_id': 'wordpress', 'status': 2}],
+    ]
+
+    class FakeAppManager:
+        def get_apps(self, endpoint_id, locale):
+            return responses.pop(0)
+
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(), revision_provider=lambda: 0)
+    monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
+    monkeypatch.setattr(app_router, 'apps_stream_cache', cache)
+    first = cache.get_snapshot(1, 'en', force_refresh=True)
+    second = cache.get_snapshot(1, 'en', force_refresh=True)
+
+    response = asyncio.run(
+        app_router.stream_apps(FakeStreamRequest({'last-event-id': first.digest}), endpointId=1, locale='en', mode='delta', digest=None)
+    )
+    event = read_first_stream_event(response)
+
+    assert f'id: {second.digest}\nevent: delta\n' in event
+    payload = json.loads(event.split('data: ', 1)[1])
+    assert payload['base_digest'] == first.digest
+    assert payload['upsert_keys'] == ['wordpress:']
+
+
+def test_apps_stream_falls_back_to_snapshot_for_unknown_digest(monkeypatch):
+    class FakeAppManager:
+        def get_apps(self, endpoint_id, locale):
+            return [{'app_id': 'wordpress', 'status': 1}]
+
+    cache = AppsStreamCache(inventory_watcher=FakeInventoryWatcher(), revision_provider=lambda: 0)
+    monkeypatch.setattr(apps_stream_cache_module, '_build_app_manager', FakeAppManager)
+    monkeypatch.setattr(app_router, 'apps_stream_cache', cache)
+
+    response = asyncio.run(
+        app_router.stream_apps(FakeStreamRequest({}), endpointId=1, locale='en', mode='delta', digest='expired-digest')
+    )
+    event = read_first_stream_event(response)
+
+    assert 'event: snapshot\n' in event
+    assert json.loads(event.split('data: ', 1)[1])['keys'] == ['wordpress:']
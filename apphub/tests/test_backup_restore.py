@@ -1,4 +1,6 @@
 import sys
+import threading
+import time
 import types
 from pathlib import Path
 from unittest.mock import patch
@@ -33,9 +35,11 @@ portainer_manager_module = types.ModuleType('src.services.portainer_manager')
 portainer_manager_module.PortainerManager = object
 sys.modules.setdefault('src.services.portainer_manager', portainer_manager_module)
 
+from src.core.event_stream import iter_sse_events
 from src.core.exception import CustomException
 from src.services import back_manager as back_manager_module
 from src.services.back_manager import BackupManager
+from src.services.backup_jobs import BackupJobTracker
 
 
 class FakePortainer:
@@ -157,12 +161,13 @@ def test_build_restic_volume_mounts_resolves_host_mountpoints(monkeypatch):
     }
 
 
-def test_repo_operations_use_restic_container_runner(monkeypatch):
+def test_repo_operations_use_restic_runner_and_cache_repository_state(monkeypatch):
     manager = _build_manager()
+    manager.repository_path = '/opt/websoft9/data/backup/restic-repo'
     commands = []
 
-    def fake_run_restic_container(command, extra_volumes):
-        commands.append((command, extra_volumes))
+    def fake_run_restic_repo_command(command):
+        commands.append(command)
         if command == ['cat', 'config']:
             return '{"id":"repo-id","version":2}'
         if command == ['snapshots', '--tag', 'wordpress_demo']:
@@ -171,7 +176,8 @@ def test_repo_operations_use_restic_container_runner(monkeypatch):
             return ''
         raise AssertionError(f'unexpected command: {command}')
 
-    monkeypatch.setattr(manager, '_run_restic_container', fake_run_restic_container)
+    monkeypatch.setattr(manager, '_run_restic_repo_command', fake_run_restic_repo_command)
+    monkeypatch.setattr(back_manager_module, '_initialized_repositories', set())
 
     assert manager._check_repository() is True
     snapshots = manager.list_snapshots('wordpress_demo')
@@ -179,14 +185,159 @@ def test_repo_operations_use_restic_container_runner(monkeypatch):
 
     assert snapshots == [{"id": "snap-1", "short_id": "snap-1"}]
     assert commands == [
-        (['cat', 'config'], {}),
-        (['cat', 'config'], {}),
-        (['snapshots', '--tag', 'wordpress_demo'], {}),
-        (['cat', 'config'], {}),
-        (['forget', 'snap-1'], {}),
+        ['cat', 'config'],
+        ['snapshots', '--tag', 'wordpress_demo'],
+        ['forget', 'snap-1'],
     ]
 
 
+class FakeResticContainer:
+    def __init__(self, chunks, exit_code=0, stderr=b''):
+        self.chunks = chunks
+        self.exit_code = exit_code
+        self.stderr = stderr
+        self.removed = False
+
+    def logs(self, stream=False, follow=False, stdout=True, stderr=True):
+        if stream:
+            return iter(self.chunks)
+        return self.stderr
+
+    def wait(self):
+        return {"StatusCode": self.exit_code}
+
+    def remove(self, force=False):
+        self.removed = True
+
+
+def test_backup_streams_restic_progress_and_returns_summary(monkeypatch):
+    manager = _build_manager()
+    manager.repository_path = '/repo-path'
+    manager.restic_image = 'restic/restic:latest'
+    container = FakeResticContainer([
+        b'{"message_type":"status","percent_done":0.5,"bytes_done":50,"total_bytes":100,"seconds_elapsed":2,"seconds_',
+        b'remaining":2}\n{"message_type":"summary","snapshot_id":"snap-2","data_added":7}\n',
+    ])
+    run_calls = []
+    manager.docker_client = types.SimpleNamespace(
+        containers=types.SimpleNamespace(run=lambda **kwargs: run_calls.append(kwargs) or container),
+    )
+    monkeypatch.setattr(manager, '_ensure_restic_image', lambda: None)
+    monkeypatch.setattr(manager, '_resolve_host_path', lambda path: path)
+    monkeypatch.setattr(manager, '_check_repository', lambda: True)
+    monkeypatch.setattr(back_manager_module, 'AppManger', lambda: types.SimpleNamespace(
+        get_app_by_id=lambda app_id: types.SimpleNamespace(
+            volumes=[{"Mountpoint": "/var/lib/docker/volumes/wordpress_demo/_data", "Name": "wordpress_demo"}],
+        )
+    ))
+    events = []
+
+    summary = manager.create_backup('wordpress_demo', on_progress=events.append)
+
+    assert summary["snapshot_id"] == "snap-2"
+    assert [event["percent_done"] for event in events] == [0.5]
+    assert run_calls[0]["hostname"] == back_manager_module.RESTIC_HOSTNAME
+    assert run_calls[0]["command"][:4] == ['-r', '/repo', 'backup', '/wordpress_demo']
+    assert container.removed is True
+
+
+def test_restic_container_failure_reports_json_stderr_message(monkeypatch):
+    manager = _build_manager()
+    manager.repository_path = '/repo-path'
+    manager.restic_image = 'restic/restic:latest'
+    container = FakeResticContainer([], exit_code=1, stderr=b'{"message_type":"exit_error","code":1,"message":"Fatal: unable to open config file"}\n')
+    manager.docker_client = types.SimpleNamespace(containers=types.SimpleNamespace(run=lambda **kwargs: container))
+    monkeypatch.setattr(manager, '_ensure_restic_image', lambda: None)
+    monkeypatch.setattr(manager, '_resolve_host_path', lambda path: path)
+    monkeypatch.setattr(back_manager_module, '_initialized_repositories', {'/repo-path'})
+
+    try:
+        manager._run_restic_container(['snapshots'], {})
+    except CustomException as exc:
+        assert exc.message == 'Fatal: unable to open config file'
+    else:
+        raise AssertionError('Expected the Restic failure to raise')
+
+    assert back_manager_module._initialized_repositories == set()
+    assert container.removed is True
+
+
+def test_backup_job_tracker_records_progress_and_result():
+    class FakeManager:
+        def create_backup(self, app_id, on_progress=None):
+            on_progress({"percent_done": 0.25, "bytes_done": 400, "total_bytes": 1600, "seconds_elapsed": 4, "seconds_remaining": 12})
+            return {"snapshot_id": "snap-3"}
+
+    tracker = BackupJobTracker(manager_factory=FakeManager)
+    job = tracker.start('wordpress_demo')
+
+    for _ in range(200):
+        payload, _version = tracker.get(job["job_id"])
+        if payload["status"] != "running":
+            break
+        time.sleep(0.01)
+
+    assert payload["status"] == "success"
+    assert payload["summary"] == {"snapshot_id": "snap-3"}
+    assert payload["progress"]["percent_done"] == 25.0
+    assert payload["progress"]["throughput_bytes"] == 100
+    assert payload["progress"]["seconds_remaining"] == 12
+
+
+def test_backup_job_stream_follows_a_job_until_it_finishes():
+    release = threading.Event()
+
+    class FakeManager:
+        def create_backup(self, app_id, on_progress=None):
+            release.wait(5)
+            on_progress({"percent_done": 0.5, "bytes_done": 800, "seconds_elapsed": 4})
+            return {"snapshot_id": "snap-4"}
+
+    tracker = BackupJobTracker(manager_factory=FakeManager)
+    job = tracker.start('wordpress_demo')
+    events = tracker.stream(job["job_id"], keepalive_seconds=0.05)
+
+    first = next(events)
+    heartbeat = next(events)
+    release.set()
+    rest = list(events)
+
+    assert first["type"] == "progress" and first["status"] == "running"
+    assert heartbeat == {"type": "heartbeat"}
+    assert rest[-1]["type"] == "done"
+    assert rest[-1]["summary"] == {"snapshot_id": "snap-4"}
+    assert all(event["type"] in {"progress", "heartbeat"} for event in rest[:-1])
+
+
+def test_backup_job_stream_ends_with_an_error_event_when_the_job_is_pruned():
+    release = threading.Event()
+
+    class FakeManager:
+        def create_backup(self, app_id, on_progress=None):
+            release.wait(5)
+            return {}
+
+    tracker = BackupJobTracker(manager_factory=FakeManager)
+    job = tracker.start('wordpress_demo')
+    frames = iter_sse_events(tracker.stream(job["job_id"], keepalive_seconds=0.05))
+
+    assert next(frames).startswith("event: progress\n")
+    with tracker._changed:
+        del tracker._jobs[job["job_id"]]
+        tracker._changed.notify_all()
+    remaining = list(frames)
+    release.set()
+
+    assert remaining[-1].startswith("event: error\n")
+    assert '"status_code":404' in remaining[-1]
+    try:
+        tracker.stream("missing")
+    except CustomException as exc:
+        assert exc.status_code == 404
+    else:
+        raise AssertionError("Expected an unknown job to raise before streaming")
+
+
 def test_backup_manager_defaults_restic_image_when_missing_from_system_config(monkeypatch):
     class FakeConfigManager:
         def __init__(self, *_args, **_kwargs):
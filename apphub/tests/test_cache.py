@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core import cache as cache_module
+from src.core.cache import TTLCache, get_cache
+
+
+def test_entries_expire_after_ttl_and_lru_evicts_oldest(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache("test", max_entries=2, default_ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=1)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    now[0] += 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.expirations >= 1
+    assert stats.hits == 3
+    assert stats.misses == 1
+
+
+def test_get_or_load_runs_loader_once_for_concurrent_misses():
+    cache = TTLCache("test", default_ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ["apps"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.wait(timeout=5)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == [["apps"]] * 4
+    assert cache.stats().loads == 1
+
+
+def test_loader_errors_are_not_cached():
+    cache = TTLCache("test")
+
+    def failing_loader():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", failing_loader)
+
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+    assert cache.stats().load_errors == 1
+
+
+def test_invalidate_tag_drops_tagged_entries_only():
+    cache = TTLCache("test")
+    cache.set("available_apps_en", [1], tags=("available_apps", "locale:en"))
+    cache.set("available_apps_zh", [2], tags=("available_apps", "locale:zh"))
+    cache.set("catalog_en", [3], tags=("catalog", "locale:en"))
+
+    assert cache.invalidate_tag("locale:en") == 2
+
+    assert "available_apps_en" not in cache
+    assert "catalog_en" not in cache
+    assert cache.get("available_apps_zh") == [2]
+
+
+def test_set_skips_values_loaded_before_an_invalidation():
+    cache = TTLCache("test")
+    generation = cache.generation()
+    cache.invalidate_tag("unrelated")
+
+    assert cache.set("session", "stale", generation=generation) is False
+    assert "session" not in cache
+    assert cache.set("session", "fresh", generation=cache.generation()) is True
+    assert cache.get("session") == "fresh"
+
+
+def test_get_cache_returns_shared_instance_by_name():
+    first = get_cache("test_shared_cache", max_entries=4, default_ttl=1)
+    second = get_cache("test_shared_cache")
+
+    assert first is second
+    assert second.max_entries == 4
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.content_search import ContentSearchOptions, search_tree
+from src.core.exception import CustomException
+
+
+def _display(root: Path):
+    return lambda path: "/" + Path(path).relative_to(root).as_posix()
+
+
+def test_search_streams_matches_with_context_and_skips_binary_files(tmp_path: Path):
+    (tmp_path / "conf").mkdir()
+    (tmp_path / "conf" / "nginx.conf").write_text("events {}\nserver_name example.com;\nlisten 80;\n")
+    (tmp_path / "conf" / "notes.txt").write_text("SERVER_NAME is set in nginx.conf\n")
+    (tmp_path / "image.bin").write_bytes(b"\x00server_name\x00")
+    options = ContentSearchOptions.from_params("server_name", context=1, include="*.conf")
+
+    events = list(search_tree(str(tmp_path), options, display_path=_display(tmp_path)))
+
+    matches = [event for event in events if event["type"] == "match"]
+    assert matches == [
+        {
+            "type": "match",
+            "path": "/conf/nginx.conf",
+            "line_number": 2,
+            "line": "server_name example.com;",
+            "before": ["events {}"],
+            "after": ["listen 80;"],
+        }
+    ]
+    everything = list(search_tree(str(tmp_path), ContentSearchOptions.from_params("server_name"), display_path=_display(tmp_path)))
+    assert [event["path"] for event in everything if event["type"] == "match"] == ["/conf/nginx.conf", "/conf/notes.txt"]
+    assert everything[-1]["files_skipped"] == 1
+
+
+def test_search_stops_at_match_limit(tmp_path: Path):
+    (tmp_path / "app.log").write_text("error\n" * 10)
+    options = ContentSearchOptions.from_params("ERROR", case_sensitive=True)
+    assert list(search_tree(str(tmp_path), options, display_path=_display(tmp_path)))[-1]["matches"] == 0
+
+    events = list(search_tree(str(tmp_path), ContentSearchOptions.from_params("error", max_matches=3), display_path=_display(tmp_path)))
+
+    assert [event["type"] for event in events] == ["match", "match", "match", "done"]
+    assert events[-1]["truncated"] is True
+
+
+def test_invalid_search_options_are_rejected():
+    with pytest.raises(CustomException) as regex_error:
+        ContentSearchOptions.from_params("(unclosed", regex=True)
+    with pytest.raises(CustomException):
+        ContentSearchOptions.from_params("   ")
+    with pytest.raises(CustomException):
+        ContentSearchOptions.from_params("x", include="conf/*.conf")
+
+    assert regex_error.value.status_code == 400
+
+
+@pytest.mark.parametrize("query", [r"port\s*=", r"(?i)host", r"a.*?b", r"[[:digit:]]+", r"[\w-]+"])
+def test_grep_incompatible_regex_is_rejected(query):
+    options = ContentSearchOptions.from_params(query, regex=True)
+
+    with pytest.raises(CustomException) as error:
+        options.require_posix_compatible()
+
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("query", [r"host = (mysql|redis)", r"^listen [0-9]{2,5};$", r"[]a-z]+\.conf", r"a\*b"])
+def test_grep_compatible_regex_and_literal_queries_are_accepted(query):
+    ContentSearchOptions.from_params(query, regex=True).require_posix_compatible()
+    ContentSearchOptions.from_params(r"port\s*=").require_posix_compatible()
+
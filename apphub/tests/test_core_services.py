@@ -1,8 +1,12 @@
+import socketserver
 import sys
+import threading
+import time
 from gzip import open as gzip_open
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
+from xmlrpc.server import SimpleXMLRPCDispatcher, SimpleXMLRPCRequestHandler
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
@@ -20,6 +24,7 @@ from src.core.exception import CustomException
 from src.schemas.coreServices import ServiceLogsQuery
 from src.schemas.errorResponse import ErrorResponse
 from src.services.core_services import CoreServicesService, HealthProbeResult, ServiceDefinition
+from src.services.core_services_health import ServiceHealthMonitor, load_supervisor_statuses
 
 
 def create_test_app() -> FastAPI:
@@ -201,6 +206,110 @@ def test_core_services_inventory_prefers_running_when_starting_service_is_health
     assert portainer.runtime_detail == "starting-endpoint-responding"
 
 
+def test_core_services_inventory_probes_concurrently_and_reads_cached_health(tmp_path: Path):
+    definitions = build_service_definitions(tmp_path)
+    probe_calls = []
+
+    def slow_probe(definition: ServiceDefinition) -> HealthProbeResult:
+        probe_calls.append(definition.key)
+        time.sleep(0.3)
+        return HealthProbeResult(ok=definition.key != "portainer", detail="HTTP 200")
+
+    service = CoreServicesService(
+        auth_service=FakeAuthService(),
+        service_definitions=definitions,
+        supervisor_status_loader=lambda: {"gitea": "RUNNING"},
+        health_probe=slow_probe,
+        now_provider=lambda: datetime(2026, 5, 6, 8, 50, tzinfo=timezone.utc),
+    )
+
+    started = time.monotonic()
+    payload = service.list_services("valid-session")
+    assert time.monotonic() - started < 0.3 * len(definitions) - 0.2
+    assert sorted(probe_calls) == sorted(definition.key for definition in definitions)
+
+    payload = service.list_services("valid-session")
+    assert len(probe_calls) == len(definitions)
+    gitea = next(item for item in payload if item.key == "gitea")
+    portainer = next(item for item in payload if item.key == "portainer")
+    assert gitea.runtime_state == "running"
+    assert gitea.health_check.checked_at == "2026-05-06T08:50:00Z"
+    assert gitea.health_check.latency_ms >= 300
+    assert gitea.health_check.latency_histogram["500"] == 1
+    assert portainer.health_check.consecutive_failures == 1
+
+
+def test_core_services_with_injected_probe_do_not_start_a_probe_thread(tmp_path: Path):
+    service = CoreServicesService(
+        auth_service=FakeAuthService(),
+        service_definitions=build_service_definitions(tmp_path),
+        supervisor_status_loader=lambda: {},
+        health_probe=lambda definition: HealthProbeResult(ok=True, detail="HTTP 200"),
+    )
+
+    service.list_services("valid-session")
+
+    assert service._health_monitor.background is False
+    assert service._health_monitor._thread is None
+
+
+def test_health_monitor_reprobes_when_results_outlived_an_idle_thread(tmp_path: Path):
+    definitions = build_service_definitions(tmp_path)[:1]
+    probe_results = [HealthProbeResult(ok=True, detail="HTTP 200")]
+    probe_calls = []
+
+    def probe(definition: ServiceDefinition) -> HealthProbeResult:
+        probe_calls.append(definition.key)
+        return probe_results[-1]
+
+    monitor = ServiceHealthMonitor(definitions, supervisor_status_loader=lambda: {}, health_probe=probe, interval_seconds=60, background=True)
+    try:
+        assert monitor.snapshot().observations[definitions[0].key].result.ok is True
+        assert monitor.snapshot().observations[definitions[0].key].result.ok is True
+        assert len(probe_calls) == 1
+
+        # The thread idled out long ago and the service went down in the meantime.
+        monitor._refreshed_at -= 3600
+        probe_results.append(HealthProbeResult(ok=False, detail="HTTP 502"))
+
+        assert monitor.snapshot().observations[definitions[0].key].result.ok is False
+        assert len(probe_calls) == 2
+    finally:
+        monitor.stop()
+
+
+class UnixXMLRPCRequestHandler(SimpleXMLRPCRequestHandler):
+    disable_nagle_algorithm = False
+
+
+class UnixXMLRPCServer(socketserver.UnixStreamServer, SimpleXMLRPCDispatcher):
+    def __init__(self, socket_path: str):
+        SimpleXMLRPCDispatcher.__init__(self, allow_none=True)
+        socketserver.UnixStreamServer.__init__(self, socket_path, UnixXMLRPCRequestHandler)
+        self.logRequests = False
+
+
+def test_supervisor_statuses_are_read_over_the_rpc_socket(tmp_path: Path):
+    socket_path = str(tmp_path / "supervisor.sock")
+    server = UnixXMLRPCServer(socket_path)
+    server.register_function(
+        lambda: [
+            {"name": "gitea", "group": "gitea", "statename": "RUNNING"},
+            {"name": "npm-nginx", "group": "npm", "statename": "BACKOFF"},
+        ],
+        "supervisor.getAllProcessInfo",
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        statuses = load_supervisor_statuses(socket_path)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert statuses == {"gitea": "RUNNING", "npm:npm-nginx": "BACKOFF", "npm-nginx": "BACKOFF"}
+
+
 def test_core_services_log_drilldown_filters_raw_lines(tmp_path: Path):
     definitions = build_service_definitions(tmp_path)
     (tmp_path / "gitea-credential").write_text("ok", encoding="utf-8")
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.directory_listing import DirectoryPageRequest, paginate_directory_entries
+from src.core.exception import CustomException
+
+
+ENTRIES = [("b.txt", False, 5, 3.0), ("docs", True, 0, 1.0), ("A.txt", False, 9, 2.0), ("bin", True, 0, 4.0)]
+
+
+def _paginate(entries, page_request):
+    return paginate_directory_entries(
+        entries,
+        page_request,
+        name=lambda entry: entry[0],
+        is_directory=lambda entry: entry[1],
+        size=lambda entry: entry[2],
+        modified=lambda entry: entry[3],
+    )
+
+
+def test_pages_keep_directories_first_and_resume_after_cursor():
+    page_request = DirectoryPageRequest.from_params(limit=3)
+    first = _paginate(ENTRIES, page_request)
+    second = _paginate(ENTRIES, DirectoryPageRequest.from_params(limit=3, cursor=first.next_cursor))
+
+    assert [entry[0] for entry in first.entries] == ["bin", "docs", "A.txt"]
+    assert first.total_items == 4
+    assert [entry[0] for entry in second.entries] == ["b.txt"]
+    assert second.next_cursor is None
+
+
+def test_cursor_survives_entries_removed_between_pages():
+    first = _paginate(ENTRIES, DirectoryPageRequest.from_params(sort="modified", order="desc", limit=2))
+    remaining = [entry for entry in ENTRIES if entry[0] != "A.txt"]
+    second = _paginate(remaining, DirectoryPageRequest.from_params(sort="modified", order="desc", limit=2, cursor=first.next_cursor))
+
+    assert [entry[0] for entry in first.entries] == ["bin", "docs"]
+    assert [entry[0] for entry in second.entries] == ["b.txt"]
+
+
+def test_rejects_cursor_from_a_different_sort_and_unknown_fields():
+    cursor = _paginate(ENTRIES, DirectoryPageRequest.from_params(limit=1)).next_cursor
+
+    with pytest.raises(CustomException) as mismatch:
+        _paginate(ENTRIES, DirectoryPageRequest.from_params(sort="size", limit=1, cursor=cursor))
+    with pytest.raises(CustomException) as invalid:
+        DirectoryPageRequest.from_params(sort="owner")
+
+    assert mismatch.value.status_code == 400
+    assert invalid.value.status_code == 400
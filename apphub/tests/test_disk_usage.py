@@ -0,0 +1,80 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.disk_usage import DiskUsageCancelled, DiskUsageScanner
+
+
+def _display(root: Path):
+    return lambda path: "/" + Path(path).relative_to(root).as_posix().removeprefix(".")
+
+
+def test_scan_reports_largest_paths_and_reuses_unchanged_directories(tmp_path: Path):
+    (tmp_path / "db" / "data").mkdir(parents=True)
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "db" / "data" / "ibdata").write_bytes(b"x" * 200_000)
+    (tmp_path / "logs" / "app.log").write_bytes(b"x" * 20_000)
+    scanner = DiskUsageScanner(workers=2)
+    progress = []
+
+    first = scanner.scan(str(tmp_path), display_path=_display(tmp_path), top=2, on_progress=progress.append)
+
+    assert first["files"] == 2
+    assert first["directories"] == 3
+    assert [child["name"] for child in first["children"]] == ["db", "logs"]
+    assert sorted(item["name"] for item in progress) == ["db", "logs"]
+    assert [item["path"] for item in first["top_files"]] == ["/db/data/ibdata", "/logs/app.log"]
+    assert [item["path"] for item in first["top_directories"]] == ["/db", "/db/data"]
+    assert first["scanned_directories"] == 4
+
+    (tmp_path / "logs" / "rotated.log").write_bytes(b"x" * 40_000)
+    second = scanner.scan(str(tmp_path), display_path=_display(tmp_path), top=2)
+
+    # Only the directory whose mtime changed is read again.
+    assert second["scanned_directories"] == 1
+    assert second["cached_directories"] == 3
+    assert second["files"] == 3
+    assert second["bytes"] > first["bytes"]
+    assert scanner.scan(str(tmp_path), display_path=_display(tmp_path), refresh=True)["scanned_directories"] == 4
+
+
+def test_scan_walks_trees_deeper_than_the_recursion_limit(tmp_path: Path):
+    depth = sys.getrecursionlimit() + 100
+    directory = str(tmp_path / "deep")
+    os.mkdir(directory)
+    for _ in range(depth):
+        directory = os.path.join(directory, "d")
+        os.mkdir(directory)
+    leaf = os.path.join(directory, "leaf.bin")
+    with open(leaf, "wb") as handle:
+        handle.write(b"x" * 10_000)
+
+    try:
+        usage = DiskUsageScanner(workers=1).scan(str(tmp_path), display_path=_display(tmp_path), top=1)
+    finally:
+        # pytest removes old temporary directories recursively, which a tree this deep would break.
+        os.remove(leaf)
+        while directory != str(tmp_path):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    assert usage["files"] == 1
+    assert usage["directories"] == depth + 1
+    assert usage["top_directories"][0]["path"] == "/deep"
+
+
+def test_scan_stops_when_cancelled(tmp_path: Path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(DiskUsageCancelled):
+        DiskUsageScanner(workers=1).scan(str(tmp_path), display_path=_display(tmp_path), cancel=cancel)
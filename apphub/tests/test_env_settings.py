@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.env_settings import env_float, env_int
+
+
+def test_env_int_clamps_to_minimum_and_ignores_malformed_values(monkeypatch):
+    monkeypatch.setenv("WEBSOFT9_TEST_SETTING", "0")
+    assert env_int("WEBSOFT9_TEST_SETTING", 4, minimum=1) == 1
+    assert env_int("WEBSOFT9_TEST_SETTING", 4, minimum=0) == 0
+
+    monkeypatch.setenv("WEBSOFT9_TEST_SETTING", "many")
+    assert env_int("WEBSOFT9_TEST_SETTING", 4, minimum=1) == 4
+
+    monkeypatch.delenv("WEBSOFT9_TEST_SETTING")
+    assert env_int("WEBSOFT9_TEST_SETTING", 4, minimum=1) == 4
+
+
+def test_env_float_clamps_to_minimum_and_ignores_malformed_values(monkeypatch):
+    monkeypatch.setenv("WEBSOFT9_TEST_SETTING", "-2.5")
+    assert env_float("WEBSOFT9_TEST_SETTING", 15.0, minimum=1.0) == 1.0
+
+    monkeypatch.setenv("WEBSOFT9_TEST_SETTING", "2.5")
+    assert env_float("WEBSOFT9_TEST_SETTING", 15.0, minimum=1.0) == 2.5
+
+    monkeypatch.setenv("WEBSOFT9_TEST_SETTING", "")
+    assert env_float("WEBSOFT9_TEST_SETTING", 15.0, minimum=1.0) == 15.0
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.event_stream import iter_sse_events
+from src.core.exception import CustomException
+
+
+def test_sse_events_frame_data_heartbeats_and_errors():
+    def events():
+        yield {"type": "progress", "entry": {"path": "/data"}}
+        yield {"type": "heartbeat"}
+        raise CustomException(404, "File Not Found", "gone")
+
+    frames = list(iter_sse_events(events(), lambda event: event.get("entry")))
+
+    assert frames[0] == 'event: progress\ndata: {"path":"/data"}\n\n'
+    assert frames[1] == ": keep-alive\n\n"
+    assert frames[2].startswith("event: error\ndata: ")
+    assert '"status_code":404' in frames[2]
+
+
+def test_sse_events_close_the_producer_when_the_client_goes_away():
+    closed = []
+
+    def events():
+        try:
+            yield {"type": "match", "path": "/a"}
+            yield {"type": "match", "path": "/b"}
+        finally:
+            closed.append(True)
+
+    stream = iter_sse_events(events())
+    assert next(stream) == 'event: match\ndata: {"path":"/a"}\n\n'
+    stream.close()
+
+    assert closed == [True]
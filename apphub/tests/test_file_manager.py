@@ -17,7 +17,7 @@ from src.api.v1.routers import auth as auth_router
 from src.api.v1.routers import files as files_router
 from src.core.exception import CustomException
 from src.schemas.errorResponse import ErrorResponse
-from src.services.file_manager import DOCKER_VOLUMES_ROOT_SENTINEL, FileManagerService
+from src.services.file_manager import DOCKER_VOLUMES_ROOT_SENTINEL, FileDownloadStream, FileManagerService
 
 
 DOCKER_VOLUMES_ROOT = "/var/lib/docker/volumes"
@@ -310,6 +310,7 @@ class FakeFilesAgentExecutor:
         }
         self.contents = {(WORDPRESS_ROOT, "/notes.txt"): "hello world\n"}
         self.downloads = {(WORDPRESS_ROOT, "/notes.txt"): b"hello world\n"}
+        self.uploads: dict[str, dict] = {}
         self.metadata = {
             (WORDPRESS_ROOT, "/"): {
                 "name": "wordpress_data",
@@ -379,7 +380,7 @@ class FakeFilesAgentExecutor:
         }
         self.last_metadata_call: Optional[tuple[str, str, str]] = None
 
-    def list_directory(self, root_path: str, relative_path: str, display_name: str):
+    def list_directory(self, root_path: str, relative_path: str, display_name: str, page_request=None):
         return self.directories[root_path][relative_path]
 
     def read_text_file(self, root_path: str, relative_path: str, display_name: str):
@@ -414,8 +415,22 @@ class FakeFilesAgentExecutor:
         self.contents[(root_path, path)] = payload.decode("utf-8")
         self.downloads[(root_path, path)] = payload
 
-    def download_file(self, root_path: str, relative_path: str, display_name: str):
-        return self.downloads[(root_path, relative_path)]
+    def open_download(self, root_path: str, relative_path: str, display_name: str, range_header: Optional[str] = None):
+        content = self.downloads[(root_path, relative_path)]
+        return FileDownloadStream(status_code=200, headers={"Content-Length": str(len(content))}, chunks=iter([content]))
+
+    def start_upload(self, root_path: str, parent_relative_path: str, file_name: str, size: int, display_name: str):
+        base = parent_relative_path.rstrip("/")
+        self.uploads["upload-1"] = {"root_path": root_path, "path": f"{base}/{file_name}", "size": size, "content": b""}
+        return {"upload_id": "upload-1", "path": f"{base}/{file_name}", "offset": 0, "size": size, "chunk_size": 4, "completed": False}
+
+    def upload_chunk(self, upload_id: str, offset: int, content: bytes, checksum: Optional[str] = None):
+        upload = self.uploads[upload_id]
+        upload["content"] += content
+        completed = len(upload["content"]) == upload["size"]
+        if completed:
+            self.downloads[(upload["root_path"], upload["path"])] = upload["content"]
+        return {"upload_id": upload_id, "path": upload["path"], "offset": len(upload["content"]), "size": upload["size"], "chunk_size": 4, "completed": completed}
 
 
 def build_service(*, with_mountpoint: bool = True) -> FileManagerService:
@@ -539,6 +554,17 @@ def test_file_manager_text_edit_upload_download_and_mutations(monkeypatch, tmp_p
         assert download_response.status_code == 200
         assert download_response.headers["content-type"] == "application/octet-stream"
 
+        start_upload_response = client.post(
+            "/files/uploads",
+            json={"volume_id": "wordpress_data", "parent_path": "/", "file_name": "chunked.bin", "size": 6},
+        )
+        assert start_upload_response.status_code == 200
+        upload_id = start_upload_response.json()["upload_id"]
+        assert client.put(f"/files/uploads/{upload_id}", params={"offset": 0}, content=b"abcd").json()["offset"] == 4
+        assert client.put(f"/files/uploads/{upload_id}", params={"offset": 4}, content=b"ef").json()["completed"] is True
+        chunked_download_response = client.get("/files/download", params={"volume_id": "wordpress_data", "path": "/chunked.bin"})
+        assert chunked_download_response.content == b"abcdef"
+
         delete_response = client.request(
             "DELETE",
             "/files/item",
@@ -620,6 +646,10 @@ def test_file_manager_rejects_unauthenticated_and_path_escape_requests(monkeypat
     with TestClient(create_test_app()) as client:
         unauthenticated_response = client.get("/files/volumes")
         assert unauthenticated_response.status_code == 401
+        # The session is checked before the chunk body is read, so an oversized body is not buffered.
+        monkeypatch.setattr(files_router, "FILE_UPLOAD_CHUNK_MAX_BYTES", 4)
+        unauthenticated_chunk_response = client.put("/files/uploads/upload-1", params={"offset": 0}, content=b"x" * 16)
+        assert unauthenticated_chunk_response.status_code == 401
 
         authenticate(client)
 
@@ -1,3 +1,8 @@
+import base64
+import hashlib
+import json
+import os
+import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -136,4 +141,265 @@ def test_helper_manager_prunes_stale_tracked_helper(monkeypatch):
     manager._prune_stale_locked()
 
     assert helper.removed is True
-    assert manager._helpers == {}
\ No newline at end of file
+    assert manager._helpers == {}
+
+class FakeExecSocket:
+    """Bridge a local `serve` process to the Docker multiplexed-stream framing the worker expects."""
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.pending = b""
+
+    def sendall(self, data: bytes):
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+
+    def recv(self, size: int) -> bytes:
+        if not self.pending:
+            line = self.process.stdout.readline()
+            if not line:
+                return b""
+            self.pending = bytes([1, 0, 0, 0]) + len(line).to_bytes(4, "big") + line
+        chunk, self.pending = self.pending[:size], self.pending[size:]
+        return chunk
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait(timeout=5)
+
+
+class FakeExecApi:
+    def __init__(self, helper_root: Path):
+        self.helper_root = helper_root
+        self.exec_creates = 0
+        self.sockets: List[FakeExecSocket] = []
+
+    def exec_create(self, container_id, cmd, **kwargs):
+        self.exec_creates += 1
+        self.cmd = cmd
+        return {"Id": f"exec-{self.exec_creates}"}
+
+    def exec_start(self, exec_id, socket: bool = False):
+        env = dict(os.environ, WEBSOFT9_FILE_HELPER_ROOT=str(self.helper_root))
+        process = subprocess.Popen([sys.executable, *self.cmd[1:]], stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+        self.sockets.append(FakeExecSocket(process))
+        return self.sockets[-1]
+
+
+def test_helper_manager_reuses_persistent_worker(monkeypatch, tmp_path: Path):
+    (tmp_path / "site").mkdir()
+    (tmp_path / "site" / "index.html").write_text("hello", encoding="utf-8")
+    helper = FakeContainer("helper-3")
+    helper.exec_run = lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("exec_run should not be used"))
+    docker_client = FakeDockerClient([helper])
+    docker_client.api = FakeExecApi(tmp_path)
+    monkeypatch.setattr(files_agent.DockerHelperManager, "_start_background_sweeper", lambda self: None)
+    manager = files_agent.DockerHelperManager(docker_client=docker_client)
+    manager._helpers = {"/volumes/site": {"container_id": helper.id, "last_used": files_agent.time.monotonic()}}
+
+    try:
+        listing = manager.execute("/volumes/site", "list-entries", {"path": "/site"})
+        content = manager.execute("/volumes/site", "read-text", {"path": "/site/index.html"})
+        try:
+            manager.execute("/volumes/site", "read-text", {"path": "/missing.txt"})
+        except files_agent.CustomException as exc:
+            missing_status = exc.status_code
+    finally:
+        manager._drop_container("/volumes/site", force_remove=False)
+
+    assert [entry[0] for entry in listing["entries"]] == ["index.html"]
+    assert content == {"content": "hello"}
+    assert missing_status == 404
+    assert docker_client.api.exec_creates == 1
+    assert docker_client.api.sockets[0].process.returncode == 0
+
+
+def _local_agent_client(monkeypatch, tmp_path: Path):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(files_agent, "_allowed_roots", lambda: (str(tmp_path),))
+    monkeypatch.setattr(files_agent, "_docker_allowed_roots", lambda: (str(tmp_path),))
+    monkeypatch.setattr(files_agent, "UPLOAD_REGISTRY_PATH", f"{tmp_path}.upload-parts.json")
+    return TestClient(files_agent.app)
+
+
+def test_download_supports_byte_ranges(monkeypatch, tmp_path: Path):
+    (tmp_path / "backup.tar").write_bytes(b"0123456789")
+    client = _local_agent_client(monkeypatch, tmp_path)
+    payload = {"root_path": str(tmp_path), "path": "/backup.tar"}
+
+    full = client.post("/internal/files/download", json=payload)
+    partial = client.post("/internal/files/download", json=payload, headers={"Range": "bytes=2-5"})
+    suffix = client.post("/internal/files/download", json=payload, headers={"Range": "bytes=-3"})
+    unsatisfiable = client.post("/internal/files/download", json=payload, headers={"Range": "bytes=20-"})
+
+    assert full.status_code == 200
+    assert full.content == b"0123456789"
+    assert full.headers["accept-ranges"] == "bytes"
+    assert partial.status_code == 206
+    assert partial.content == b"2345"
+    assert partial.headers["content-range"] == "bytes 2-5/10"
+    assert suffix.content == b"789"
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == "bytes */10"
+
+
+def test_startup_sweep_removes_registered_parts_of_unfinished_uploads(monkeypatch, tmp_path: Path):
+    (tmp_path / "data").mkdir()
+    client = _local_agent_client(monkeypatch, tmp_path)
+    unfinished = client.post(
+        "/internal/files/uploads",
+        json={"root_path": str(tmp_path), "parent_path": "/data", "file_name": "dump.sql", "size": 6},
+    ).json()
+    finished = client.post(
+        "/internal/files/uploads",
+        json={"root_path": str(tmp_path), "parent_path": "/data", "file_name": "notes.txt", "size": 3},
+    ).json()
+    client.put(f"/internal/files/uploads/{finished['upload_id']}", params={"offset": 0}, content=b"abc")
+    (tmp_path / "data" / f"{files_agent.UPLOAD_PART_PREFIX}unregistered.part").write_bytes(b"x")
+
+    assert set(files_agent._read_upload_registry()) == {unfinished["upload_id"]}
+
+    # A restarted agent has no sessions in memory.
+    monkeypatch.setattr(files_agent, "_upload_sessions", {})
+    removed = files_agent._sweep_orphaned_upload_parts()
+
+    assert removed == 1
+    assert sorted(path.name for path in (tmp_path / "data").iterdir()) == [
+        f"{files_agent.UPLOAD_PART_PREFIX}unregistered.part",
+        "notes.txt",
+    ]
+    assert files_agent._read_upload_registry() == {}
+
+
+def test_chunked_upload_resumes_and_verifies_checksums(monkeypatch, tmp_path: Path):
+    (tmp_path / "data").mkdir()
+    client = _local_agent_client(monkeypatch, tmp_path)
+
+    started = client.post(
+        "/internal/files/uploads",
+        json={"root_path": str(tmp_path), "parent_path": "/data", "file_name": "archive.bin", "size": 6},
+    ).json()
+    upload_url = f"/internal/files/uploads/{started['upload_id']}"
+
+    corrupted = client.put(upload_url, params={"offset": 0}, content=b"abc", headers={"X-Content-SHA256": "0" * 64})
+    first = client.put(upload_url, params={"offset": 0}, content=b"abc", headers={"X-Content-SHA256": hashlib.sha256(b"abc").hexdigest()})
+    replayed = client.put(upload_url, params={"offset": 0}, content=b"abc")
+    status = client.get(upload_url).json()
+    last = client.put(upload_url, params={"offset": 3}, content=b"def")
+
+    assert corrupted.status_code == 400
+    assert first.json()["offset"] == 3
+    assert replayed.status_code == 409
+    assert status["offset"] == 3
+    assert last.json()["completed"] is True
+    assert (tmp_path / "data" / "archive.bin").read_bytes() == b"abcdef"
+    assert [path.name for path in (tmp_path / "data").iterdir()] == ["archive.bin"]
+    assert client.get(upload_url).status_code == 404
+
+
+def test_directory_listing_pages_with_cursor(monkeypatch, tmp_path: Path):
+    (tmp_path / "logs").mkdir()
+    for name, size in (("a.txt", 30), ("b.txt", 10), ("c.txt", 20)):
+        (tmp_path / name).write_bytes(b"x" * size)
+    client = _local_agent_client(monkeypatch, tmp_path)
+    payload = {"root_path": str(tmp_path), "path": "/", "sort": "size", "order": "desc", "limit": 2, "include_details": False}
+
+    first = client.post("/internal/files/directory", json=payload).json()
+    second = client.post("/internal/files/directory", json={**payload, "cursor": first["next_cursor"]}).json()
+    filtered = client.post("/internal/files/directory", json={"root_path": str(tmp_path), "name_filter": "B"}).json()
+
+    assert [item["name"] for item in first["items"]] == ["logs", "a.txt"]
+    assert first["total_items"] == 4
+    assert first["items"][1]["owner"] is None
+    assert [item["name"] for item in second["items"]] == ["c.txt", "b.txt"]
+    assert second["next_cursor"] is None
+    assert [item["name"] for item in filtered["items"]] == ["b.txt"]
+    assert filtered["items"][0]["owner"] is not None
+
+
+def test_disk_usage_streams_progress_before_result(monkeypatch, tmp_path: Path):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "uploads" / "video.mp4").write_bytes(b"x" * 100_000)
+    (tmp_path / "cache").mkdir()
+    client = _local_agent_client(monkeypatch, tmp_path)
+
+    response = client.post("/internal/files/disk-usage", json={"root_path": str(tmp_path), "top": 5, "stream": True})
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    missing = client.post("/internal/files/disk-usage", json={"root_path": str(tmp_path), "path": "/uploads/video.mp4"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert sorted(event["entry"]["name"] for event in events[:-1]) == ["cache", "uploads"]
+    assert events[-1]["type"] == "result"
+    assert events[-1]["usage"]["top_files"][0]["path"] == "/uploads/video.mp4"
+    assert events[-1]["usage"]["children"][0]["path"] == "/uploads"
+    assert missing.status_code == 400
+
+
+def test_disk_usage_stream_cancels_the_walk_when_closed(monkeypatch, tmp_path: Path):
+    cancels = []
+
+    def compute(root_path, payload, on_progress=None, cancel=None):
+        cancels.append(cancel)
+        cancel.wait(timeout=5)
+        raise files_agent.DiskUsageCancelled(root_path)
+
+    monkeypatch.setattr(files_agent, "_compute_disk_usage", compute)
+    monkeypatch.setattr(files_agent, "DISK_USAGE_HEARTBEAT_SECONDS", 0.01)
+    events = files_agent._iter_disk_usage_events(str(tmp_path), files_agent.AgentDiskUsageRequest(root_path=str(tmp_path), stream=True))
+
+    assert next(events) == b'{"type":"heartbeat"}\n'
+    events.close()
+
+    assert cancels[0].is_set()
+
+
+def test_helper_disk_usage_matches_the_scanner(tmp_path: Path):
+    (tmp_path / "db" / "data").mkdir(parents=True)
+    (tmp_path / "db" / "data" / "ibdata").write_bytes(b"x" * 200_000)
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "app.log").write_bytes(b"x" * 20_000)
+
+    payload = base64.b64encode(json.dumps({"path": "/", "top": 5}).encode()).decode()
+    helper = subprocess.run(
+        [sys.executable, "-c", files_agent.DOCKER_HELPER_SCRIPT, "disk-usage", payload],
+        env={**os.environ, "WEBSOFT9_FILE_HELPER_ROOT": str(tmp_path)},
+        capture_output=True,
+        check=True,
+    )
+    usage = json.loads(helper.stdout)["data"]
+    expected = files_agent.DiskUsageScanner(workers=1).scan(
+        str(tmp_path),
+        display_path=lambda path: files_agent._normalize_item_path(str(tmp_path), path),
+        top=5,
+    )
+
+    for key in ("bytes", "files", "directories", "children", "top_directories", "top_files"):
+        assert usage[key] == expected[key]
+
+
+def test_search_streams_ndjson_matches_from_local_and_helper_roots(monkeypatch, tmp_path: Path):
+    (tmp_path / "conf").mkdir()
+    (tmp_path / "conf" / "app.ini").write_text("[db]\nhost = mysql\nport = 3306\n")
+    (tmp_path / "blob.bin").write_bytes(b"host\x00")
+    client = _local_agent_client(monkeypatch, tmp_path)
+
+    response = client.post("/internal/files/search", json={"root_path": str(tmp_path), "query": "HOST", "context": 1})
+    events = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert events[0] == {"type": "match", "path": "/conf/app.ini", "line_number": 2, "line": "host = mysql", "before": ["[db]"], "after": ["port = 3306"]}
+    assert events[-1]["type"] == "done"
+    assert events[-1]["files_skipped"] == 1
+
+    payload = base64.b64encode(json.dumps({"path": "/", "query": "port", "regex": True, "max_matches": 10}).encode()).decode()
+    helper = subprocess.run(
+        [sys.executable, "-c", files_agent.DOCKER_HELPER_SCRIPT, "search", payload],
+        env={**os.environ, "WEBSOFT9_FILE_HELPER_ROOT": str(tmp_path)},
+        capture_output=True,
+        check=True,
+    )
+    helper_events = [json.loads(line) for line in helper.stdout.decode().splitlines()]
+
+    assert [event["line_number"] for event in helper_events if event["type"] == "match"] == [3]
+    assert helper_events[-1]["type"] == "done"
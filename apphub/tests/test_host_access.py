@@ -1,10 +1,14 @@
 import stat
 import sys
+import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Optional
 
+import pytest
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -18,6 +22,7 @@ if "paramiko" not in sys.modules:
         Transport=object,
         AutoAddPolicy=object,
         AuthenticationException=Exception,
+        SSHException=Exception,
         RSAKey=object,
         Ed25519Key=object,
         ECDSAKey=object,
@@ -25,6 +30,7 @@ if "paramiko" not in sys.modules:
     )
 
 from src.core.exception import CustomException
+from src.services import host_access
 from src.services.host_access import HostAccessService
 
 
@@ -82,4 +88,310 @@ def test_list_directory_uses_locked_sftp_helper(monkeypatch):
             {"path": "/home/websoft9/docs"},
             {"path": "/home/websoft9/notes.txt"},
         ],
-    }
\ No newline at end of file
+        "next_cursor": None,
+        "total_items": 2,
+    }
+
+class FakeRemoteFile:
+    def __init__(self, files: dict[str, bytearray], path: str):
+        self.files = files
+        self.path = path
+        self.position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def close(self):
+        return None
+
+    def prefetch(self, file_size=None):
+        return None
+
+    def set_pipelined(self, pipelined=True):
+        return None
+
+    def seek(self, offset):
+        self.position = offset
+
+    def read(self, size=-1):
+        data = self.files[self.path]
+        end = len(data) if size is None or size < 0 else self.position + size
+        chunk = bytes(data[self.position:end])
+        self.position += len(chunk)
+        return chunk
+
+    def readv(self, chunks):
+        time.sleep(0.01)
+        for offset, length in chunks:
+            yield bytes(self.files[self.path][offset:offset + length])
+
+    def write(self, payload):
+        time.sleep(0.01)
+        data = self.files[self.path]
+        if len(data) < self.position:
+            data.extend(b"\0" * (self.position - len(data)))
+        data[self.position:self.position + len(payload)] = payload
+        self.position += len(payload)
+
+
+class FakePooledSFTP:
+    def __init__(self, host):
+        self.host = host
+        self.closed = False
+
+    def get_channel(self):
+        return SimpleNamespace(closed=self.closed)
+
+    def close(self):
+        self.closed = True
+
+    def open(self, path: str, mode: str = "r"):
+        if "w" in mode:
+            self.host.files[path] = bytearray()
+        return FakeRemoteFile(self.host.files, path)
+
+    def stat(self, path: str):
+        if path in self.host.files:
+            return SimpleNamespace(st_mode=stat.S_IFREG | 0o644, st_size=len(self.host.files[path]))
+        if path in self.host.directories:
+            return SimpleNamespace(st_mode=stat.S_IFDIR | 0o755, st_size=0)
+        raise IOError(f"No such file: {path}")
+
+    def listdir_attr(self, path: str):
+        names = sorted({item[len(path) + 1:].split("/")[0] for item in [*self.host.files, *self.host.directories] if item.startswith(path + "/")})
+        return [SimpleNamespace(filename=name, **vars(self.stat(f"{path}/{name}"))) for name in names]
+
+    def remove(self, path: str):
+        self.host.removed.append(path)
+        self.host.files.pop(path)
+
+    def rmdir(self, path: str):
+        self.host.removed.append(path)
+        self.host.directories.discard(path)
+
+
+class FakeExecChannel:
+    """Exec channel whose exit status only arrives once the command's output has been read."""
+
+    def __init__(self, exit_code: Optional[int], stdout: bytes = b"", stderr: bytes = b""):
+        self.exit_code = exit_code
+        self.stdout = bytearray(stdout)
+        self.stderr = bytearray(stderr)
+        self.status_event = threading.Event()
+        self.closed = False
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv(self, size):
+        chunk, self.stdout[:size] = bytes(self.stdout[:size]), b""
+        return chunk
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv_stderr(self, size):
+        chunk, self.stderr[:size] = bytes(self.stderr[:size]), b""
+        return chunk
+
+    def exit_status_ready(self):
+        # Like a remote process blocked on a full pipe, the command only exits once drained.
+        return self.exit_code is not None and not self.stdout and not self.stderr
+
+    def recv_exit_status(self):
+        return self.exit_code
+
+    def close(self):
+        self.closed = True
+
+
+class FakePooledHost:
+    def __init__(self, exec_exit_code: int = 0):
+        self.files: dict[str, bytearray] = {}
+        self.directories: set[str] = set()
+        self.removed: list[str] = []
+        self.commands: list[str] = []
+        self.opened_channels = 0
+        self.exec_exit_code = exec_exit_code
+        self.exec_stdout = b""
+        self.exec_stderr = b""
+        self.exec_channels: list[FakeExecChannel] = []
+        self.transport = SimpleNamespace(is_active=lambda: True, set_keepalive=lambda interval: None, sock=None)
+
+    def get_transport(self):
+        return self.transport
+
+    def open_sftp(self):
+        self.opened_channels += 1
+        return FakePooledSFTP(self)
+
+    def exec_command(self, command: str, timeout=None):
+        self.commands.append(command)
+        channel = FakeExecChannel(self.exec_exit_code, self.exec_stdout, self.exec_stderr)
+        self.exec_channels.append(channel)
+        return None, SimpleNamespace(channel=channel), SimpleNamespace(channel=channel)
+
+    def close(self):
+        return None
+
+
+def _pooled_service(monkeypatch, host: FakePooledHost) -> HostAccessService:
+    service = HostAccessService(auth_service=FakeAuthService())
+    monkeypatch.setattr(HostAccessService, "_file_browser_clients", {})
+    monkeypatch.setattr(service, "_connect_client", lambda profile: host)
+    monkeypatch.setattr(service, "get_connection_profile", lambda session_token, profile_id=None: {"username": "websoft9"})
+    return service
+
+
+def test_sftp_channels_are_pooled_per_host_and_bounded(monkeypatch):
+    host = FakePooledHost()
+    service = _pooled_service(monkeypatch, host)
+    profile = {"username": "websoft9"}
+    monkeypatch.setattr(host_access, "SFTP_CHANNELS_PER_HOST", 2)
+    monkeypatch.setattr(host_access, "SFTP_CHANNEL_WAIT_SECONDS", 0.05)
+
+    with service._open_sftp(profile) as first, service._open_sftp(profile) as second:
+        assert first is not second
+        try:
+            with service._open_sftp(profile):
+                raise AssertionError("a third channel should not be opened")
+        except CustomException as exc:
+            assert exc.status_code == 503
+    with service._open_sftp(profile) as reused:
+        assert reused in (first, second)
+
+    released = threading.Event()
+
+    def release_later():
+        with service._open_sftp(profile), service._open_sftp(profile):
+            released.wait(1)
+
+    worker = threading.Thread(target=release_later)
+    worker.start()
+    monkeypatch.setattr(host_access, "SFTP_CHANNEL_WAIT_SECONDS", 2)
+    threading.Timer(0.05, released.set).start()
+    with service._open_sftp(profile) as waited:
+        assert waited in (first, second)
+    worker.join()
+    assert host.opened_channels == 2
+
+
+def test_large_transfers_are_split_across_channels(monkeypatch):
+    host = FakePooledHost()
+    service = _pooled_service(monkeypatch, host)
+    host.directories.add("/srv")
+    monkeypatch.setattr(service, "_resolve_directory_path", lambda sftp, path: path)
+    monkeypatch.setattr(host_access, "SFTP_TRANSFER_CHUNK_BYTES", 4)
+    payload = bytes(range(30))
+
+    uploaded = service.upload_file("valid-session", "/srv", "data.bin", payload)
+    downloaded = service.download_file("valid-session", "/srv/data.bin")
+
+    assert uploaded["path"] == "/srv/data.bin"
+    assert bytes(host.files["/srv/data.bin"]) == payload
+    assert downloaded["content"] == payload
+    assert host.opened_channels > 1
+
+
+def test_delete_directory_runs_rm_on_host_and_falls_back_to_sftp(monkeypatch):
+    host = FakePooledHost()
+    service = _pooled_service(monkeypatch, host)
+    host.directories.update({"/srv/site", "/srv/site/assets"})
+    host.files["/srv/site/assets/app.js"] = bytearray(b"x")
+
+    service.delete_item("valid-session", "/srv/site")
+
+    assert host.commands == ["rm -rf -- /srv/site"]
+    assert host.removed == []
+
+    host.exec_exit_code = 127
+    service.delete_item("valid-session", "/srv/site")
+
+    assert host.removed == ["/srv/site/assets/app.js", "/srv/site/assets", "/srv/site"]
+
+
+def test_remote_delete_drains_stderr_beyond_the_channel_window(monkeypatch):
+    host = FakePooledHost(exec_exit_code=1)
+    host.exec_stderr = b"rm: cannot remove '/srv/site/x': Permission denied\n" * 10_000
+    service = _pooled_service(monkeypatch, host)
+    host.directories.add("/srv/site")
+
+    with pytest.raises(CustomException) as raised:
+        service.delete_item("valid-session", "/srv/site")
+
+    assert "Permission denied" in raised.value.details
+    assert host.removed == []
+
+
+def test_remote_command_gives_up_after_the_timeout(monkeypatch):
+    host = FakePooledHost(exec_exit_code=None)
+    service = _pooled_service(monkeypatch, host)
+    host.directories.add("/srv/site")
+    monkeypatch.setattr(host_access, "REMOTE_FILE_COMMAND_TIMEOUT_SECONDS", 0.05)
+
+    with pytest.raises(CustomException) as raised:
+        service.delete_item("valid-session", "/srv/site")
+
+    assert raised.value.message == "Remote Command Failed"
+    assert host.exec_channels[0].closed
+    assert host.removed == []
+
+
+def test_terminal_reader_pushes_raw_output_and_reports_close_after_drain(monkeypatch):
+    service = HostAccessService(auth_service=FakeAuthService())
+    monkeypatch.setattr(HostAccessService, "_terminal_sessions", {})
+    chunks = [b"build step 1\n", "✓".encode("utf-8")[:1], "✓".encode("utf-8")[1:] + b"\n", b""]
+
+    class FakeTerminalChannel:
+        closed = False
+
+        def recv(self, size):
+            return chunks.pop(0)
+
+        def recv_stderr_ready(self):
+            return False
+
+        def close(self):
+            self.closed = True
+
+    service._terminal_sessions["session-1"] = {
+        "client": SimpleNamespace(close=lambda: None),
+        "channel": FakeTerminalChannel(),
+        "output": host_access.TerminalOutputBuffer(host_access.TERMINAL_SESSION_BUFFER_LIMIT),
+        "closed": False,
+    }
+    woken = threading.Event()
+    service.subscribe_terminal_output("session-1", woken.set)
+
+    with HostAccessService._lock:
+        service._start_terminal_reader_locked("session-1")
+    service._terminal_sessions["session-1"]["reader"].join(1)
+
+    monkeypatch.setattr(host_access, "TERMINAL_SESSION_READ_LIMIT", 12)
+    first, cursor, first_closed = service.read_terminal_updates("session-1", 0)
+    rest, cursor, closed = service.read_terminal_updates("session-1", cursor)
+
+    assert woken.is_set()
+    assert (first + rest).decode("utf-8") == "build step 1\n✓\n"
+    assert first_closed is False
+    assert closed is True
+
+
+def test_copy_falls_back_to_sftp_for_forced_internal_sftp_accounts(monkeypatch):
+    host = FakePooledHost(exec_exit_code=1)
+    host.exec_stdout = b"This service allows sftp connections only.\n"
+    service = _pooled_service(monkeypatch, host)
+    host.directories.update({"/srv", "/srv/site", "/backup"})
+    host.files["/srv/site/index.html"] = bytearray(b"hello")
+    copied = []
+    monkeypatch.setattr(service, "_resolve_directory_path", lambda sftp, path: path)
+    monkeypatch.setattr(service, "_copy_tree_over_sftp", lambda profile, source, target: copied.append((source, target)))
+
+    result = service.copy_item("valid-session", "/srv/site", "/backup")
+
+    assert host.commands == ["cp -a -- /srv/site /backup/site"]
+    assert copied == [("/srv/site", "/backup/site")]
+    assert result == {"path": "/backup/site", "operation": "copy"}
@@ -0,0 +1,107 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import docker
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.exception import CustomException
+from src.services.image_pull_scheduler import ImagePullScheduler, MirrorSelector, get_image_registry
+
+
+class FakeImages:
+    def __init__(self, present):
+        self.present = set(present)
+
+    def get(self, image):
+        if image not in self.present:
+            raise docker.errors.ImageNotFound(image)
+        return image
+
+
+class FakeAPI:
+    def __init__(self, failing_prefixes=(), delay=0.0):
+        self.failing_prefixes = failing_prefixes
+        self.delay = delay
+        self.pulls = []
+        self.tags = []
+        self.removed = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def pull(self, image, stream=True, decode=True):
+        with self._lock:
+            self.pulls.append(image)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if any(image.startswith(prefix) for prefix in self.failing_prefixes):
+                yield {"error": f"pull access denied for {image}"}
+                return
+            yield {"status": "Downloading", "id": f"{image}-layer"}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def tag(self, source, target):
+        self.tags.append((source, target))
+
+    def remove_image(self, image):
+        self.removed.append(image)
+
+
+class FakeDockerClient:
+    def __init__(self, api, present=()):
+        self.api = api
+        self.images = FakeImages(present)
+
+
+def test_get_image_registry():
+    assert get_image_registry("mysql:8") == "docker.io"
+    assert get_image_registry("library/redis") == "docker.io"
+    assert get_image_registry("ghcr.io/org/app:1") == "ghcr.io"
+    assert get_image_registry("localhost:5000/app") == "localhost:5000"
+
+
+def test_pull_all_dedupes_skips_present_and_runs_in_parallel():
+    api = FakeAPI(delay=0.05)
+    client = FakeDockerClient(api, present={"redis:7"})
+    progress = []
+
+    ImagePullScheduler(client, on_progress=progress.append, max_workers=3).pull_all(
+        ["wordpress:6", "mysql:8", "wordpress:6", "redis:7", "nginx:1"]
+    )
+
+    assert sorted(api.pulls) == ["mysql:8", "nginx:1", "wordpress:6"]
+    assert api.max_active > 1
+    assert len(progress) == 3
+
+
+def test_failed_direct_pull_falls_back_and_remembers_fastest_mirror():
+    selector = MirrorSelector(probe=lambda host: None)
+    api = FakeAPI(failing_prefixes=("mysql", "slow.mirror"))
+    client = FakeDockerClient(api)
+    scheduler = ImagePullScheduler(client, accelerators=["slow.mirror", "fast.mirror"], selector=selector, max_workers=1)
+
+    scheduler.pull_all(["mysql:8"])
+
+    assert api.pulls == ["mysql:8", "slow.mirror/mysql:8", "fast.mirror/mysql:8"]
+    assert api.tags == [("fast.mirror/mysql:8", "mysql:8")]
+    assert selector.order_sources("docker.io", ["slow.mirror", "fast.mirror"])[0] == "fast.mirror"
+
+
+def test_pull_all_raises_when_every_source_fails():
+    api = FakeAPI(failing_prefixes=("",))
+    scheduler = ImagePullScheduler(FakeDockerClient(api), selector=MirrorSelector(probe=lambda host: None))
+
+    with pytest.raises(CustomException) as exc_info:
+        scheduler.pull_all(["mysql:8"])
+
+    assert "mysql:8" in exc_info.value.details
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.log_tail import LogTimeIndex, iter_lines_reversed
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_reverse_reader_matches_forward_lines_and_offsets(tmp_path: Path, use_mmap: bool):
+    log_path = tmp_path / "runtime.log"
+    content = b"first\n\nsecond line\r\n" + b"x" * 50 + b"\npartial"
+    log_path.write_bytes(content)
+    expected = []
+    offset = 0
+    for line in content.split(b"\n"):
+        expected.append((offset, line))
+        offset += len(line) + 1
+
+    lines = list(iter_lines_reversed(log_path, block_size=7, use_mmap=use_mmap))
+    tail = list(iter_lines_reversed(log_path, stop_offset=expected[2][0], block_size=7, use_mmap=use_mmap))
+
+    assert lines == expected[::-1]
+    assert tail == expected[2:][::-1]
+
+
+def test_time_index_finds_a_line_boundary_before_the_threshold_and_caches_probes(tmp_path: Path):
+    log_path = tmp_path / "service.log"
+    lines = [f"{second:06d} event {second}\n".encode() for second in range(400)]
+    log_path.write_bytes(b"".join(lines))
+    probed = []
+
+    def timestamp_of(line: bytes):
+        probed.append(line)
+        return float(line.split()[0])
+
+    index = LogTimeIndex(grid_bytes=256)
+    offset = index.find_offset(log_path, 300.0, timestamp_of)
+    probes_first_run = len(probed)
+    assert index.find_offset(log_path, 300.0, timestamp_of) == offset
+    kept = [line for _, line in iter_lines_reversed(log_path, stop_offset=offset)]
+
+    assert offset > 0
+    assert log_path.read_bytes()[offset - 1:offset] == b"\n"
+    assert b"000300 event 300" in kept
+    assert len(kept) < 400 - 250
+    assert len(probed) == probes_first_run
+
+    log_path.write_bytes(b"no timestamps here\n" * 100)
+    assert index.find_offset(log_path, 300.0, lambda line: None) == 0
@@ -0,0 +1,108 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.log_tail_multiplexer import LogTailMultiplexer, LogTailSource, _ChangeWatcher
+
+
+def build_source(log_path: Path, parsed: list):
+    def parse_line(path: Path, offset: int, raw_line: bytes):
+        parsed.append((path.name, offset, raw_line))
+        return raw_line.decode("utf-8")
+
+    return LogTailSource(
+        key=f"test:{log_path}",
+        list_files=lambda: [log_path] if log_path.exists() else [],
+        parse_line=parse_line,
+    )
+
+
+def test_subscribers_share_one_parse_of_each_line(tmp_path: Path):
+    log_path = tmp_path / "app.log"
+    log_path.write_text("old\n", encoding="utf-8")
+    parsed: list = []
+    multiplexer = LogTailMultiplexer()
+    first = multiplexer.subscribe(build_source(log_path, parsed))
+    second = multiplexer.subscribe(build_source(log_path, parsed))
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write("one\ntwo\npart")
+
+    try:
+        assert first.poll() == (["one", "two"], False)
+        assert second.poll() == (["one", "two"], False)
+        assert parsed == [("app.log", 4, b"one"), ("app.log", 8, b"two")]
+
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("ial\n")
+        assert second.poll() == (["partial"], False)
+        assert first.poll() == (["partial"], False)
+        assert len(parsed) == 3
+    finally:
+        first.close()
+        second.close()
+
+
+def test_slow_subscriber_and_truncation_get_a_reset(tmp_path: Path):
+    log_path = tmp_path / "app.log"
+    log_path.write_text("", encoding="utf-8")
+    multiplexer = LogTailMultiplexer()
+    source = build_source(log_path, [])
+    fast = multiplexer.subscribe(source)
+    slow = multiplexer.subscribe(source, max_pending=2)
+
+    try:
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("a\nb\nc\n")
+        assert fast.poll() == (["a", "b", "c"], False)
+        assert slow.poll() == ([], True)
+
+        log_path.write_text("x\n", encoding="utf-8")
+        assert fast.poll() == ([], True)
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("y\n")
+        assert fast.poll() == (["y"], False)
+    finally:
+        fast.close()
+        slow.close()
+
+
+def test_waiting_subscriber_wakes_when_lines_arrive(tmp_path: Path):
+    log_path = tmp_path / "app.log"
+    log_path.write_text("", encoding="utf-8")
+    multiplexer = LogTailMultiplexer()
+    source = build_source(log_path, [])
+    writer_side = multiplexer.subscribe(source)
+    waiting = multiplexer.subscribe(source)
+
+    async def scenario():
+        waiter = asyncio.create_task(waiting.wait(5.0))
+        await asyncio.sleep(0)
+        with log_path.open("a", encoding="utf-8") as handle:
+            handle.write("hello\n")
+        writer_side.poll()
+        started = time.monotonic()
+        await waiter
+        return time.monotonic() - started
+
+    try:
+        assert asyncio.run(scenario()) < 1.0
+        assert waiting.poll() == (["hello"], False)
+    finally:
+        writer_side.close()
+        waiting.close()
+
+
+def test_change_watcher_ignores_wake_after_close():
+    watcher = _ChangeWatcher()
+    watcher.close()
+
+    # An unsubscribe racing the tail thread's shutdown must not write to a closed descriptor.
+    watcher.wake()
+    watcher.close()
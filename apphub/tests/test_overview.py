@@ -1,4 +1,6 @@
 import sys
+import threading
+import time
 import types
 import shutil
 from datetime import datetime, timezone
@@ -23,6 +25,7 @@ from src.schemas.appResponse import AppResponse
 from src.schemas.coreServices import CoreServiceSummary
 from src.schemas.errorResponse import ErrorResponse
 from src.schemas.overview import OverviewTaskItem
+from src.services.overview_metrics import MetricsSampler
 from src.services.overview_service import OverviewService
 from src.services.overview_stream_cache import overview_stream_cache
 
@@ -59,6 +62,7 @@ class FakeAuthService:
 def test_overview_service_aggregates_product_apps_services_and_tasks():
     service = OverviewService(
         auth_service=FakeAuthService(),
+        metrics_sampler=MetricsSampler(lambda: {}),
         product_metadata_loader=lambda: {"version": "2.2.17", "edition_key": "free", "edition_name": "Free", "max_apps": 2},
         available_catalog_count_loader=lambda: 432,
         host_summary_loader=lambda: {
@@ -176,6 +180,7 @@ def test_overview_service_aggregates_product_apps_services_and_tasks():
 def test_overview_service_degrades_per_section_instead_of_failing_whole_page():
     service = OverviewService(
         auth_service=FakeAuthService(),
+        metrics_sampler=MetricsSampler(lambda: {}),
         product_metadata_loader=lambda: {"version": "2.2.17", "edition_key": "free", "edition_name": "Free", "max_apps": 2},
         available_catalog_count_loader=lambda: 432,
         host_summary_loader=lambda: {"hostname": "host-a"},
@@ -231,9 +236,77 @@ def test_overview_service_degrades_per_section_instead_of_failing_whole_page():
     assert payload.tasks.available is True
 
 
+def test_overview_service_marks_slow_loaders_timed_out_then_stale():
+    release = threading.Event()
+    calls = []
+
+    def slow_services(session_token):
+        calls.append(session_token)
+        release.wait(5)
+        return [
+            CoreServiceSummary(
+                key="gitea",
+                label="Gitea",
+                description="Git repository service",
+                runtime_state="running",
+                runtime_detail="running",
+                health_state="healthy",
+                updated_at="2026-05-07T09:00:00Z",
+                workspace_route="repository",
+                integration_key="gitea",
+                logs_available=True,
+                runtime_logs_href="/logs?keyword=gitea",
+                indicators=[],
+            )
+        ]
+
+    service = OverviewService(
+        auth_service=FakeAuthService(),
+        metrics_sampler=MetricsSampler(lambda: {}),
+        product_metadata_loader=lambda: {"version": "2.2.17"},
+        available_catalog_count_loader=lambda: 432,
+        host_summary_loader=lambda: {"hostname": "host-a"},
+        host_runtime_summary_loader=lambda: {"cpu_percent": 1.0},
+        apps_loader=lambda: [{"app_id": "a1", "status": 1}],
+        runtime_summary_loader=lambda: {"cpu_percent": 2.0},
+        services_loader=slow_services,
+        tasks_loader=lambda: [],
+        loader_timeouts={"services": 0.05},
+    )
+
+    started = time.monotonic()
+    first = service.get_overview("valid-session")
+    assert time.monotonic() - started < 2.0
+    assert first.timed_out == ["services"]
+    assert first.services.available is False
+    assert first.apps.installed_count == 1
+    assert first.host.hostname == "host-a"
+
+    # A second request while the probe is still running waits on the same call.
+    assert service.get_overview("valid-session").timed_out == ["services"]
+    assert len(calls) == 1
+
+    release.set()
+    deadline = time.monotonic() + 2.0
+    while service.get_overview("valid-session").timed_out and time.monotonic() < deadline:
+        time.sleep(0.01)
+    fresh = service.get_overview("valid-session")
+    assert fresh.timed_out == []
+    assert fresh.services.total_count == 1
+    assert fresh.services.stale is False
+
+    release.clear()
+    stale = service.get_overview("valid-session")
+    release.set()
+    assert stale.timed_out == ["services"]
+    assert stale.services.stale is True
+    assert stale.services.healthy_count == 1
+
+
 def test_overview_service_supports_runtime_app_response_models():
     service = OverviewService(
         auth_service=FakeAuthService(),
+        metrics_sampler=MetricsSampler(lambda: {}),
         product_metadata_loader=lambda: {"version": "2.2.17", "edition_key": "free", "edition_name": "Free", "max_apps": 2},
         available_catalog_count_loader=lambda: 432,
         host_summary_loader=lambda: {"hostname": "host-a"},
@@ -298,6 +371,7 @@ def test_overview_service_reuses_loaded_apps_for_apps_and_tasks():
 
     service = OverviewService(
         auth_service=FakeAuthService(),
+        metrics_sampler=MetricsSampler(lambda: {}),
         product_metadata_loader=lambda: {"version": "2.2.17", "edition_key": "free", "edition_name": "Free", "max_apps": 2},
         available_catalog_count_loader=lambda: 432,
         host_summary_loader=lambda: {"hostname": "host-a"},
@@ -345,7 +419,7 @@ def test_overview_service_reuses_loaded_apps_for_apps_and_tasks():
 
 
 def test_overview_default_app_loader_builds_lightweight_inventory():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     class FakePortainerManager:
         def get_local_endpoint_id(self):
@@ -388,6 +462,7 @@ def test_overview_router_returns_normalized_payload():
 
     overview_stream_cache._overview_service = OverviewService(
         auth_service=FakeAuthService(),
+        metrics_sampler=MetricsSampler(lambda: {}),
         product_metadata_loader=lambda: {"version": "2.2.17", "edition_key": "free", "edition_name": "Free", "max_apps": 2},
         host_summary_loader=lambda: {
             "hostname": "host-a",
@@ -449,7 +524,7 @@ def test_overview_router_returns_normalized_payload():
 
 
 def test_overview_host_runtime_summary_reports_system_disk_usage():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     with (
         patch.object(service, "_load_docker_host_info", return_value={}),
@@ -470,7 +545,7 @@ def test_overview_host_runtime_summary_reports_system_disk_usage():
 
 
 def test_overview_host_summary_prefers_docker_host_info_when_available():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     with (
         patch.object(
@@ -501,7 +576,7 @@ def test_overview_host_summary_prefers_docker_host_info_when_available():
 
 
 def test_overview_host_runtime_summary_prefers_docker_host_capacity_when_available():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     with (
         patch.object(
@@ -530,7 +605,7 @@ def test_overview_host_runtime_summary_prefers_docker_host_capacity_when_availab
 
 
 def test_overview_host_cpu_percent_uses_proc_stat_deltas():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     with (
         patch.object(service, "_read_host_cpu_times", side_effect=[(400, 1_000), (420, 1_100)]),
@@ -544,7 +619,7 @@ def test_overview_host_cpu_percent_uses_proc_stat_deltas():
 
 
 def test_overview_runtime_summary_prefers_cgroup_limits_when_available():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     with (
         patch.object(service, "_read_cgroup_cpu_limit_cores", return_value=1.5),
@@ -568,7 +643,7 @@ def test_overview_runtime_summary_prefers_cgroup_limits_when_available():
 
 
 def test_overview_runtime_memory_snapshot_excludes_inactive_file_cache():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     with patch.object(
         service,
@@ -585,7 +660,7 @@ def test_overview_runtime_memory_snapshot_excludes_inactive_file_cache():
 
 
 def test_overview_runtime_summary_uses_container_memory_when_limit_is_unbounded():
-    service = OverviewService(auth_service=FakeAuthService())
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=MetricsSampler(lambda: {}))
 
     with (
         patch.object(service, "_read_cgroup_cpu_limit_cores", return_value=None),
@@ -601,4 +676,45 @@ def test_overview_runtime_summary_uses_container_memory_when_limit_is_unbounded(
     assert payload["runtime_scope"] == "container"
     assert payload["memory_used_bytes"] == 600_000_000
     assert payload["memory_total_bytes"] == 7_500_000_000
-    assert payload["memory_percent"] == 8.0
\ No newline at end of file
+    assert payload["memory_percent"] == 8.0
+
+
+def test_metrics_sampler_records_rolling_series_and_downsamples():
+    readings = iter([10.0, 20.0, 30.0, 40.0])
+    sampler = MetricsSampler(lambda: {"runtime": {"cpu_percent": next(readings), "memory_percent": None}}, interval_seconds=30)
+    start = 1_800_000_000.0
+
+    for offset in (0, 30, 60, 90):
+        sampler.sample_once(now=start + offset)
+    hour = sampler.series("1h", points=2, now=start + 120)
+    day = sampler.series("24h", points=24, now=start + 120)
+
+    assert hour["interval_seconds"] == 1800
+    assert hour["series"]["runtime.cpu_percent"] == [None, 25.0]
+    assert hour["series"]["runtime.memory_percent"] == [None, None]
+    assert len(hour["timestamps"]) == 2
+    assert day["series"]["runtime.cpu_percent"][-1] == 25.0
+    assert sum(value is not None for value in day["series"]["runtime.cpu_percent"]) == 1
+
+
+def test_metrics_sampler_only_starts_a_thread_in_background_mode():
+    sampler = MetricsSampler(lambda: {})
+    sampler.ensure_started()
+
+    assert sampler._thread is None
+
+
+def test_overview_service_serves_sampled_runtime_metrics_when_fresh():
+    sampler = MetricsSampler(lambda: {"runtime": {"runtime_scope": "container", "cpu_percent": 12.5}}, interval_seconds=60)
+    sampler.sample_once()
+    service = OverviewService(auth_service=FakeAuthService(), metrics_sampler=sampler)
+
+    try:
+        with patch.object(service, "_load_runtime_summary", side_effect=AssertionError("sampled inline")):
+            payload = service._runtime_summary_loader()
+        series = service.get_metrics_series("valid-session", "1h", 4)
+    finally:
+        sampler.stop()
+
+    assert payload == {"runtime_scope": "container", "cpu_percent": 12.5}
+    assert series.series["runtime.cpu_percent"][-1] == 12.5
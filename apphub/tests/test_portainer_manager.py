@@ -124,4 +124,24 @@ def test_rewrite_legacy_stack_git_settings_updates_only_legacy_urls(monkeypatch)
     args, kwargs = fake_api.calls[0]
     assert args[0] == 7
     assert args[2] == 'http://127.0.0.1:3001/websoft9/moodle_ntg2o.git'
-    assert kwargs['prune'] is False
\ No newline at end of file
+    assert kwargs['prune'] is False
+
+def test_get_containers_by_ids_dedupes_and_skips_failed_inspects():
+    class InspectApi:
+        def __init__(self):
+            self.calls = []
+
+        def get_container_by_id(self, endpoint_id, container_id):
+            self.calls.append(container_id)
+            if container_id == 'gone':
+                return FakeResponse(404, text='no such container')
+            return FakeResponse(200, payload={'Id': container_id, 'Config': {'Env': [f'ID={container_id}']}})
+
+    fake_api = InspectApi()
+    manager = _build_manager(fake_api)
+
+    result = manager.get_containers_by_ids(1, ['a', 'b', 'a', 'gone', ''], max_workers=4)
+
+    assert sorted(fake_api.calls) == ['a', 'b', 'gone']
+    assert set(result) == {'a', 'b'}
+    assert result['b']['Config']['Env'] == ['ID=b']
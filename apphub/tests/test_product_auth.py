@@ -14,6 +14,7 @@ from src.api.v1.routers import auth as auth_router
 from src.core.request_auth import has_valid_internal_gateway_auth
 from src.core.exception import CustomException
 from src.schemas.errorResponse import ErrorResponse
+from src.services import product_auth as product_auth_module
 from src.services.product_auth import ProductAuthService
 from fastapi.responses import JSONResponse
 
@@ -350,6 +351,102 @@ def test_product_auth_invalidates_existing_session_when_operator_is_disabled(mon
         assert service.database_file.exists() is True
 
 
+def test_product_auth_resolves_session_by_token_and_throttles_activity_writes(monkeypatch, tmp_path):
+    monkeypatch.setenv("WEBSOFT9_PRODUCT_AUTH_ENABLED", "true")
+    monkeypatch.setattr(product_auth_module, "SESSION_TOUCH_INTERVAL_SECONDS", 60)
+
+    service = ProductAuthService(str(tmp_path))
+    service.initialize_first_operator(username="admin", password="StrongPass123!", display_name="Platform Admin")
+    operator_id = service._load_operators()[0]["id"]
+    first_token = service._create_session(operator_id)
+    second_token = service._create_session(operator_id)
+
+    stale_seen_at = "2000-01-01T00:00:00Z"
+    with service._db_connect() as connection:
+        connection.execute("UPDATE sessions SET last_seen_at = ?", (stale_seen_at,))
+        connection.commit()
+
+    assert service._resolve_session(first_token)["id"] == operator_id
+    first_session = service._load_session_by_token_hash(service._hash_session_token(first_token))
+    second_session = service._load_session_by_token_hash(service._hash_session_token(second_token))
+    assert first_session["last_seen_at"] != stale_seen_at
+    assert second_session["last_seen_at"] == stale_seen_at
+
+    touched_at = first_session["last_seen_at"]
+    assert service._resolve_session(first_token)["id"] == operator_id
+    assert service._load_session_by_token_hash(service._hash_session_token(first_token))["last_seen_at"] == touched_at
+
+
+def test_product_auth_prunes_sessions_past_retention(monkeypatch, tmp_path):
+    monkeypatch.setenv("WEBSOFT9_PRODUCT_AUTH_ENABLED", "true")
+
+    service = ProductAuthService(str(tmp_path))
+    service.initialize_first_operator(username="admin", password="StrongPass123!", display_name="Platform Admin")
+    operator_id = service._load_operators()[0]["id"]
+    live_token = service._create_session(operator_id)
+    old_token = service._create_session(operator_id)
+
+    with service._db_connect() as connection:
+        connection.execute(
+            "UPDATE sessions SET expires_at = ? WHERE token_hash = ?",
+            ("2000-01-01T00:00:00Z", service._hash_session_token(old_token)),
+        )
+        connection.commit()
+
+    assert service._prune_sessions() == 1
+    assert service._load_session_by_token_hash(service._hash_session_token(old_token)) is None
+    assert service._resolve_session(live_token)["id"] == operator_id
+
+
+def test_product_auth_caches_resolved_sessions_until_invalidated(monkeypatch, tmp_path):
+    monkeypatch.setenv("WEBSOFT9_PRODUCT_AUTH_ENABLED", "true")
+
+    service = ProductAuthService(str(tmp_path))
+    service.initialize_first_operator(username="admin", password="StrongPass123!", display_name="Platform Admin")
+    operator_id = service._load_operators()[0]["id"]
+    first_token = service._create_session(operator_id)
+    second_token = service._create_session(operator_id)
+    assert service._resolve_session(first_token)["id"] == operator_id
+    assert service._resolve_session(second_token)["id"] == operator_id
+
+    def fail_lookup(_token_hash):
+        raise AssertionError("cached sessions must not hit the database")
+
+    monkeypatch.setattr(service, "_load_session_by_token_hash", fail_lookup)
+    assert service._resolve_session(first_token)["username"] == "admin"
+    monkeypatch.undo()
+    monkeypatch.setenv("WEBSOFT9_PRODUCT_AUTH_ENABLED", "true")
+
+    service.logout(first_token)
+    assert service._resolve_session(first_token) is None
+    assert service._resolve_session(second_token)["id"] == operator_id
+
+    service.invalidate_sessions_for_operator(operator_id, "test")
+    assert service._resolve_session(second_token) is None
+
+
+def test_product_auth_does_not_cache_a_session_logged_out_during_lookup(monkeypatch, tmp_path):
+    monkeypatch.setenv("WEBSOFT9_PRODUCT_AUTH_ENABLED", "true")
+
+    service = ProductAuthService(str(tmp_path))
+    service.initialize_first_operator(username="admin", password="StrongPass123!", display_name="Platform Admin")
+    token = service._create_session(service._load_operators()[0]["id"])
+    load_session = service._load_session_by_token_hash
+
+    def load_then_logout(token_hash):
+        # The lookup has read the live session row when a concurrent logout lands.
+        session = load_session(token_hash)
+        monkeypatch.setattr(service, "_load_session_by_token_hash", load_session)
+        service.logout(token)
+        return session
+
+    monkeypatch.setattr(service, "_load_session_by_token_hash", load_then_logout)
+    assert service._resolve_session(token) is not None
+
+    assert service._session_cache_key(service._hash_session_token(token)) not in service._session_cache
+    assert service._resolve_session(token) is None
+
+
 def test_product_auth_user_management_crud_and_session_invalidation(monkeypatch, tmp_path):
     monkeypatch.setenv("WEBSOFT9_PRODUCT_AUTH_ENABLED", "true")
     monkeypatch.setenv("WEBSOFT9_PRODUCT_AUTH_DATA_DIR", str(tmp_path))
@@ -19,7 +19,9 @@ from src.api.v1.routers import auth as auth_router
 from src.api.v1.routers import logs as logs_router
 from src.core.exception import CustomException
 from src.schemas.errorResponse import ErrorResponse
-from src.schemas.runtimeLogs import RuntimeLogsQuery
+from src.schemas.runtimeLogs import RuntimeLogEntry, RuntimeLogsQuery, RuntimeLogsSearchQuery
+from src.services import runtime_log_store as runtime_log_store_module
+from src.services.runtime_log_store import RuntimeLogStore
 from src.services.runtime_logs import RuntimeLogsService
 
 
@@ -245,4 +247,129 @@ def test_runtime_logs_stream_resets_snapshot_after_truncate(tmp_path: Path):
 
     assert delta.snapshot is not None
     assert len(delta.snapshot) == 1
-    assert delta.snapshot[0].message == "[platform-entrypoint] ok"
\ No newline at end of file
+    assert delta.snapshot[0].message == "[platform-entrypoint] ok"
+
+
+def test_runtime_log_store_searches_history_across_truncation(tmp_path: Path):
+    now = datetime.now(timezone.utc)
+    stamp = lambda minutes: (now - timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z")
+    log_path = write_runtime_log_file(
+        tmp_path,
+        [
+            {"ts": stamp(50), "level": "info", "component": "platform-entrypoint", "domain": "runtime", "message": "gateway started"},
+            {"ts": stamp(40), "level": "error", "component": "platform-entrypoint", "domain": "runtime", "message": "gateway crashed"},
+            {"ts": stamp(30), "level": "error", "component": "library-sync", "domain": "runtime", "message": "sync failed"},
+        ],
+    )
+    service = RuntimeLogsService(log_path=str(log_path), auth_service=FakeAuthService(), log_store=RuntimeLogStore(str(tmp_path / "index.sqlite")))
+
+    errors = service.search_runtime_logs("valid-session", RuntimeLogsSearchQuery(level="error", limit=1))
+    older = service.search_runtime_logs("valid-session", RuntimeLogsSearchQuery(level="error", limit=1, before=errors.next_cursor))
+    log_path.write_text(json.dumps({"ts": stamp(5), "level": "info", "component": "library-sync", "domain": "runtime", "message": "sync recovered"}) + "\n", encoding="utf-8")
+    by_component = service.search_runtime_logs("valid-session", RuntimeLogsSearchQuery(component="Library-Sync"))
+    by_text = service.search_runtime_logs("valid-session", RuntimeLogsSearchQuery(keyword="GATEWAY", time_range="1h"))
+    recent = service.get_runtime_logs("valid-session", RuntimeLogsQuery(time_range="15m"))
+
+    assert [entry.message for entry in errors.entries] == ["[library-sync] sync failed"]
+    assert [entry.message for entry in older.entries] == ["[platform-entrypoint] gateway crashed"]
+    assert older.next_cursor is None
+    assert [entry.message for entry in by_component.entries] == ["[library-sync] sync recovered", "[library-sync] sync failed"]
+    assert [entry.message for entry in by_text.entries] == ["[platform-entrypoint] gateway crashed", "[platform-entrypoint] gateway started"]
+    assert [entry.message for entry in recent] == ["[library-sync] sync recovered"]
+
+
+def test_runtime_log_store_compacts_by_age_and_size(tmp_path: Path):
+    now = datetime.now(timezone.utc)
+    payloads = [{"ts": (now - timedelta(days=40)).isoformat(), "level": "info", "component": "old", "domain": "runtime", "message": "expired"}]
+    payloads += [{"ts": now.isoformat(), "level": "info", "component": "bulk", "domain": "runtime", "message": f"line {index} " + "x" * 200} for index in range(2000)]
+    log_path = write_runtime_log_file(tmp_path, payloads)
+    store = RuntimeLogStore(str(tmp_path / "index.sqlite"), retention_days=30, max_bytes=256 * 1024)
+    service = RuntimeLogsService(log_path=str(log_path), auth_service=FakeAuthService(), log_store=store)
+
+    assert store.sync(log_path, service._parse_line)
+    assert store.wait(timeout=30)
+    entries, _cursor = store.query(limit=5000)
+
+    assert 0 < len(entries) < 2000
+    assert all(entry.source == "bulk" for entry in entries)
+    assert entries[0].message.startswith("[bulk] line 1999 ")
+    connection = store._db_connect()
+    assert connection.execute("PRAGMA freelist_count").fetchone()[0] < 16
+
+
+def test_runtime_log_store_catches_up_large_backlog_in_background(tmp_path: Path, monkeypatch):
+    now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    log_path = write_runtime_log_file(
+        tmp_path,
+        [{"ts": now, "level": "info", "component": "bulk", "domain": "runtime", "message": f"line {index}"} for index in range(50)],
+    )
+    store = RuntimeLogStore(str(tmp_path / "index.sqlite"))
+    service = RuntimeLogsService(log_path=str(log_path), auth_service=FakeAuthService(), log_store=store)
+    monkeypatch.setattr(runtime_log_store_module, "RUNTIME_LOG_INLINE_INGEST_BYTES", 64)
+
+    catching_up = store.sync(log_path, service._parse_line)
+    from_file = service.get_runtime_logs("valid-session", RuntimeLogsQuery(limit=5))
+    assert store.wait(timeout=30)
+    entries, _cursor = store.query(limit=100)
+
+    assert catching_up is False
+    assert [entry.message for entry in from_file][-1] == "[bulk] line 49"
+    assert len(entries) == 50
+    assert store.sync(log_path, service._parse_line)
+
+
+def test_runtime_log_store_time_filters_match_file_reads_for_untimestamped_entries(tmp_path: Path):
+    now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    log_path = write_runtime_log_file(
+        tmp_path,
+        [
+            {"level": "info", "component": "platform-entrypoint", "domain": "runtime", "message": "no timestamp"},
+            {"ts": now, "level": "info", "component": "platform-entrypoint", "domain": "runtime", "message": "recent"},
+        ],
+    )
+    file_service = RuntimeLogsService(log_path=str(log_path), auth_service=FakeAuthService())
+    index_service = RuntimeLogsService(log_path=str(log_path), auth_service=FakeAuthService(), log_store=RuntimeLogStore(str(tmp_path / "index.sqlite")))
+
+    for query in (RuntimeLogsQuery(limit=10), RuntimeLogsQuery(limit=10, time_range="15m")):
+        from_file = [entry.message for entry in file_service.get_runtime_logs("valid-session", query)]
+        from_index = [entry.message for entry in index_service.get_runtime_logs("valid-session", query)]
+        assert from_index == from_file
+    index_service.log_store.wait(timeout=30)
+
+
+def _offset_keyed_line(line: str, fingerprint: str) -> RuntimeLogEntry:
+    # Ids derived from the file offset alone, so entries of a rewritten log reuse the old ids.
+    return RuntimeLogEntry(id=fingerprint, timestamp=None, level="info", source="test", message=line, raw=line)
+
+
+def test_runtime_log_store_keeps_lines_of_a_rotated_log(tmp_path: Path):
+    log_path = tmp_path / "runtime.log"
+    log_path.write_text("aaa1\naaa2\n", encoding="utf-8")
+    store = RuntimeLogStore(str(tmp_path / "index.sqlite"))
+    store.sync(log_path, _offset_keyed_line)
+
+    log_path.rename(tmp_path / "runtime.log.1")
+    log_path.write_text("bbb1\nbbb2\nbbb3\n", encoding="utf-8")
+    store.sync(log_path, _offset_keyed_line)
+    entries, _cursor = store.query(limit=10)
+
+    assert [entry.message for entry in entries] == ["bbb3", "bbb2", "bbb1", "aaa2", "aaa1"]
+
+
+def test_runtime_log_store_reads_a_log_truncated_in_place_from_the_top(tmp_path: Path):
+    log_path = tmp_path / "runtime.log"
+    log_path.write_text("aaa1\naaa2\n", encoding="utf-8")
+    store = RuntimeLogStore(str(tmp_path / "index.sqlite"))
+    store.sync(log_path, _offset_keyed_line)
+
+    # Truncated and grown past the old position before the next sync.
+    with open(log_path, "r+", encoding="utf-8") as handle:
+        handle.truncate(0)
+        handle.write("ccc1\nccc2\nccc3\n")
+    store.sync(log_path, _offset_keyed_line)
+    with open(log_path, "a", encoding="utf-8") as handle:
+        handle.write("ccc4\n")
+    store.sync(log_path, _offset_keyed_line)
+    entries, _cursor = store.query(limit=10)
+
+    assert [entry.message for entry in entries] == ["ccc4", "ccc3", "ccc2", "ccc1", "aaa2", "aaa1"]
@@ -0,0 +1,49 @@
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.sqlite_storage import SQLiteStorage, get_sqlite_storage
+
+
+def test_connections_are_reused_per_thread_and_use_wal(tmp_path):
+    storage = SQLiteStorage(tmp_path / "nested" / "state.sqlite")
+
+    connection = storage.connect()
+    assert storage.connect() is connection
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    other_thread_connections = []
+    thread = threading.Thread(target=lambda: other_thread_connections.append(storage.connect()))
+    thread.start()
+    thread.join()
+    assert other_thread_connections[0] is not connection
+
+    storage.close()
+
+
+def test_schema_initializer_runs_once_and_connection_blocks_commit(tmp_path):
+    storage = get_sqlite_storage(tmp_path / "state.sqlite")
+    assert get_sqlite_storage(str(tmp_path / "state.sqlite")) is storage
+    calls = []
+
+    def initialize(connection):
+        calls.append(1)
+        connection.execute("CREATE TABLE IF NOT EXISTS items (name TEXT)")
+
+    storage.ensure_schema("items", initialize)
+    storage.ensure_schema("items", initialize)
+    assert calls == [1]
+
+    with storage.connect() as connection:
+        connection.execute("INSERT INTO items (name) VALUES ('a')")
+
+    reader = SQLiteStorage(tmp_path / "state.sqlite")
+    assert reader.connect().execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+    reader.close()
+    storage.close()
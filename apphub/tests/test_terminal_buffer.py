@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.terminal_buffer import TerminalOutputBuffer
+
+
+def test_ring_buffer_wraps_and_lagging_readers_resume_from_oldest_byte():
+    buffer = TerminalOutputBuffer(8)
+
+    buffer.append(b"abcdef")
+    first, cursor = buffer.read(0)
+    buffer.append(b"ghij")
+
+    assert first == b"abcdef"
+    assert buffer.read(cursor) == (b"ghij", 10)
+    assert buffer.read(0) == (b"cdefghij", 10)
+    assert buffer.read(4, limit=3) == (b"efg", 7)
+    assert buffer.read(10) == (b"", 10)
+
+    buffer.append(b"0123456789ABC")
+
+    assert (buffer.start, buffer.end) == (15, 23)
+    assert buffer.read(cursor) == (b"56789ABC", 23)
+
+
+def test_split_multibyte_output_is_kept_as_bytes_and_listeners_are_notified():
+    buffer = TerminalOutputBuffer(64)
+    calls = []
+    remove = buffer.add_listener(lambda: calls.append(buffer.end))
+    encoded = "终端".encode("utf-8")
+
+    buffer.append(encoded[:2])
+    buffer.append(encoded[2:])
+    remove()
+    buffer.append(b"!")
+
+    assert buffer.read(0)[0].decode("utf-8") == "终端!"
+    assert calls == [2, 6]
@@ -39,10 +39,20 @@ type MyAppsError = Error & {
 
 type MyAppsStreamPayload = {
     apps?: MyApp[]
+    keys?: string[]
     digest?: string
     refresh_hint_ms?: number
 }
 
+type MyAppsStreamDeltaPayload = {
+    base_digest?: string
+    digest?: string
+    upserts?: MyApp[]
+    upsert_keys?: string[]
+    removed?: string[]
+    refresh_hint_ms?: number
+}
+
 const statusOrder: Record<MyAppStatusKey, number> = {
     installing: 0,
     active: 1,
@@ -146,7 +156,7 @@ async function fetchMyApps(apiLocale: string) {
 }
 
 function buildMyAppsStreamUrl(apiLocale: string) {
-    return `/api/apps/stream?locale=${encodeURIComponent(apiLocale)}`
+    return `/api/apps/stream?locale=${encodeURIComponent(apiLocale)}&mode=delta`
 }
 
 function mergeMyAppSummaryIntoDetail(previousData: MyApp, app: MyApp): MyApp {
@@ -178,6 +188,7 @@ export function useMyApps() {
         }
 
         const eventSource = new EventSource(buildMyAppsStreamUrl(apiLocale), { withCredentials: true })
+        const streamApps = new Map<string, MyApp>()
         const applySnapshot = (apps: MyApp[]) => {
             const normalizedApps = sortMyApps(deduplicateApps(apps))
             queryClient.setQueryData<MyApp[]>(['my-apps', apiLocale], normalizedApps)
@@ -202,6 +213,10 @@ export function useMyApps() {
             try {
                 const payload = JSON.parse((event as MessageEvent<string>).data) as MyAppsStreamPayload
                 if (Array.isArray(payload.apps)) {
+                    // Record keys come from the server, which also disambiguates duplicate apps.
+                    const keys = payload.keys ?? []
+                    streamApps.clear()
+                    payload.apps.forEach((app, index) => streamApps.set(keys[index] ?? String(index), app))
                     applySnapshot(payload.apps)
                 }
             } catch {
@@ -209,10 +224,28 @@ export function useMyApps() {
             }
         }
 
+        const handleDelta = (event: Event) => {
+            try {
+                const payload = JSON.parse((event as MessageEvent<string>).data) as MyAppsStreamDeltaPayload
+                for (const key of payload.removed ?? []) {
+                    streamApps.delete(key)
+                }
+                const upsertKeys = payload.upsert_keys ?? []
+                ;(payload.upserts ?? []).forEach((app, index) => {
+                    streamApps.set(upsertKeys[index] ?? String(index), app)
+                })
+                applySnapshot([...streamApps.values()])
+            } catch {
+                // Ignore malformed events and wait for the next delta.
+            }
+        }
+
         eventSource.addEventListener('snapshot', handleSnapshot)
+        eventSource.addEventListener('delta', handleDelta)
 
         return () => {
             eventSource.removeEventListener('snapshot', handleSnapshot)
+            eventSource.removeEventListener('delta', handleDelta)
             eventSource.close()
         }
     }, [apiLocale, queryClient, supportsEventSource])